@@ -11,49 +11,72 @@ Input:
 Output:
   - cortex/state/category-heatmap.json
 
+Categories are interned to integer codes (first-seen order) and counted
+into a dense 7 x C weekday x category matrix. Totals, percentages and
+dominant categories are derived from the matrix, vectorized with NumPy
+when installed (the pure-Python engine gives identical output).
+
+When the task store (cortex/state/tasks.db, cortex_lib/task_store.py)
+exists, the matrix is a SQL GROUP BY category, weekday over its indexed
+rows instead of decoding JSON (identical output; --no-store skips it).
+
+Without the store, the matrix is summed from the per-day sidecars
+(cortex/state/day-agg-YYYY-MM-DD.json, cortex_lib/day_agg.py) the
+extractors write; stale or missing ones are rebuilt. --no-day-agg decodes
+every task entry instead, --compact decodes them into the column arrays
+of cortex_lib/task_table.py (identical output either way).
+
+--windows 7,30,90,365 loads the longest window once and adds a "windows"
+map ({"7": {...}, ...}) with the same fields per window; the top-level
+fields stay the --days view.
+
+The output begins with a "_meta" header line (cortex_lib/result_cache.py)
+fingerprinting the arguments, the run date and the window's task-entry
+files; when nothing changed the existing output is reused instead of
+recomputed. --no-cache always recomputes.
+
 Usage:
-    python scripts/analyze-category-heatmap.py [--days 30] [--min-tasks 5]
+    python scripts/analyze-category-heatmap.py [--days 30] [--min-tasks 5] [--backend auto|python|numpy]
+        [--windows 7,30,90] [--no-store] [--no-day-agg] [--compact] [--no-cache]
 """
 
 import json
 import sys
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import Dict, List, Any
-from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Any, Optional
 import argparse
 
+SCRIPTS_DIR = Path(__file__).resolve().parent
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from cortex_lib import day_agg, profiling, result_cache, spans, task_entries, task_store, task_table  # noqa: E402
+from cortex_lib.windows import accumulate_windows, parse_windows, windows_json  # noqa: E402
+
 
 STATE_DIR = Path("cortex/state")
 WEEKDAY_ORDER = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
 
 
-def load_task_entries(days: int) -> List[Dict[str, Any]]:
-    """Load task-entry files from the past N days."""
+def load_task_entries(days: int, compact: bool = False) -> List[Dict[str, Any]]:
+    """Load task-entry files from the past N days (compact: as task_table entry adapters)."""
     if not STATE_DIR.exists():
         print(f"❌ State directory not found: {STATE_DIR}", file=sys.stderr)
         sys.exit(1)
 
-    entries: List[Dict[str, Any]] = []
-    today = datetime.now().date()
+    if compact:
+        return list(task_table.load_task_table(days, STATE_DIR).entries())
+    return task_entries.load_task_entries(days, STATE_DIR)
 
-    for i in range(days):
-        date = today - timedelta(days=i)
-        date_str = date.strftime("%Y-%m-%d")
-        entry_file = STATE_DIR / f"task-entry-{date_str}.json"
 
-        if entry_file.exists():
-            try:
-                with entry_file.open("r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    data["__date"] = date_str
-                    entries.append(data)
-            except json.JSONDecodeError:
-                print(f"⚠️  Skipping invalid JSON: {entry_file}", file=sys.stderr)
-            except Exception as e:
-                print(f"⚠️  Error loading {entry_file}: {e}", file=sys.stderr)
+def load_day_aggs(days: int) -> List[Dict[str, Any]]:
+    """Day aggregates (cortex_lib/day_agg.py) of the past N days, newest first."""
+    if not STATE_DIR.exists():
+        print(f"❌ State directory not found: {STATE_DIR}", file=sys.stderr)
+        sys.exit(1)
 
-    return entries
+    return day_agg.load_window(days, STATE_DIR)
 
 
 def parse_iso_datetime(value: str) -> datetime | None:
@@ -66,6 +89,230 @@ def parse_iso_datetime(value: str) -> datetime | None:
         return None
 
 
+def is_task_completed(task: Dict[str, Any]) -> bool:
+    """
+    Check if a task is completed using multiple indicators.
+
+    Supports:
+    - status: "completed", "done", "finished"
+    - title: starts with "[x]" or "- [x]"
+    """
+    status = task.get("status", "").lower()
+    title = task.get("title", "")
+
+    return (
+        status in ("completed", "done", "finished") or
+        title.startswith("[x]") or
+        title.startswith("- [x]")
+    )
+
+
+def new_category_activity() -> Dict[str, Any]:
+    """Running matrix aggregates (see add_category_activity())."""
+    return {"codes": {}, "categories": [], "matrix": [[] for _ in WEEKDAY_ORDER], "active_dates": set()}
+
+
+def add_category_activity(activity: Dict[str, Any], entry: Dict[str, Any]) -> None:
+    """Count one task entry's completed tasks into the running matrix."""
+    codes = activity["codes"]
+    categories = activity["categories"]
+    matrix = activity["matrix"]
+    entry_date = entry.get("__date")
+
+    for task in entry.get("tasks", []):
+        # Only count completed tasks (various status formats)
+        if not is_task_completed(task):
+            continue
+
+        # Get weekday from started_at or completed_at
+        dt = parse_iso_datetime(task.get("started_at")) or parse_iso_datetime(task.get("completed_at"))
+        if not dt:
+            continue
+
+        # Extract category (default to "uncategorized")
+        category = task.get("category", "uncategorized")
+        if not category or category.strip() == "":
+            category = "uncategorized"
+
+        code = codes.get(category)
+        if code is None:
+            code = codes[category] = len(categories)
+            categories.append(category)
+            for row in matrix:
+                row.append(0)
+
+        matrix[dt.weekday()][code] += 1
+
+        # Track active dates
+        if entry_date:
+            activity["active_dates"].add(entry_date)
+
+
+def add_category_day_agg(activity: Dict[str, Any], agg: Dict[str, Any]) -> None:
+    """Count one day aggregate (cortex_lib/day_agg.py) into the running matrix."""
+    codes = activity["codes"]
+    categories = activity["categories"]
+    matrix = activity["matrix"]
+
+    for category, weekdays in agg["categories"].items():
+        code = codes.get(category)
+        if code is None:
+            code = codes[category] = len(categories)
+            categories.append(category)
+            for row in matrix:
+                row.append(0)
+        for weekday, n in enumerate(weekdays):
+            matrix[weekday][code] += n
+        if any(weekdays):
+            activity["active_dates"].add(agg["date"])
+
+
+# Completed "tasks" with a started_at / completed_at weekday. "seen" gives
+# the JSON path's first-seen category order (newest date, then task order).
+STORE_MATRIX_SQL = """
+SELECT category, weekday, COUNT(*) AS n,
+       MIN(seq - CAST(replace(date, '-', '') AS INTEGER) * 1000000) AS seen
+FROM tasks
+WHERE list = 'tasks' AND completed AND weekday IS NOT NULL AND date BETWEEN :since AND :until
+GROUP BY category, weekday
+"""
+
+STORE_DATES_SQL = """
+SELECT DISTINCT date FROM tasks
+WHERE list = 'tasks' AND completed AND weekday IS NOT NULL AND date BETWEEN :since AND :until
+"""
+
+
+def store_category_activity(conn: Any, days: int) -> Dict[str, Any]:
+    """new_category_activity() aggregates for the past N days from the task store."""
+    params = dict(zip(("since", "until"), task_store.window_bounds(days)))
+    cells = []
+    first_seen: Dict[str, int] = {}
+    for row in conn.execute(STORE_MATRIX_SQL, params):
+        category = row["category"]
+        if not category or category.strip() == "":
+            category = "uncategorized"
+        cells.append((category, row["weekday"], row["n"]))
+        first_seen[category] = min(first_seen.get(category, row["seen"]), row["seen"])
+
+    activity = new_category_activity()
+    activity["categories"] = sorted(first_seen, key=first_seen.get)
+    activity["codes"] = {category: code for code, category in enumerate(activity["categories"])}
+    activity["matrix"] = [[0] * len(activity["categories"]) for _ in WEEKDAY_ORDER]
+    for category, weekday, n in cells:
+        activity["matrix"][weekday][activity["codes"][category]] += n
+    activity["active_dates"] = {row["date"] for row in conn.execute(STORE_DATES_SQL, params)}
+    return activity
+
+
+def build_category_matrix(entries: List[Dict[str, Any]]):
+    """
+    Count completed tasks into a weekday x category matrix.
+
+    Returns:
+        categories: list[str] (index = category code, first-seen order)
+        matrix: 7 rows (Monday first) of len(categories) counts
+        active_days: int (number of unique calendar days with completed tasks)
+    """
+    activity = new_category_activity()
+    for entry in entries:
+        add_category_activity(activity, entry)
+    return activity["categories"], activity["matrix"], len(activity["active_dates"])
+
+
+def numpy_available() -> bool:
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def matrix_stats_python(matrix: List[List[int]], threshold: float) -> Dict[str, Any]:
+    """
+    Row/column totals and dominant cells of the matrix.
+
+    Returns:
+        {"weekday_totals": [7], "category_totals": [C],
+         "dominant": 7 lists of (code, count, percentage), count descending}
+    """
+    weekday_totals = [sum(row) for row in matrix]
+    category_totals = [sum(column) for column in zip(*matrix)] if matrix and matrix[0] else []
+
+    dominant = []
+    for row, total in zip(matrix, weekday_totals):
+        cells = []
+        if total:
+            for code in sorted(range(len(row)), key=lambda c: -row[c]):
+                percentage = (row[code] / total) * 100
+                if row[code] and percentage >= (threshold * 100):
+                    cells.append((code, row[code], percentage))
+        dominant.append(cells)
+
+    return {"weekday_totals": weekday_totals, "category_totals": category_totals, "dominant": dominant}
+
+
+def matrix_stats_numpy(matrix: List[List[int]], threshold: float) -> Dict[str, Any]:
+    """matrix_stats_python() with array operations (optional dependency)."""
+    import numpy as np
+
+    counts = np.asarray(matrix, dtype=np.int64).reshape(len(WEEKDAY_ORDER), -1)
+    weekday_totals = counts.sum(axis=1)
+    category_totals = counts.sum(axis=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percentages = counts / weekday_totals[:, None] * 100
+    selected = (counts > 0) & (percentages >= threshold * 100)
+    order = np.argsort(-counts, axis=1, kind="stable")
+
+    dominant = []
+    for day, day_order in enumerate(order):
+        codes = day_order[selected[day, day_order]]
+        dominant.append([(int(code), int(counts[day, code]), float(percentages[day, code])) for code in codes])
+
+    return {
+        "weekday_totals": weekday_totals.tolist(),
+        "category_totals": category_totals.tolist(),
+        "dominant": dominant,
+    }
+
+
+def heatmap_from_matrix(
+    categories: List[str],
+    matrix: List[List[int]],
+    threshold: float = 0.3,
+    backend: str = "auto",
+) -> Dict[str, Any]:
+    """
+    JSON sections of the heatmap from the interned matrix.
+
+    Returns:
+        {"weekday_category_matrix", "category_totals", "weekday_totals",
+         "total_completed", "dominant_categories"}
+    """
+    if backend == "auto":
+        backend = "numpy" if numpy_available() and categories else "python"
+    engine = matrix_stats_numpy if backend == "numpy" else matrix_stats_python
+    stats = engine(matrix, threshold)
+
+    return {
+        "weekday_category_matrix": {
+            weekday: {categories[code]: count for code, count in enumerate(row) if count}
+            for weekday, row in zip(WEEKDAY_ORDER, matrix)
+        },
+        "category_totals": dict(zip(categories, stats["category_totals"])),
+        "weekday_totals": dict(zip(WEEKDAY_ORDER, stats["weekday_totals"])),
+        "total_completed": sum(stats["weekday_totals"]),
+        "dominant_categories": {
+            weekday: [
+                {"category": categories[code], "count": count, "percentage": round(percentage, 1)}
+                for code, count, percentage in cells
+            ]
+            for weekday, cells in zip(WEEKDAY_ORDER, stats["dominant"])
+        },
+    }
+
+
 def extract_category_activity(entries: List[Dict[str, Any]]):
     """
     Extract category activity by weekday.
@@ -77,69 +324,14 @@ def extract_category_activity(entries: List[Dict[str, Any]]):
         total_completed: int
         active_days: int (number of unique calendar days with completed tasks)
     """
-    weekday_category_matrix: Dict[str, Dict[str, int]] = {
-        day: defaultdict(int) for day in WEEKDAY_ORDER
-    }
-    category_totals: Dict[str, int] = defaultdict(int)
-    weekday_totals: Dict[str, int] = {day: 0 for day in WEEKDAY_ORDER}
-    total_completed = 0
-    active_dates = set()  # Track unique dates with completed tasks
-
-    for entry in entries:
-        tasks = entry.get("tasks", [])
-        
-        for task in tasks:
-            # Only count completed tasks (various status formats)
-            status = task.get("status", "").lower()
-            title = task.get("title", "")
-            
-            # Check if task is completed
-            is_completed = (
-                status in ("completed", "done", "finished") or
-                title.startswith("[x]") or
-                title.startswith("- [x]")
-            )
-            
-            if not is_completed:
-                continue
-
-            # Extract category (default to "uncategorized")
-            category = task.get("category", "uncategorized")
-            if not category or category.strip() == "":
-                category = "uncategorized"
-
-            # Get weekday from started_at or completed_at
-            started_at = parse_iso_datetime(task.get("started_at"))
-            completed_at = parse_iso_datetime(task.get("completed_at"))
-            dt = started_at or completed_at
-
-            if not dt:
-                continue
-
-            weekday = dt.strftime("%A")  # e.g., "Monday"
-
-            # Update counters
-            weekday_category_matrix[weekday][category] += 1
-            category_totals[category] += 1
-            weekday_totals[weekday] += 1
-            total_completed += 1
-
-            # Track active dates
-            entry_date = entry.get("__date")
-            if entry_date:
-                active_dates.add(entry_date)
-
-    # Convert defaultdict to regular dict for JSON serialization
-    weekday_category_matrix = {
-        day: dict(categories) for day, categories in weekday_category_matrix.items()
-    }
-
+    categories, matrix, active_days = build_category_matrix(entries)
+    heatmap = heatmap_from_matrix(categories, matrix, backend="python")
     return (
-        weekday_category_matrix,
-        dict(category_totals),
-        weekday_totals,
-        total_completed,
-        len(active_dates),  # active_days
+        heatmap["weekday_category_matrix"],
+        heatmap["category_totals"],
+        heatmap["weekday_totals"],
+        heatmap["total_completed"],
+        active_days,
     )
 
 
@@ -152,29 +344,14 @@ def find_dominant_categories(
     Find dominant categories for each weekday.
     A category is "dominant" if it represents >= threshold% of that day's tasks.
     """
-    dominant: Dict[str, List[Dict[str, Any]]] = {}
-
-    for weekday in WEEKDAY_ORDER:
-        total = weekday_totals[weekday]
-        if total == 0:
-            dominant[weekday] = []
-            continue
-
-        categories = weekday_category_matrix[weekday]
-        dominant_cats = []
-
-        for category, count in sorted(categories.items(), key=lambda x: -x[1]):
-            percentage = (count / total) * 100
-            if percentage >= (threshold * 100):
-                dominant_cats.append({
-                    "category": category,
-                    "count": count,
-                    "percentage": round(percentage, 1),
-                })
-
-        dominant[weekday] = dominant_cats
-
-    return dominant
+    categories = list(dict.fromkeys(
+        category for weekday in WEEKDAY_ORDER for category in weekday_category_matrix.get(weekday, {})
+    ))
+    matrix = [
+        [weekday_category_matrix.get(weekday, {}).get(category, 0) for category in categories]
+        for weekday in WEEKDAY_ORDER
+    ]
+    return heatmap_from_matrix(categories, matrix, threshold, backend="python")["dominant_categories"]
 
 
 def generate_insights(
@@ -223,7 +400,41 @@ def generate_insights(
     return insights
 
 
-def main():
+def heatmap_analysis(activity: Dict[str, Any], threshold: float, min_tasks: int,
+                     backend: str = "auto") -> Dict[str, Any]:
+    """category-heatmap.json fields (without generated_at / analysis_period_days) for the aggregates."""
+    heatmap = heatmap_from_matrix(activity["categories"], activity["matrix"], threshold, backend)
+
+    return {
+        "total_completed_tasks": heatmap["total_completed"],
+        "active_days": len(activity["active_dates"]),  # Number of unique calendar days with completed tasks
+        "weekday_category_matrix": heatmap["weekday_category_matrix"],
+        "category_totals": heatmap["category_totals"],
+        "weekday_totals": heatmap["weekday_totals"],
+        "dominant_categories": heatmap["dominant_categories"],
+        "insights": generate_insights(
+            heatmap["weekday_category_matrix"],
+            heatmap["category_totals"],
+            heatmap["weekday_totals"],
+            heatmap["dominant_categories"],
+            heatmap["total_completed"],
+            min_tasks,
+        ),
+    }
+
+
+def result_fingerprint(args: argparse.Namespace, days: int) -> str:
+    """Result cache fingerprint: arguments, run date, store use and the window's task-entry files."""
+    files = task_entries.window_files(days, STATE_DIR)
+    key = {
+        "args": result_cache.args_key(args),
+        "today": datetime.now().date().isoformat(),
+        "store": not args.no_store and task_store.STORE_PATH.exists(),
+    }
+    return result_cache.input_fingerprint(key, {str(path): (mtime, size) for path, mtime, size in files.values()})
+
+
+def main(argv: Optional[List[str]] = None):
     parser = argparse.ArgumentParser(description="Analyze category patterns across weekdays")
     parser.add_argument(
         "--days",
@@ -249,60 +460,138 @@ def main():
         default="cortex/state/category-heatmap.json",
         help="Output file path",
     )
+    parser.add_argument(
+        "--backend",
+        choices=["auto", "python", "numpy"],
+        default="auto",
+        help="Matrix engine (default: auto = numpy if installed)",
+    )
+    parser.add_argument(
+        "--windows",
+        type=parse_windows,
+        help='Extra windows in days, e.g. 7,30,90,365 (written to a "windows" map)',
+    )
+    parser.add_argument(
+        "--no-store",
+        action="store_true",
+        help="Read the JSON files even if the task store (cortex/state/tasks.db) exists",
+    )
+    parser.add_argument(
+        "--no-day-agg",
+        action="store_true",
+        help="Decode every task-entry file instead of summing the day-agg-*.json sidecars",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Decode the task-entry files into the compact task table (less memory for long windows)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Recompute even if the inputs are unchanged since the output was written",
+    )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
-    print(f"📊 Analyzing category heatmap (past {args.days} days)...", file=sys.stderr)
+    window_days = sorted(set(args.windows or []) | {args.days})
+    longest = window_days[-1]
 
-    entries = load_task_entries(args.days)
-    if not entries:
-        print("❌ No task entries found", file=sys.stderr)
+    if args.backend == "numpy" and not numpy_available():
+        print("Error: numpy is required for --backend numpy. Install with: pip install numpy", file=sys.stderr)
         sys.exit(1)
 
-    print(f"✅ Loaded {len(entries)} task entries", file=sys.stderr)
-
-    (
-        weekday_category_matrix,
-        category_totals,
-        weekday_totals,
-        total_completed,
-        active_days,
-    ) = extract_category_activity(entries)
-
-    print(f"✅ Extracted {total_completed} completed tasks across {active_days} active days", file=sys.stderr)
+    print(f"📊 Analyzing category heatmap (past {longest} days)...", file=sys.stderr)
 
-    dominant_categories = find_dominant_categories(
-        weekday_category_matrix,
-        weekday_totals,
-        args.threshold,
-    )
+    output_path = Path(args.output)
+    fingerprint = result_fingerprint(args, longest)
+    cached = None if args.no_cache else result_cache.load_result(output_path, fingerprint)
+    if cached is not None:
+        print(f"⏭️  Inputs unchanged, keeping {output_path}", file=sys.stderr)
+        print(json.dumps(cached, ensure_ascii=False))
+        return
+
+    store = None
+    if not args.no_store:
+        with spans.span("analyze-category-heatmap.sync"):
+            store = task_store.open_synced()
+
+    if store is not None:
+        try:
+            loaded = task_store.count_days(store, *task_store.window_bounds(longest))
+            if not loaded:
+                print("❌ No task entries found", file=sys.stderr)
+                sys.exit(1)
+            print(f"✅ Loaded {loaded} task entries (task store)", file=sys.stderr)
+
+            with spans.span("analyze-category-heatmap.analyze") as sp:
+                results = {
+                    days: heatmap_analysis(store_category_activity(store, days), args.threshold,
+                                           args.min_tasks, args.backend)
+                    for days in window_days
+                }
+                sp["items"] = results[longest]["total_completed_tasks"]
+        finally:
+            store.close()
+    elif not (args.no_day_agg or args.compact):
+        with spans.span("analyze-category-heatmap.load") as sp:
+            aggs = load_day_aggs(longest)
+            sp["items"] = len(aggs)
+        if not aggs:
+            print("❌ No task entries found", file=sys.stderr)
+            sys.exit(1)
+
+        print(f"✅ Loaded {len(aggs)} task entries (day aggregates)", file=sys.stderr)
+
+        with spans.span("analyze-category-heatmap.analyze") as sp:
+            activity = new_category_activity()
+            results = accumulate_windows(
+                aggs,
+                window_days,
+                lambda agg: add_category_day_agg(activity, agg),
+                lambda: heatmap_analysis(activity, args.threshold, args.min_tasks, args.backend),
+                date_of=lambda agg: agg["date"],
+            )
+            sp["items"] = results[longest]["total_completed_tasks"]
+    else:
+        with spans.span("analyze-category-heatmap.load") as sp:
+            entries = load_task_entries(longest, args.compact)
+            sp["items"] = len(entries)
+        if not entries:
+            print("❌ No task entries found", file=sys.stderr)
+            sys.exit(1)
+
+        print(f"✅ Loaded {len(entries)} task entries", file=sys.stderr)
+
+        with spans.span("analyze-category-heatmap.analyze") as sp:
+            activity = new_category_activity()
+            results = accumulate_windows(
+                entries,
+                window_days,
+                lambda entry: add_category_activity(activity, entry),
+                lambda: heatmap_analysis(activity, args.threshold, args.min_tasks, args.backend),
+            )
+            sp["items"] = results[longest]["total_completed_tasks"]
 
-    insights = generate_insights(
-        weekday_category_matrix,
-        category_totals,
-        weekday_totals,
-        dominant_categories,
-        total_completed,
-        args.min_tasks,
-    )
+    print(f"✅ Extracted {results[args.days]['total_completed_tasks']} completed tasks "
+          f"across {results[args.days]['active_days']} active days", file=sys.stderr)
 
     result = {
         "generated_at": datetime.now().astimezone().isoformat(timespec="seconds"),
         "analysis_period_days": args.days,
-        "total_completed_tasks": total_completed,
-        "active_days": active_days,  # Number of unique calendar days with completed tasks
-        "weekday_category_matrix": weekday_category_matrix,
-        "category_totals": category_totals,
-        "weekday_totals": weekday_totals,
-        "dominant_categories": dominant_categories,
-        "insights": insights,
+        **results[args.days],
     }
+    if args.windows:
+        for days in args.windows:
+            print(f"   • {days}d: {results[days]['total_completed_tasks']} completed tasks, "
+                  f"{len(results[days]['category_totals'])} categories", file=sys.stderr)
+        result["windows"] = windows_json(
+            {days: {"analysis_period_days": days, **r} for days, r in results.items()}, args.windows
+        )
 
-    output_path = Path(args.output)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(
-        json.dumps(result, ensure_ascii=False, indent=2),
-        encoding="utf-8",
+    result_cache.write_result(
+        output_path, result, fingerprint,
+        summary={"total_completed_tasks": result["total_completed_tasks"], "active_days": result["active_days"]},
     )
 
     print(f"✅ Category heatmap saved to {output_path}", file=sys.stderr)
@@ -317,4 +606,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    profiling.run_main(main)
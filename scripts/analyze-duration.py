@@ -10,46 +10,93 @@ Input:
 Output:
   - cortex/state/duration-patterns.json
 
+Per-day sketches:
+  Accepted durations are summarized per day and category into mergeable
+  sketches (cortex_lib/sketches.py) stored in
+  cortex/state/.duration-sketches.json, keyed by each task-entry file's
+  mtime/size. A run only decodes days whose file changed; any --days
+  window is answered by merging the stored daily sketches.
+
+  Compared with calculate_duration_stats over the raw durations:
+  count/min/max are identical, mean/std_dev equal up to float rounding
+  (so the 2-decimal value can differ by 0.01 at a rounding tie), and the
+  median is exact while a category has at most sketches.COMPRESS_AT (200)
+  samples in the window; above that it is a t-digest estimate with a rank
+  error below 1%. Use --exact to compute from the raw durations.
+
+Task store:
+  When cortex/state/tasks.db exists (cortex_lib/task_store.py), each
+  window is answered by SQL GROUP BY category over the indexed rows
+  instead of decoding JSON: count/min/max and the median are exact,
+  mean/std_dev equal up to float rounding. --no-store skips it.
+
+Day aggregates:
+  Without the store, durations come from the per-day sidecars
+  (cortex/state/day-agg-YYYY-MM-DD.json, cortex_lib/day_agg.py) the
+  extractors write, both for the sketches and --exact; stale or missing
+  ones are rebuilt. --no-day-agg decodes the task entries instead. With
+  --exact, --compact decodes them into the column arrays of
+  cortex_lib/task_table.py (durations are float32 there: stats equal up
+  to that rounding).
+
+Multiple windows:
+  --windows 7,30,90,365 loads the longest window once and adds a
+  "windows" map ({"7": {...}, ...}) with the same fields per window; the
+  top-level fields stay the --days view.
+
+Result cache:
+  The output's first line is a "_meta" header (cortex_lib/result_cache.py)
+  holding a fingerprint of the arguments, the run date and the window's
+  task-entry files. A rerun with an unchanged fingerprint reuses the
+  existing output without touching the sketches; --no-cache recomputes.
+
 Usage:
-    python scripts/analyze-duration.py [--days 30] [--min-samples 3]
+    python scripts/analyze-duration.py [--days 30] [--min-samples 3] [--exact] [--windows 7,30,90]
+        [--no-store] [--no-day-agg] [--compact] [--no-cache]
 """
 
 import json
 import sys
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from datetime import datetime
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 from collections import defaultdict
 import argparse
+import math
 import statistics
 
+SCRIPTS_DIR = Path(__file__).resolve().parent
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from cortex_lib import day_agg, profiling, result_cache, sketches, spans, task_entries, task_store, task_table  # noqa: E402
+from cortex_lib.fingerprint import atomic_write_text, load_manifest  # noqa: E402
+from cortex_lib.windows import accumulate_windows, parse_windows, windows_json  # noqa: E402
+
+
+STATE_DIR = Path('cortex/state')
+SKETCH_STORE = STATE_DIR / '.duration-sketches.json'
+SKETCH_STORE_VERSION = 1
 
-def load_task_entries(days: int) -> List[Dict[str, Any]]:
-    """Load task-entry files from the past N days."""
-    state_dir = Path('cortex/state')
-    if not state_dir.exists():
-        print(f"❌ State directory not found: {state_dir}", file=sys.stderr)
+
+def load_task_entries(days: int, compact: bool = False) -> List[Dict[str, Any]]:
+    """Load task-entry files from the past N days (compact: as task_table entry adapters)."""
+    if not STATE_DIR.exists():
+        print(f"❌ State directory not found: {STATE_DIR}", file=sys.stderr)
+        sys.exit(1)
+
+    if compact:
+        return list(task_table.load_task_table(days, STATE_DIR).entries())
+    return task_entries.load_task_entries(days, STATE_DIR)
+
+
+def load_day_aggs(days: int) -> List[Dict[str, Any]]:
+    """Day aggregates (cortex_lib/day_agg.py) of the past N days, newest first."""
+    if not STATE_DIR.exists():
+        print(f"❌ State directory not found: {STATE_DIR}", file=sys.stderr)
         sys.exit(1)
-    
-    entries = []
-    today = datetime.now().date()
-    
-    for i in range(days):
-        date = today - timedelta(days=i)
-        date_str = date.strftime('%Y-%m-%d')
-        entry_file = state_dir / f'task-entry-{date_str}.json'
-        
-        if entry_file.exists():
-            try:
-                with open(entry_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    entries.append(data)
-            except json.JSONDecodeError:
-                print(f"⚠️  Skipping invalid JSON: {entry_file}", file=sys.stderr)
-            except Exception as e:
-                print(f"⚠️  Error loading {entry_file}: {e}", file=sys.stderr)
-    
-    return entries
+
+    return day_agg.load_window(days, STATE_DIR)
 
 
 def is_task_completed(task: Dict[str, Any]) -> bool:
@@ -70,91 +117,273 @@ def is_task_completed(task: Dict[str, Any]) -> bool:
     )
 
 
-def extract_durations(entries: List[Dict[str, Any]], min_confidence: float = 0.7) -> Dict[str, List[float]]:
+def task_duration(task: Dict[str, Any], min_confidence: float) -> Dict[str, Any]:
     """
-    Extract duration data grouped by category.
-
-    Args:
-        entries: List of task entry dictionaries
-        min_confidence: Minimum duration_confidence to include (default: 0.7)
-                       This filters out low-quality duration data:
-                       - 1.0: explicit duration (10分, 10m)
-                       - 0.7: timerange-derived duration
-                       - 0.3: inferred (excluded by default)
-                       - 0.0: unknown (excluded by default)
+    Classify one task for duration analysis.
 
     Returns:
-        {
-            "development": [1.5, 2.0, 1.8, ...],
-            "meeting": [0.5, 1.0, 0.75, ...],
-            ...
-        }
+        {"has_duration": bool, "filtered": bool, "duration": hours or None}
     """
-    durations_by_category = defaultdict(list)
-    filtered_count = 0
-    total_with_duration = 0
-
-    for entry in entries:
-        tasks = entry.get('tasks', [])
-        for task in tasks:
-            # Only analyze completed tasks with duration data
-            if not is_task_completed(task):
-                continue
-
-            # Support both duration_hours and duration_minutes
-            duration_hours = task.get('duration_hours')
-            duration_minutes = task.get('duration_minutes')
-
-            # Check duration_confidence (new: confidence filtering)
-            duration_confidence = task.get('duration_confidence', 1.0)  # Default to 1.0 for backwards compat
-
-            if duration_minutes is not None or duration_hours is not None:
-                total_with_duration += 1
-
-                # Filter by confidence threshold
-                if duration_confidence < min_confidence:
-                    filtered_count += 1
-                    continue
-
-            # Convert minutes to hours if available
-            if duration_minutes is not None and duration_minutes > 0:
-                duration = duration_minutes / 60.0
-            elif duration_hours is not None and duration_hours > 0:
-                duration = duration_hours
-            else:
-                continue
+    result = {"has_duration": False, "filtered": False, "duration": None}
+
+    # Only analyze completed tasks with duration data
+    if not is_task_completed(task):
+        return result
+
+    # Support both duration_hours and duration_minutes
+    duration_hours = task.get('duration_hours')
+    duration_minutes = task.get('duration_minutes')
+
+    # Check duration_confidence (new: confidence filtering)
+    duration_confidence = task.get('duration_confidence', 1.0)  # Default to 1.0 for backwards compat
 
-            category = task.get('category', 'uncategorized')
-            durations_by_category[category].append(duration)
+    if duration_minutes is not None or duration_hours is not None:
+        result["has_duration"] = True
 
-    # Log filtering statistics
+        # Filter by confidence threshold
+        if duration_confidence < min_confidence:
+            result["filtered"] = True
+            return result
+
+    # Convert minutes to hours if available
+    if duration_minutes is not None and duration_minutes > 0:
+        result["duration"] = duration_minutes / 60.0
+    elif duration_hours is not None and duration_hours > 0:
+        result["duration"] = duration_hours
+    return result
+
+
+def report_confidence_filtering(total_with_duration: int, filtered_count: int, min_confidence: float) -> None:
+    """Log filtering statistics."""
     if total_with_duration > 0:
         print(f"🔍 Duration confidence filtering (min_confidence={min_confidence}):", file=sys.stderr)
         print(f"   Total with duration: {total_with_duration}", file=sys.stderr)
         print(f"   Filtered out (low confidence): {filtered_count}", file=sys.stderr)
         print(f"   Accepted: {total_with_duration - filtered_count}", file=sys.stderr)
 
-    return dict(durations_by_category)
+
+def entry_task_durations(entry: Dict[str, Any], min_confidence: float) -> Iterator[Tuple[Any, Dict[str, Any]]]:
+    """(category, task_duration() result) for the tasks of one task entry."""
+    for task in entry.get('tasks', []):
+        yield task.get('category', 'uncategorized'), task_duration(task, min_confidence)
+
+
+def day_agg_task_durations(agg: Dict[str, Any], min_confidence: float) -> Iterator[Tuple[Any, Dict[str, Any]]]:
+    """entry_task_durations() from a day aggregate (cortex_lib/day_agg.py): tasks with a duration field only."""
+    for category, hours, confidence in agg['durations']:
+        filtered = confidence < min_confidence
+        yield category, {"has_duration": True, "filtered": filtered, "duration": None if filtered else hours}
+
+
+def sketch_day(entry: Dict[str, Any], min_confidence: float, from_day_agg: bool = False) -> Dict[str, Any]:
+    """Per-category duration sketches and filtering counts for one task entry (or day aggregate)."""
+    day: Dict[str, Any] = {"with_duration": 0, "filtered": 0, "categories": {}}
+    durations_of = day_agg_task_durations if from_day_agg else entry_task_durations
+    for category, result in durations_of(entry, min_confidence):
+        day["with_duration"] += result["has_duration"]
+        day["filtered"] += result["filtered"]
+        if result["duration"] is not None:
+            sketch = day["categories"].setdefault(category, sketches.new_sketch())
+            sketches.add(sketch, result["duration"])
+    return day
+
+
+def update_sketch_store(days: int, min_confidence: float,
+                        store_path: Path = SKETCH_STORE, use_day_agg: bool = True) -> Dict[str, Any]:
+    """
+    Bring the per-day sketch store up to date for the past N days.
+
+    Only days whose task-entry file changed since the last run are
+    sketched, from their day aggregates unless use_day_agg is false
+    (then the task entries are decoded). Returns {"days": {date: day sketch}, "decoded": int} for the
+    window (newest first).
+    """
+    store = load_manifest(store_path)
+    if store.get("version") != SKETCH_STORE_VERSION or store.get("min_confidence") != min_confidence:
+        store = {"version": SKETCH_STORE_VERSION, "min_confidence": min_confidence, "days": {}}
+    stored = store["days"]
+
+    dates = task_entries.window_dates(days)
+    all_files = task_entries.scan_task_entry_files(STATE_DIR)
+    files = {d: all_files[d] for d in dates if d in all_files}
+
+    stale = {
+        d: meta for d, meta in files.items()
+        if [stored.get(d, {}).get("mtime_ns"), stored.get(d, {}).get("size")] != [meta[1], meta[2]]
+    }
+    # Days outside the window are kept for wider windows until their file is removed
+    removed = [d for d in stored if d not in all_files]
+    for d in removed:
+        del stored[d]
+
+    if use_day_agg:
+        loaded = day_agg.load_day_aggs(stale, STATE_DIR)
+    else:
+        loaded = task_entries.load_task_entry_files(stale)
+    for d, (_, mtime_ns, size) in stale.items():
+        if d in loaded:
+            stored[d] = {"mtime_ns": mtime_ns, "size": size, **sketch_day(loaded[d], min_confidence, use_day_agg)}
+        else:
+            stored.pop(d, None)
+
+    if files and (stale or removed or not store_path.exists()):
+        atomic_write_text(store_path, json.dumps(store, ensure_ascii=False))
+
+    return {"days": {d: stored[d] for d in dates if d in stored}, "decoded": len(stale)}
+
+
+def window_summary(patterns: Dict[str, Any], samples: int, categories: int,
+                   counts: Dict[str, int]) -> Dict[str, Any]:
+    return {"patterns": patterns, "samples": samples, "categories": categories, **counts}
+
+
+def analyze_windows_exact(entries: List[Dict[str, Any]], window_days: List[int],
+                          min_confidence: float, min_samples: int,
+                          from_day_aggs: bool = False) -> Dict[int, Dict[str, Any]]:
+    """
+    Duration patterns for every window from raw durations, in one pass over
+    the entries (or day aggregates, newest first).
+    """
+    durations_by_category: Dict[str, List[float]] = defaultdict(list)
+    counts = {"with_duration": 0, "filtered": 0}
+    durations_of = day_agg_task_durations if from_day_aggs else entry_task_durations
+
+    def add(entry: Dict[str, Any]) -> None:
+        for category, result in durations_of(entry, min_confidence):
+            counts["with_duration"] += result["has_duration"]
+            counts["filtered"] += result["filtered"]
+            if result["duration"] is not None:
+                durations_by_category[category].append(result["duration"])
+
+    def snapshot() -> Dict[str, Any]:
+        patterns = generate_duration_patterns(dict(durations_by_category), min_samples)
+        samples = sum(len(d) for d in durations_by_category.values())
+        return window_summary(patterns, samples, len(durations_by_category), counts)
+
+    date_of = (lambda agg: agg["date"]) if from_day_aggs else (lambda entry: entry["__date"])
+    return accumulate_windows(entries, window_days, add, snapshot, date_of=date_of)
+
+
+def analyze_windows_sketches(day_sketches: Dict[str, Dict[str, Any]], window_days: List[int],
+                             min_samples: int) -> Dict[int, Dict[str, Any]]:
+    """
+    Duration patterns for every window by merging per-day sketches newest
+    to oldest (O(days x categories)).
+    """
+    running: Dict[str, Dict[str, Any]] = {}
+    counts = {"with_duration": 0, "filtered": 0}
+
+    def add(item: Tuple[str, Dict[str, Any]]) -> None:
+        day = item[1]
+        counts["with_duration"] += day["with_duration"]
+        counts["filtered"] += day["filtered"]
+        for category, sketch in day["categories"].items():
+            running[category] = sketches.merge([running.get(category), sketch])
+
+    def snapshot() -> Dict[str, Any]:
+        patterns = generate_sketch_patterns(running, min_samples)
+        return window_summary(patterns, sum(sk["n"] for sk in running.values()), len(running), counts)
+
+    return accumulate_windows(day_sketches.items(), window_days, add, snapshot, date_of=lambda item: item[0])
+
+
+# Per-group stats of the accepted durations in one sorted pass. "seen"
+# orders groups like the JSON path (newest date first, then task order).
+STORE_STATS_SQL = """
+SELECT grp, n, mean, seen, MIN(d) AS lo, MAX(d) AS hi,
+       SUM((d - mean) * (d - mean)) AS ssd,
+       AVG(CASE WHEN rn IN ((n + 1) / 2, (n + 2) / 2) THEN d END) AS median
+FROM (
+    SELECT grp, d,
+           COUNT(*) OVER g AS n, AVG(d) OVER g AS mean, MIN(seen) OVER g AS seen,
+           ROW_NUMBER() OVER (PARTITION BY grp ORDER BY d) AS rn
+    FROM (
+        SELECT {group} AS grp, duration_hours AS d,
+               seq - CAST(replace(date, '-', '') AS INTEGER) * 1000000 AS seen
+        FROM tasks
+        WHERE list = 'tasks' AND date BETWEEN :since AND :until
+          AND duration_hours IS NOT NULL AND duration_confidence >= :min_confidence
+    )
+    WINDOW g AS (PARTITION BY grp)
+)
+GROUP BY grp
+ORDER BY seen
+"""
+
+STORE_COUNTS_SQL = """
+SELECT COALESCE(SUM(has_duration), 0) AS with_duration,
+       COALESCE(SUM(has_duration AND duration_confidence < :min_confidence), 0) AS filtered
+FROM tasks
+WHERE list = 'tasks' AND date BETWEEN :since AND :until
+"""
+
+
+def store_duration_stats(row: Any) -> Dict[str, Any]:
+    std_dev = math.sqrt(row["ssd"] / (row["n"] - 1)) if row["n"] > 1 else 0
+    return duration_stats(row["n"], row["mean"], row["median"], std_dev, row["lo"], row["hi"])
+
+
+def analyze_windows_store(conn: Any, window_days: List[int], min_confidence: float,
+                          min_samples: int) -> Dict[int, Dict[str, Any]]:
+    """Duration patterns for every window from SQL aggregates over the task store."""
+    results = {}
+    for days in window_days:
+        since, until = task_store.window_bounds(days)
+        params = {"since": since, "until": until, "min_confidence": min_confidence}
+
+        by_category = conn.execute(STORE_STATS_SQL.format(group="category"), params).fetchall()
+        overall = conn.execute(STORE_STATS_SQL.format(group="0"), params).fetchone()
+        counts = dict(conn.execute(STORE_COUNTS_SQL, params).fetchone())
+
+        patterns = {
+            row["grp"]: store_duration_stats(row)
+            for row in by_category
+            if row["n"] >= min_samples
+        }
+        overall_stats = store_duration_stats(overall) if overall else empty_duration_stats()
+        results[days] = window_summary(
+            build_patterns(patterns, overall_stats, min_samples),
+            overall["n"] if overall else 0, len(by_category), counts,
+        )
+    return results
 
 
 def calculate_duration_stats(durations: List[float]) -> Dict[str, Any]:
     """Calculate statistical measures for a list of durations."""
     if not durations:
-        return {
-            'count': 0,
-            'mean': 0,
-            'median': 0,
-            'std_dev': 0,
-            'min': 0,
-            'max': 0,
-            'confidence': 'none'
-        }
-    
+        return empty_duration_stats()
+
     count = len(durations)
     mean = statistics.mean(durations)
     median = statistics.median(durations)
     std_dev = statistics.stdev(durations) if count > 1 else 0
-    
+
+    return duration_stats(count, mean, median, std_dev, min(durations), max(durations))
+
+
+def calculate_sketch_stats(sketch: Dict[str, Any]) -> Dict[str, Any]:
+    """calculate_duration_stats() from a merged sketch (see module docstring for error bounds)."""
+    if not sketch["n"]:
+        return empty_duration_stats()
+
+    return duration_stats(sketch["n"], sketch["mean"], sketches.quantile(sketch, 0.5),
+                          sketches.std_dev(sketch), sketch["min"], sketch["max"])
+
+
+def empty_duration_stats() -> Dict[str, Any]:
+    return {
+        'count': 0,
+        'mean': 0,
+        'median': 0,
+        'std_dev': 0,
+        'min': 0,
+        'max': 0,
+        'confidence': 'none'
+    }
+
+
+def duration_stats(count: int, mean: float, median: float, std_dev: float,
+                   minimum: float, maximum: float) -> Dict[str, Any]:
     # Determine confidence level based on sample size
     if count >= 10:
         confidence = 'high'
@@ -170,8 +399,8 @@ def calculate_duration_stats(durations: List[float]) -> Dict[str, Any]:
         'mean': round(mean, 2),
         'median': round(median, 2),
         'std_dev': round(std_dev, 2),
-        'min': round(min(durations), 2),
-        'max': round(max(durations), 2),
+        'min': round(minimum, 2),
+        'max': round(maximum, 2),
         'confidence': confidence
     }
 
@@ -193,7 +422,24 @@ def generate_duration_patterns(durations_by_category: Dict[str, List[float]],
         all_durations.extend(durations)
     
     overall_stats = calculate_duration_stats(all_durations)
-    
+
+    return build_patterns(patterns, overall_stats, min_samples)
+
+
+def generate_sketch_patterns(sketches_by_category: Dict[str, Dict[str, Any]],
+                             min_samples: int) -> Dict[str, Any]:
+    """generate_duration_patterns() from merged per-category sketches."""
+    patterns = {
+        category: calculate_sketch_stats(sketch)
+        for category, sketch in sketches_by_category.items()
+        if sketch["n"] >= min_samples
+    }
+    overall_stats = calculate_sketch_stats(sketches.merge(sketches_by_category.values()))
+
+    return build_patterns(patterns, overall_stats, min_samples)
+
+
+def build_patterns(patterns: Dict[str, Any], overall_stats: Dict[str, Any], min_samples: int) -> Dict[str, Any]:
     return {
         'generated_at': datetime.now().isoformat(),
         'analysis_period_days': None,  # Will be set by caller
@@ -245,7 +491,18 @@ def generate_insights(patterns: Dict[str, Any], overall: Dict[str, Any]) -> List
     return insights
 
 
-def main():
+def result_fingerprint(args: argparse.Namespace, days: int) -> str:
+    """Result cache fingerprint: arguments, run date, store use and the window's task-entry files."""
+    files = task_entries.window_files(days, STATE_DIR)
+    key = {
+        'args': result_cache.args_key(args),
+        'today': datetime.now().date().isoformat(),
+        'store': not args.no_store and task_store.STORE_PATH.exists(),
+    }
+    return result_cache.input_fingerprint(key, {str(path): (mtime, size) for path, mtime, size in files.values()})
+
+
+def main(argv: Optional[List[str]] = None):
     parser = argparse.ArgumentParser(description='Analyze task duration patterns')
     parser.add_argument('--days', type=int, default=30,
                        help='Number of days to analyze (default: 30)')
@@ -256,36 +513,113 @@ def main():
     parser.add_argument('--output', type=str,
                        default='cortex/state/duration-patterns.json',
                        help='Output file path')
+    parser.add_argument('--exact', action='store_true',
+                       help='Compute from the raw durations instead of the per-day sketches')
+    parser.add_argument('--windows', type=parse_windows,
+                       help='Extra windows in days, e.g. 7,30,90,365 (written to a "windows" map)')
+    parser.add_argument('--no-store', action='store_true',
+                       help='Read the JSON files even if the task store (cortex/state/tasks.db) exists')
+    parser.add_argument('--no-day-agg', action='store_true',
+                       help='Decode task-entry files instead of reading the day-agg-*.json sidecars')
+    parser.add_argument('--compact', action='store_true',
+                       help='With --exact: decode the task-entry files into the compact task table '
+                            '(less memory for long windows)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Recompute even if the inputs are unchanged since the output was written')
+
+    args = parser.parse_args(argv)
+
+    window_days = sorted(set(args.windows or []) | {args.days})
+    longest = window_days[-1]
+
+    print(f"📊 Analyzing duration patterns (past {longest} days)...", file=sys.stderr)
 
-    args = parser.parse_args()
-
-    print(f"📊 Analyzing duration patterns (past {args.days} days)...", file=sys.stderr)
-
-    # Load task entries
-    entries = load_task_entries(args.days)
-    if not entries:
-        print("❌ No task entries found", file=sys.stderr)
-        sys.exit(1)
-
-    print(f"✅ Loaded {len(entries)} task entries", file=sys.stderr)
-
-    # Extract durations with confidence filtering
-    durations_by_category = extract_durations(entries, min_confidence=args.min_confidence)
-    total_samples = sum(len(d) for d in durations_by_category.values())
-    
-    print(f"✅ Extracted {total_samples} duration samples from {len(durations_by_category)} categories", 
+    output_path = Path(args.output)
+    fingerprint = result_fingerprint(args, longest)
+    cached = None if args.no_cache else result_cache.load_result(output_path, fingerprint)
+    if cached is not None:
+        print(f"⏭️  Inputs unchanged, keeping {output_path}", file=sys.stderr)
+        print(json.dumps(cached, ensure_ascii=False))
+        return
+
+    store = None
+    if not args.no_store:
+        with spans.span("analyze-duration.sync"):
+            store = task_store.open_synced()
+
+    if store is not None:
+        try:
+            loaded = task_store.count_days(store, *task_store.window_bounds(longest))
+            if not loaded:
+                print("❌ No task entries found", file=sys.stderr)
+                sys.exit(1)
+            print(f"✅ Loaded {loaded} task entries (task store)", file=sys.stderr)
+
+            with spans.span("analyze-duration.analyze") as sp:
+                results = analyze_windows_store(store, window_days, args.min_confidence, args.min_samples)
+                sp["items"] = results[longest]["samples"]
+        finally:
+            store.close()
+    elif args.exact:
+        use_day_agg = not (args.no_day_agg or args.compact)
+        # Load task entries (or their day aggregates)
+        with spans.span("analyze-duration.load") as sp:
+            if use_day_agg:
+                entries = load_day_aggs(longest)
+            else:
+                entries = load_task_entries(longest, args.compact)
+            sp["items"] = len(entries)
+        if not entries:
+            print("❌ No task entries found", file=sys.stderr)
+            sys.exit(1)
+
+        print(f"✅ Loaded {len(entries)} task entries{' (day aggregates)' if use_day_agg else ''}", file=sys.stderr)
+
+        # Extract durations with confidence filtering
+        with spans.span("analyze-duration.analyze") as sp:
+            results = analyze_windows_exact(entries, window_days, args.min_confidence, args.min_samples,
+                                            use_day_agg)
+            sp["items"] = results[longest]["samples"]
+    else:
+        if not STATE_DIR.exists():
+            print(f"❌ State directory not found: {STATE_DIR}", file=sys.stderr)
+            sys.exit(1)
+
+        # Decode only changed days into the sketch store
+        with spans.span("analyze-duration.load") as sp:
+            window = update_sketch_store(longest, args.min_confidence, use_day_agg=not args.no_day_agg)
+            sp["items"] = window["decoded"]
+        if not window["days"]:
+            print("❌ No task entries found", file=sys.stderr)
+            sys.exit(1)
+
+        print(f"✅ Loaded {len(window['days'])} task entries "
+              f"({window['decoded']} decoded, {len(window['days']) - window['decoded']} from sketches)",
+              file=sys.stderr)
+
+        with spans.span("analyze-duration.analyze") as sp:
+            results = analyze_windows_sketches(window["days"], window_days, args.min_samples)
+            sp["items"] = results[longest]["samples"]
+
+    primary = results[args.days]
+    report_confidence_filtering(primary["with_duration"], primary["filtered"], args.min_confidence)
+    print(f"✅ Extracted {primary['samples']} duration samples from {primary['categories']} categories",
           file=sys.stderr)
-    
-    # Generate patterns
-    patterns = generate_duration_patterns(durations_by_category, args.min_samples)
+
+    patterns = primary["patterns"]
     patterns['analysis_period_days'] = args.days
+
+    if args.windows:
+        by_window = {}
+        for days, result in results.items():
+            by_window[days] = {k: v for k, v in result["patterns"].items() if k != 'generated_at'}
+            by_window[days]['analysis_period_days'] = days
+            print(f"   • {days}d: {result['samples']} samples, {result['categories']} categories", file=sys.stderr)
+        patterns['windows'] = windows_json(by_window, args.windows)
     
-    # Save output
-    output_path = Path(args.output)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(patterns, f, indent=2, ensure_ascii=False)
+    # Save output (the header carries what analyze-health reads)
+    result_cache.write_result(output_path, patterns, fingerprint,
+                              summary={'overall': {'count': patterns['overall']['count']}})
     
     print(f"✅ Duration patterns saved to {output_path}", file=sys.stderr)
     
@@ -300,4 +634,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    profiling.run_main(main)
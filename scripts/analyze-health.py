@@ -5,30 +5,65 @@ Evaluates the overall health of Cortex OS by analyzing:
 - Automation reliability (Recipe execution logs)
 - Data freshness (state file timestamps)
 - Analytics health (sample sizes and completeness)
+- Stage latency/throughput (timing spans in the recipe JSONL logs;
+  reported, not part of the overall score)
 
 Input:
   - cortex/logs/*.jsonl (v1.3+ structured execution logs)
   - cortex/logs/*.log   (legacy text logs)
-  - cortex/state/*.json (analytics outputs)
+    Rotated / compressed segments (.1, -YYYYMMDD, .gz, .zst) of both are
+    read too (cortex_lib/log_segments.py).
+  - cortex/state/*.json (analytics outputs; only the "_meta" header line
+    the analyzers write (cortex_lib/result_cache.py) is read, older
+    outputs without one are decoded in full)
 
 Output:
   - cortex/state/health-score.json
+  - cortex/logs/.health-checkpoints.json (incremental JSONL scan state)
+  - cortex/logs/.recipe-*.jsonl.idx (sparse timestamp indexes)
+
+The health score carries a "_meta" header of its own, fingerprinting the
+window, the current UTC hour, the recipe log segments and the analytics
+outputs as of before the run. The span logs (cortex_lib/spans.py) are
+left out, so that its own and the other analyzers' spans do not
+invalidate it; new spans reach the latency report within the hour only
+with --no-cache. A rerun within the same hour with none of them changed
+reuses the existing score (file ages are then as of its generated_at);
+--no-cache or --rescan recomputes.
 
 Usage:
-    python scripts/analyze-health.py [--window-days 7] [--verbose]
+    python scripts/analyze-health.py [--window-days 7] [--verbose] [--rescan] [--no-cache]
 """
 
 import argparse
 import json
+import re
 import sys
 from pathlib import Path
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Any, Tuple, Optional
 
+SCRIPTS_DIR = Path(__file__).resolve().parent
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from cortex_lib import log_index, log_segments, profiling, result_cache  # noqa: E402
+from cortex_lib import spans as timing_spans  # noqa: E402
+from cortex_lib.fingerprint import atomic_write_text, load_manifest  # noqa: E402
+
 
 STATE_DIR = Path("cortex/state")
 LOGS_DIR = Path("cortex/logs")
 
+CHECKPOINT_NAME = ".health-checkpoints.json"
+CHECKPOINT_VERSION = 2
+BUCKET_FORMAT = "%Y-%m-%dT%H"  # UTC hour
+UNDATED = "undated"
+
+# Legacy .log run markers; success wins when both occur
+LEGACY_SUCCESS_RE = re.compile("✅|SUCCESS|(?i:completed)".encode("utf-8"))
+LEGACY_FAILURE_RE = re.compile("❌|ERROR|FAILED".encode("utf-8"))
+
 
 def _parse_iso_ts(value: Any) -> Optional[datetime]:
     """Parse ISO timestamps used in JSONL logs.
@@ -58,85 +93,223 @@ def _parse_iso_ts(value: Any) -> Optional[datetime]:
     return dt.astimezone(timezone.utc)
 
 
-def parse_log_files(window_days: int) -> Tuple[int, int, int]:
+def checkpoint_path() -> Path:
+    """Scan checkpoints live next to the logs they describe."""
+    return LOGS_DIR / CHECKPOINT_NAME
+
+
+def _new_bucket() -> Dict[str, Any]:
+    return {"runs": 0, "successes": 0, "failures": 0, "stages": {}}
+
+
+def fold_log_line(buckets: Dict[str, Dict[str, Any]], line: bytes) -> None:
+    """Decode one JSONL line into its UTC hour bucket ("undated" without a usable ts)."""
+    try:
+        entry = json.loads(line)
+    except ValueError:  # JSONDecodeError, UnicodeDecodeError
+        return
+
+    # Skip if entry is not a dict (e.g., bare integers, strings)
+    if not isinstance(entry, dict):
+        return
+
+    entry_ts = _parse_iso_ts(entry.get("ts"))
+    key = entry_ts.strftime(BUCKET_FORMAT) if entry_ts is not None else UNDATED
+    bucket = buckets.setdefault(key, _new_bucket())
+
+    if timing_spans.is_span(entry):
+        timing_spans.add_span(bucket["stages"], entry)
+        return
+
+    bucket["runs"] += 1
+    status = entry.get("status")
+    if status == "success":
+        bucket["successes"] += 1
+    elif status == "error":
+        bucket["failures"] += 1
+
+
+def scan_jsonl_log(
+    segment: Dict[str, Any], checkpoint: Optional[Dict[str, Any]], window_start: datetime
+) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    """Bring one segment's checkpoint up to date, decoding only appended lines.
+
+    The checkpoint is reset when the inode changed (rotated / replaced),
+    the file shrank below the last offset (truncated), or the window now
+    starts before the hour the checkpoint was started from. A reset
+    checkpoint starts at the window start found through the sparse
+    timestamp index (cortex_lib/log_index.py) instead of byte 0; its
+    "from" key records the first complete hour bucket.
+
+    Compressed segments (cortex_lib/log_segments.py) are not appended to:
+    they are decoded in full once and re-read only if the file changes.
+
+    Returns:
+        (checkpoint, tail) - tail holds the buckets of a final line without
+        a newline yet. It is counted but not checkpointed, so a line that
+        is still being written is read again next time.
+    """
+    st = segment["stat"]
+    compressed = segment["compression"] is not None
+    window_key = window_start.strftime(BUCKET_FORMAT)
+
+    if compressed:
+        if (checkpoint is not None and checkpoint.get("inode") == st.st_ino and checkpoint.get("size") == st.st_size
+                and checkpoint.get("from", "") <= window_key):
+            return checkpoint, {}
+        checkpoint = {"inode": st.st_ino, "size": st.st_size, "offset": 0, "from": "", "buckets": {}}
+        for line in log_segments.iter_lines(segment):
+            fold_log_line(checkpoint["buckets"], line)
+            checkpoint["offset"] += len(line)
+        return checkpoint, {}
+
+    if (checkpoint is None or checkpoint.get("inode") != st.st_ino
+            or st.st_size < checkpoint.get("offset", 0) or checkpoint.get("from", "") > window_key):
+        offset = log_index.window_start(segment["path"], window_start)
+        checkpoint = {"inode": st.st_ino, "size": 0, "offset": offset,
+                      "from": window_key if offset else "", "buckets": {}}
+
+    tail: Dict[str, Dict[str, Any]] = {}
+    if st.st_size > checkpoint["offset"]:
+        offset = checkpoint["offset"]
+        for line in log_segments.iter_lines(segment, offset):
+            if not line.endswith(b"\n"):
+                fold_log_line(tail, line)
+                break
+            fold_log_line(checkpoint["buckets"], line)
+            offset += len(line)
+        checkpoint["offset"] = offset
+    checkpoint["size"] = st.st_size
+    return checkpoint, tail
+
+
+def prune_checkpoint(checkpoint: Dict[str, Any], cutoff_key: str) -> bool:
+    """Drop the hour buckets before cutoff_key ("undated" is kept); True if any were.
+
+    "from" moves up to cutoff_key, so a later, wider window resets the
+    checkpoint and re-seeks instead of missing the dropped hours.
+    """
+    buckets = checkpoint["buckets"]
+    stale = [key for key in buckets if key != UNDATED and key < cutoff_key]
+    if not stale:
+        return False
+    for key in stale:
+        del buckets[key]
+    checkpoint["from"] = max(checkpoint.get("from", ""), cutoff_key)
+    return True
+
+
+def parse_log_files(
+    window_days: int, latency: Optional[List[Dict[str, Any]]] = None, rescan: bool = False
+) -> Tuple[int, int, int]:
     """Parse Recipe execution logs for success/failure counts.
 
     Supports both:
     - .jsonl files (JSONL format, v1.3+)
     - .log files (legacy text format)
+    including their rotated and .gz / .zst compressed segments.
+
+    Args:
+        window_days: Days to include
+        latency: If given, the per-stage span totals (cortex_lib/spans.py
+            add_span()) of every hour bucket in the window are appended
+            here, oldest first
+        rescan: Ignore the saved checkpoints and decode every JSONL file again
 
     Returns:
         (runs, successes, failures)
 
     Notes:
-      - For JSONL, each log line is treated as one run.
-      - Entries are filtered by `ts` when available (more accurate than file mtime).
+      - For JSONL, each log line is treated as one run, except timing
+        span records (cortex_lib/spans.py), which are not runs.
+      - JSONL files are scanned incrementally: per-file checkpoints
+        (inode, size, byte offset, per-hour counters and span totals) are
+        kept in cortex/logs/.health-checkpoints.json and each run only
+        decodes the lines appended since. The window is rebuilt from the
+        hour buckets, so entries are filtered by `ts` to the hour (entries
+        without `ts` always count). Buckets older than the window are
+        dropped when the checkpoints are saved. New checkpoints seek to the
+        window start with the sparse timestamp index instead of reading the
+        whole file.
       - Legacy .log files are counted per-file.
     """
     if not LOGS_DIR.exists():
         return 0, 0, 0
 
     cutoff_dt = datetime.now(timezone.utc) - timedelta(days=window_days)
+    cutoff_key = cutoff_dt.strftime(BUCKET_FORMAT)
+    window_start = cutoff_dt.replace(minute=0, second=0, microsecond=0)
 
     runs = 0
     successes = 0
     failures = 0
 
-    # Parse JSONL files (v1.3+)
-    for log_file in LOGS_DIR.glob("recipe-*.jsonl"):
+    store_path = checkpoint_path()
+    store = {} if rescan else load_manifest(store_path)
+    if store.get("version") != CHECKPOINT_VERSION:
+        store = {"version": CHECKPOINT_VERSION, "files": {}}
+    checkpoints: Dict[str, Any] = {}
+    periods: List[Tuple[str, Dict[str, Any]]] = []
+    changed = rescan
+
+    # Parse JSONL segments (v1.3+; live, rotated or compressed)
+    for segment in log_segments.list_segments(LOGS_DIR, "jsonl"):
+        log_file = segment["path"]
         try:
-            # Fast skip: if the file itself is old, it's unlikely to contain recent entries.
-            mtime = datetime.fromtimestamp(log_file.stat().st_mtime, tz=timezone.utc)
-            if mtime < cutoff_dt:
+            previous = store["files"].get(log_file.name)
+            # Fast skip: a segment last written before the window has no entries in it.
+            # Unreadable (.zst without zstandard) segments keep their checkpoint too.
+            if segment["end"] < cutoff_dt or not log_segments.readable(segment):
+                if previous is not None:
+                    checkpoints[log_file.name] = previous
                 continue
 
-            with log_file.open("r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-
-                    try:
-                        entry = json.loads(line)
-                    except json.JSONDecodeError:
-                        continue
-
-                    # Skip if entry is not a dict (e.g., bare integers, strings)
-                    if not isinstance(entry, dict):
-                        continue
+            position = (previous or {}).get("inode"), (previous or {}).get("offset"), (previous or {}).get("size")
+            checkpoint, tail = scan_jsonl_log(segment, previous, window_start)
+            checkpoints[log_file.name] = checkpoint
+            changed = changed or position != (checkpoint["inode"], checkpoint["offset"], checkpoint["size"])
 
-                    entry_ts = _parse_iso_ts(entry.get("ts"))
-                    if entry_ts is not None and entry_ts < cutoff_dt:
+            for buckets in (checkpoint["buckets"], tail):
+                for key, bucket in buckets.items():
+                    if key != UNDATED and key < cutoff_key:
                         continue
-
-                    runs += 1
-                    status = entry.get("status")
-                    if status == "success":
-                        successes += 1
-                    elif status == "error":
-                        failures += 1
+                    runs += bucket["runs"]
+                    successes += bucket["successes"]
+                    failures += bucket["failures"]
+                    if bucket["stages"]:
+                        periods.append((key, bucket["stages"]))
 
         except Exception as e:
             print(f"⚠️  Error reading {log_file}: {e}", file=sys.stderr)
 
-    # Parse legacy .log files (backwards compatibility)
-    for log_file in LOGS_DIR.glob("recipe-*.log"):
+    if latency is not None:
+        # Undated spans sort first, as they do by ts in summarize_spans()
+        periods.sort(key=lambda period: "" if period[0] == UNDATED else period[0])
+        latency.extend(stages for _, stages in periods)
+
+    # Checkpoints of deleted files are dropped, hours before the window too
+    changed = changed or checkpoints.keys() != store["files"].keys()
+    for checkpoint in checkpoints.values():
+        changed = prune_checkpoint(checkpoint, cutoff_key) or changed
+    store["files"] = checkpoints
+    if changed:
         try:
-            mtime = datetime.fromtimestamp(log_file.stat().st_mtime, tz=timezone.utc)
-            if mtime < cutoff_dt:
-                continue
+            atomic_write_text(store_path, json.dumps(store, ensure_ascii=False))
+        except OSError as e:
+            print(f"⚠️  Could not save log checkpoints to {store_path}: {e}", file=sys.stderr)
 
-            content = log_file.read_text(encoding="utf-8")
-
-            if "✅" in content or "SUCCESS" in content or "completed" in content.lower():
+    # Parse legacy .log segments (backwards compatibility); old ones are never opened
+    for segment in log_segments.list_segments(LOGS_DIR, "log", since=cutoff_dt):
+        try:
+            if log_segments.search(segment, LEGACY_SUCCESS_RE):
                 successes += 1
-            elif "❌" in content or "ERROR" in content or "FAILED" in content:
+            elif log_segments.search(segment, LEGACY_FAILURE_RE):
                 failures += 1
 
             runs += 1
 
         except Exception as e:
-            print(f"⚠️  Error reading {log_file}: {e}", file=sys.stderr)
+            print(f"⚠️  Error reading {segment['path']}: {e}", file=sys.stderr)
 
     return runs, successes, failures
 
@@ -216,28 +389,64 @@ def calculate_freshness_score(state_files: Dict[str, Path]) -> Tuple[int, Dict[s
     }
 
 
-def calculate_analytics_health(state_dir: Path) -> Tuple[int, Dict[str, Any]]:
-    """Calculate analytics health based on sample sizes."""
-    scores: List[int] = []
-    details: Dict[str, Any] = {}
-
+def analytics_files(state_dir: Path) -> Dict[str, Optional[Path]]:
+    """The analyzer outputs scored by calculate_analytics_health (None = missing)."""
     # Check duration stats (support both legacy + current filenames)
     duration_candidates = [
         state_dir / "duration-patterns.json",
         state_dir / "duration-stats.json",
     ]
-    duration_file = next((p for p in duration_candidates if p.exists()), None)
+    return {
+        "duration": next((p for p in duration_candidates if p.exists()), None),
+        "rhythm": state_dir / "rhythm-patterns.json",
+        "category": state_dir / "category-heatmap.json",
+    }
+
+
+def calculate_analytics_health(state_dir: Path) -> Tuple[int, Dict[str, Any]]:
+    """Calculate analytics health based on sample sizes."""
+    files = analytics_files(state_dir)
+    duration_file = files["duration"]
+
+    def load(path: Optional[Path]) -> Optional[Dict[str, Any]]:
+        if path is None or not path.exists():
+            return None
+        # The header summary holds the fields scored below; decode in full only without one
+        header = result_cache.read_header(path)
+        if header is not None and isinstance(header.get("summary"), dict):
+            return header["summary"]
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except Exception:
+            return None
+
+    return score_analytics(
+        load(duration_file),
+        load(files["rhythm"]),
+        load(files["category"]),
+        duration_file.name if duration_file is not None else None,
+    )
+
 
-    if duration_file is not None:
+def score_analytics(
+    duration: Optional[Dict[str, Any]],
+    rhythm: Optional[Dict[str, Any]],
+    category: Optional[Dict[str, Any]],
+    duration_file: Optional[str] = None,
+) -> Tuple[int, Dict[str, Any]]:
+    """Analytics health from the analyzer outputs (None = missing / unreadable)."""
+    scores: List[int] = []
+    details: Dict[str, Any] = {}
+
+    if duration is not None:
         try:
-            data = json.loads(duration_file.read_text(encoding="utf-8"))
             # Support both legacy and v1.3+ formats
             total_tasks = (
-                data.get("total_tasks_with_duration")
-                or data.get("total_tasks")
-                or data.get("task_count")
-                or data.get("count")
-                or data.get("overall", {}).get("count")  # v1.3+ format
+                duration.get("total_tasks_with_duration")
+                or duration.get("total_tasks")
+                or duration.get("task_count")
+                or duration.get("count")
+                or duration.get("overall", {}).get("count")  # v1.3+ format
                 or 0
             )
 
@@ -255,17 +464,16 @@ def calculate_analytics_health(state_dir: Path) -> Tuple[int, Dict[str, Any]]:
             scores.append(dur_score)
             details["duration_samples"] = total_tasks
             details["duration_score"] = dur_score
-            details["duration_file"] = duration_file.name
+            if duration_file is not None:
+                details["duration_file"] = duration_file
         except Exception:
             pass
 
     # Check rhythm patterns
-    rhythm_file = state_dir / "rhythm-patterns.json"
-    if rhythm_file.exists():
+    if rhythm is not None:
         try:
-            data = json.loads(rhythm_file.read_text(encoding="utf-8"))
-            active_days = data.get("active_days", 0)
-            total_tasks = data.get("total_tasks", 0)
+            active_days = rhythm.get("active_days", 0)
+            total_tasks = rhythm.get("total_tasks", 0)
 
             if active_days >= 15 and total_tasks >= 30:
                 rhythm_score = 95
@@ -284,14 +492,12 @@ def calculate_analytics_health(state_dir: Path) -> Tuple[int, Dict[str, Any]]:
             pass
 
     # Check category heatmap
-    category_file = state_dir / "category-heatmap.json"
-    if category_file.exists():
+    if category is not None:
         try:
-            data = json.loads(category_file.read_text(encoding="utf-8"))
-            total_tasks = data.get("total_completed_tasks", 0)
+            total_tasks = category.get("total_completed_tasks", 0)
 
             # Get active_days from file (unique calendar days), not weekday count
-            active_days = data.get("active_days", 0)
+            active_days = category.get("active_days", 0)
 
             if active_days >= 14 and total_tasks >= 40:
                 cat_score = 95
@@ -318,6 +524,44 @@ def calculate_analytics_health(state_dir: Path) -> Tuple[int, Dict[str, Any]]:
     return overall_score, details
 
 
+def weighted_score(automation_score: int, freshness_score: int, analytics_score: int) -> int:
+    """Overall health: 40% automation, 30% freshness, 30% analytics."""
+    return round(
+        0.4 * automation_score +
+        0.3 * freshness_score +
+        0.3 * analytics_score
+    )
+
+
+def calculate_latency_health(periods: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Per-stage p50/p95 latency and throughput from per-hour span totals (oldest first)."""
+    stages = timing_spans.summarize_stage_totals(periods)
+    if not stages:
+        return {"status": "no_data", "stages": {}}
+
+    slowing = sorted(
+        stage for stage, stats in stages.items()
+        if stats["trend_ratio"] is not None and stats["trend_ratio"] >= timing_spans.SLOWDOWN_RATIO
+    )
+    return {
+        "status": "slowing" if slowing else "ok",
+        "span_count": sum(stats["count"] for stats in stages.values()),
+        "slowing_stages": slowing,
+        "stages": stages,
+    }
+
+
+def generate_latency_insights(latency: Dict[str, Any]) -> List[str]:
+    insights: List[str] = []
+    for stage in latency.get("slowing_stages", []):
+        stats = latency["stages"][stage]
+        insights.append(
+            f"🐢 {stage} is getting slower: p50 {stats['p50_ms']:.0f}ms "
+            f"({stats['trend_ratio']:.1f}x earlier in the window)."
+        )
+    return insights
+
+
 def generate_insights(
     overall_score: int,
     automation: Dict[str, Any],
@@ -366,7 +610,25 @@ def generate_insights(
     return insights
 
 
-def main() -> None:
+def result_fingerprint(args: argparse.Namespace) -> str:
+    """Result cache fingerprint: window, current UTC hour, recipe run logs (not span logs) and analytics outputs."""
+    files: Dict[str, result_cache.Signature] = {}
+    if LOGS_DIR.exists():
+        for kind in ("jsonl", "log"):
+            for segment in log_segments.list_segments(LOGS_DIR, kind):
+                if timing_spans.is_span_log(segment["path"]):
+                    continue
+                files[str(segment["path"])] = (segment["stat"].st_mtime_ns, segment["stat"].st_size)
+    for name in ("duration-patterns.json", "duration-stats.json", "rhythm-patterns.json", "category-heatmap.json"):
+        files[str(STATE_DIR / name)] = result_cache.file_signature(STATE_DIR / name)
+    key = {
+        "args": result_cache.args_key(args, exclude=("output", "no_cache", "rescan", "verbose")),
+        "hour": datetime.now(timezone.utc).strftime(BUCKET_FORMAT),
+    }
+    return result_cache.input_fingerprint(key, files)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
     parser = argparse.ArgumentParser(description="Analyze Cortex OS health")
     parser.add_argument(
         "--window-days",
@@ -379,6 +641,16 @@ def main() -> None:
         action="store_true",
         help="Print detailed component scores",
     )
+    parser.add_argument(
+        "--rescan",
+        action="store_true",
+        help="Ignore the JSONL scan checkpoints and re-read the logs from the start",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Recompute even if the inputs are unchanged since the output was written",
+    )
     parser.add_argument(
         "--output",
         type=str,
@@ -386,12 +658,24 @@ def main() -> None:
         help="Output file path",
     )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     print(f"🏥 Analyzing Cortex OS health (window: {args.window_days} days)...", file=sys.stderr)
 
+    output_path = Path(args.output)
+    fingerprint = result_fingerprint(args)
+    cached = None if args.no_cache or args.rescan else result_cache.load_result(output_path, fingerprint)
+    if cached is not None:
+        print(f"⏭️  Inputs unchanged this hour, keeping {output_path} "
+              f"(health score: {cached.get('overall_score')}/100)", file=sys.stderr)
+        print(json.dumps(cached, ensure_ascii=False))
+        return
+
     # 1. Automation reliability
-    runs, successes, failures = parse_log_files(args.window_days)
+    latency_periods: List[Dict[str, Any]] = []
+    with timing_spans.span("analyze-health.logs") as sp:
+        runs, successes, failures = parse_log_files(args.window_days, latency_periods, rescan=args.rescan)
+        sp["items"] = runs + sum(totals["durations"]["n"] for stages in latency_periods for totals in stages.values())
     automation_score, automation_details = calculate_automation_score(runs, successes, failures)
     automation_details["window_days"] = args.window_days
 
@@ -407,16 +691,16 @@ def main() -> None:
     analytics_score, analytics_details = calculate_analytics_health(STATE_DIR)
 
     # 4. Overall score (weighted average)
-    overall_score = round(
-        0.4 * automation_score +
-        0.3 * freshness_score +
-        0.3 * analytics_score
-    )
+    overall_score = weighted_score(automation_score, freshness_score, analytics_score)
 
-    # 5. Generate insights
+    # 5. Stage latency (informational, not weighted into the overall score)
+    latency_details = calculate_latency_health(latency_periods)
+
+    # 6. Generate insights
     insights = generate_insights(overall_score, automation_details, freshness_details, analytics_details)
+    insights.extend(generate_latency_insights(latency_details))
 
-    # 6. Build result
+    # 7. Build result
     result = {
         "generated_at": datetime.now().astimezone().isoformat(timespec="seconds"),
         "version": "1.0",
@@ -425,19 +709,20 @@ def main() -> None:
             "automation": automation_details,
             "data_freshness": freshness_details,
             "analytics_health": analytics_details,
+            "latency": latency_details,
         },
         "insights": insights,
     }
 
-    # 7. Write output
-    output_path = Path(args.output)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+    # 8. Write output (fingerprinted as of before the run; lines appended meanwhile invalidate it)
+    result_cache.write_result(output_path, result, fingerprint, summary={"overall_score": overall_score})
 
     if args.verbose:
         print(f"  Automation: {automation_score}/100 ({successes}/{runs} successful)", file=sys.stderr)
         print(f"  Data Freshness: {freshness_score}/100", file=sys.stderr)
         print(f"  Analytics Health: {analytics_score}/100", file=sys.stderr)
+        for stage, stats in latency_details["stages"].items():
+            print(f"  Latency {stage}: p50 {stats['p50_ms']:.1f}ms, p95 {stats['p95_ms']:.1f}ms", file=sys.stderr)
 
     print(f"✅ Health score: {overall_score}/100", file=sys.stderr)
     print(f"✅ Results saved to {output_path}", file=sys.stderr)
@@ -452,4 +737,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    profiling.run_main(main)
@@ -7,28 +7,62 @@ Analyzes recipe execution logs to track success rates, failures,
 and performance metrics for each automation recipe.
 
 Input:
-  - cortex/logs/recipe-*.log (execution logs)
+  - cortex/logs/recipe-*.log   (legacy text execution logs)
+  - cortex/logs/recipe-*.jsonl (v1.3+ structured execution logs)
+    Both including rotated and .gz / .zst segments (cortex_lib/log_segments.py);
+    reading starts at the window start found through the sparse timestamp
+    index (cortex_lib/log_index.py).
+
+Lines are folded straight into per-recipe accumulators (constant memory
+per recipe); durations go into a quantile sketch (cortex_lib/sketches.py)
+for the mean and p50/p95/p99.
 
 Output:
   - cortex/state/recipe-metrics.json
 
+The output starts with a "_meta" header line (cortex_lib/result_cache.py)
+fingerprinting the arguments, the current UTC hour and every recipe log
+segment except the span logs (cortex_lib/spans.py), where this and the
+other analyzers write their timing spans. A rerun within the same hour
+with no run log segment changed reuses the existing output (the window
+start moves by less than an hour); --no-cache recomputes.
+
 Usage:
-    python scripts/analyze-recipes.py [--days 7] [--output path/to/output.json]
+    python scripts/analyze-recipes.py [--days 7] [--output path/to/output.json] [--no-cache]
 """
 
 import json
 import sys
 import re
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Tuple
-from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Any, Tuple, Optional
 import argparse
 
+SCRIPTS_DIR = Path(__file__).resolve().parent
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from cortex_lib import log_index, log_segments, profiling, result_cache, sketches, spans  # noqa: E402
+
 
 LOGS_DIR = Path("cortex/logs")
 STATE_DIR = Path("cortex/state")
 
+# v1.3 JSONL statuses -> this analyzer's success / failure
+JSONL_STATUS = {"success": "success", "error": "failure", "failure": "failure", "failed": "failure"}
+DURATION_PERCENTILES = (50, 95, 99)
+
+LOG_TIMESTAMP_RE = re.compile(rb'(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}[+-]\d{2}:\d{2})')
+# "recipe_13_nightly_wrapup", "Recipe 02: Nightly KB Rebuild", "15" -> recipe number
+RECIPE_NUMBER_RE = re.compile(r'^(?:recipe[\s_-]*)?(\d+)(?!\d)', re.IGNORECASE)
+
+
+def log_line_ts(line: bytes) -> Optional[str]:
+    """Timestamp of a legacy log line, as found by parse_log_line (for the log index)."""
+    match = LOG_TIMESTAMP_RE.search(line)
+    return match.group(1).decode("ascii") if match else None
+
 
 def parse_log_line(line: str) -> Tuple[str | None, str | None, str | None, float | None]:
     """
@@ -83,90 +117,196 @@ def parse_log_line(line: str) -> Tuple[str | None, str | None, str | None, float
     return timestamp, recipe_name, status, duration
 
 
-def load_recipe_logs(days: int) -> List[Dict[str, Any]]:
-    """Load and parse recipe logs from the past N days."""
+def recipe_id(name: str) -> str:
+    """
+    One "recipe_NN" id per recipe, whichever log it came from.
+
+    Legacy .log lines tag runs as [recipe_13_nightly_wrapup], JSONL records
+    name them "Recipe 13: Nightly Wrap-up" (or "recipe": "13"); both become
+    recipe_13. Names without a recipe number are kept as they are.
+    """
+    match = RECIPE_NUMBER_RE.match(name.strip())
+    return f"recipe_{int(match.group(1)):02d}" if match else name
+
+
+def failure_reason(raw_line: str) -> Optional[str]:
+    """Failure reason of a legacy log line (everything after the second ":"), truncated."""
+    if ":" not in raw_line:
+        return None
+    return raw_line.split(":", 2)[-1].strip()[:100]
+
+
+def parse_jsonl_record(line: bytes) -> Optional[Dict[str, Any]]:
+    """
+    Parse one v1.3 JSONL run record (docs/operations/recipe-logging-quickstart.md).
+
+    {"ts": "...Z", "workflow": "Recipe 02: Nightly KB Rebuild", "status": "success",
+     "durationMs": 1234, "errorMessage": null, ...}
+
+    Returns an entry dict, or None for span records (cortex_lib/spans.py),
+    unknown statuses and unreadable lines.
+    """
+    try:
+        record = json.loads(line)
+    except ValueError:  # JSONDecodeError, UnicodeDecodeError
+        return None
+    if not isinstance(record, dict) or spans.is_span(record):
+        return None
+
+    status = JSONL_STATUS.get(str(record.get("status", "")).lower())
+    recipe = record.get("workflow") or record.get("recipe")
+    timestamp = record.get("ts")
+    if not (status and recipe and isinstance(timestamp, str)):
+        return None
+
+    duration = None
+    if isinstance(record.get("durationMs"), (int, float)):
+        duration = record["durationMs"] / 1000
+
+    reason = None
+    if status == "failure" and record.get("errorMessage"):
+        reason = str(record["errorMessage"]).strip()[:100]
+
+    return {
+        "timestamp": timestamp,
+        "recipe": recipe_id(str(recipe)),
+        "status": status,
+        "duration_sec": duration,
+        "reason": reason,
+    }
+
+
+def parse_timestamp(timestamp: str) -> Optional[datetime]:
+    """Aware datetime for a log timestamp ("Z" accepted, naive = UTC), None if unparsable."""
+    try:
+        dt = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return dt if dt.tzinfo is not None else dt.replace(tzinfo=timezone.utc)
+
+
+def iter_recipe_entries(days: int) -> Iterator[Dict[str, Any]]:
+    """
+    Stream parsed run entries from the past N days, one at a time.
+
+    Reads legacy recipe-*.log lines and v1.3 recipe-*.jsonl records,
+    including rotated and compressed segments, under one recipe_id() per
+    recipe. Each entry is
+    {"timestamp", "recipe", "status", "duration_sec", "reason", "log_file"};
+    "reason" is only set for failures.
+    """
     if not LOGS_DIR.exists():
         print(f"⚠️  Logs directory not found: {LOGS_DIR}", file=sys.stderr)
-        return []
-    
-    entries: List[Dict[str, Any]] = []
+        return
+
     cutoff_date = datetime.now().astimezone() - timedelta(days=days)
-    
-    for log_file in sorted(LOGS_DIR.glob("recipe-*.log")):
-        try:
-            with log_file.open("r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    timestamp, recipe_name, status, duration = parse_log_line(line)
-                    
-                    if not (timestamp and recipe_name and status):
-                        continue
-                    
-                    try:
-                        dt = datetime.fromisoformat(timestamp)
-                    except ValueError:
-                        continue
-                    
-                    if dt < cutoff_date:
+
+    for kind, ts_of in (("log", log_line_ts), ("jsonl", log_index.jsonl_ts)):
+        # Segments last written before the window are never opened
+        for segment in log_segments.list_segments(LOGS_DIR, kind, since=cutoff_date):
+            log_file = segment["path"]
+            try:
+                # Skip everything before the window via the sparse timestamp index
+                start = 0
+                if segment["compression"] is None:
+                    start = log_index.window_start(log_file, cutoff_date, ts_of=ts_of)
+                for raw in log_segments.iter_lines(segment, start):
+                    if kind == "jsonl":
+                        entry = parse_jsonl_record(raw)
+                        if entry is None:
+                            continue
+                    else:
+                        line = raw.decode("utf-8").strip()
+                        if not line:
+                            continue
+
+                        timestamp, recipe_name, status, duration = parse_log_line(line)
+
+                        if not (timestamp and recipe_name and status):
+                            continue
+
+                        entry = {
+                            "timestamp": timestamp,
+                            "recipe": recipe_id(recipe_name),
+                            "status": status,
+                            "duration_sec": duration,
+                            "reason": failure_reason(line) if status == "failure" else None,
+                        }
+
+                    dt = parse_timestamp(entry["timestamp"])
+                    if dt is None or dt < cutoff_date:
                         continue
-                    
-                    entries.append({
-                        "timestamp": timestamp,
-                        "recipe": recipe_name,
-                        "status": status,
-                        "duration_sec": duration,
-                        "log_file": log_file.name,
-                        "raw_line": line,
-                    })
-        except Exception as e:
-            print(f"⚠️  Error reading {log_file}: {e}", file=sys.stderr)
-    
-    return entries
 
+                    entry["log_file"] = log_file.name
+                    yield entry
+            except Exception as e:
+                print(f"⚠️  Error reading {log_file}: {e}", file=sys.stderr)
 
-def aggregate_metrics(entries: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Aggregate metrics per recipe."""
-    recipe_data: Dict[str, Dict[str, Any]] = defaultdict(lambda: {
+
+def load_recipe_logs(days: int) -> List[Dict[str, Any]]:
+    """Load and parse recipe logs from the past N days (materialized iter_recipe_entries)."""
+    return list(iter_recipe_entries(days))
+
+
+def new_recipe_stats() -> Dict[str, Any]:
+    """Per-recipe accumulator; durations is a quantile sketch (cortex_lib/sketches.py)."""
+    return {
         "runs": 0,
         "successes": 0,
         "failures": 0,
-        "durations": [],
+        "durations": sketches.new_sketch(),
         "last_run": None,
         "last_status": None,
         "last_failure": None,
         "last_failure_reason": None,
-    })
-    
+    }
+
+
+def _newer(timestamp: str, than: Optional[str]) -> bool:
+    if not than:
+        return True
+    a, b = parse_timestamp(timestamp), parse_timestamp(than)
+    if a is None or b is None:
+        return timestamp > than
+    return a > b
+
+
+def fold_entry(recipe_data: Dict[str, Dict[str, Any]], entry: Dict[str, Any]) -> None:
+    """Fold one parsed entry into its recipe's accumulator."""
+    data = recipe_data.get(entry["recipe"])
+    if data is None:
+        data = recipe_data[entry["recipe"]] = new_recipe_stats()
+
+    data["runs"] += 1
+
+    if entry["status"] == "success":
+        data["successes"] += 1
+    else:
+        data["failures"] += 1
+        # Track last failure (only its reason is kept)
+        if _newer(entry["timestamp"], data["last_failure"]):
+            data["last_failure"] = entry["timestamp"]
+            if "reason" in entry:
+                reason = entry["reason"]
+            else:
+                reason = failure_reason(entry.get("raw_line", ""))
+            if reason:
+                data["last_failure_reason"] = reason
+
+    if entry["duration_sec"] is not None:
+        sketches.add(data["durations"], float(entry["duration_sec"]))
+
+    # Track most recent run
+    if _newer(entry["timestamp"], data["last_run"]):
+        data["last_run"] = entry["timestamp"]
+        data["last_status"] = entry["status"]
+
+
+def aggregate_metrics(entries: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate metrics per recipe, consuming entries as a stream."""
+    recipe_data: Dict[str, Dict[str, Any]] = {}
     for entry in entries:
-        recipe = entry["recipe"]
-        data = recipe_data[recipe]
-        
-        data["runs"] += 1
-        
-        if entry["status"] == "success":
-            data["successes"] += 1
-        else:
-            data["failures"] += 1
-            # Track last failure
-            if not data["last_failure"] or entry["timestamp"] > data["last_failure"]:
-                data["last_failure"] = entry["timestamp"]
-                # Try to extract failure reason from raw line
-                raw = entry.get("raw_line", "")
-                if ":" in raw:
-                    reason = raw.split(":", 2)[-1].strip()
-                    data["last_failure_reason"] = reason[:100]  # Truncate
-        
-        if entry["duration_sec"] is not None:
-            data["durations"].append(entry["duration_sec"])
-        
-        # Track most recent run
-        if not data["last_run"] or entry["timestamp"] > data["last_run"]:
-            data["last_run"] = entry["timestamp"]
-            data["last_status"] = entry["status"]
-    
+        fold_entry(recipe_data, entry)
     return recipe_data
 
 
@@ -181,10 +321,6 @@ def compute_statistics(recipe_data: Dict[str, Dict[str, Any]]) -> Dict[str, Any]
         
         success_rate = successes / runs if runs > 0 else 0.0
         
-        avg_duration = None
-        if data["durations"]:
-            avg_duration = sum(data["durations"]) / len(data["durations"])
-        
         recipe_info: Dict[str, Any] = {
             "runs": runs,
             "successes": successes,
@@ -194,8 +330,11 @@ def compute_statistics(recipe_data: Dict[str, Dict[str, Any]]) -> Dict[str, Any]
             "last_status": data["last_status"],
         }
         
-        if avg_duration is not None:
-            recipe_info["avg_duration_sec"] = round(avg_duration, 2)
+        durations = data["durations"]
+        if durations["n"]:
+            recipe_info["avg_duration_sec"] = round(durations["mean"], 2)
+            for pct in DURATION_PERCENTILES:
+                recipe_info[f"p{pct}_duration_sec"] = round(sketches.quantile(durations, pct / 100), 2)
         
         if data["last_failure"]:
             recipe_info["last_failure"] = data["last_failure"]
@@ -257,7 +396,23 @@ def generate_insights(recipes: Dict[str, Any], window_days: int) -> List[str]:
     return insights
 
 
-def main():
+def result_fingerprint(args: argparse.Namespace) -> str:
+    """Result cache fingerprint: arguments, current UTC hour and every recipe log segment with run records."""
+    files: Dict[str, result_cache.Signature] = {}
+    if LOGS_DIR.exists():
+        for kind in ("log", "jsonl"):
+            for segment in log_segments.list_segments(LOGS_DIR, kind):
+                if spans.is_span_log(segment["path"]):
+                    continue
+                files[str(segment["path"])] = (segment["stat"].st_mtime_ns, segment["stat"].st_size)
+    key = {
+        "args": result_cache.args_key(args),
+        "hour": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H"),
+    }
+    return result_cache.input_fingerprint(key, files)
+
+
+def main(argv: Optional[List[str]] = None):
     parser = argparse.ArgumentParser(description="Analyze recipe execution logs")
     parser.add_argument(
         "--days",
@@ -271,14 +426,31 @@ def main():
         default="cortex/state/recipe-metrics.json",
         help="Output file path",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Recompute even if the inputs are unchanged since the output was written",
+    )
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     print(f"📊 Analyzing recipe logs (past {args.days} days)...", file=sys.stderr)
     
-    entries = load_recipe_logs(args.days)
+    output_path = Path(args.output)
+    fingerprint = result_fingerprint(args)
+    cached = None if args.no_cache else result_cache.load_result(output_path, fingerprint)
+    if cached is not None:
+        print(f"⏭️  Inputs unchanged, keeping {output_path}", file=sys.stderr)
+        print(json.dumps(cached, ensure_ascii=False))
+        return
+    
+    # Entries are folded as they are parsed; nothing per line is kept
+    with spans.span("analyze-recipes.load") as sp:
+        recipe_data = aggregate_metrics(iter_recipe_entries(args.days))
+        entry_count = sum(data["runs"] for data in recipe_data.values())
+        sp["items"] = entry_count
     
-    if not entries:
+    if not entry_count:
         print("⚠️  No recipe log entries found", file=sys.stderr)
         # Create empty output
         result = {
@@ -289,9 +461,8 @@ def main():
             "insights": ["No recipe execution data found."],
         }
     else:
-        print(f"✅ Loaded {len(entries)} log entries", file=sys.stderr)
+        print(f"✅ Loaded {entry_count} log entries", file=sys.stderr)
         
-        recipe_data = aggregate_metrics(entries)
         recipes = compute_statistics(recipe_data)
         insights = generate_insights(recipes, args.days)
         
@@ -307,10 +478,9 @@ def main():
         
         print(f"✅ Analyzed {len(recipes)} recipes ({total_runs} total runs)", file=sys.stderr)
     
-    # Write output
-    output_path = Path(args.output)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+    # Write output, fingerprinted as of before the run: lines other recipes
+    # appended meanwhile may not be counted, so they must invalidate it
+    result_cache.write_result(output_path, result, fingerprint, summary={"total_runs": result["total_runs"]})
     
     print(f"✅ Recipe metrics saved to {output_path}", file=sys.stderr)
     
@@ -324,4 +494,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    profiling.run_main(main)
@@ -11,49 +11,76 @@ Input:
 Output:
   - cortex/state/rhythm-patterns.json
 
+Activity is counted into a 7x24 weekday x hour matrix. "peak_windows"
+holds the busiest window for every size 1-24 hours, overall and per
+weekday. Windows are circular (23:00-02:00 is a 3-hour window) and are
+found from prefix sums over the doubled day. NumPy is used when installed
+(all rows and sizes in one vectorized pass); the pure-Python engine gives
+identical results.
+
+When the task store (cortex/state/tasks.db, cortex_lib/task_store.py)
+exists, the matrix is a SQL GROUP BY weekday, hour over its indexed rows
+instead of decoding JSON (identical results; --no-store skips it).
+
+Without the store, the matrix is summed from the per-day sidecars
+(cortex/state/day-agg-YYYY-MM-DD.json, cortex_lib/day_agg.py) the
+extractors write; stale or missing ones are rebuilt. --no-day-agg decodes
+every task entry instead, --compact decodes them into the column arrays
+of cortex_lib/task_table.py (identical results either way).
+
+--windows 7,30,90,365 loads the longest window once and adds a "windows"
+map ({"7": {...}, ...}) with the same fields per window; the top-level
+fields stay the --days view.
+
+The output's first line is a "_meta" header (cortex_lib/result_cache.py)
+with a fingerprint of the arguments, the run date and the window's
+task-entry files. A rerun with the same fingerprint reuses the existing
+output without loading anything; --no-cache recomputes.
+
 Usage:
-    python scripts/analyze-rhythm.py [--days 30] [--min-tasks 10]
+    python scripts/analyze-rhythm.py [--days 30] [--min-tasks 10] [--backend auto|python|numpy]
+        [--windows 7,30,90] [--no-store] [--no-day-agg] [--compact] [--no-cache]
 """
 
 import json
 import sys
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Tuple
-from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Any, Tuple, Optional
 import argparse
-import statistics
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from cortex_lib import day_agg, profiling, result_cache, spans, task_entries, task_store, task_table  # noqa: E402
+from cortex_lib.windows import accumulate_windows, parse_windows, windows_json  # noqa: E402
 
 
 STATE_DIR = Path("cortex/state")
 
+# datetime.weekday() order
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
 
-def load_task_entries(days: int) -> List[Dict[str, Any]]:
-    """Load task-entry files from the past N days."""
+def load_task_entries(days: int, compact: bool = False) -> List[Dict[str, Any]]:
+    """Load task-entry files from the past N days (compact: as task_table entry adapters)."""
     if not STATE_DIR.exists():
         print(f"❌ State directory not found: {STATE_DIR}", file=sys.stderr)
         sys.exit(1)
 
-    entries: List[Dict[str, Any]] = []
-    today = datetime.now().date()
+    if compact:
+        return list(task_table.load_task_table(days, STATE_DIR).entries())
+    return task_entries.load_task_entries(days, STATE_DIR)
 
-    for i in range(days):
-        date = today - timedelta(days=i)
-        date_str = date.strftime("%Y-%m-%d")
-        entry_file = STATE_DIR / f"task-entry-{date_str}.json"
 
-        if entry_file.exists():
-            try:
-                with entry_file.open("r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    data["__date"] = date_str
-                    entries.append(data)
-            except json.JSONDecodeError:
-                print(f"⚠️  Skipping invalid JSON: {entry_file}", file=sys.stderr)
-            except Exception as e:
-                print(f"⚠️  Error loading {entry_file}: {e}", file=sys.stderr)
+def load_day_aggs(days: int) -> List[Dict[str, Any]]:
+    """Day aggregates (cortex_lib/day_agg.py) of the past N days, newest first."""
+    if not STATE_DIR.exists():
+        print(f"❌ State directory not found: {STATE_DIR}", file=sys.stderr)
+        sys.exit(1)
 
-    return entries
+    return day_agg.load_window(days, STATE_DIR)
 
 
 def parse_iso_datetime(value: str) -> datetime | None:
@@ -83,84 +110,142 @@ def is_task_completed(task: Dict[str, Any]) -> bool:
     )
 
 
-def extract_activity(entries: List[Dict[str, Any]]):
-    """
-    Extract activity by hour and weekday.
+def new_activity() -> Dict[str, Any]:
+    """Running activity aggregates (see add_activity())."""
+    return {"matrix": [[0] * 24 for _ in WEEKDAYS], "active_dates": set()}
 
-    Returns:
-        hourly_counts: dict[int, int]
-        weekday_hour: dict[str, dict[int, int]]
-        active_days: int
-        start_hours: list[int]
-    """
-    hourly_counts: Dict[int, int] = {h: 0 for h in range(24)}
-    weekday_hour: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
-    start_hours: List[int] = []
-
-    days_with_activity: set[str] = set()
-
-    for entry in entries:
-        date_str = entry.get("__date")
-        # Support both "tasks" (scheduled) and "completed" (finished)
-        tasks = entry.get("tasks", []) + entry.get("completed", [])
-        day_has_task = False
-
-        for task in tasks:
-            if not is_task_completed(task):
-                continue
-
-            started_at = parse_iso_datetime(task.get("started_at"))
-            completed_at = parse_iso_datetime(task.get("completed_at"))
-
-            # Support timestamp field (HH:MM format) from /log completed tasks
-            timestamp_str = task.get("timestamp")
-            if timestamp_str and date_str and not (started_at or completed_at):
-                try:
-                    # Parse "HH:MM" and combine with date
-                    hour_min = timestamp_str.split(":")
-                    if len(hour_min) == 2:
-                        dt = datetime.strptime(f"{date_str} {timestamp_str}", "%Y-%m-%d %H:%M")
-                    else:
-                        dt = None
-                except Exception:
+
+def add_activity(activity: Dict[str, Any], entry: Dict[str, Any]) -> None:
+    """Count one task entry's completed tasks into the running aggregates."""
+    matrix = activity["matrix"]
+    date_str = entry.get("__date")
+    # Support both "tasks" (scheduled) and "completed" (finished)
+    tasks = entry.get("tasks", []) + entry.get("completed", [])
+    day_has_task = False
+
+    for task in tasks:
+        if not is_task_completed(task):
+            continue
+
+        started_at = parse_iso_datetime(task.get("started_at"))
+        completed_at = parse_iso_datetime(task.get("completed_at"))
+
+        # Support timestamp field (HH:MM format) from /log completed tasks
+        timestamp_str = task.get("timestamp")
+        if timestamp_str and date_str and not (started_at or completed_at):
+            try:
+                # Parse "HH:MM" and combine with date
+                hour_min = timestamp_str.split(":")
+                if len(hour_min) == 2:
+                    dt = datetime.strptime(f"{date_str} {timestamp_str}", "%Y-%m-%d %H:%M")
+                else:
                     dt = None
-            else:
-                dt = started_at or completed_at
+            except Exception:
+                dt = None
+        else:
+            dt = started_at or completed_at
+
+        if not dt:
+            continue
+
+        matrix[dt.weekday()][dt.hour] += 1
+        day_has_task = True
 
-            if not dt:
-                continue
+    if day_has_task and date_str:
+        activity["active_dates"].add(date_str)
+
+
+def add_day_agg(activity: Dict[str, Any], agg: Dict[str, Any], sign: int = 1) -> None:
+    """
+    Count one day aggregate (cortex_lib/day_agg.py) into the running
+    matrix; sign=-1 takes it back out (sliding windows, backfill-history.py).
+    """
+    matrix = activity["matrix"]
+    day_has_task = False
+    for weekday, hours in enumerate(agg["weekday_hour"]):
+        for hour, n in enumerate(hours):
+            if n:
+                matrix[weekday][hour] += sign * n
+                day_has_task = True
+    if day_has_task:
+        if sign > 0:
+            activity["active_dates"].add(agg["date"])
+        else:
+            activity["active_dates"].discard(agg["date"])
+
+
+# Completed tasks of both lists, at started_at / completed_at, else at the
+# /log "timestamp" on the entry date (see add_activity())
+STORE_ACTIVITY_SQL = """
+SELECT date,
+       CASE WHEN hour IS NOT NULL THEN weekday ELSE clock_weekday END AS wd,
+       CASE WHEN hour IS NOT NULL THEN hour ELSE clock_hour END AS hr
+FROM tasks
+WHERE completed AND date BETWEEN :since AND :until
+"""
+
+
+def store_activity(conn: Any, days: int) -> Dict[str, Any]:
+    """new_activity() aggregates for the past N days from the task store."""
+    params = dict(zip(("since", "until"), task_store.window_bounds(days)))
+    activity = new_activity()
+    matrix = activity["matrix"]
+    cells = conn.execute(
+        f"SELECT wd, hr, COUNT(*) AS n FROM ({STORE_ACTIVITY_SQL}) WHERE hr IS NOT NULL GROUP BY wd, hr", params
+    )
+    for row in cells:
+        matrix[row["wd"]][row["hr"]] += row["n"]
+    activity["active_dates"] = {
+        row["date"]
+        for row in conn.execute(f"SELECT DISTINCT date FROM ({STORE_ACTIVITY_SQL}) WHERE hr IS NOT NULL", params)
+    }
+    return activity
 
-            hour = dt.hour
-            weekday = dt.strftime("%A")
 
-            hourly_counts[hour] += 1
-            weekday_hour[weekday][hour] += 1
-            start_hours.append(hour)
-            day_has_task = True
+def hourly_totals(matrix: List[List[int]]) -> Dict[int, int]:
+    return {h: sum(row[h] for row in matrix) for h in range(24)}
 
-        if day_has_task and date_str:
-            days_with_activity.add(date_str)
 
-    active_days = len(days_with_activity)
-    return hourly_counts, weekday_hour, active_days, start_hours
+def weekday_hour_counts(matrix: List[List[int]]) -> Dict[str, Dict[int, int]]:
+    """Non-zero cells of the matrix by weekday name."""
+    return {
+        weekday: {h: count for h, count in enumerate(row) if count}
+        for weekday, row in zip(WEEKDAYS, matrix)
+        if any(row)
+    }
 
 
-def classify_chronotype(start_hours: List[int], min_tasks: int) -> str:
+def classify_chronotype_counts(hourly_counts: Dict[int, int], min_tasks: int) -> str:
+    """
+    Classify into morning / balanced / evening / night / unknown by the
+    median hour, read off the hourly totals (see chronotype_for()).
     """
-    Classify into morning / balanced / evening / night / unknown.
+    total = sum(hourly_counts.values())
+    if total < min_tasks or total == 0:
+        return "unknown"
 
+    # statistics.median() of the expanded hours: the middle one, or the mean of the middle two
+    low_rank, high_rank = (total - 1) // 2, total // 2
+    low = high = None
+    seen = 0
+    for hour in sorted(hourly_counts):
+        seen += hourly_counts[hour]
+        if low is None and seen > low_rank:
+            low = hour
+        if seen > high_rank:
+            high = hour
+            break
+    return chronotype_for(low if total % 2 else (low + high) / 2)
+
+
+def chronotype_for(median_hour: float) -> str:
+    """
     Handles midnight crossover:
     - 0-4: night (late night continuation)
     - 5-10: morning
     - 11-16: balanced
     - 17-23: evening
     """
-    if len(start_hours) < min_tasks:
-        return "unknown"
-
-    median_hour = statistics.median(start_hours)
-
-    # Midnight crossover handling: 0-4 is considered late night, not morning
     if 0 <= median_hour <= 4:
         return "night"
     elif median_hour < 11:
@@ -180,16 +265,17 @@ def find_peak_hour(hourly_counts: Dict[int, int]) -> int | None:
 def find_peak_window(hourly_counts: Dict[int, int], window_size: int = 3) -> Tuple[int, int, int]:
     """
     Find the contiguous window of hours [start, end) with the highest total tasks.
+    Windows are clipped at midnight (see peak_windows() for circular windows).
     Returns (start_hour, end_hour_non_inclusive, total_tasks).
     """
-    hours = list(range(24))
+    prefix = [0]
+    for h in range(24):
+        prefix.append(prefix[-1] + hourly_counts[h])
+
     best_start = 0
     best_sum = -1
-
-    for start in hours:
-        end = start + window_size
-        window_hours = [h for h in range(start, min(end, 24))]
-        total = sum(hourly_counts[h] for h in window_hours)
+    for start in range(24):
+        total = prefix[min(start + window_size, 24)] - prefix[start]
         if total > best_sum:
             best_sum = total
             best_start = start
@@ -197,6 +283,96 @@ def find_peak_window(hourly_counts: Dict[int, int], window_size: int = 3) -> Tup
     return best_start, min(best_start + window_size, 24), best_sum
 
 
+def peak_windows_python(rows: List[List[int]]) -> Tuple[List[List[int]], List[List[int]]]:
+    """
+    Busiest circular window start for every size 1-24, per row.
+
+    Returns (starts, totals), each rows x 24 (index = size - 1). Ties go
+    to the earliest start hour.
+    """
+    all_starts: List[List[int]] = []
+    all_totals: List[List[int]] = []
+    for row in rows:
+        prefix = [0]
+        for count in row + row:
+            prefix.append(prefix[-1] + count)
+
+        starts: List[int] = []
+        totals: List[int] = []
+        for size in range(1, 25):
+            best_start, best_total = 0, -1
+            for start in range(24):
+                total = prefix[start + size] - prefix[start]
+                if total > best_total:
+                    best_start, best_total = start, total
+            starts.append(best_start)
+            totals.append(best_total)
+        all_starts.append(starts)
+        all_totals.append(totals)
+    return all_starts, all_totals
+
+
+def peak_windows_numpy(rows: List[List[int]]) -> Tuple[List[List[int]], List[List[int]]]:
+    """peak_windows_python() for all rows and sizes at once (optional dependency)."""
+    import numpy as np
+
+    counts = np.asarray(rows, dtype=np.int64).reshape(-1, 24)
+    prefix = np.zeros((counts.shape[0], 49), dtype=np.int64)
+    np.cumsum(np.concatenate([counts, counts], axis=1), axis=1, out=prefix[:, 1:])
+
+    sizes = np.arange(1, 25)[:, None]
+    starts = np.arange(24)[None, :]
+    totals = prefix[:, starts + sizes] - prefix[:, starts]  # rows x sizes x starts
+    best = totals.argmax(axis=2)
+    best_totals = np.take_along_axis(totals, best[..., None], axis=2)[..., 0]
+    return best.tolist(), best_totals.tolist()
+
+
+def numpy_available() -> bool:
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def peak_windows(matrix: List[List[int]], backend: str = "auto") -> Dict[str, Any]:
+    """
+    Busiest circular window for every size 1-24, overall and per active weekday.
+
+    Returns:
+        {"overall": [{"size", "start_hour", "end_hour", "total_tasks"}, ...],
+         "by_weekday": {"Monday": [...], ...}}
+        end_hour is exclusive and wraps (start 23, size 3 -> end 2).
+    """
+    if backend == "auto":
+        backend = "numpy" if numpy_available() else "python"
+
+    rows = [[sum(row[h] for row in matrix) for h in range(24)]] + matrix
+    engine = peak_windows_numpy if backend == "numpy" else peak_windows_python
+    starts, totals = engine(rows)
+
+    def windows(i: int) -> List[Dict[str, int]]:
+        return [
+            {
+                "size": size,
+                "start_hour": starts[i][size - 1],
+                "end_hour": (starts[i][size - 1] + size) % 24,
+                "total_tasks": totals[i][size - 1],
+            }
+            for size in range(1, 25)
+        ]
+
+    return {
+        "overall": windows(0),
+        "by_weekday": {
+            weekday: windows(i + 1)
+            for i, weekday in enumerate(WEEKDAYS)
+            if any(matrix[i])
+        },
+    }
+
+
 def normalize_weekday_hour(weekday_hour: Dict[str, Dict[int, int]]) -> Dict[str, Dict[str, int]]:
     """Convert keys to strings for JSON compatibility."""
     result: Dict[str, Dict[str, int]] = {}
@@ -247,7 +423,60 @@ def generate_insights(
     return insights
 
 
-def main():
+def rhythm_summary(activity: Dict[str, Any], min_tasks: int) -> Dict[str, Any]:
+    """The scalar rhythm fields (everything but the weekday matrices and insights)."""
+    hourly_counts = hourly_totals(activity["matrix"])
+    total_tasks = sum(hourly_counts.values())
+    peak_window_tuple = find_peak_window(hourly_counts) if total_tasks > 0 else None
+
+    return {
+        "total_tasks": total_tasks,
+        "active_days": len(activity["active_dates"]),
+        "chronotype": classify_chronotype_counts(hourly_counts, min_tasks),
+        "peak_hour": find_peak_hour(hourly_counts),
+        "peak_window": {
+            "start_hour": peak_window_tuple[0],
+            "end_hour": peak_window_tuple[1],
+            "total_tasks": peak_window_tuple[2],
+        }
+        if peak_window_tuple
+        else None,
+        "hourly_distribution": {str(h): hourly_counts[h] for h in range(24)},
+    }
+
+
+def rhythm_analysis(activity: Dict[str, Any], min_tasks: int, backend: str = "auto") -> Dict[str, Any]:
+    """rhythm-patterns.json fields (without generated_at / analysis_period_days) for the aggregates."""
+    matrix = activity["matrix"]
+    summary = rhythm_summary(activity, min_tasks)
+    peak_window = summary["peak_window"]
+
+    return {
+        **summary,
+        "weekday_hour_matrix": normalize_weekday_hour(weekday_hour_counts(matrix)),
+        "peak_windows": peak_windows(matrix, backend) if summary["total_tasks"] > 0 else None,
+        "insights": generate_insights(
+            summary["chronotype"],
+            summary["peak_hour"],
+            (peak_window["start_hour"], peak_window["end_hour"], peak_window["total_tasks"]) if peak_window else None,
+            summary["total_tasks"],
+            summary["active_days"],
+        ),
+    }
+
+
+def result_fingerprint(args: argparse.Namespace, days: int) -> str:
+    """Result cache fingerprint: arguments, run date, store use and the window's task-entry files."""
+    files = task_entries.window_files(days, STATE_DIR)
+    key = {
+        "args": result_cache.args_key(args),
+        "today": datetime.now().date().isoformat(),
+        "store": not args.no_store and task_store.STORE_PATH.exists(),
+    }
+    return result_cache.input_fingerprint(key, {str(path): (mtime, size) for path, mtime, size in files.values()})
+
+
+def main(argv: Optional[List[str]] = None):
     parser = argparse.ArgumentParser(description="Analyze daily rhythm patterns")
     parser.add_argument(
         "--days",
@@ -267,60 +496,141 @@ def main():
         default="cortex/state/rhythm-patterns.json",
         help="Output file path",
     )
+    parser.add_argument(
+        "--backend",
+        choices=["auto", "python", "numpy"],
+        default="auto",
+        help="Peak window engine (default: auto = numpy if installed)",
+    )
+    parser.add_argument(
+        "--windows",
+        type=parse_windows,
+        help='Extra windows in days, e.g. 7,30,90,365 (written to a "windows" map)',
+    )
+    parser.add_argument(
+        "--no-store",
+        action="store_true",
+        help="Read the JSON files even if the task store (cortex/state/tasks.db) exists",
+    )
+    parser.add_argument(
+        "--no-day-agg",
+        action="store_true",
+        help="Decode every task-entry file instead of summing the day-agg-*.json sidecars",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Decode the task-entry files into the compact task table (less memory for long windows)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Recompute even if the inputs are unchanged since the output was written",
+    )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
-    print(f"📊 Analyzing rhythm patterns (past {args.days} days)...", file=sys.stderr)
+    window_days = sorted(set(args.windows or []) | {args.days})
+    longest = window_days[-1]
 
-    entries = load_task_entries(args.days)
-    if not entries:
-        print("❌ No task entries found", file=sys.stderr)
+    if args.backend == "numpy" and not numpy_available():
+        print("Error: numpy is required for --backend numpy. Install with: pip install numpy", file=sys.stderr)
         sys.exit(1)
 
-    print(f"✅ Loaded {len(entries)} task entries", file=sys.stderr)
+    print(f"📊 Analyzing rhythm patterns (past {longest} days)...", file=sys.stderr)
 
-    hourly_counts, weekday_hour, active_days, start_hours = extract_activity(entries)
-    total_tasks = sum(hourly_counts.values())
+    output_path = Path(args.output)
+    fingerprint = result_fingerprint(args, longest)
+    cached = None if args.no_cache else result_cache.load_result(output_path, fingerprint)
+    if cached is not None:
+        print(f"⏭️  Inputs unchanged, keeping {output_path}", file=sys.stderr)
+        print(json.dumps(cached, ensure_ascii=False))
+        return
+
+    store = None
+    if not args.no_store:
+        with spans.span("analyze-rhythm.sync"):
+            store = task_store.open_synced()
+
+    if store is not None:
+        try:
+            loaded = task_store.count_days(store, *task_store.window_bounds(longest))
+            if not loaded:
+                print("❌ No task entries found", file=sys.stderr)
+                sys.exit(1)
+            print(f"✅ Loaded {loaded} task entries (task store)", file=sys.stderr)
+
+            with spans.span("analyze-rhythm.analyze") as sp:
+                results = {
+                    days: rhythm_analysis(store_activity(store, days), args.min_tasks, args.backend)
+                    for days in window_days
+                }
+                sp["items"] = results[longest]["total_tasks"]
+        finally:
+            store.close()
+    elif not (args.no_day_agg or args.compact):
+        with spans.span("analyze-rhythm.load") as sp:
+            aggs = load_day_aggs(longest)
+            sp["items"] = len(aggs)
+        if not aggs:
+            print("❌ No task entries found", file=sys.stderr)
+            sys.exit(1)
+
+        print(f"✅ Loaded {len(aggs)} task entries (day aggregates)", file=sys.stderr)
+
+        with spans.span("analyze-rhythm.analyze") as sp:
+            activity = new_activity()
+            results = accumulate_windows(
+                aggs,
+                window_days,
+                lambda agg: add_day_agg(activity, agg),
+                lambda: rhythm_analysis(activity, args.min_tasks, args.backend),
+                date_of=lambda agg: agg["date"],
+            )
+            sp["items"] = results[longest]["total_tasks"]
+    else:
+        with spans.span("analyze-rhythm.load") as sp:
+            entries = load_task_entries(longest, args.compact)
+            sp["items"] = len(entries)
+        if not entries:
+            print("❌ No task entries found", file=sys.stderr)
+            sys.exit(1)
+
+        print(f"✅ Loaded {len(entries)} task entries", file=sys.stderr)
+
+        with spans.span("analyze-rhythm.analyze") as sp:
+            activity = new_activity()
+            results = accumulate_windows(
+                entries,
+                window_days,
+                lambda entry: add_activity(activity, entry),
+                lambda: rhythm_analysis(activity, args.min_tasks, args.backend),
+            )
+            sp["items"] = results[longest]["total_tasks"]
 
     print(
-        f"✅ Extracted {total_tasks} completed tasks across {active_days} active days",
+        f"✅ Extracted {results[args.days]['total_tasks']} completed tasks "
+        f"across {results[args.days]['active_days']} active days",
         file=sys.stderr,
     )
 
-    chronotype = classify_chronotype(start_hours, args.min_tasks)
-    peak_hour = find_peak_hour(hourly_counts)
-    peak_window_tuple = find_peak_window(hourly_counts) if total_tasks > 0 else None
-
-    weekday_hour_json = normalize_weekday_hour(weekday_hour)
-
     result = {
         "generated_at": datetime.now().astimezone().isoformat(timespec="seconds"),
         "analysis_period_days": args.days,
-        "total_tasks": total_tasks,
-        "active_days": active_days,
-        "chronotype": chronotype,
-        "peak_hour": peak_hour,
-        "peak_window": {
-            "start_hour": peak_window_tuple[0],
-            "end_hour": peak_window_tuple[1],
-            "total_tasks": peak_window_tuple[2],
-        }
-        if peak_window_tuple
-        else None,
-        "hourly_distribution": {str(h): hourly_counts[h] for h in range(24)},
-        "weekday_hour_matrix": weekday_hour_json,
-        "insights": generate_insights(
-            chronotype,
-            peak_hour,
-            peak_window_tuple,
-            total_tasks,
-            active_days,
-        ),
+        **results[args.days],
     }
-
-    output_path = Path(args.output)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+    if args.windows:
+        for days in args.windows:
+            print(f"   • {days}d: {results[days]['total_tasks']} tasks, chronotype {results[days]['chronotype']}",
+                  file=sys.stderr)
+        result["windows"] = windows_json(
+            {days: {"analysis_period_days": days, **r} for days, r in results.items()}, args.windows
+        )
+
+    result_cache.write_result(
+        output_path, result, fingerprint,
+        summary={"active_days": result["active_days"], "total_tasks": result["total_tasks"]},
+    )
 
     print(f"✅ Rhythm patterns saved to {output_path}", file=sys.stderr)
 
@@ -333,4 +643,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    profiling.run_main(main)
@@ -5,87 +5,95 @@ Workload Heatmap Analyzer (MVP)
 Analyzes task-entry.json files to generate workload patterns.
 Outputs temporal-patterns.json and a Markdown report.
 
+Aggregation is plain Python counting (no third-party dependencies).
+pandas is an optional backend for very large inputs; both backends
+produce identical output.
+
+--windows 7,30,90,365 loads the longest window once and adds a "windows"
+map ({"7": {...}, ...}) to temporal-patterns.json, computed in a single
+newest-to-oldest pass with running counters; the top-level fields and
+the Markdown report stay the --days view.
+
 Usage:
-    python scripts/analyze-workload.py [--days 30]
+    python scripts/analyze-workload.py [--days 30] [--backend auto|python|pandas] [--windows 7,30,90]
+        [--state-dir cortex/state] [--output-dir data/analytics]
+
+Both directories default to the repository's, wherever the script is run
+from.
 """
 
+import argparse
 import json
 import sys
 from pathlib import Path
-from datetime import datetime, timedelta
-from collections import defaultdict
+from datetime import datetime
+from collections import Counter
+from typing import Any, Dict, List, Optional
 
-try:
-    import pandas as pd
-except ImportError:
-    print("Error: pandas is required. Install with: pip install pandas", file=sys.stderr)
-    sys.exit(1)
+SCRIPTS_DIR = Path(__file__).resolve().parent
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
 
+from cortex_lib import profiling, task_entries  # noqa: E402
+from cortex_lib.windows import accumulate_windows, parse_windows, window_cutoff, windows_json  # noqa: E402
+
+
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# --backend auto switches to pandas (when installed) from this many tasks
+PANDAS_MIN_ROWS = 500_000
+
+STATE_DIR = SCRIPTS_DIR.parent / "cortex" / "state"
+OUTPUT_DIR = SCRIPTS_DIR.parent / "data" / "analytics"
+
+
+def load_task_entry_days(days=30, base_path: Path = STATE_DIR) -> List[Dict[str, Any]]:
+    """Task-entry files from the last N days, newest first."""
 
-def load_task_entries(days=30):
-    """Load task entries from the last N days."""
-    entries = []
-    base_path = Path(__file__).parent.parent / "cortex" / "state"
-    
     if not base_path.exists():
         print(f"Warning: {base_path} does not exist", file=sys.stderr)
         return []
-    
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=days)
-    
-    current = start_date
-    while current <= end_date:
-        date_str = current.strftime("%Y-%m-%d")
-        file_path = base_path / f"task-entry-{date_str}.json"
-        
-        if file_path.exists():
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    file_date = data.get('date', date_str)
-                    
-                    # Add date to each task
-                    for task in data.get('tasks', []):
-                        task['date'] = file_date
-                        entries.append(task)
-            except Exception as e:
-                print(f"Warning: Failed to load {file_path}: {e}", file=sys.stderr)
-        
-        current += timedelta(days=1)
-    
+
+    # The window runs from (today - days) through today inclusive
+    return task_entries.load_task_entries(days + 1, base_path)
+
+
+def flatten_tasks(day_entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Tasks of newest-first task entries, oldest first, each with its file 'date'."""
+    entries = []
+    for data in reversed(day_entries):
+        file_date = data.get('date', data['__date'])
+
+        # Add date to each task (copy: loaded entries are shared)
+        for task in data.get('tasks', []):
+            entries.append({**task, 'date': file_date})
+
     return entries
 
 
-def analyze_workload(entries):
-    """Analyze workload patterns from task entries."""
-    if not entries:
-        return {
-            "total_tasks": 0,
-            "by_weekday": {},
-            "by_status": {},
-            "by_category": {},
-            "completion_rate": 0.0
-        }
-    
-    # Convert to DataFrame
-    df = pd.DataFrame(entries)
-    
-    # Parse dates and add weekday
-    df['date'] = pd.to_datetime(df['date'])
-    df['weekday'] = df['date'].dt.day_name()
-    
-    # Basic statistics
-    total_tasks = len(df)
-    completed = len(df[df['status'] == 'done'])
+def load_task_entries(days=30, base_path: Path = STATE_DIR):
+    """Load task entries from the last N days."""
+    return flatten_tasks(load_task_entry_days(days, base_path))
+
+
+def empty_analysis() -> Dict[str, Any]:
+    return {
+        "total_tasks": 0,
+        "by_weekday": {},
+        "by_status": {},
+        "by_category": {},
+        "completion_rate": 0.0
+    }
+
+
+def build_analysis(total_tasks: int, completed: int, weekday_counts: Dict[str, int],
+                   weekday_completion: Dict[str, int], by_status: Dict[Any, int],
+                   by_category: Dict[Any, int], start: datetime, end: datetime) -> Dict[str, Any]:
+    """Assemble the temporal-patterns.json structure from backend counts."""
     completion_rate = (completed / total_tasks * 100) if total_tasks > 0 else 0.0
-    
-    # By weekday
-    weekday_counts = df.groupby('weekday').size().to_dict()
-    weekday_completion = df[df['status'] == 'done'].groupby('weekday').size().to_dict()
-    
+
     by_weekday = {}
-    for day in ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']:
+    for day in WEEKDAYS:
         total = weekday_counts.get(day, 0)
         done = weekday_completion.get(day, 0)
         by_weekday[day] = {
@@ -93,15 +101,7 @@ def analyze_workload(entries):
             "completed": done,
             "completion_rate": (done / total * 100) if total > 0 else 0.0
         }
-    
-    # By status
-    by_status = df['status'].value_counts().to_dict()
-    
-    # By category
-    by_category = {}
-    if 'category' in df.columns:
-        by_category = df['category'].value_counts().to_dict()
-    
+
     return {
         "total_tasks": total_tasks,
         "completion_rate": round(completion_rate, 1),
@@ -109,13 +109,185 @@ def analyze_workload(entries):
         "by_status": by_status,
         "by_category": by_category,
         "period": {
-            "start": df['date'].min().strftime("%Y-%m-%d"),
-            "end": df['date'].max().strftime("%Y-%m-%d"),
-            "days": (df['date'].max() - df['date'].min()).days + 1
+            "start": start.strftime("%Y-%m-%d"),
+            "end": end.strftime("%Y-%m-%d"),
+            "days": (end - start).days + 1
         }
     }
 
 
+def value_counts(values) -> Dict[Any, int]:
+    """Counts by descending frequency, ties in first-seen order; None is dropped."""
+    return dict(Counter(v for v in values if v is not None).most_common())
+
+
+def analyze_workload_python(entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Single pass over the tasks with Counters."""
+    weekday_by_date: Dict[str, tuple] = {}
+    weekday_counts: Counter = Counter()
+    weekday_completion: Counter = Counter()
+    statuses = []
+    categories = []
+    completed = 0
+
+    for entry in entries:
+        date_value = entry['date']
+        parsed = weekday_by_date.get(date_value)
+        if parsed is None:
+            dt = datetime.fromisoformat(date_value)
+            parsed = weekday_by_date[date_value] = (dt, WEEKDAYS[dt.weekday()])
+        weekday = parsed[1]
+
+        status = entry.get('status')
+        weekday_counts[weekday] += 1
+        if status == 'done':
+            completed += 1
+            weekday_completion[weekday] += 1
+        statuses.append(status)
+        categories.append(entry.get('category'))
+
+    dates = [dt for dt, _ in weekday_by_date.values()]
+    return build_analysis(
+        len(entries), completed, weekday_counts, weekday_completion,
+        value_counts(statuses), value_counts(categories), min(dates), max(dates),
+    )
+
+
+def analyze_workload_pandas(entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """DataFrame groupby/value_counts (optional dependency)."""
+    import pandas as pd
+
+    df = pd.DataFrame(entries)
+
+    # Parse dates and add weekday
+    df['date'] = pd.to_datetime(df['date'])
+    df['weekday'] = df['date'].dt.day_name()
+
+    done = df[df['status'] == 'done']
+    by_category = {}
+    if 'category' in df.columns:
+        by_category = df['category'].value_counts().to_dict()
+
+    return build_analysis(
+        len(df), len(done),
+        df.groupby('weekday').size().to_dict(),
+        done.groupby('weekday').size().to_dict(),
+        df['status'].value_counts().to_dict(),
+        by_category,
+        df['date'].min().to_pydatetime(),
+        df['date'].max().to_pydatetime(),
+    )
+
+
+def pandas_available() -> bool:
+    try:
+        import pandas  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def analyze_workload(entries: List[Dict[str, Any]], backend: str = "auto") -> Dict[str, Any]:
+    """
+    Analyze workload patterns from task entries.
+
+    Args:
+        entries: Task dicts with a 'date' field
+        backend: "python", "pandas", or "auto" (pandas only for very large
+            inputs, and only if installed)
+    """
+    if not entries:
+        return empty_analysis()
+
+    if backend == "auto":
+        backend = "pandas" if len(entries) >= PANDAS_MIN_ROWS and pandas_available() else "python"
+
+    if backend == "pandas":
+        return analyze_workload_pandas(entries)
+    return analyze_workload_python(entries)
+
+
+def analyze_workload_windows(day_entries: List[Dict[str, Any]], windows: List[int],
+                             backend: str = "auto") -> Dict[int, Dict[str, Any]]:
+    """
+    analyze_workload() for several --days values from one load.
+
+    day_entries are newest-first task entries covering the longest window.
+    The Python engine folds days newest to oldest into running counters and
+    snapshots each window; status/category ties keep the oldest-first
+    first-seen order of value_counts() by remembering each key's earliest
+    position.
+    """
+    windows = sorted(set(windows))
+    # --days N covers N + 1 files (see load_task_entry_days)
+    spans_by_window = {days: days + 1 for days in windows}
+
+    if backend == "auto":
+        total = sum(len(entry.get('tasks', [])) for entry in day_entries)
+        backend = "pandas" if total >= PANDAS_MIN_ROWS and pandas_available() else "python"
+
+    if backend == "pandas":
+        results = {}
+        for days, span in spans_by_window.items():
+            cutoff = window_cutoff(span)
+            results[days] = analyze_workload(
+                flatten_tasks([e for e in day_entries if e['__date'] >= cutoff]), "pandas"
+            )
+        return results
+
+    state: Dict[str, Any] = {
+        "total": 0, "completed": 0, "position": 0,
+        "weekday_counts": Counter(), "weekday_completion": Counter(),
+        "statuses": {}, "categories": {}, "first": None, "last": None,
+    }
+    weekday_by_date: Dict[str, str] = {}
+
+    def count(counter: Dict[Any, List[int]], value: Any) -> None:
+        if value is None:
+            return
+        slot = counter.setdefault(value, [0, 0])
+        slot[0] += 1
+        slot[1] = state["position"]
+
+    def add(entry: Dict[str, Any]) -> None:
+        date_value = entry.get('date', entry['__date'])
+        weekday = weekday_by_date.get(date_value)
+        if weekday is None:
+            weekday = weekday_by_date[date_value] = WEEKDAYS[datetime.fromisoformat(date_value).weekday()]
+        tasks = entry.get('tasks', [])
+        if not tasks:
+            return
+
+        for task in reversed(tasks):
+            state["position"] -= 1
+            status = task.get('status')
+            state["weekday_counts"][weekday] += 1
+            if status == 'done':
+                state["completed"] += 1
+                state["weekday_completion"][weekday] += 1
+            count(state["statuses"], status)
+            count(state["categories"], task.get('category'))
+        state["total"] += len(tasks)
+        state["first"] = min(state["first"] or date_value, date_value)
+        state["last"] = max(state["last"] or date_value, date_value)
+
+    def ranked(counter: Dict[Any, List[int]]) -> Dict[Any, int]:
+        return {key: slot[0] for key, slot in sorted(counter.items(), key=lambda kv: (-kv[1][0], kv[1][1]))}
+
+    def snapshot() -> Dict[str, Any]:
+        if not state["total"]:
+            return empty_analysis()
+        return build_analysis(
+            state["total"], state["completed"],
+            dict(state["weekday_counts"]), dict(state["weekday_completion"]),
+            ranked(state["statuses"]), ranked(state["categories"]),
+            datetime.fromisoformat(state["first"]), datetime.fromisoformat(state["last"]),
+        )
+
+    results = accumulate_windows(day_entries, list(spans_by_window.values()), add, snapshot)
+    return {days: results[span] for days, span in spans_by_window.items()}
+
+
 def generate_markdown_report(analysis):
     """Generate Markdown report from analysis."""
     lines = [
@@ -131,7 +303,7 @@ def generate_markdown_report(analysis):
         "|---------|-------|-----------|------|"
     ]
     
-    for day in ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']:
+    for day in WEEKDAYS:
         stats = analysis['by_weekday'].get(day, {"total": 0, "completed": 0, "completion_rate": 0.0})
         lines.append(f"| {day} | {stats['total']} | {stats['completed']} | {stats['completion_rate']:.1f}% |")
     
@@ -156,26 +328,54 @@ def generate_markdown_report(analysis):
     return "\n".join(lines)
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """Main entry point."""
-    days = 30
-    if len(sys.argv) > 1:
-        if sys.argv[1] == '--days' and len(sys.argv) > 2:
-            days = int(sys.argv[2])
-    
-    print(f"Loading task entries from the last {days} days...", file=sys.stderr)
-    entries = load_task_entries(days)
-    
-    if not entries:
-        print("No task entries found. Generate some with convert-to-task-entry.mjs first.", file=sys.stderr)
+    parser = argparse.ArgumentParser(description="Analyze workload patterns")
+    parser.add_argument('--days', type=int, default=30,
+                        help='Number of days to analyze (default: 30)')
+    parser.add_argument('--backend', choices=['auto', 'python', 'pandas'], default='auto',
+                        help=f'Aggregation backend (default: auto = pandas from {PANDAS_MIN_ROWS:,} tasks if installed)')
+    parser.add_argument('--windows', type=parse_windows,
+                        help='Extra windows in days, e.g. 7,30,90,365 (written to a "windows" map)')
+    parser.add_argument('--state-dir', type=Path, default=STATE_DIR,
+                        help='Directory holding the task-entry files (default: the repository\'s cortex/state)')
+    parser.add_argument('--output-dir', type=Path, default=OUTPUT_DIR,
+                        help='Directory for the JSON and Markdown outputs (default: the repository\'s data/analytics)')
+    args = parser.parse_args(argv)
+    days = args.days
+
+    if args.backend == 'pandas' and not pandas_available():
+        print("Error: pandas is required for --backend pandas. Install with: pip install pandas", file=sys.stderr)
         sys.exit(1)
     
-    print(f"Analyzing {len(entries)} tasks...", file=sys.stderr)
-    analysis = analyze_workload(entries)
+    if args.windows:
+        longest = max(days, *args.windows)
+        print(f"Loading task entries from the last {longest} days...", file=sys.stderr)
+        day_entries = load_task_entry_days(longest, args.state_dir)
+        if not any(entry.get('tasks') for entry in day_entries):
+            print("No task entries found. Generate some with convert-to-task-entry.mjs first.", file=sys.stderr)
+            sys.exit(1)
+
+        results = analyze_workload_windows(day_entries, [days, *args.windows], args.backend)
+        analysis = {**results[days]}
+        analysis["windows"] = windows_json(results, args.windows)
+        for window in args.windows:
+            print(f"  {window}d: {results[window]['total_tasks']} tasks, "
+                  f"{results[window]['completion_rate']}% completed", file=sys.stderr)
+    else:
+        print(f"Loading task entries from the last {days} days...", file=sys.stderr)
+        entries = load_task_entries(days, args.state_dir)
+
+        if not entries:
+            print("No task entries found. Generate some with convert-to-task-entry.mjs first.", file=sys.stderr)
+            sys.exit(1)
+
+        print(f"Analyzing {len(entries)} tasks...", file=sys.stderr)
+        analysis = analyze_workload(entries, args.backend)
     
     # Save JSON
-    output_dir = Path(__file__).parent.parent / "data" / "analytics"
-    output_dir.mkdir(exist_ok=True)
+    output_dir = args.output_dir
+    output_dir.mkdir(parents=True, exist_ok=True)
     
     json_path = output_dir / "temporal-patterns.json"
     with open(json_path, 'w', encoding='utf-8') as f:
@@ -195,4 +395,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    profiling.run_main(main)
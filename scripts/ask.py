@@ -30,6 +30,12 @@ try:
 except ImportError:
     pass  # dotenv is optional
 
+SCRIPTS_DIR = Path(__file__).resolve().parent
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from cortex_lib import profiling  # noqa: E402
+
 
 def load_context(question: str) -> dict:
     """
@@ -266,4 +272,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    profiling.run_main(main)
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Historical Backfill
+
+Computes the rhythm, duration and health analytics "as of" every past
+date and writes them as time series, in one linear pass instead of one
+analyzer run per day (cortex_lib/backfill.py).
+
+Input:
+  - cortex/state/day-agg-YYYY-MM-DD.json (rebuilt from the task entries
+    where missing or stale, cortex_lib/day_agg.py)
+  - cortex/logs/recipe-*.jsonl / *.log (automation reliability)
+
+Output (one JSON object per line and date, oldest first):
+  - cortex/state/rhythm-history.jsonl    analyze-rhythm's scalar fields
+                                         (chronotype, peak hour/window, hourly distribution)
+  - cortex/state/duration-history.jsonl  analyze-duration --exact overall / per-category stats
+  - cortex/state/health-history.jsonl    analyze-health's overall score with its
+                                         automation and analytics components
+
+Each date D sees what the analyzer would have seen if run on D: the
+--days task-entry dates ending on D, and recipe log entries from the
+--window-days UTC days ending on D. Differences from a live run:
+  - duration mean/std_dev come from running sums (equal up to float
+    rounding); categories are listed alphabetically
+  - log entries without a timestamp cannot be placed and are left out;
+    legacy .log files count on the UTC date they were last written
+  - data freshness is scored as current (95): the backfilled analytics
+    are computed as of each date, i.e. 0 hours old
+  - latency spans are not backfilled
+
+Usage:
+    python scripts/backfill-history.py [--from 2025-01-01] [--to 2025-12-31] [--days 30]
+        [--window-days 7] [--min-tasks 10] [--min-samples 3] [--min-confidence 0.7]
+        [--output-dir cortex/state]
+"""
+
+import argparse
+import importlib.util
+import json
+import sys
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from cortex_lib import backfill, day_agg, log_segments, profiling, spans, task_entries  # noqa: E402
+from cortex_lib.fingerprint import atomic_write_text  # noqa: E402
+
+
+STATE_DIR = Path("cortex/state")
+LOGS_DIR = Path("cortex/logs")
+# Freshness score of a 0-hour-old analytics output (analyze-health.calculate_freshness_score)
+FRESH_SCORE = 95
+
+
+def load_script(name: str) -> Any:
+    """Import scripts/<name>.py as a module (hyphenated names are not importable)."""
+    spec = importlib.util.spec_from_file_location(name.replace("-", "_"), SCRIPTS_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def parse_date(value: str) -> date:
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date: {value!r} (expected YYYY-MM-DD)")
+
+
+def daily_log_counts(health: Any) -> Dict[str, List[int]]:
+    """{"YYYY-MM-DD" (UTC): [runs, successes, failures]} over every recipe log segment."""
+    counts: Dict[str, List[int]] = defaultdict(lambda: [0, 0, 0])
+    if not LOGS_DIR.exists():
+        return counts
+
+    for segment in log_segments.list_segments(LOGS_DIR, "jsonl"):
+        if not log_segments.readable(segment):
+            continue
+        buckets: Dict[str, Dict[str, Any]] = {}
+        try:
+            for line in log_segments.iter_lines(segment):
+                health.fold_log_line(buckets, line)
+        except Exception as e:
+            print(f"⚠️  Error reading {segment['path']}: {e}", file=sys.stderr)
+        for key, bucket in buckets.items():
+            if key == health.UNDATED:
+                continue
+            day = counts[key[:10]]  # BUCKET_FORMAT starts with the date
+            day[0] += bucket["runs"]
+            day[1] += bucket["successes"]
+            day[2] += bucket["failures"]
+
+    for segment in log_segments.list_segments(LOGS_DIR, "log"):
+        try:
+            day = counts[segment["end"].strftime("%Y-%m-%d")]
+            if log_segments.search(segment, health.LEGACY_SUCCESS_RE):
+                day[1] += 1
+            elif log_segments.search(segment, health.LEGACY_FAILURE_RE):
+                day[2] += 1
+            day[0] += 1
+        except Exception as e:
+            print(f"⚠️  Error reading {segment['path']}: {e}", file=sys.stderr)
+
+    return counts
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Backfill rhythm / duration / health history")
+    parser.add_argument("--from", dest="start", type=parse_date,
+                        help="First as-of date (default: the oldest task entry)")
+    parser.add_argument("--to", dest="end", type=parse_date, help="Last as-of date (default: today)")
+    parser.add_argument("--days", type=int, default=30,
+                        help="Analytics window in days, as the analyzers' --days (default: 30)")
+    parser.add_argument("--window-days", type=int, default=7,
+                        help="Automation reliability window in days, as analyze-health (default: 7)")
+    parser.add_argument("--min-tasks", type=int, default=10,
+                        help="Minimum completed tasks to classify the chronotype (default: 10)")
+    parser.add_argument("--min-samples", type=int, default=3,
+                        help="Minimum samples per duration category (default: 3)")
+    parser.add_argument("--min-confidence", type=float, default=0.7,
+                        help="Minimum duration_confidence to include (default: 0.7)")
+    parser.add_argument("--output-dir", type=str, default=str(STATE_DIR),
+                        help="Directory for the *-history.jsonl files (default: cortex/state)")
+
+    args = parser.parse_args(argv)
+
+    if args.days < 1 or args.window_days < 1:
+        print("❌ --days and --window-days must be positive", file=sys.stderr)
+        sys.exit(1)
+
+    files = task_entries.scan_task_entry_files(STATE_DIR)
+    if not files:
+        print("❌ No task entries found", file=sys.stderr)
+        sys.exit(1)
+
+    start = args.start or parse_date(min(files))
+    end = args.end or datetime.now().date()
+    if start > end:
+        print(f"❌ --from {start} is after --to {end}", file=sys.stderr)
+        sys.exit(1)
+
+    rhythm = load_script("analyze-rhythm")
+    duration = load_script("analyze-duration")
+    health = load_script("analyze-health")
+
+    print(f"📈 Backfilling history {start} → {end} ({(end - start).days + 1} dates, "
+          f"{args.days}-day window)...", file=sys.stderr)
+
+    lead_in = (start - timedelta(days=args.days - 1)).isoformat()
+    with spans.span("backfill-history.load") as sp:
+        aggs = day_agg.load_day_aggs(
+            {d: meta for d, meta in files.items() if lead_in <= d <= end.isoformat()}, STATE_DIR
+        )
+        log_counts = daily_log_counts(health)
+        sp["items"] = len(aggs)
+    print(f"✅ Loaded {len(aggs)} day aggregates, recipe logs for {len(log_counts)} days", file=sys.stderr)
+
+    # Running aggregates, one set per window
+    activity = rhythm.new_activity()
+    heatmap = {"completed": 0, "active_dates": set()}
+    samples: Dict[Any, Dict[str, Any]] = {}
+    overall = backfill.new_sample()
+    duration_counts = {"with_duration": 0, "filtered": 0}
+    automation = [0, 0, 0]
+
+    def fold_tasks(date_str: str, sign: int) -> None:
+        agg = aggs.get(date_str)
+        if agg is None:
+            return
+        rhythm.add_day_agg(activity, agg, sign)
+
+        completed = sum(sum(weekdays) for weekdays in agg["categories"].values())
+        heatmap["completed"] += sign * completed
+        if completed and sign > 0:
+            heatmap["active_dates"].add(date_str)
+        elif completed:
+            heatmap["active_dates"].discard(date_str)
+
+        for category, result in duration.day_agg_task_durations(agg, args.min_confidence):
+            duration_counts["with_duration"] += sign * result["has_duration"]
+            duration_counts["filtered"] += sign * result["filtered"]
+            if result["duration"] is None:
+                continue
+            if sign > 0:
+                backfill.sample_add(samples.setdefault(category, backfill.new_sample()), result["duration"])
+                backfill.sample_add(overall, result["duration"])
+            else:
+                backfill.sample_remove(samples[category], result["duration"])
+                backfill.sample_remove(overall, result["duration"])
+                if not samples[category]["values"]:
+                    del samples[category]
+
+    def fold_logs(date_str: str, sign: int) -> None:
+        for i, n in enumerate(log_counts.get(date_str, ())):
+            automation[i] += sign * n
+
+    def stats(sample: Dict[str, Any]) -> Dict[str, Any]:
+        values = backfill.sample_stats(sample)
+        return duration.duration_stats(*values) if values else duration.empty_duration_stats()
+
+    rhythm_history: List[Dict[str, Any]] = []
+    duration_history: List[Dict[str, Any]] = []
+    health_history: List[Dict[str, Any]] = []
+
+    with spans.span("backfill-history.sweep") as sp:
+        windows = [
+            (args.days, lambda d: fold_tasks(d, 1), lambda d: fold_tasks(d, -1)),
+            (args.window_days, lambda d: fold_logs(d, 1), lambda d: fold_logs(d, -1)),
+        ]
+        for as_of in backfill.sweep(start, end, windows):
+            rhythm_fields = {"date": as_of, "analysis_period_days": args.days,
+                             **rhythm.rhythm_summary(activity, args.min_tasks)}
+            rhythm_history.append(rhythm_fields)
+
+            duration_fields = {
+                "date": as_of,
+                "analysis_period_days": args.days,
+                "samples": len(overall["values"]),
+                **duration_counts,
+                "overall": stats(overall),
+                "by_category": {
+                    category: stats(samples[category])
+                    for category in sorted(samples, key=str)
+                    if len(samples[category]["values"]) >= args.min_samples
+                },
+            }
+            duration_history.append(duration_fields)
+
+            automation_score, automation_details = health.calculate_automation_score(*automation)
+            automation_details["window_days"] = args.window_days
+            analytics_score, analytics_details = health.score_analytics(
+                duration_fields,
+                rhythm_fields,
+                {"total_completed_tasks": heatmap["completed"], "active_days": len(heatmap["active_dates"])},
+            )
+            health_history.append({
+                "date": as_of,
+                "overall_score": health.weighted_score(automation_score, FRESH_SCORE, analytics_score),
+                "components": {
+                    "automation": automation_details,
+                    "data_freshness": {"score": FRESH_SCORE, "status": "assumed_current"},
+                    "analytics_health": analytics_details,
+                },
+            })
+        sp["items"] = len(health_history)
+
+    output_dir = Path(args.output_dir)
+    for name, records in (("rhythm-history.jsonl", rhythm_history),
+                          ("duration-history.jsonl", duration_history),
+                          ("health-history.jsonl", health_history)):
+        atomic_write_text(output_dir / name, "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records))
+        print(f"✅ {len(records)} dates → {output_dir / name}", file=sys.stderr)
+
+    latest = health_history[-1]
+    print(f"✅ As of {latest['date']}: health {latest['overall_score']}/100, "
+          f"chronotype {rhythm_history[-1]['chronotype']}, "
+          f"{duration_history[-1]['samples']} duration samples", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    profiling.run_main(main)
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Analytics Benchmark Harness
+
+Generates synthetic corpora (cortex_lib/synthetic.py) at several sizes and
+times + memory-profiles each analytics script's main() over them.
+
+Per script and corpus size:
+- cold_sec: first run (empty in-process caches, no digest cache on disk)
+- warm_sec: best of --repeat further runs (in-process caches dropped,
+  on-disk caches and manifests kept, as on a second nightly run)
+- peak_kb: tracemalloc peak of one extra cold run (timed runs are not
+  traced, so tracing overhead does not skew the timings)
+
+The analyzers run with --no-cache: every run recomputes instead of
+reusing the output of the previous one (cortex_lib/result_cache.py).
+
+Every script that works on the cortex/ tree under the working directory
+is covered. Left out are the ones that cannot run on a synthetic corpus:
+- detect-incomplete-tasks, sync-digest-tasks, suggest: their paths are
+  anchored to the repository, not the working directory, so they would
+  read (and the first two rewrite) the real cortex/ tree
+- ask: calls the Anthropic API
+- log, note, verify-phase2-event, extract-tasks-from-obsidian / -mcp /
+  -simple and the corpus / digest-parser tools: manual commands or
+  extractors for other sources (an Obsidian vault, MCP, stdin), not part
+  of the analytics chain
+
+Results are appended to a JSON history file (last HISTORY_LIMIT runs),
+and each script is compared with the previous run so regressions show up
+immediately.
+
+Usage:
+    python scripts/benchmark-analytics.py [--sizes 30x10x20,365x25x100] [--repeat 3]
+        [--scripts analyze-duration,analyze-rhythm] [--output cortex/state/benchmark-analytics.json]
+
+A size is DAYSxTASKS_PER_DAYxLOG_LINES (log lines per recipe per day).
+"""
+
+import argparse
+import contextlib
+import gc
+import importlib.util
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from cortex_lib import digest_cache, spans, task_entries  # noqa: E402
+from cortex_lib.fingerprint import atomic_write_text, load_manifest  # noqa: E402
+from cortex_lib.synthetic import generate_corpus  # noqa: E402
+
+
+DEFAULT_OUTPUT = "cortex/state/benchmark-analytics.json"
+DEFAULT_SIZES = "30x10x20,365x25x100"
+HISTORY_LIMIT = 20
+
+# Flag a script when it is this much slower than in the previous run
+REGRESSION_RATIO = 1.25
+
+# (script, argv builder taking the corpus day count)
+SCRIPTS: List[tuple] = [
+    ("extract-tasks", lambda days: ["--days", str(days)]),
+    ("process-obsidian-batch", lambda days: ["--from-files"]),
+    ("enrich-task-metadata", lambda days: ["--all"]),
+    ("analyze-duration", lambda days: ["--days", str(days), "--no-cache"]),
+    ("analyze-rhythm", lambda days: ["--days", str(days), "--no-cache"]),
+    ("analyze-category-heatmap", lambda days: ["--days", str(days), "--no-cache"]),
+    ("analyze-recipes", lambda days: ["--days", str(days), "--no-cache"]),
+    ("extract-feedback", lambda days: ["--days", str(days), "--no-cache"]),
+    ("analyze-health", lambda days: ["--window-days", "7", "--no-cache"]),
+    ("analyze-workload", lambda days: ["--days", str(days), "--state-dir", "cortex/state",
+                                       "--output-dir", "data/analytics"]),
+    ("backfill-history", lambda days: ["--days", "30"]),
+    ("task-store", lambda days: ["sync"]),
+    ("run-pipeline", lambda days: ["--days", str(days), "--force"]),
+]
+
+
+def parse_size(spec: str) -> Dict[str, int]:
+    days, tasks, logs = (int(part) for part in spec.lower().split("x"))
+    return {"days": days, "tasks_per_day": tasks, "log_lines": logs}
+
+
+def load_script(name: str) -> Any:
+    """Import scripts/<name>.py as a module (hyphenated names are not importable)."""
+    spec = importlib.util.spec_from_file_location(f"bench_{name.replace('-', '_')}", SCRIPTS_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def reset_caches(corpus: Path, disk: bool) -> None:
+    """
+    Drop in-process caches, and optionally the on-disk ones: digest cache,
+    manifests, sketches, day aggregates, task store and log indexes.
+    """
+    task_entries.clear_cache()
+    digest_cache.clear_memo()
+    if disk:
+        shutil.rmtree(corpus / "cortex" / "tmp", ignore_errors=True)
+        state_dir = corpus / "cortex" / "state"
+        for stored in [*state_dir.glob(".*-manifest.json"), *state_dir.glob(".*-sketches.json"),
+                       *state_dir.glob("day-agg-*.json"), *state_dir.glob("tasks.db*")]:
+            stored.unlink()
+        logs_dir = corpus / "cortex" / "logs"
+        for stored in [*logs_dir.glob(".*-checkpoints.json"), *logs_dir.glob(".*.idx")]:
+            stored.unlink()
+    gc.collect()
+
+
+def call_main(main: Callable[..., Any], argv: List[str], verbose: bool) -> Optional[str]:
+    """Run main(argv); return an error string instead of raising."""
+    sink = open(os.devnull, "w", encoding="utf-8")
+    try:
+        with contextlib.redirect_stdout(sink):
+            if verbose:
+                main(argv)
+            else:
+                with contextlib.redirect_stderr(sink):
+                    main(argv)
+    except SystemExit as e:
+        if e.code not in (0, None):
+            return f"exit status {e.code}"
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+    finally:
+        sink.close()
+    return None
+
+
+def bench_script(name: str, argv: List[str], corpus: Path, repeat: int, verbose: bool) -> Dict[str, Any]:
+    main = load_script(name).main
+
+    reset_caches(corpus, disk=True)
+    start = time.perf_counter()
+    error = call_main(main, argv, verbose)
+    cold = time.perf_counter() - start
+    if error:
+        return {"argv": argv, "error": error}
+
+    warm: List[float] = []
+    for _ in range(repeat):
+        reset_caches(corpus, disk=False)
+        start = time.perf_counter()
+        error = call_main(main, argv, verbose)
+        warm.append(time.perf_counter() - start)
+        if error:
+            return {"argv": argv, "error": f"warm run: {error}"}
+
+    reset_caches(corpus, disk=True)
+    tracemalloc.start()
+    try:
+        error = call_main(main, argv, verbose)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    if error:
+        return {"argv": argv, "error": f"traced run: {error}"}
+
+    return {
+        "argv": argv,
+        "cold_sec": round(cold, 4),
+        "warm_sec": round(min(warm), 4) if warm else None,
+        "peak_kb": round(peak / 1024),
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=SCRIPTS_DIR,
+                                capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def compare(previous: Optional[Dict[str, Any]], current: Dict[str, Any]) -> List[str]:
+    """Lines describing scripts whose cold or warm run got slower than REGRESSION_RATIO."""
+    if not previous:
+        return []
+    warnings = []
+    previous_sizes = {s["size"]: s for s in previous.get("sizes", [])}
+    for size in current["sizes"]:
+        before = previous_sizes.get(size["size"])
+        if not before:
+            continue
+        for name, result in size["scripts"].items():
+            for run in ("cold", "warm"):
+                old = before["scripts"].get(name, {}).get(f"{run}_sec")
+                new = result.get(f"{run}_sec")
+                if old and new and new > old * REGRESSION_RATIO:
+                    warnings.append(f"{size['size']} {name} ({run}): {old:.3f}s → {new:.3f}s ({new / old:.2f}x)")
+    return warnings
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark analytics scripts on synthetic corpora")
+    parser.add_argument("--sizes", type=str, default=DEFAULT_SIZES,
+                        help=f"Comma-separated DAYSxTASKSxLOGLINES corpus sizes (default: {DEFAULT_SIZES})")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Warm runs per script; the best is reported (default: 3)")
+    parser.add_argument("--scripts", type=str,
+                        help="Comma-separated subset of scripts to benchmark (default: all)")
+    parser.add_argument("--seed", type=int, default=42, help="Corpus RNG seed (default: 42)")
+    parser.add_argument("--output", type=str, default=DEFAULT_OUTPUT,
+                        help=f"Results history file (default: {DEFAULT_OUTPUT})")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated corpora")
+    parser.add_argument("--verbose", action="store_true", help="Show the scripts' own stderr output")
+    args = parser.parse_args(argv)
+
+    selected = SCRIPTS
+    if args.scripts:
+        wanted = [s.strip() for s in args.scripts.split(",") if s.strip()]
+        unknown = set(wanted) - {name for name, _ in SCRIPTS}
+        if unknown:
+            print(f"❌ Unknown scripts: {', '.join(sorted(unknown))}", file=sys.stderr)
+            sys.exit(1)
+        selected = [(name, build) for name, build in SCRIPTS if name in wanted]
+
+    # Timing spans would grow the corpus logs between repeats
+    os.environ[spans.SPANS_ENV] = "0"
+
+    output_path = Path(args.output).resolve()
+    run: Dict[str, Any] = {
+        "generated_at": datetime.now().astimezone().isoformat(timespec="seconds"),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "sizes": [],
+    }
+
+    cwd = Path.cwd()
+    for spec in (s.strip() for s in args.sizes.split(",") if s.strip()):
+        size = parse_size(spec)
+        corpus = Path(tempfile.mkdtemp(prefix=f"cortex-bench-{spec}-"))
+        try:
+            stats = generate_corpus(corpus, size["days"], size["tasks_per_day"], size["log_lines"], args.seed)
+            print(f"📦 Corpus {spec}: {stats['tasks']} tasks, "
+                  f"{stats['jsonl_lines'] + stats['log_lines']} log lines ({corpus})", file=sys.stderr)
+
+            results: Dict[str, Any] = {}
+            os.chdir(corpus)
+            try:
+                for name, build in selected:
+                    result = bench_script(name, build(size["days"]), corpus, args.repeat, args.verbose)
+                    results[name] = result
+                    if result.get("error"):
+                        print(f"   ❌ {name:<26} {result['error']}", file=sys.stderr)
+                    else:
+                        print(f"   ✅ {name:<26} cold {result['cold_sec']:>8.3f}s  "
+                              f"warm {result['warm_sec'] or 0:>8.3f}s  peak {result['peak_kb']:>8,} KB",
+                              file=sys.stderr)
+            finally:
+                os.chdir(cwd)
+
+            run["sizes"].append({"size": spec, **size, "corpus": stats, "scripts": results})
+        finally:
+            if args.keep:
+                print(f"   Corpus kept at {corpus}", file=sys.stderr)
+            else:
+                shutil.rmtree(corpus, ignore_errors=True)
+
+    history = load_manifest(output_path).get("runs", [])
+    regressions = compare(history[-1] if history else None, run)
+    run["regressions"] = regressions
+    history = (history + [run])[-HISTORY_LIMIT:]
+    atomic_write_text(output_path, json.dumps({"runs": history}, ensure_ascii=False, indent=2))
+
+    print(f"✅ Results saved to {output_path}", file=sys.stderr)
+    if regressions:
+        print(f"\n⚠️  Slower than the previous run (>{REGRESSION_RATIO}x):", file=sys.stderr)
+        for line in regressions:
+            print(f"   • {line}", file=sys.stderr)
+
+    print(json.dumps(run, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
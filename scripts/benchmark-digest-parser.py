@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Digest Parser Benchmark
+
+Measures parse_daily_digest throughput (lines per second) on large
+synthetic digests that mix every supported format: checkbox lists under
+category headers, | 時刻 | タスク | 時間 | tables, and
+### Title (HH:MM-HH:MM JST) progress blocks with **所要時間** lines.
+
+Usage:
+    python scripts/benchmark-digest-parser.py [--lines 10000,100000] [--repeat 5] [--json]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from cortex_lib.digest_parser import parse_daily_digest  # noqa: E402
+from cortex_lib.synthetic import synthetic_digest  # noqa: E402
+
+
+def bench(lines: int, repeat: int) -> Dict[str, Any]:
+    content = synthetic_digest(lines)
+    line_count = content.count("\n") + 1
+
+    timings: List[float] = []
+    tasks = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        tasks = len(parse_daily_digest(content, "2025-12-10")["tasks"])
+        timings.append(time.perf_counter() - start)
+
+    best = min(timings)
+    return {
+        "lines": line_count,
+        "tasks": tasks,
+        "best_sec": round(best, 6),
+        "lines_per_sec": int(line_count / best) if best > 0 else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the daily digest parser")
+    parser.add_argument("--lines", type=str, default="1000,10000,100000",
+                        help="Comma-separated digest sizes in lines (default: 1000,10000,100000)")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Runs per size; the best time is reported (default: 5)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.lines.split(",") if s.strip()]
+    results = [bench(size, args.repeat) for size in sizes]
+
+    if args.json:
+        print(json.dumps({"benchmark": "digest-parser", "results": results}, indent=2))
+        return
+
+    print(f"{'lines':>10} {'tasks':>8} {'best (s)':>10} {'lines/s':>12}")
+    for r in results:
+        print(f"{r['lines']:>10} {r['tasks']:>8} {r['best_sec']:>10.4f} {r['lines_per_sec']:>12,}")
+
+
+if __name__ == "__main__":
+    main()
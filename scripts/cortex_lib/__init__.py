@@ -0,0 +1,7 @@
+"""
+Cortex OS shared helpers for the Python analytics scripts.
+
+The scripts under scripts/ are run directly (``python scripts/analyze-*.py``),
+so shared code lives in this package and each script imports it after
+putting its own directory on ``sys.path``.
+"""
@@ -0,0 +1,92 @@
+"""
+Historical Backfill
+
+Helpers for computing analytics "as of" every past date in one linear
+pass (scripts/backfill-history.py). Rerunning an analyzer once per day
+with a faked clock re-reads the whole window each time (O(days x
+window)); sweep() instead walks the dates oldest to newest and slides
+each window forward by one day, adding the day that entered and
+subtracting the day that left.
+
+The running aggregates must therefore be subtractable: plain counters,
+or sliding samples (sorted values plus running sums) where order
+statistics are needed.
+"""
+
+import bisect
+import math
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+def date_range(start: date, end: date) -> List[date]:
+    """Every date from start to end, inclusive."""
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+def sweep(
+    start: date,
+    end: date,
+    windows: Iterable[Tuple[int, Callable[[str], None], Callable[[str], None]]],
+) -> Iterator[str]:
+    """
+    Slide windows over the dates from start to end.
+
+    Args:
+        windows: (days, add, remove) per window. add / remove fold one
+            date (YYYY-MM-DD) into / out of the caller's aggregates;
+            dates without data are theirs to ignore.
+
+    Yields:
+        Each date (YYYY-MM-DD) once every window covers the `days` days
+        ending on it.
+    """
+    windows = list(windows)
+    for i, current in enumerate(date_range(start, end)):
+        for days, add, remove in windows:
+            if i == 0:
+                for back in range(days - 1, -1, -1):
+                    add((current - timedelta(days=back)).isoformat())
+            else:
+                add(current.isoformat())
+                remove((current - timedelta(days=days)).isoformat())
+        yield current.isoformat()
+
+
+def new_sample() -> Dict[str, Any]:
+    """A sliding sample: sorted values plus running sums."""
+    return {"values": [], "sum": 0.0, "sumsq": 0.0}
+
+
+def sample_add(sample: Dict[str, Any], value: float) -> None:
+    bisect.insort(sample["values"], value)
+    sample["sum"] += value
+    sample["sumsq"] += value * value
+
+
+def sample_remove(sample: Dict[str, Any], value: float) -> None:
+    values = sample["values"]
+    del values[bisect.bisect_left(values, value)]
+    if values:
+        sample["sum"] -= value
+        sample["sumsq"] -= value * value
+    else:
+        # No rounding residue once the window is empty
+        sample["sum"] = sample["sumsq"] = 0.0
+
+
+def sample_stats(sample: Dict[str, Any]) -> Optional[Tuple[int, float, float, float, float, float]]:
+    """
+    (count, mean, median, std_dev, min, max) as the statistics module
+    gives them for the values (mean / std_dev up to float rounding of the
+    running sums), or None when empty.
+    """
+    values = sample["values"]
+    n = len(values)
+    if not n:
+        return None
+    mean = sample["sum"] / n
+    middle = n // 2
+    median = values[middle] if n % 2 else (values[middle - 1] + values[middle]) / 2
+    std_dev = math.sqrt(max(0.0, (sample["sumsq"] - n * mean * mean) / (n - 1))) if n > 1 else 0
+    return n, mean, median, std_dev, values[0], values[-1]
@@ -0,0 +1,145 @@
+"""
+Task Category Classifier
+
+Python side of cortex/config/category-rules.json (the rules the digest
+generator applies in JS):
+
+    {"default_category": "other",
+     "rules": [{"category": "ops", "priority": 1, "case_sensitive": false,
+                "patterns": ["運用", "incident", "on[- ]?call", ...]}, ...]}
+
+A title gets the category of the highest-priority rule (lowest
+"priority", then file order) with any pattern matching anywhere in it.
+
+Patterns are split into two kinds at compile time:
+
+- literal patterns ("incident", "pull request", "tomorrow\\.json") become
+  plain substring checks (`in`, lowered once per title for
+  case-insensitive rules), which is much cheaper than a regex scan;
+- the remaining patterns of all rules are compiled into one regex, an
+  alternation of one lookahead branch per rule in priority order:
+
+      (?=[\\s\\S]*?(?i:on[- ]?call))(?P<_rule0>)|(?=[\\s\\S]*?(?i:\\bn8n\\b))(?P<_rule1>)|...
+
+  pattern.match() tries the branches in order at position 0, so the
+  first one that succeeds is the highest-priority regex rule, and
+  match.lastgroup names it.
+
+The literal checks then only run for rules of higher priority than the
+regex hit. Titles are memoized on top with an LRU cache (titles repeat
+across days: carried-over tasks).
+"""
+
+import functools
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+RULES_PATH = Path("cortex/config/category-rules.json")
+DEFAULT_CATEGORY = "other"
+CACHE_SIZE = 8192
+GROUP_PREFIX = "_rule"
+
+# No regex metacharacters, except escaped punctuation ("tomorrow\\.json")
+LITERAL_RE = re.compile(r"(?:[^\\.^$*+?{}\[\]()|]|\\[^A-Za-z0-9])*")
+
+
+def load_rules(path: Path = RULES_PATH) -> Dict[str, Any]:
+    """The rules config, or an empty one (with a warning) if missing or invalid."""
+    try:
+        config = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+    except (OSError, json.JSONDecodeError, UnicodeDecodeError) as e:
+        print(f"⚠️  Could not read category rules {path}: {e}", file=sys.stderr)
+        return {}
+    return config if isinstance(config, dict) else {}
+
+
+def literal_text(pattern: str) -> Optional[str]:
+    """The text a pattern matches if it is a plain literal (escapes allowed), else None."""
+    if not LITERAL_RE.fullmatch(pattern):
+        return None
+    return re.sub(r"\\(.)", r"\1", pattern)
+
+
+def compile_rules(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compile the rules in priority order.
+
+    Returns:
+        {"categories": [category per rule],
+         "literals": [(case-sensitive literals, lowered literals) per rule],
+         "pattern": combined regex of the non-literal patterns, or None}
+        Branch group "_rule<i>" of the pattern belongs to rule i.
+        Invalid patterns are skipped with a warning.
+    """
+    rules = [rule for rule in config.get("rules", []) if isinstance(rule, dict) and rule.get("category")]
+    ordered = sorted(enumerate(rules), key=lambda item: (item[1].get("priority", float("inf")), item[0]))
+
+    compiled: Dict[str, Any] = {"categories": [], "literals": [], "pattern": None}
+    branches = []
+    for _, rule in ordered:
+        case_sensitive = bool(rule.get("case_sensitive", False))
+        literals: List[str] = []
+        patterns: List[str] = []
+        for pattern in rule.get("patterns", []):
+            try:
+                re.compile(f"(?:{pattern})")  # as embedded in the combined regex
+            except (re.error, TypeError) as e:
+                print(f"⚠️  Skipping category pattern {pattern!r} ({rule['category']}): {e}", file=sys.stderr)
+                continue
+            text = literal_text(pattern)
+            if text is None:
+                patterns.append(f"(?:{pattern})")
+            elif text:
+                literals.append(text if case_sensitive else text.lower())
+
+        index = len(compiled["categories"])
+        compiled["categories"].append(str(rule["category"]))
+        compiled["literals"].append((tuple(literals), ()) if case_sensitive else ((), tuple(literals)))
+        if patterns:
+            body = "|".join(patterns)
+            body = f"(?:{body})" if case_sensitive else f"(?i:{body})"
+            branches.append(f"(?=[\\s\\S]*?{body})(?P<{GROUP_PREFIX}{index}>)")
+
+    if branches:
+        compiled["pattern"] = re.compile("|".join(branches))
+    return compiled
+
+
+def build_classifier(config: Dict[str, Any], cache_size: int = CACHE_SIZE) -> Callable[[str], Optional[str]]:
+    """Memoized title -> category of the first matching rule (None if no rule matches)."""
+    compiled = compile_rules(config)
+    categories, literals, pattern = compiled["categories"], compiled["literals"], compiled["pattern"]
+
+    @functools.lru_cache(maxsize=cache_size)
+    def classify(title: str) -> Optional[str]:
+        best = len(categories)
+        if pattern is not None:
+            match = pattern.match(title)
+            if match:
+                best = int(match.lastgroup[len(GROUP_PREFIX):])
+
+        lowered = title.lower()
+        for index in range(best):
+            exact, folded = literals[index]
+            if any(text in title for text in exact) or any(text in lowered for text in folded):
+                return categories[index]
+        return categories[best] if best < len(categories) else None
+
+    return classify
+
+
+@functools.lru_cache(maxsize=None)
+def _load_classifier(path: Path) -> Tuple[Callable[[str], Optional[str]], str]:
+    config = load_rules(path)
+    return build_classifier(config), str(config.get("default_category") or DEFAULT_CATEGORY)
+
+
+def load_classifier(path: Path = RULES_PATH) -> Tuple[Callable[[str], Optional[str]], str]:
+    """(classify, default_category) for a rules file, built once per process and absolute path."""
+    return _load_classifier(path.resolve())
@@ -0,0 +1,157 @@
+"""
+Daily Aggregate Sidecars
+
+Every analyzer re-derives the same per-day facts from the raw tasks. The
+extractors (extract-tasks.py, process-obsidian-batch.py,
+sync-digest-tasks.py) therefore write cortex/state/day-agg-YYYY-MM-DD.json
+next to each task-entry file, and the analyzers build their 7..365-day
+results by summing these small records instead of parsing every task:
+
+    {
+      "version": 1,
+      "date": "2025-12-01",
+      "source": [mtime_ns, size],        # of the task-entry file it was built from
+      "tasks": 14,                       # both lists
+      "completed": 11,
+      "weekday_hour": [[0] * 24] * 7,    # completed tasks at started_at / completed_at,
+                                         # else the /log "timestamp" (analyze-rhythm)
+      "categories": {"dev": [0] * 7},    # completed "tasks" per weekday, first-seen order,
+                                         # blank -> "uncategorized" (analyze-category-heatmap)
+      "durations": [[category, hours, confidence], ...]
+                                         # completed "tasks" with a duration field, task order
+                                         # (hours null if not positive; analyze-duration)
+    }
+
+The per-task facts come from the task store's helpers, so sidecars, the
+SQLite store and the JSON code paths agree. A sidecar is only trusted
+while "source" matches the task-entry file's mtime/size: files rewritten
+by other tools (enrich --in-place, detect-incomplete-tasks) or written
+before sidecars existed are rebuilt and rewritten on first use
+(load_day_aggs()). Bump DAY_AGG_VERSION when a field changes.
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from . import task_entries
+from .fingerprint import atomic_write_json
+from .task_entries import STATE_DIR
+from .task_store import clock_time, duration_fields, is_completed, parse_iso
+
+
+DAY_AGG_VERSION = 1
+DAY_AGG_PREFIX = "day-agg-"
+
+
+def day_agg_path(state_dir: Path, date_str: str) -> Path:
+    return state_dir / f"{DAY_AGG_PREFIX}{date_str}.json"
+
+
+def build_day_agg(date_str: str, entry: Dict[str, Any], mtime_ns: int = 0, size: int = 0) -> Dict[str, Any]:
+    """The aggregate record of one task entry."""
+    weekday_hour = [[0] * 24 for _ in range(7)]
+    categories: Dict[str, List[int]] = {}
+    durations: List[List[Any]] = []
+    total = completed = 0
+
+    for list_name in ("tasks", "completed"):
+        tasks = entry.get(list_name) or []
+        if not isinstance(tasks, list):
+            continue
+        for task in tasks:
+            if not isinstance(task, dict):
+                continue
+            total += 1
+            if not is_completed(task):
+                continue
+            completed += 1
+
+            at = parse_iso(task.get("started_at")) or parse_iso(task.get("completed_at"))
+            when = at or clock_time(date_str, task.get("timestamp"))
+            if when:
+                weekday_hour[when.weekday()][when.hour] += 1
+
+            if list_name != "tasks":
+                continue
+            if at:
+                category = task.get("category", "uncategorized")
+                if not category or str(category).strip() == "":
+                    category = "uncategorized"
+                categories.setdefault(str(category), [0] * 7)[at.weekday()] += 1
+
+            has_duration, hours = duration_fields(task)
+            if has_duration:
+                durations.append([task.get("category", "uncategorized"), hours, task.get("duration_confidence", 1.0)])
+
+    return {
+        "version": DAY_AGG_VERSION,
+        "date": date_str,
+        "source": [mtime_ns, size],
+        "tasks": total,
+        "completed": completed,
+        "weekday_hour": weekday_hour,
+        "categories": categories,
+        "durations": durations,
+    }
+
+
+def write_day_agg(date_str: str, entry: Dict[str, Any], entry_path: Path) -> Dict[str, Any]:
+    """Write the sidecar of a task-entry file that was just written to entry_path."""
+    st = entry_path.stat()
+    agg = build_day_agg(date_str, entry, st.st_mtime_ns, st.st_size)
+    atomic_write_json(day_agg_path(entry_path.parent, date_str), agg, ensure_ascii=False)
+    return agg
+
+
+def read_day_agg(path: Path, mtime_ns: int, size: int) -> Any:
+    """The sidecar at path if it is current for a task-entry file with this mtime/size, else None."""
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            agg = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(agg, dict) or agg.get("version") != DAY_AGG_VERSION or agg.get("source") != [mtime_ns, size]:
+        return None
+    return agg
+
+
+def load_day_aggs(
+    files: Dict[str, Tuple[Path, int, int]],
+    state_dir: Path = STATE_DIR,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Current aggregates for a task-entry scan result.
+
+    Missing or stale sidecars are rebuilt from their task entries (decoded
+    in parallel) and rewritten.
+
+    Returns:
+        {"YYYY-MM-DD": day aggregate, ...} (undecodable entries left out)
+    """
+    aggs: Dict[str, Dict[str, Any]] = {}
+    stale: Dict[str, Tuple[Path, int, int]] = {}
+    for date_str, (path, mtime_ns, size) in files.items():
+        agg = read_day_agg(day_agg_path(state_dir, date_str), mtime_ns, size)
+        if agg is None:
+            stale[date_str] = (path, mtime_ns, size)
+        else:
+            aggs[date_str] = agg
+
+    for date_str, entry in task_entries.load_task_entry_files(stale).items():
+        _, mtime_ns, size = stale[date_str]
+        agg = aggs[date_str] = build_day_agg(date_str, entry, mtime_ns, size)
+        try:
+            atomic_write_json(day_agg_path(state_dir, date_str), agg, ensure_ascii=False)
+        except OSError as e:
+            print(f"⚠️  Could not write day aggregate for {date_str}: {e}", file=sys.stderr)
+    return aggs
+
+
+def load_window(days: int, state_dir: Path = STATE_DIR) -> List[Dict[str, Any]]:
+    """Aggregates of the past N days, newest first (one per task-entry file)."""
+    dates = task_entries.window_dates(days)
+    all_files = task_entries.scan_task_entry_files(state_dir)
+    aggs = load_day_aggs({d: all_files[d] for d in dates if d in all_files}, state_dir)
+    return [aggs[d] for d in dates if d in aggs]
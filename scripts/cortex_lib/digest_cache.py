@@ -0,0 +1,267 @@
+"""
+Parsed Digest Cache
+
+One parsed representation of cortex/daily/YYYY-MM-DD-digest.md shared by
+every script that reads digests, cached on disk so a nightly run parses
+each digest at most once.
+
+Parsed digest (plain dict):
+    {
+        "date": "YYYY-MM-DD",
+        "sections": [{"level": 2, "title": "進捗", "body": "..."}, ...],
+        "checkboxes": [("x", "Task title"), ...],      # extract-tasks.py
+        "tasks_section": ["Task text", ...],             # suggest.py (## Tasks)
+        "progress": [{"title", "category", ...}, ...],   # sync-digest-tasks.py (## 進捗)
+        "log_headings": [("Title", "HH:MM"), ...],       # verify-phase2-event.py
+        "tables": [[["cell", ...], ...], ...],
+        "reflection": "..." or None,                     # extract-feedback.py
+        "tasks": [...],                                  # process-obsidian-batch.py
+    }
+
+Cache files live in cortex/tmp/digest-cache/ (next to the digest's
+cortex/ directory) as zlib-compressed pickles, keyed by resolved path +
+mtime + size + DIGEST_PARSER_VERSION. Any mismatch reparses and rewrites
+the entry. The cache is local, trusted state; delete the directory to
+reset it.
+"""
+
+import hashlib
+import os
+import pickle
+import re
+import sys
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .digest_parser import parse_daily_digest
+from .fingerprint import temp_path
+
+
+# Bump whenever any field of the parsed representation changes
+DIGEST_PARSER_VERSION = 1
+
+CACHE_DIRNAME = Path("tmp") / "digest-cache"
+
+CHECKBOX_RE = re.compile(r'^\s*-\s*\[([xX ])\]\s*(.+)$')
+HEADING_RE = re.compile(r'^(#{1,6})\s+(.*?)\s*$')
+LOG_HEADING_RE = re.compile(r'### (.+?) \((\d{2}:\d{2}) JST\)')
+REFLECTION_RE = re.compile(r"^## Reflection\s*\n(.*?)(?=^##|\Z)", re.MULTILINE | re.DOTALL)
+PROGRESS_SECTION_RE = re.compile(r'## 進捗\s*\n(.*?)(?=\n## |$)', re.DOTALL)
+PROGRESS_BLOCK_RE = re.compile(
+    r'### (.+?) \((\d{2}:\d{2}) JST\)\s*\n- \*\*カテゴリ\*\*: (.+?)\n- \*\*所要時間\*\*: (.+?)'
+    r'(?:\n- \*\*メモ\*\*: (.+?))?(?:\n|$)'
+)
+
+_memo: Dict[str, Tuple[Tuple[Any, ...], Dict[str, Any]]] = {}
+_memo_lock = threading.Lock()
+
+
+# ---------------------------------------------------------------------------
+# Field parsers (each keeps the semantics of the script that owned it)
+# ---------------------------------------------------------------------------
+
+def extract_reflection(content: str) -> Optional[str]:
+    """Extract the Reflection section from digest content."""
+    match = REFLECTION_RE.search(content)
+    if match:
+        reflection = match.group(1).strip()
+        # Remove empty placeholder text
+        if reflection and "（今日の振り返り" not in reflection:
+            return reflection
+    return None
+
+
+def parse_digest_progress(digest_content: str) -> List[Dict]:
+    """
+    Parse ## 進捗 section and extract task entries
+
+    Returns list of tasks with:
+    - title: str
+    - category: str
+    - duration: str
+    - memo: Optional[str]
+    - timestamp: str (HH:MM JST)
+    """
+    tasks = []
+
+    progress_match = PROGRESS_SECTION_RE.search(digest_content)
+    if not progress_match:
+        return tasks
+
+    for match in PROGRESS_BLOCK_RE.finditer(progress_match.group(1)):
+        tasks.append({
+            "title": match.group(1).strip(),
+            "category": match.group(3).strip(),
+            "duration": match.group(4).strip(),
+            "memo": match.group(5).strip() if match.group(5) else None,
+            "timestamp": match.group(2).strip(),
+            "status": "completed"
+        })
+
+    return tasks
+
+
+def parse_checkboxes(content: str) -> List[Tuple[str, str]]:
+    """Return (status_char, title) for every `- [ ]` / `- [x]` line."""
+    checkboxes = []
+    for line in content.split('\n'):
+        match = CHECKBOX_RE.match(line)
+        if match:
+            checkboxes.append((match.group(1), match.group(2).strip()))
+    return checkboxes
+
+
+def parse_tasks_section(content: str) -> List[str]:
+    """Return the `- ` items of the `## Tasks` section, checkboxes stripped."""
+    tasks = []
+    in_tasks_section = False
+    for line in content.split('\n'):
+        if line.startswith('## Tasks'):
+            in_tasks_section = True
+            continue
+        if in_tasks_section:
+            if line.startswith('##'):  # Next section
+                break
+            if line.strip().startswith('- '):
+                tasks.append(line.strip()[2:].replace('[x]', '').replace('[ ]', '').strip())
+    return tasks
+
+
+def split_sections(content: str) -> List[Dict[str, Any]]:
+    """Split markdown into heading sections (body runs to the next heading)."""
+    sections: List[Dict[str, Any]] = []
+    current: Optional[Dict[str, Any]] = None
+    body: List[str] = []
+
+    for line in content.split('\n'):
+        match = HEADING_RE.match(line)
+        if match:
+            if current is not None:
+                current["body"] = "\n".join(body).strip()
+                sections.append(current)
+            current = {"level": len(match.group(1)), "title": match.group(2)}
+            body = []
+        elif current is not None:
+            body.append(line)
+
+    if current is not None:
+        current["body"] = "\n".join(body).strip()
+        sections.append(current)
+    return sections
+
+
+def parse_tables(content: str) -> List[List[List[str]]]:
+    """Return every pipe table as rows of stripped cells (separator rows dropped)."""
+    tables: List[List[List[str]]] = []
+    rows: List[List[str]] = []
+
+    for line in content.split('\n'):
+        line = line.strip()
+        if line.startswith('|'):
+            cells = [cell.strip() for cell in line.strip('|').split('|')]
+            if not all(cell and set(cell) <= set("-: ") for cell in cells):
+                rows.append(cells)
+        elif rows:
+            tables.append(rows)
+            rows = []
+
+    if rows:
+        tables.append(rows)
+    return tables
+
+
+def parse_digest(content: str, date_str: str) -> Dict[str, Any]:
+    """Build the full parsed representation of one digest."""
+    return {
+        "date": date_str,
+        "sections": split_sections(content),
+        "checkboxes": parse_checkboxes(content),
+        "tasks_section": parse_tasks_section(content),
+        "progress": parse_digest_progress(content),
+        "log_headings": LOG_HEADING_RE.findall(content),
+        "tables": parse_tables(content),
+        "reflection": extract_reflection(content),
+        "tasks": parse_daily_digest(content, date_str)["tasks"],
+    }
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+
+def default_cache_dir(digest_path: Path) -> Path:
+    """cortex/daily/X-digest.md -> cortex/tmp/digest-cache/"""
+    return digest_path.resolve().parent.parent / CACHE_DIRNAME
+
+
+def _cache_file(cache_dir: Path, resolved: str, stem: str) -> Path:
+    tag = hashlib.sha1(resolved.encode("utf-8")).hexdigest()[:10]
+    return cache_dir / f"{stem}-{tag}.pickle.z"
+
+
+def _read_cache(cache_file: Path, key: Tuple[Any, ...]) -> Optional[Dict[str, Any]]:
+    try:
+        stored_key, parsed = pickle.loads(zlib.decompress(cache_file.read_bytes()))
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # Corrupt or written by an incompatible version: reparse
+        return None
+    return parsed if stored_key == key else None
+
+
+def _write_cache(cache_file: Path, key: Tuple[Any, ...], parsed: Dict[str, Any]) -> None:
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        payload = zlib.compress(pickle.dumps((key, parsed), protocol=pickle.HIGHEST_PROTOCOL))
+        tmp = temp_path(cache_file)
+        tmp.write_bytes(payload)
+        os.replace(tmp, cache_file)
+    except OSError as e:
+        print(f"⚠️  Could not write digest cache {cache_file}: {e}", file=sys.stderr)
+
+
+def load_parsed_digest(
+    path: Path,
+    date_str: Optional[str] = None,
+    cache_dir: Optional[Path] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Return the parsed digest for `path`, or None if the file does not exist.
+
+    Args:
+        path: Digest markdown file
+        date_str: Date used for task timestamps (default: from the filename)
+        cache_dir: Override the on-disk cache location
+    """
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+
+    resolved = str(path.resolve())
+    date_str = date_str or path.name[:10]
+    key = (resolved, st.st_mtime_ns, st.st_size, DIGEST_PARSER_VERSION, date_str)
+
+    with _memo_lock:
+        memo = _memo.get(resolved)
+    if memo is not None and memo[0] == key:
+        return memo[1]
+
+    cache_file = _cache_file(cache_dir or default_cache_dir(path), resolved, path.stem)
+    parsed = _read_cache(cache_file, key)
+    if parsed is None:
+        parsed = parse_digest(path.read_text(encoding="utf-8"), date_str)
+        _write_cache(cache_file, key, parsed)
+
+    with _memo_lock:
+        _memo[resolved] = (key, parsed)
+    return parsed
+
+
+def clear_memo() -> None:
+    """Drop the in-process layer (the on-disk cache is kept)."""
+    with _memo_lock:
+        _memo.clear()
@@ -0,0 +1,323 @@
+"""
+Daily Digest Parser
+
+Single-pass parser for cortex/daily/YYYY-MM-DD-digest.md.
+
+Supports the three task formats found in digests:
+1. Task list: - [x] Task title (30分)
+2. Table: | 時刻 | タスク | 時間 |
+3. Progress section: ### Title (HH:MM-HH:MM JST) + **所要時間**: Xm
+
+Every line is visited once. Each format is tracked by its own small
+state (current category header, "inside a table", pending progress
+block waiting for its **所要時間** line), and tasks are collected per
+format and concatenated at the end so the output order is: list tasks,
+then table tasks, then progress-block tasks.
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Timerange: (HH:MM-HH:MM JST) or (HH:MM-HH:MM)
+TIMERANGE_RE = re.compile(r'\((\d{2}:\d{2})-(\d{2}:\d{2})(?:\s*JST)?\)')
+
+# Duration patterns in priority order. The first pattern that matches
+# anywhere wins and all of its occurrences are removed from the text.
+# (**所要時間**: 10m / 10分 are always caught by the bare 10m / 10分 forms.)
+DURATION_RES = (
+    re.compile(r'\((\d+)分\)'),     # (30分)
+    re.compile(r'(\d+)分'),         # 30分
+    re.compile(r'\((\d+)m\)'),      # (10m)
+    re.compile(r'(\d+)m(?!\w)'),    # 10m (not followed by word chars)
+)
+# Cheap pre-check: no "<digit>分" / "<digit>m" means no duration at all
+DURATION_HINT_RE = re.compile(r'\d[分m]')
+
+WHITESPACE_RE = re.compile(r'\s+')
+TASK_LINE_RE = re.compile(r'^-\s*\[([ xX✓])\]\s+(.+)$')
+TABLE_HEADER_RE = re.compile(r'\|\s*時刻\s*\|.*\|\s*時間\s*\|', re.IGNORECASE)
+TABLE_SEPARATOR_RE = re.compile(r'\|[-:\s]+\|')
+PROGRESS_HEADER_RE = re.compile(r'^###\s+(.+?)\s*\((\d{2}:\d{2})-(\d{2}:\d{2})\s*JST\)')
+
+# Category headers in priority order, plus a combined pre-check so that
+# ordinary lines cost one regex search instead of six substring tests
+CATEGORY_HEADERS = (
+    ("high-priority", ("優先度：高", "優先度: 高", "High Priority")),
+    ("normal", ("通常タスク", "Regular Tasks")),
+    ("untagged", ("タグなしタスク", "No Tags")),
+)
+CATEGORY_HEADER_RE = re.compile(
+    '|'.join(re.escape(marker) for _, markers in CATEGORY_HEADERS for marker in markers)
+)
+PLACEHOLDER_RE = re.compile(r'タスクなし|今日の主な進捗')
+DURATION_MARKER_RE = re.compile(r'\*\*(?:所要時間|カテゴリ)\*\*:')
+
+# A progress block looks at most this many lines ahead for its duration
+PROGRESS_LOOKAHEAD = 4
+
+
+def extract_timerange_from_text(text: str) -> Tuple[Optional[str], Optional[str], str]:
+    """
+    Extract time range from text like (18:20-18:30 JST).
+    Returns (start_time, end_time, cleaned_text) tuple.
+    Times are returned in HH:MM format.
+    """
+    if "(" not in text:
+        return None, None, text
+
+    match = TIMERANGE_RE.search(text)
+    if match:
+        text = TIMERANGE_RE.sub('', text).strip()
+        text = WHITESPACE_RE.sub(' ', text).strip()
+        return match.group(1), match.group(2), text
+
+    return None, None, text
+
+
+def extract_duration_from_text(text: str) -> Tuple[Optional[int], Optional[str], str]:
+    """
+    Extract duration from text using multiple patterns.
+    Returns (duration_minutes, duration_source, cleaned_text) tuple.
+
+    duration_source values:
+    - "explicit": Explicitly stated duration (10分, 10m, **所要時間**: 10m)
+    - None: No duration found
+    """
+    if not DURATION_HINT_RE.search(text):
+        return None, None, text
+
+    for pattern in DURATION_RES:
+        match = pattern.search(text)
+        if match:
+            text = pattern.sub('', text).strip()
+            text = WHITESPACE_RE.sub(' ', text).strip()
+            return int(match.group(1)), "explicit", text
+
+    return None, None, text
+
+
+def _timerange_minutes(start_time: str, end_time: str) -> int:
+    start_h, start_m = start_time.split(':')
+    end_h, end_m = end_time.split(':')
+    return (int(end_h) * 60 + int(end_m)) - (int(start_h) * 60 + int(start_m))
+
+
+def _apply_timerange(task: Dict[str, Any], date_str: str, start_time: str, end_time: str,
+                     duration: Optional[int]) -> None:
+    """Set timerange timestamps, plus a derived duration when none was stated."""
+    task["started_at"] = f"{date_str}T{start_time}:00+09:00"
+    task["completed_at"] = f"{date_str}T{end_time}:00+09:00"
+    task["timestamp_source"] = "timerange"
+    task["timestamp_confidence"] = 0.7
+
+    if not duration:
+        duration_mins = _timerange_minutes(start_time, end_time)
+        if 1 <= duration_mins <= 240:  # Sanity check: 1-240 minutes
+            task["duration_minutes"] = duration_mins
+            task["duration_source"] = "timerange"
+            task["duration_confidence"] = 0.7
+
+
+def _apply_duration(task: Dict[str, Any], duration: Optional[int], duration_source: Optional[str]) -> None:
+    """Set explicit duration, or mark the duration unknown if nothing was derived."""
+    if duration and duration_source == "explicit":
+        task["duration_minutes"] = duration
+        task["duration_source"] = "explicit"
+        task["duration_confidence"] = 1.0
+    elif "duration_source" not in task:
+        task["duration_source"] = "unknown"
+        task["duration_confidence"] = 0.0
+
+
+def _header_category(line: str) -> str:
+    """Resolve a header line to its category, honouring marker priority."""
+    for category, markers in CATEGORY_HEADERS:
+        if any(marker in line for marker in markers):
+            return category
+    raise ValueError(f"not a category header: {line!r}")
+
+
+def _list_task(line: str, category: str, date_str: str) -> Optional[Dict[str, Any]]:
+    match = TASK_LINE_RE.match(line)
+    if not match:
+        return None
+
+    is_completed = match.group(1) in ('x', 'X', '✓')
+    task_text = match.group(2).strip()
+
+    # Skip placeholder tasks
+    if PLACEHOLDER_RE.search(task_text):
+        return None
+
+    # Extract time range first (highest priority)
+    start_time, end_time, task_text = extract_timerange_from_text(task_text)
+    duration, duration_source, task_text = extract_duration_from_text(task_text)
+
+    task: Dict[str, Any] = {
+        "title": task_text,
+        "status": "completed" if is_completed else "incomplete",
+        "category": category,
+    }
+
+    if start_time and end_time:
+        _apply_timerange(task, date_str, start_time, end_time, duration)
+    elif is_completed:
+        # No timerange: use fixed placeholder (方針B)
+        task["completed_at"] = f"{date_str}T01:00:00Z"
+        task["timestamp_source"] = "fixed"
+        task["timestamp_confidence"] = 0.1
+    else:
+        task["completed_at"] = None
+        task["timestamp_source"] = "unknown"
+        task["timestamp_confidence"] = 0.0
+
+    _apply_duration(task, duration, duration_source)
+    return task
+
+
+def _table_task(line: str, date_str: str) -> Optional[Dict[str, Any]]:
+    parts = [p.strip() for p in line.split('|')]
+    if len(parts) < 4:  # | time | task | duration |
+        return None
+
+    task_title = parts[2]
+    if not task_title or task_title == "タスク":
+        return None
+
+    start_time, end_time, _ = extract_timerange_from_text(parts[1])
+    duration, duration_source, _ = extract_duration_from_text(parts[3])
+
+    task: Dict[str, Any] = {
+        "title": task_title,
+        "status": "completed",  # Table tasks are assumed completed
+        "category": "normal",
+    }
+
+    if start_time and end_time:
+        _apply_timerange(task, date_str, start_time, end_time, duration)
+    else:
+        # No time info: fixed placeholder
+        task["completed_at"] = f"{date_str}T01:00:00Z"
+        task["timestamp_source"] = "fixed"
+        task["timestamp_confidence"] = 0.1
+
+    _apply_duration(task, duration, duration_source)
+    return task
+
+
+def _progress_task(title: str, start_time: str, end_time: str, duration: Optional[int],
+                   duration_source: Optional[str], date_str: str) -> Dict[str, Any]:
+    task: Dict[str, Any] = {
+        "title": title,
+        "status": "completed",
+        "category": "normal",
+        "started_at": f"{date_str}T{start_time}:00+09:00",
+        "completed_at": f"{date_str}T{end_time}:00+09:00",
+        "timestamp_source": "timerange",
+        "timestamp_confidence": 0.7,
+    }
+
+    if duration and duration_source == "explicit":
+        task["duration_minutes"] = duration
+        task["duration_source"] = "explicit"
+        task["duration_confidence"] = 1.0
+    else:
+        # Calculate from timerange
+        duration_mins = _timerange_minutes(start_time, end_time)
+        if 1 <= duration_mins <= 240:
+            task["duration_minutes"] = duration_mins
+            task["duration_source"] = "timerange"
+            task["duration_confidence"] = 0.7
+        else:
+            task["duration_source"] = "unknown"
+            task["duration_confidence"] = 0.0
+
+    return task
+
+
+def parse_daily_digest(content: str, date_str: str) -> Dict[str, Any]:
+    """
+    Parse a daily digest markdown content and extract task data.
+
+    Returns task entry dict in format:
+    {
+        "tasks": [
+            {
+                "title": "Task title",
+                "status": "completed" | "incomplete",
+                "category": "high-priority" | "normal" | "untagged",
+                "completed_at": "ISO8601" or None,
+                "duration_minutes": int or None
+            }
+        ]
+    }
+    """
+    list_tasks: List[Dict[str, Any]] = []
+    table_tasks: List[Dict[str, Any]] = []
+    progress_tasks: List[Dict[str, Any]] = []
+
+    current_category = "untagged"
+    in_table = False
+
+    # Pending progress block: [title, start, end, header_index]
+    pending: Optional[List[Any]] = None
+
+    for index, raw_line in enumerate(content.split("\n")):
+        line = raw_line.strip()
+
+        # --- Progress block look-ahead (runs before this line can open a new block)
+        if pending is not None:
+            if index - pending[3] > PROGRESS_LOOKAHEAD:
+                progress_tasks.append(_progress_task(*pending[:3], None, None, date_str))
+                pending = None
+            else:
+                duration = None
+                if DURATION_MARKER_RE.search(line):
+                    duration, duration_source, _ = extract_duration_from_text(line)
+                if duration:
+                    progress_tasks.append(
+                        _progress_task(*pending[:3], duration, duration_source, date_str)
+                    )
+                    pending = None
+                elif line.startswith('###') or (not line and index > pending[3] + 2):
+                    progress_tasks.append(_progress_task(*pending[:3], None, None, date_str))
+                    pending = None
+
+        if not line:
+            if in_table:
+                in_table = False
+            continue
+
+        first = line[0]
+
+        # --- Task list format (category headers take precedence over tasks)
+        if CATEGORY_HEADER_RE.search(line):
+            current_category = _header_category(line)
+        elif first == '-':
+            task = _list_task(line, current_category, date_str)
+            if task is not None:
+                list_tasks.append(task)
+
+        # --- Table format
+        if first == '|':
+            if TABLE_HEADER_RE.match(line):
+                in_table = True
+            elif in_table and not TABLE_SEPARATOR_RE.match(line):
+                task = _table_task(line, date_str)
+                if task is not None:
+                    table_tasks.append(task)
+        elif in_table:
+            # End of table
+            in_table = False
+
+        # --- Progress section format
+        if first == '#' and line.startswith('###'):
+            match = PROGRESS_HEADER_RE.match(line)
+            if match:
+                pending = [match.group(1).strip(), match.group(2), match.group(3), index]
+
+    if pending is not None:
+        progress_tasks.append(_progress_task(*pending[:3], None, None, date_str))
+
+    return {"tasks": list_tasks + table_tasks + progress_tasks}
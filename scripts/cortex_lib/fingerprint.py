@@ -0,0 +1,120 @@
+"""
+File Fingerprints
+
+Content fingerprints for incremental processing.
+
+A fingerprint is {"sha256", "mtime_ns", "size"}. When a previous
+fingerprint is supplied and mtime/size are unchanged, the stored hash is
+reused so unchanged files cost a single stat() instead of a full read.
+Touched-but-identical files are detected by comparing the hash.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+CHUNK_SIZE = 1 << 16
+
+
+def sha256_file(path: Path) -> str:
+    """Return the hex SHA256 of a file's content."""
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_fingerprint(
+    path: Path,
+    previous: Optional[Dict[str, Any]] = None,
+    st: Optional[os.stat_result] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Fingerprint a file, or return None if it does not exist.
+
+    Args:
+        path: File to fingerprint
+        previous: Fingerprint recorded on an earlier run (hash reuse)
+        st: stat() result already at hand (e.g. from os.scandir)
+    """
+    if st is None:
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+
+    if (
+        previous
+        and previous.get("mtime_ns") == st.st_mtime_ns
+        and previous.get("size") == st.st_size
+        and previous.get("sha256")
+    ):
+        return dict(previous)
+
+    return {
+        "sha256": sha256_file(path),
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+    }
+
+
+def same_content(a: Optional[Dict[str, Any]], b: Optional[Dict[str, Any]]) -> bool:
+    """True if two fingerprints describe the same content (or both are missing)."""
+    if a is None or b is None:
+        return a is b
+    return a.get("sha256") == b.get("sha256")
+
+
+def load_manifest(path: Path) -> Dict[str, Any]:
+    """Load a JSON manifest, returning {} if missing or unreadable."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError, UnicodeDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def temp_path(path: Path) -> Path:
+    """
+    Private temp file next to path for a write + os.replace().
+
+    Unique per process and thread: run-pipeline.py runs stages as threads
+    of one process, and they may write the same file (a day aggregate)
+    at the same time.
+    """
+    return path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """Write text via a temp file + rename so readers never see partial files."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = temp_path(path)
+    try:
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def atomic_write_json(path: Path, data: Any, **dump_kwargs: Any) -> None:
+    """Stream data as JSON into a temp file + rename (no intermediate string, no partial files)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = temp_path(path)
+    try:
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(data, f, **dump_kwargs)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def save_manifest(path: Path, data: Dict[str, Any]) -> None:
+    """Atomically write a JSON manifest."""
+    atomic_write_text(path, json.dumps(data, ensure_ascii=False, indent=2, sort_keys=True))
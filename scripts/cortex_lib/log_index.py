@@ -0,0 +1,142 @@
+"""
+Sparse Timestamp Index
+
+Sidecar index for append-only recipe logs, so "last N days" can seek to
+the window start instead of scanning from byte 0:
+
+    cortex/logs/recipe-15-2025-12-22.jsonl
+    cortex/logs/.recipe-15-2025-12-22.jsonl.idx
+
+    {"version": 1, "every": 512, "inode": 1234, "offset": 40960,
+     "lines": 1000, "max_ts": "2025-12-22T04:00:01.000000",
+     "points": [[0, ""], [20480, "2025-12-22T02:10:00.000000"], ...]}
+
+Every `every`-th complete line gets a point [byte offset of the line,
+latest ts of all lines before it]. Timestamps are normalized to UTC keys
+("%Y-%m-%dT%H:%M:%S.%f") so they compare as strings. Because each point
+stores the running maximum, the points are sorted even when lines are
+slightly out of order, and everything before a point whose key is below
+the cutoff is guaranteed to be older than the cutoff. A line without a
+readable ts counts as newest (UNDATED_KEY), so seeks never skip it.
+
+The index is brought up to date on every use: only lines appended since
+the indexed offset are read (a cheap ts extraction, no JSON decode). A new
+inode or a file shorter than the indexed offset (rotation, truncation)
+rebuilds it. A trailing line without a newline is left for the next
+update.
+"""
+
+import bisect
+import json
+import re
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from .fingerprint import atomic_write_text, load_manifest
+
+
+INDEX_VERSION = 1
+INDEX_EVERY = 512
+UNDATED_KEY = "~"  # sorts after every "YYYY-..." key
+KEY_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+
+JSONL_TS_RE = re.compile(rb'"ts"\s*:\s*"([^"]+)"')
+
+
+def index_path(log_file: Path) -> Path:
+    return log_file.with_name(f".{log_file.name}.idx")
+
+
+def ts_key(value: Any) -> Optional[str]:
+    """UTC sort key for an ISO timestamp (naive = UTC), None if unparsable."""
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        if isinstance(value, bytes):
+            value = value.decode("utf-8", errors="replace")
+        if not isinstance(value, str) or not value.strip():
+            return None
+        s = value.strip()
+        if s.endswith("Z"):
+            s = s[:-1] + "+00:00"
+        try:
+            dt = datetime.fromisoformat(s)
+        except ValueError:
+            return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).strftime(KEY_FORMAT)
+
+
+def jsonl_ts(line: bytes) -> Optional[str]:
+    """The "ts" value of a JSONL record, without decoding the whole line."""
+    match = JSONL_TS_RE.search(line)
+    return match.group(1).decode("utf-8", errors="replace") if match else None
+
+
+def _new_index(inode: int, every: int) -> Dict[str, Any]:
+    return {"version": INDEX_VERSION, "every": every, "inode": inode, "offset": 0,
+            "lines": 0, "max_ts": "", "points": [[0, ""]]}
+
+
+def update_index(
+    log_file: Path,
+    ts_of: Callable[[bytes], Optional[str]] = jsonl_ts,
+    every: int = INDEX_EVERY,
+) -> Dict[str, Any]:
+    """Load the sidecar index, extend it over appended lines and save it if it changed."""
+    path = index_path(log_file)
+    st = log_file.stat()
+    index = load_manifest(path)
+    if (index.get("version") != INDEX_VERSION or index.get("every") != every
+            or index.get("inode") != st.st_ino or st.st_size < index.get("offset", 0)):
+        index = _new_index(st.st_ino, every)
+
+    if st.st_size == index["offset"]:
+        return index
+
+    offset, lines, max_ts = index["offset"], index["lines"], index["max_ts"]
+    points = index["points"]
+    with log_file.open("rb") as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            if lines and lines % every == 0:
+                points.append([offset, max_ts])
+            key = ts_key(ts_of(line)) or UNDATED_KEY
+            if key > max_ts:
+                max_ts = key
+            offset += len(line)
+            lines += 1
+
+    if offset != index["offset"]:
+        index.update(offset=offset, lines=lines, max_ts=max_ts)
+        try:
+            atomic_write_text(path, json.dumps(index, ensure_ascii=False))
+        except OSError as e:
+            print(f"⚠️  Could not save log index {path}: {e}", file=sys.stderr)
+    return index
+
+
+def seek_offset(index: Dict[str, Any], cutoff: datetime) -> int:
+    """Byte offset before which every indexed line is older than cutoff."""
+    keys = [key for _, key in index["points"]]
+    i = bisect.bisect_left(keys, ts_key(cutoff))
+    return index["points"][i - 1][0] if i else 0
+
+
+def window_start(
+    log_file: Path,
+    cutoff: datetime,
+    ts_of: Callable[[bytes], Optional[str]] = jsonl_ts,
+) -> int:
+    """Where to start reading log_file for lines at or after cutoff (0 on any problem)."""
+    try:
+        return seek_offset(update_index(log_file, ts_of), cutoff)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"⚠️  Log index unavailable for {log_file}: {e}", file=sys.stderr)
+        return 0
+
@@ -0,0 +1,159 @@
+"""
+Recipe Log Segments
+
+Reads recipe logs whether they are live, rotated or compressed. Every file
+matching
+
+    recipe-<name>.<jsonl|log>[.N | -YYYYMMDD][.gz | .zst]
+
+is one segment, e.g. recipe-15-2025-12-22.jsonl, recipe-15.jsonl.1,
+recipe-13.log.2.gz, recipe-13.log-20251220.zst (logrotate numbering and
+dateext). Hidden sidecars (.recipe-*.idx) are not segments.
+
+- list_segments() orders segments by time range using stat() only: the
+  end of a segment is its mtime (nothing in it was written later), so
+  segments that end before a window starts are dropped without opening
+  them.
+- iter_lines() streams lines through gzip / zstandard decompression.
+  zstandard is optional; .zst segments are skipped with a warning when it
+  is not installed.
+- search() looks for markers with early exit: plain files through mmap
+  (no full read), compressed ones chunk by chunk.
+"""
+
+import gzip
+import io
+import mmap
+import re
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Pattern
+
+
+SEGMENT_RE = re.compile(
+    r"^recipe-(?P<stem>.+?)\.(?P<kind>jsonl|log)(?P<rotation>\.\d+|-\d{8})?(?P<compression>\.gz|\.zst)?$"
+)
+CHUNK_SIZE = 1 << 20
+SEARCH_OVERLAP = 256  # longest marker match searched across chunk boundaries
+
+_zstd_warned = False
+
+
+def zstd_available() -> bool:
+    try:
+        import zstandard  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def parse_segment_name(name: str) -> Optional[Dict[str, Any]]:
+    """{"stem", "kind", "rotation", "compression"} for a segment file name, else None."""
+    match = SEGMENT_RE.match(name)
+    if not match:
+        return None
+    compression = match.group("compression")
+    return {
+        "stem": match.group("stem"),
+        "kind": match.group("kind"),
+        "rotation": (match.group("rotation") or "").lstrip(".-") or None,
+        "compression": compression[1:] if compression else None,
+    }
+
+
+def list_segments(logs_dir: Path, kind: str, since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """
+    Segments of one kind ("jsonl" or "log"), oldest first.
+
+    Args:
+        logs_dir: Directory holding the recipe logs
+        kind: "jsonl" or "log"
+        since: Drop segments whose last write (mtime) is before this
+
+    Returns:
+        [{"path", "name", "kind", "rotation", "compression", "stat", "end"}]
+        where end is the mtime as an aware UTC datetime.
+    """
+    segments = []
+    for path in logs_dir.glob("recipe-*"):
+        info = parse_segment_name(path.name)
+        if info is None or info["kind"] != kind:
+            continue
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        end = datetime.fromtimestamp(st.st_mtime, tz=timezone.utc)
+        if since is not None and end < since:
+            continue
+        segments.append({"path": path, "name": path.name, **info, "stat": st, "end": end})
+
+    segments.sort(key=lambda s: (s["end"], s["name"]))
+    return segments
+
+
+def readable(segment: Dict[str, Any]) -> bool:
+    """False (with a one-time warning) for .zst segments without zstandard installed."""
+    global _zstd_warned
+    if segment["compression"] != "zst" or zstd_available():
+        return True
+    if not _zstd_warned:
+        _zstd_warned = True
+        print(f"⚠️  Skipping .zst log segments such as {segment['name']}: zstandard is not installed. "
+              f"Install with: pip install zstandard", file=sys.stderr)
+    return False
+
+
+def open_segment(segment: Dict[str, Any]) -> Optional[BinaryIO]:
+    """Binary stream of the segment's (decompressed) content, None if it cannot be read here."""
+    path = segment["path"]
+    if not readable(segment):
+        return None
+    if segment["compression"] == "gz":
+        return gzip.open(path, "rb")
+    if segment["compression"] == "zst":
+        import zstandard
+
+        raw = path.open("rb")
+        reader = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        return io.BufferedReader(reader, CHUNK_SIZE)
+    return path.open("rb")
+
+
+def iter_lines(segment: Dict[str, Any], offset: int = 0) -> Iterator[bytes]:
+    """
+    Lines (with their newline) of a segment, starting at byte offset.
+
+    The offset is a position in the decompressed content; it is only cheap
+    for uncompressed segments (compressed ones decompress up to it).
+    """
+    stream = open_segment(segment)
+    if stream is None:
+        return
+    with stream:
+        if offset:
+            stream.seek(offset)
+        yield from stream
+
+
+def search(segment: Dict[str, Any], pattern: Pattern[bytes]) -> bool:
+    """True if pattern occurs in the segment; stops at the first match."""
+    if segment["compression"] is None:
+        if segment["stat"].st_size == 0:
+            return False
+        with segment["path"].open("rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return pattern.search(mm) is not None
+
+    stream = open_segment(segment)
+    if stream is None:
+        return False
+    carry = b""
+    with stream:
+        for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+            window = carry + chunk
+            if pattern.search(window):
+                return True
+            carry = window[-SEARCH_OVERLAP:]
+    return False
@@ -0,0 +1,208 @@
+"""
+Pipeline Runner
+
+Runs a dependency graph of stages in one process.
+
+A stage is a plain dict:
+
+    {
+        "name": "duration",
+        "deps": ["enrich"],                 # stages that must finish first
+        "run": callable,                    # no arguments; raise on failure
+        "inputs": ["cortex/state/task-entry-*.json"],   # glob patterns
+        "outputs": ["cortex/state/duration-patterns.json"],
+        "key": [...],                       # JSON-able config (argv, run date)
+        "always": False,                    # never skip (time-dependent stages)
+    }
+
+Stages run on a thread pool as soon as all of their dependencies have
+finished, so independent stages execute concurrently. A stage whose
+dependency failed is not run ("blocked").
+
+After a stage succeeds, the fingerprints of its inputs and outputs are
+recorded in a manifest. On the next run the stage is skipped when its key
+is unchanged and every input/output file still has the recorded content
+(cortex_lib/fingerprint.py). Fingerprints are taken after the stage ran,
+so stages that rewrite their own inputs (enrich --in-place) settle after
+one run instead of invalidating themselves.
+"""
+
+import glob
+import sys
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .fingerprint import file_fingerprint, load_manifest, same_content, save_manifest
+
+
+# Results: "ran" | "skipped" | "failed" | "blocked"
+DONE_OK = ("ran", "skipped")
+
+
+def validate(stages: List[Dict[str, Any]]) -> List[str]:
+    """
+    Check names/deps and return the stage names in a topological order.
+
+    Raises:
+        ValueError: duplicate name, unknown dependency, or a cycle
+    """
+    by_name: Dict[str, Dict[str, Any]] = {}
+    for stage in stages:
+        if stage["name"] in by_name:
+            raise ValueError(f"Duplicate stage: {stage['name']}")
+        by_name[stage["name"]] = stage
+
+    for stage in stages:
+        for dep in stage.get("deps", []):
+            if dep not in by_name:
+                raise ValueError(f"Stage {stage['name']} depends on unknown stage {dep}")
+
+    order: List[str] = []
+    state: Dict[str, str] = {}  # "visiting" | "done"
+
+    def visit(name: str, path: List[str]) -> None:
+        if state.get(name) == "done":
+            return
+        if state.get(name) == "visiting":
+            raise ValueError(f"Dependency cycle: {' -> '.join(path + [name])}")
+        state[name] = "visiting"
+        for dep in by_name[name].get("deps", []):
+            visit(dep, path + [name])
+        state[name] = "done"
+        order.append(name)
+
+    for stage in stages:
+        visit(stage["name"], [])
+    return order
+
+
+def expand_files(patterns: List[str]) -> List[Path]:
+    """Expand glob patterns (plain paths included) to existing files."""
+    files = set()
+    for pattern in patterns:
+        for match in glob.glob(pattern):
+            path = Path(match)
+            if path.is_file():
+                files.add(path)
+    return sorted(files)
+
+
+def fingerprint_files(stage: Dict[str, Any], previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Fingerprint every input and output file of a stage."""
+    previous = previous or {}
+    files = expand_files(stage.get("inputs", []) + stage.get("outputs", []))
+    return {str(path): file_fingerprint(path, previous.get(str(path))) for path in files}
+
+
+def is_up_to_date(stage: Dict[str, Any], record: Optional[Dict[str, Any]]) -> bool:
+    """True if the stage's key and files match what the manifest recorded."""
+    if not record or stage.get("always"):
+        return False
+    if record.get("key") != stage.get("key"):
+        return False
+
+    # Declared plain-path outputs must exist
+    for output in stage.get("outputs", []):
+        if not glob.has_magic(output) and not Path(output).exists():
+            return False
+
+    recorded = record.get("files", {})
+    current = fingerprint_files(stage, recorded)
+    if set(recorded) != set(current):
+        return False
+    return all(same_content(recorded[path], current[path]) for path in current)
+
+
+def _execute(stage: Dict[str, Any], previous: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    start = time.perf_counter()
+    error = None
+    try:
+        stage["run"]()
+    except SystemExit as e:
+        # Scripts report failure through sys.exit(1) in their main()
+        if e.code not in (0, None):
+            error = f"exit status {e.code}"
+    except Exception as e:
+        traceback.print_exc(file=sys.stderr)
+        error = f"{type(e).__name__}: {e}"
+
+    if error:
+        return {"status": "failed", "seconds": round(time.perf_counter() - start, 3), "error": error}
+
+    files = fingerprint_files(stage, (previous or {}).get("files"))
+    return {"status": "ran", "seconds": round(time.perf_counter() - start, 3), "files": files}
+
+
+def run_pipeline(
+    stages: List[Dict[str, Any]],
+    manifest_path: Path,
+    max_workers: int = 4,
+    force: bool = False,
+    on_finish: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run the stage graph and return {name: {"status", "seconds", ...}}.
+
+    Args:
+        stages: Stage dicts (see module docstring)
+        manifest_path: Where stage fingerprints are stored
+        max_workers: Concurrent stages
+        force: Run every stage regardless of the manifest
+        on_finish: Called with (name, result) as each stage completes
+    """
+    validate(stages)
+    by_name = {stage["name"]: stage for stage in stages}
+
+    manifest = load_manifest(manifest_path)
+    records: Dict[str, Any] = manifest.get("stages", {}) if isinstance(manifest.get("stages"), dict) else {}
+
+    results: Dict[str, Dict[str, Any]] = {}
+    pending = [stage["name"] for stage in stages]
+    running: Dict[Any, str] = {}
+
+    def finish(name: str, result: Dict[str, Any]) -> None:
+        files = result.pop("files", None)
+        if result["status"] == "ran":
+            records[name] = {
+                "key": by_name[name].get("key"),
+                "files": files,
+                "updated_at": datetime.now().astimezone().isoformat(timespec="seconds"),
+            }
+        elif result["status"] == "failed":
+            records.pop(name, None)
+        results[name] = result
+        if on_finish:
+            on_finish(name, result)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        while pending or running:
+            for name in list(pending):
+                deps = by_name[name].get("deps", [])
+                if any(dep not in results for dep in deps):
+                    continue
+                pending.remove(name)
+
+                failed = [dep for dep in deps if results[dep]["status"] not in DONE_OK]
+                if failed:
+                    finish(name, {"status": "blocked", "seconds": 0.0, "error": f"dependency failed: {', '.join(failed)}"})
+                elif not force and is_up_to_date(by_name[name], records.get(name)):
+                    finish(name, {"status": "skipped", "seconds": 0.0})
+                else:
+                    running[executor.submit(_execute, by_name[name], records.get(name))] = name
+
+            if not running:
+                continue
+
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                finish(running.pop(future), future.result())
+
+    save_manifest(manifest_path, {
+        "updated_at": datetime.now().astimezone().isoformat(timespec="seconds"),
+        "stages": records,
+    })
+    return results
@@ -0,0 +1,146 @@
+"""
+--profile Mode
+
+Common --profile option for the Cortex scripts. Scripts end with
+
+    if __name__ == "__main__":
+        profiling.run_main(main)
+
+which calls main() unchanged unless --profile is on the command line. With
+--profile the flag is removed from sys.argv and main() runs under cProfile
+and tracemalloc. Three files are written to cortex/tmp/profiles/:
+
+- <script>-<stamp>.pstats       cProfile stats (python -m pstats, snakeviz)
+- <script>-<stamp>.alloc.txt    top allocation sites still alive at exit,
+                                plus the traced peak
+- <script>-<stamp>.trace.json   Chrome trace events (chrome://tracing,
+                                ui.perfetto.dev): one event for main(),
+                                one per timing span (cortex_lib/spans.py,
+                                per thread), and heap counter samples
+
+cProfile has no timeline, so the trace is built from the spans. A summary
+of the hottest functions goes to stderr.
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from . import spans
+
+
+PROFILE_DIR = Path("cortex/tmp/profiles")
+PROFILE_FLAG = "--profile"
+TOP_ALLOCATIONS = 25
+TOP_FUNCTIONS = 15
+
+
+def profile_paths(name: str, out_dir: Path = PROFILE_DIR) -> Dict[str, Path]:
+    stamp = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+    base = out_dir / f"{name}-{stamp}"
+    return {
+        "pstats": base.with_name(base.name + ".pstats"),
+        "alloc": base.with_name(base.name + ".alloc.txt"),
+        "trace": base.with_name(base.name + ".trace.json"),
+    }
+
+
+def format_allocations(snapshot: tracemalloc.Snapshot, peak: int, limit: int = TOP_ALLOCATIONS) -> str:
+    """Top allocation sites by size, one line each."""
+    stats = snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    ]).statistics("lineno")
+
+    lines = [
+        f"Peak traced memory: {peak / 1024:,.1f} KiB",
+        f"Top {limit} allocation sites alive at exit:",
+        "",
+        f"{'KiB':>10} {'blocks':>8}  site",
+    ]
+    for stat in stats[:limit]:
+        frame = stat.traceback[0]
+        lines.append(f"{stat.size / 1024:>10,.1f} {stat.count:>8}  {frame.filename}:{frame.lineno}")
+    return "\n".join(lines) + "\n"
+
+
+def profile_call(func: Callable[[], Any], name: str, out_dir: Path = PROFILE_DIR) -> Any:
+    """
+    Run func() under cProfile + tracemalloc and write the profile files.
+
+    Files are written even when func() raises (SystemExit included); the
+    exception is then re-raised.
+    """
+    paths = profile_paths(name, out_dir)
+    events: List[Dict[str, Any]] = []
+    pid = os.getpid()
+
+    def heap_sample() -> None:
+        current, peak = tracemalloc.get_traced_memory()
+        events.append({
+            "name": "heap", "ph": "C", "ts": round(spans.trace_now_us(), 1), "pid": pid,
+            "args": {"current_kib": round(current / 1024, 1), "peak_kib": round(peak / 1024, 1)},
+        })
+
+    tracemalloc.start()
+    spans.set_trace_sink(events)
+    heap_sample()
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return func()
+    finally:
+        profiler.disable()
+        duration_us = spans.trace_now_us()
+        heap_sample()
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        spans.set_trace_sink(None)
+
+        events.append({
+            "name": f"{name}.main", "cat": "main", "ph": "X", "ts": 0, "dur": round(duration_us, 1),
+            "pid": pid, "tid": threading.main_thread().ident, "args": {"argv": sys.argv[1:]},
+        })
+        write_profile(paths, profiler, snapshot, peak, events, name)
+
+
+def write_profile(paths: Dict[str, Path], profiler: cProfile.Profile, snapshot: tracemalloc.Snapshot,
+                  peak: int, events: List[Dict[str, Any]], name: str) -> None:
+    try:
+        paths["pstats"].parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(paths["pstats"]))
+        paths["alloc"].write_text(format_allocations(snapshot, peak), encoding="utf-8")
+        paths["trace"].write_text(json.dumps({
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"script": name, "generated_at": datetime.now().astimezone().isoformat(timespec="seconds")},
+        }, ensure_ascii=False), encoding="utf-8")
+    except OSError as e:
+        print(f"⚠️  Could not write profile to {paths['pstats'].parent}: {e}", file=sys.stderr)
+        return
+
+    summary = io.StringIO()
+    pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+    print(f"\n🔬 Profile ({name}):", file=sys.stderr)
+    print(summary.getvalue().strip(), file=sys.stderr)
+    print(f"   Peak traced memory: {peak / 1024:,.1f} KiB", file=sys.stderr)
+    for path in paths.values():
+        print(f"   📄 {path}", file=sys.stderr)
+
+
+def run_main(main: Callable[[], Any], name: Optional[str] = None) -> Any:
+    """Entry point wrapper: profile main() when --profile is given."""
+    if PROFILE_FLAG not in sys.argv[1:]:
+        return main()
+
+    sys.argv = [sys.argv[0]] + [arg for arg in sys.argv[1:] if arg != PROFILE_FLAG]
+    return profile_call(main, name or Path(sys.argv[0]).stem)
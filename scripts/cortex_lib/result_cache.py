@@ -0,0 +1,147 @@
+"""
+Analyzer Result Cache
+
+Lets an analyzer skip its work when none of its inputs changed since the
+output was last written. Each analyzer declares its inputs as a key
+(arguments, run date or hour) plus a set of files; input_fingerprint()
+hashes the key with every file's mtime/size, so checking costs one stat()
+per input file. The fingerprint is stored in a header inside the output
+JSON itself, and an unchanged fingerprint means the existing output is
+reused as is.
+
+The header is the first line of the output file, so readers that only
+need the summary (analyze-health) parse one short line instead of the
+whole document:
+
+    {"_meta": {"version": 1, "fingerprint": "...", "summary": {...}},
+      "generated_at": "...",
+      ...
+    }
+
+The file stays ordinary JSON; consumers that decode it in full see an
+extra "_meta" key. Files written without a header (older outputs, hand
+written fixtures) are treated as cache misses.
+"""
+
+import argparse
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from .fingerprint import atomic_write_text
+
+
+# Bump when the fingerprint inputs or header layout change
+RESULT_CACHE_VERSION = 1
+HEADER_KEY = "_meta"
+HEADER_PREFIX = '{"' + HEADER_KEY + '": '
+# The header line is small; never read more than this looking for it
+HEADER_LIMIT = 1 << 16
+
+Signature = Optional[Tuple[int, int]]
+
+
+def args_key(args: argparse.Namespace, exclude: Iterable[str] = ("output", "no_cache")) -> Dict[str, Any]:
+    """Parsed arguments as fingerprint input (the output path and cache switch excluded)."""
+    skip = set(exclude)
+    return {name: value for name, value in sorted(vars(args).items()) if name not in skip}
+
+
+def file_signature(path: Path) -> Signature:
+    """(mtime_ns, size) of a file, or None if it does not exist."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def file_signatures(paths: Iterable[Path]) -> Dict[str, Signature]:
+    """{path: (mtime_ns, size) or None} for every path."""
+    return {str(path): file_signature(path) for path in paths}
+
+
+def input_fingerprint(key: Any, files: Dict[str, Signature]) -> str:
+    """
+    SHA256 over the analyzer's key and its input files' signatures.
+
+    Args:
+        key: JSON-able description of everything besides files that the
+            output depends on (arguments, run date, ...)
+        files: {path: (mtime_ns, size) or None for a missing file}
+    """
+    payload = {
+        "version": RESULT_CACHE_VERSION,
+        "key": key,
+        "files": sorted((name, list(sig) if sig is not None else None) for name, sig in files.items()),
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def read_header(path: Path) -> Optional[Dict[str, Any]]:
+    """The "_meta" header from the first line of an output file, or None."""
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            line = f.readline(HEADER_LIMIT)
+    except (OSError, UnicodeDecodeError):
+        return None
+
+    text = line.rstrip()
+    if not text.startswith(HEADER_PREFIX):
+        return None
+    if text.endswith(","):
+        text = text[:-1] + "}"
+    try:
+        header = json.loads(text).get(HEADER_KEY)
+    except ValueError:
+        return None
+    return header if isinstance(header, dict) else None
+
+
+def load_result(path: Path, fingerprint: str) -> Optional[Dict[str, Any]]:
+    """
+    The output written for this fingerprint, without its header.
+
+    Returns None when the file is missing, unreadable, has no header or
+    was written for different inputs.
+    """
+    header = read_header(path)
+    if header is None or header.get("version") != RESULT_CACHE_VERSION or header.get("fingerprint") != fingerprint:
+        return None
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict):
+        return None
+    data.pop(HEADER_KEY, None)
+    return data
+
+
+def write_result(
+    path: Path, result: Dict[str, Any], fingerprint: str, summary: Optional[Dict[str, Any]] = None
+) -> None:
+    """
+    Atomically write an analyzer result with its header as the first line.
+
+    Args:
+        path: Output file
+        result: The analyzer's JSON result (written indented, as before)
+        fingerprint: input_fingerprint() of the inputs the result was computed from
+        summary: Small dict of headline fields for readers of the header
+    """
+    header: Dict[str, Any] = {"version": RESULT_CACHE_VERSION, "fingerprint": fingerprint}
+    if summary is not None:
+        header["summary"] = summary
+
+    first = HEADER_PREFIX + json.dumps(header, ensure_ascii=False, separators=(",", ":"))
+    body = {k: v for k, v in result.items() if k != HEADER_KEY}
+    if body:
+        # json.dumps(indent=2) starts with "{\n": splice the header in front of the first key
+        text = first + ",\n" + json.dumps(body, ensure_ascii=False, indent=2)[2:]
+    else:
+        text = first + "}"
+    atomic_write_text(path, text)
@@ -0,0 +1,139 @@
+"""
+Mergeable Summary Sketches
+
+Compact, JSON-serializable summaries of a stream of numbers that can be
+merged without the raw values:
+
+    {"n": 12, "mean": 1.4, "m2": 3.1, "min": 0.25, "max": 3.0,
+     "centroids": [[0.25, 1], [0.5, 2], ...]}
+
+- n / mean / m2 / min / max: Welford running moments, merged with Chan's
+  parallel formula. count, min and max are exact; mean and the sample
+  standard deviation are exact up to floating point rounding.
+- centroids: a merging t-digest ([mean, weight] pairs, sorted by mean)
+  for quantiles. Values are kept as singletons until a sketch holds more
+  than COMPRESS_AT centroids, so quantiles of up to COMPRESS_AT values are
+  exact (statistics.median semantics). Beyond that, centroids are merged
+  with the k1 scale function at COMPRESSION; a centroid then covers at
+  most ~pi/COMPRESSION (about 3%) of the ranks around the median and far
+  less in the tails, which bounds the rank error of quantile().
+"""
+
+import bisect
+import math
+from typing import Any, Dict, Iterable, List, Optional
+
+
+COMPRESSION = 100
+COMPRESS_AT = 2 * COMPRESSION
+
+
+def new_sketch() -> Dict[str, Any]:
+    return {"n": 0, "mean": 0.0, "m2": 0.0, "min": None, "max": None, "centroids": []}
+
+
+def add(sketch: Dict[str, Any], value: float) -> Dict[str, Any]:
+    """Add one value in place (Welford update) and return the sketch."""
+    sketch["n"] += 1
+    delta = value - sketch["mean"]
+    sketch["mean"] += delta / sketch["n"]
+    sketch["m2"] += delta * (value - sketch["mean"])
+    sketch["min"] = value if sketch["min"] is None else min(sketch["min"], value)
+    sketch["max"] = value if sketch["max"] is None else max(sketch["max"], value)
+
+    bisect.insort(sketch["centroids"], [value, 1])
+    if len(sketch["centroids"]) > COMPRESS_AT:
+        sketch["centroids"] = _compress(sketch["centroids"], sketch["n"])
+    return sketch
+
+
+def from_values(values: Iterable[float]) -> Dict[str, Any]:
+    sketch = new_sketch()
+    for value in values:
+        add(sketch, value)
+    return sketch
+
+
+def merge(sketches: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge sketches into a new one; the inputs are not modified."""
+    merged = new_sketch()
+    centroids: List[List[float]] = []
+    for sketch in sketches:
+        if not sketch or not sketch["n"]:
+            continue
+        n = merged["n"] + sketch["n"]
+        delta = sketch["mean"] - merged["mean"]
+        merged["mean"] += delta * sketch["n"] / n
+        merged["m2"] += sketch["m2"] + delta * delta * merged["n"] * sketch["n"] / n
+        merged["n"] = n
+        merged["min"] = sketch["min"] if merged["min"] is None else min(merged["min"], sketch["min"])
+        merged["max"] = sketch["max"] if merged["max"] is None else max(merged["max"], sketch["max"])
+        centroids.extend(sketch["centroids"])
+
+    if len(centroids) > COMPRESS_AT:
+        merged["centroids"] = _compress(centroids, merged["n"])
+    else:
+        merged["centroids"] = [list(c) for c in sorted(centroids, key=lambda c: c[0])]
+    return merged
+
+
+def _k1(q: float) -> float:
+    return COMPRESSION / (2 * math.pi) * math.asin(2 * min(max(q, 0.0), 1.0) - 1)
+
+
+def _compress(centroids: List[List[float]], total: float) -> List[List[float]]:
+    """Greedy t-digest merge pass: adjacent centroids join while they span <= 1 unit of k1."""
+    ordered = sorted(centroids, key=lambda c: c[0])
+    result: List[List[float]] = []
+    cumulative = 0.0
+    current = list(ordered[0])
+    k_low = _k1(0.0)
+    for mean, weight in ordered[1:]:
+        if _k1((cumulative + current[1] + weight) / total) - k_low <= 1:
+            joined = current[1] + weight
+            current[0] += (mean - current[0]) * weight / joined
+            current[1] = joined
+        else:
+            result.append(current)
+            cumulative += current[1]
+            k_low = _k1(cumulative / total)
+            current = [mean, weight]
+    result.append(current)
+    return result
+
+
+def quantile(sketch: Dict[str, Any], q: float) -> Optional[float]:
+    """
+    Quantile (q in 0-1), interpolating between centroid centers.
+
+    Exact for singleton centroids (q=0.5 equals statistics.median).
+    """
+    centroids = sketch["centroids"]
+    if not centroids:
+        return None
+
+    # (rank, value) points: centroid centers, anchored to min/max at the ends
+    points = []
+    if centroids[0][1] > 1:
+        points.append((0.0, sketch["min"]))
+    cumulative = 0.0
+    for mean, weight in centroids:
+        points.append((cumulative + (weight - 1) / 2, mean))
+        cumulative += weight
+    if centroids[-1][1] > 1:
+        points.append((cumulative - 1, sketch["max"]))
+
+    rank = q * (sketch["n"] - 1)
+    if rank <= points[0][0]:
+        return points[0][1]
+    for (low_rank, low), (high_rank, high) in zip(points, points[1:]):
+        if rank <= high_rank:
+            return low + (high - low) * (rank - low_rank) / (high_rank - low_rank)
+    return points[-1][1]
+
+
+def std_dev(sketch: Dict[str, Any]) -> float:
+    """Sample standard deviation (statistics.stdev), 0 for fewer than 2 values."""
+    if sketch["n"] < 2:
+        return 0.0
+    return math.sqrt(max(sketch["m2"], 0.0) / (sketch["n"] - 1))
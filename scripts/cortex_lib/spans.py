@@ -0,0 +1,271 @@
+"""
+Timing Spans
+
+Lightweight stage timers for the extractors and analyzers. Each finished
+span appends one JSON line to the recipe's span log of the day:
+
+    cortex/logs/recipe-<recipe>-spans-YYYY-MM-DD.jsonl
+    {"ts": "2025-12-22T13:00:01.123Z", "recipe": "15",
+     "stage": "analyze-duration.load", "duration_ms": 12.4, "items": 204}
+
+<recipe> comes from $CORTEX_RECIPE (set by the n8n recipe that runs the
+script) and is "local" for manual runs. Set CORTEX_SPANS=0 to disable.
+
+Span records carry "stage" and "duration_ms" and no "status", so the run
+counters in analyze-health.py skip them (see is_span()). They are kept
+apart from the run records in recipe-<recipe>-YYYY-MM-DD.jsonl so that
+the log analyzers' result cache (cortex_lib/result_cache.py) can leave
+span logs out of its fingerprint (see is_span_log()): otherwise every
+analyzer run would invalidate the next one with its own spans.
+
+While a trace sink is installed (set_trace_sink(), used by --profile),
+every span is also recorded as a Chrome trace "X" event, whether or not
+logging is enabled.
+
+Usage:
+    with spans.span("analyze-duration.load") as sp:
+        entries = load_task_entries(days)
+        sp["items"] = len(entries)
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from . import sketches
+
+
+LOGS_DIR = Path("cortex/logs")
+RECIPE_ENV = "CORTEX_RECIPE"
+SPANS_ENV = "CORTEX_SPANS"
+DEFAULT_RECIPE = "local"
+# recipe-<recipe>-spans-YYYY-MM-DD.jsonl[...]; recipe-local-* only ever held spans
+SPAN_LOG_RE = re.compile(r"^recipe-(?:" + DEFAULT_RECIPE + r"-|.+?-spans-\d{4}-\d{2}-\d{2}\.)")
+
+# A stage is "slowing" when its recent median is this much above the earlier one
+SLOWDOWN_RATIO = 1.5
+
+_write_lock = threading.Lock()
+_warned = False
+_trace_sink: Optional[List[Dict[str, Any]]] = None
+_trace_origin = 0.0
+
+
+def set_trace_sink(events: Optional[List[Dict[str, Any]]]) -> None:
+    """Collect spans as Chrome trace events into `events` (None to stop)."""
+    global _trace_sink, _trace_origin
+    _trace_origin = time.perf_counter()
+    _trace_sink = events
+
+
+def trace_now_us() -> float:
+    """Microseconds since the trace sink was installed."""
+    return (time.perf_counter() - _trace_origin) * 1e6
+
+
+def _trace_span(stage: str, duration_ms: float, items: Optional[int], error: Optional[str]) -> None:
+    sink = _trace_sink
+    if sink is None:
+        return
+    args: Dict[str, Any] = {"items": items}
+    if error:
+        args["error"] = error
+    end = trace_now_us()
+    sink.append({
+        "name": stage,
+        "cat": "span",
+        "ph": "X",
+        "ts": round(end - duration_ms * 1000, 1),
+        "dur": round(duration_ms * 1000, 1),
+        "pid": os.getpid(),
+        "tid": threading.get_ident(),
+        "args": args,
+    })
+
+
+def spans_enabled() -> bool:
+    return os.environ.get(SPANS_ENV, "1") != "0"
+
+
+def current_recipe() -> str:
+    return os.environ.get(RECIPE_ENV) or DEFAULT_RECIPE
+
+
+def span_log_path(recipe: str, logs_dir: Path = LOGS_DIR) -> Path:
+    """Daily span log for a recipe (local date, like the n8n recipes)."""
+    return logs_dir / f"recipe-{recipe}-spans-{datetime.now().astimezone().strftime('%Y-%m-%d')}.jsonl"
+
+
+def is_span_log(path: Path) -> bool:
+    """True for (segments of) span-only logs: span_log_path() files and any recipe-local-* log."""
+    return SPAN_LOG_RE.match(path.name) is not None
+
+
+def write_span(
+    stage: str,
+    duration_ms: float,
+    items: Optional[int] = None,
+    error: Optional[str] = None,
+    recipe: Optional[str] = None,
+    logs_dir: Optional[Path] = None,
+) -> None:
+    """Append one span record; logging problems never fail the caller."""
+    global _warned
+    _trace_span(stage, duration_ms, items, error)
+    if not spans_enabled():
+        return
+
+    recipe = recipe or current_recipe()
+    record: Dict[str, Any] = {
+        "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+        "recipe": recipe,
+        "stage": stage,
+        "duration_ms": round(duration_ms, 3),
+        "items": items,
+    }
+    if error:
+        record["error"] = error
+
+    path = span_log_path(recipe, logs_dir or LOGS_DIR)
+    try:
+        with _write_lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    except OSError as e:
+        if not _warned:
+            _warned = True
+            print(f"⚠️  Could not write timing span to {path}: {e}", file=sys.stderr)
+
+
+@contextmanager
+def span(stage: str, items: Optional[int] = None, **kwargs: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Time a block and log it as a span.
+
+    The yielded dict's "items" may be set inside the block. Exceptions
+    (including SystemExit) are recorded in "error" and re-raised.
+    """
+    record: Dict[str, Any] = {"items": items}
+    start = time.perf_counter()
+    error = None
+    try:
+        yield record
+    except BaseException as e:
+        error = type(e).__name__ if not isinstance(e, SystemExit) else f"SystemExit({e.code})"
+        raise
+    finally:
+        write_span(stage, (time.perf_counter() - start) * 1000, record.get("items"), error, **kwargs)
+
+
+def is_span(entry: Dict[str, Any]) -> bool:
+    """True for span records (as opposed to recipe run records)."""
+    return "stage" in entry and "duration_ms" in entry and "status" not in entry
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Linear-interpolated percentile (pct in 0-100) of unsorted values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def add_span(stages: Dict[str, Dict[str, Any]], record: Dict[str, Any]) -> None:
+    """
+    Fold one span record into per-stage totals, in place:
+
+        {stage: {"durations": <sketch>, "items": 204, "counted": 1, "counted_ms": 12.4}}
+
+    durations is a quantile sketch (cortex_lib/sketches.py); items and
+    counted_ms only cover the spans that reported items. Records without a
+    numeric duration_ms are skipped.
+    """
+    try:
+        duration = float(record["duration_ms"])
+    except (KeyError, TypeError, ValueError):
+        return
+
+    totals = stages.setdefault(str(record["stage"]), {
+        "durations": sketches.new_sketch(), "items": 0, "counted": 0, "counted_ms": 0.0,
+    })
+    sketches.add(totals["durations"], duration)
+    if isinstance(record.get("items"), (int, float)):
+        totals["items"] += record["items"]
+        totals["counted"] += 1
+        totals["counted_ms"] += duration
+
+
+def summarize_stage_totals(periods: List[Dict[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Per-stage latency/throughput statistics from add_span() totals.
+
+    Args:
+        periods: Stage totals of consecutive periods (e.g. hours), oldest first
+
+    Returns:
+        {stage: {"count", "p50_ms", "p95_ms", "items", "items_per_sec",
+                 "trend_ratio"}}
+        trend_ratio is median(later half) / median(earlier half), or None
+        with fewer than 2 samples in either half. Periods are not split:
+        each goes to the half that holds the middle of its samples.
+    """
+    by_stage: Dict[str, List[Dict[str, Any]]] = {}
+    for period in periods:
+        for stage, totals in period.items():
+            by_stage.setdefault(stage, []).append(totals)
+
+    summary: Dict[str, Dict[str, Any]] = {}
+    for stage, stage_totals in sorted(by_stage.items()):
+        durations = sketches.merge(t["durations"] for t in stage_totals)
+        if not durations["n"]:
+            continue
+        items = sum(t["items"] for t in stage_totals)
+        counted = sum(t["counted"] for t in stage_totals)
+        counted_ms = sum(t["counted_ms"] for t in stage_totals)
+
+        half = durations["n"] // 2
+        earlier: List[Dict[str, Any]] = []
+        later: List[Dict[str, Any]] = []
+        seen = 0
+        for totals in stage_totals:
+            n = totals["durations"]["n"]
+            (earlier if seen + n / 2 <= half else later).append(totals["durations"])
+            seen += n
+
+        trend = None
+        earlier_sketch, later_sketch = sketches.merge(earlier), sketches.merge(later)
+        if earlier_sketch["n"] >= 2 and later_sketch["n"] >= 2:
+            earlier_median = sketches.quantile(earlier_sketch, 0.5)
+            if earlier_median:
+                trend = round(sketches.quantile(later_sketch, 0.5) / earlier_median, 2)
+
+        summary[stage] = {
+            "count": durations["n"],
+            "p50_ms": round(sketches.quantile(durations, 0.5), 3),
+            "p95_ms": round(sketches.quantile(durations, 0.95), 3),
+            "items": items if counted else None,
+            "items_per_sec": round(items / (counted_ms / 1000), 1) if counted and counted_ms > 0 else None,
+            "trend_ratio": trend,
+        }
+    return summary
+
+
+def summarize_spans(records: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """summarize_stage_totals() of raw span records, each its own period in ts order."""
+    periods = []
+    for record in sorted(records, key=lambda r: str(r.get("ts", ""))):
+        stages: Dict[str, Dict[str, Any]] = {}
+        add_span(stages, record)
+        periods.append(stages)
+    return summarize_stage_totals(periods)
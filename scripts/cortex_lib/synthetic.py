@@ -0,0 +1,246 @@
+"""
+Synthetic Cortex Corpus
+
+Deterministic (seeded) generators for benchmark data shaped like a real
+cortex/ tree:
+
+- cortex/daily/YYYY-MM-DD-digest.md: every format parse_daily_digest
+  supports (checkboxes under category headers, | 時刻 | タスク | 時間 |
+  tables, ### Title (HH:MM-HH:MM JST) progress blocks), plus the ## Tasks,
+  ## 進捗 and ## Reflection sections read by suggest / sync-digest-tasks /
+  extract-feedback
+- cortex/state/task-entry-YYYY-MM-DD.json: the parsed digest tasks, with
+  #tags promoted to categories
+- cortex/logs/recipe-NN-YYYY-MM-DD.jsonl: n8n JSONL run logs
+- cortex/logs/recipe-NN-YYYY-MM-DD.log: legacy text run logs
+"""
+
+import json
+import random
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .digest_parser import parse_daily_digest
+
+
+CATEGORIES = ["dev", "review", "docs", "ops", "meeting", "learning"]
+RECIPES = [
+    (2, "Recipe 02: Daily Digest"),
+    (10, "Recipe 10: TODO.md Auto-sync"),
+    (13, "Recipe 13: Nightly Wrap-up"),
+    (15, "Recipe 15: Daily Analytics Runner"),
+]
+MOODS = ["😊", "🙂", "😐", "😕", "😄"]
+REFLECTIONS = [
+    "Productive day, good progress on the roadmap.",
+    "Tired after meetings, some problems left open.",
+    "順調に進んだ。達成感あり。",
+    "Stuck on an issue for a while but completed the fix.",
+]
+
+
+def synthetic_block(rng: random.Random, n: int) -> List[str]:
+    """One ~20-line chunk of digest markdown covering all formats."""
+    h = rng.randint(6, 20)
+    m = rng.choice([0, 10, 20, 30])
+    return [
+        "### 優先度：高",
+        f"- [x] Recipe {n} 修正 ({rng.randint(5, 90)}分)",
+        f"- [ ] Review PR #{n} #review",
+        "### 通常タスク",
+        f"- [x] Deploy step {n} ({h:02d}:{m:02d}-{h:02d}:{m + 25:02d} JST)",
+        f"- [x] Write docs {rng.randint(5, 60)}m",
+        "",
+        "| 時刻 | タスク | 時間 |",
+        "|------|--------|------|",
+        f"| ({h:02d}:00-{h:02d}:15) | Table task {n} | 15分 |",
+        f"| {h:02d}:30+ | Follow-up {n} | 10分 |",
+        "",
+        f"### 🔧 Progress {n} ({h:02d}:{m:02d}-{h + 1:02d}:{m:02d} JST)",
+        "- **カテゴリ**: maintenance",
+        f"- **所要時間**: {rng.randint(10, 60)}m",
+        "- **メモ**: synthetic benchmark block",
+        "",
+        "Free-form reflection text that none of the formats match.",
+        "",
+        "---",
+    ]
+
+
+def synthetic_digest(lines: int, seed: int = 42) -> str:
+    """Build a single digest of roughly `lines` lines."""
+    rng = random.Random(seed)
+    out: List[str] = ["# デイリーダイジェスト - 2025-12-10", "", "## 今日のフォーカス"]
+    n = 0
+    while len(out) < lines:
+        out.extend(synthetic_block(rng, n))
+        n += 1
+    return "\n".join(out[:lines])
+
+
+def _clock(minutes: int) -> str:
+    minutes = max(0, min(minutes, 23 * 60 + 59))
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def daily_digest(rng: random.Random, date_str: str, tasks_per_day: int) -> str:
+    """A realistic digest for one day with about `tasks_per_day` tasks."""
+    checkbox_count = max(1, tasks_per_day // 2)
+    table_count = max(0, tasks_per_day // 4)
+    progress_count = max(0, tasks_per_day - checkbox_count - table_count)
+
+    lines = [f"# Daily Digest - {date_str}", "", "## Tasks", "", "### 優先度：高"]
+    for i in range(checkbox_count):
+        if i == checkbox_count // 2:
+            lines.append("### 通常タスク")
+        mark = "x" if rng.random() < 0.7 else " "
+        title = f"Task {i} #{rng.choice(CATEGORIES)}"
+        start = rng.randint(7 * 60, 21 * 60)
+        style = rng.random()
+        if style < 0.35:
+            title += f" ({_clock(start)}-{_clock(start + rng.randint(10, 90))} JST)"
+        elif style < 0.7:
+            title += f" ({rng.randint(5, 120)}分)"
+        elif style < 0.85:
+            title += f" {rng.randint(5, 60)}m"
+        lines.append(f"- [{mark}] {title}")
+
+    if table_count:
+        lines.extend(["", "| 時刻 | タスク | 時間 |", "|------|--------|------|"])
+        for i in range(table_count):
+            start = rng.randint(7 * 60, 21 * 60)
+            lines.append(f"| ({_clock(start)}-{_clock(start + 15)}) | Table task {i} | {rng.randint(5, 45)}分 |")
+
+    lines.extend(["", "## 進捗", ""])
+    for i in range(progress_count):
+        start = rng.randint(7 * 60, 21 * 60)
+        # Time ranges feed parse_daily_digest; single times feed sync-digest-tasks
+        when = _clock(start) if i % 2 else f"{_clock(start)}-{_clock(start + rng.randint(15, 120))}"
+        lines.extend([
+            f"### Session {i} ({when} JST)",
+            f"- **カテゴリ**: {rng.choice(CATEGORIES)}",
+            f"- **所要時間**: {rng.randint(10, 90)}m",
+            "- **メモ**: synthetic progress entry",
+            "",
+        ])
+
+    lines.extend([
+        "## Reflection",
+        rng.choice(REFLECTIONS),
+        f"Mood: {rng.choice(MOODS)}",
+        f"Energy: {rng.randint(3, 9)}/10",
+        f"Satisfaction: {rng.randint(3, 9)}/10",
+        "",
+    ])
+    return "\n".join(lines)
+
+
+def task_entry(digest: str, date_str: str) -> Dict[str, Any]:
+    """task-entry JSON for a digest, with #tags promoted to categories."""
+    tasks = parse_daily_digest(digest, date_str)["tasks"]
+    for task in tasks:
+        for word in task["title"].split():
+            if word.startswith("#") and word[1:] in CATEGORIES:
+                task["category"] = word[1:]
+                break
+    return {"date": date_str, "source": "synthetic", "tasks": tasks}
+
+
+def recipe_jsonl_lines(rng: random.Random, day: date, recipe: int, workflow: str, count: int) -> List[str]:
+    """n8n-style JSONL run log lines for one recipe and day."""
+    lines = []
+    base = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+    for i in range(count):
+        ts = base + timedelta(seconds=int(86399 * (i + rng.random()) / count))
+        ok = rng.random() < 0.92
+        lines.append(json.dumps({
+            "ts": ts.isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+            "workflow": workflow,
+            "executionId": str(rng.randint(1, 99999)),
+            "status": "success" if ok else "error",
+            "durationMs": rng.randint(50, 60000),
+            "env": "production",
+            "errorMessage": None if ok else "Obsidian API timeout",
+            "meta": {"recipe": recipe},
+        }, ensure_ascii=False))
+    return lines
+
+
+def recipe_log_lines(rng: random.Random, day: date, recipe: int, count: int) -> List[str]:
+    """Legacy text log lines (analyze-recipes.py format) for one recipe and day."""
+    lines = []
+    name = f"recipe_{recipe:02d}"
+    for i in range(count):
+        seconds = int(86399 * (i + rng.random()) / count)
+        stamp = f"{day.isoformat()}T{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}+09:00"
+        if rng.random() < 0.92:
+            lines.append(f"{stamp} [{name}] SUCCESS ({rng.uniform(0.5, 90):.1f}s)")
+        else:
+            lines.append(f"{stamp} [{name}] FAILURE: Obsidian API timeout")
+    return lines
+
+
+def generate_corpus(
+    root: Path,
+    days: int,
+    tasks_per_day: int,
+    log_lines: int,
+    seed: int = 42,
+    end_date: Optional[date] = None,
+) -> Dict[str, Any]:
+    """
+    Write a synthetic cortex/ tree under `root`.
+
+    Args:
+        root: Directory that will contain cortex/
+        days: Number of days ending at `end_date` (default: today)
+        tasks_per_day: Approximate tasks per digest / task entry
+        log_lines: Log lines per recipe per day (split JSONL / legacy .log)
+        seed: RNG seed; the same arguments always produce the same corpus
+
+    Returns:
+        Counts of generated files and records
+    """
+    rng = random.Random(seed)
+    end_date = end_date or datetime.now().date()
+
+    daily_dir = root / "cortex" / "daily"
+    state_dir = root / "cortex" / "state"
+    logs_dir = root / "cortex" / "logs"
+    for directory in (daily_dir, state_dir, logs_dir):
+        directory.mkdir(parents=True, exist_ok=True)
+
+    stats = {"days": days, "digests": 0, "task_entries": 0, "tasks": 0, "jsonl_lines": 0, "log_lines": 0}
+    jsonl_share = log_lines - log_lines // 4
+
+    for offset in range(days - 1, -1, -1):
+        day = end_date - timedelta(days=offset)
+        date_str = day.isoformat()
+
+        digest = daily_digest(rng, date_str, tasks_per_day)
+        (daily_dir / f"{date_str}-digest.md").write_text(digest, encoding="utf-8")
+        stats["digests"] += 1
+
+        entry = task_entry(digest, date_str)
+        (state_dir / f"task-entry-{date_str}.json").write_text(
+            json.dumps(entry, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+        stats["task_entries"] += 1
+        stats["tasks"] += len(entry["tasks"])
+
+        for recipe, workflow in RECIPES:
+            if jsonl_share:
+                lines = recipe_jsonl_lines(rng, day, recipe, workflow, jsonl_share)
+                (logs_dir / f"recipe-{recipe:02d}-{date_str}.jsonl").write_text(
+                    "\n".join(lines) + "\n", encoding="utf-8"
+                )
+                stats["jsonl_lines"] += len(lines)
+            if log_lines - jsonl_share:
+                lines = recipe_log_lines(rng, day, recipe, log_lines - jsonl_share)
+                (logs_dir / f"recipe-{recipe:02d}-{date_str}.log").write_text(
+                    "\n".join(lines) + "\n", encoding="utf-8"
+                )
+                stats["log_lines"] += len(lines)
+
+    return stats
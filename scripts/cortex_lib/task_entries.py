@@ -0,0 +1,156 @@
+"""
+Task Entry Loader
+
+Shared loader for cortex/state/task-entry-YYYY-MM-DD.json files.
+
+- Enumerates the state directory once with os.scandir (no per-day stat)
+- Decodes files on a thread pool
+- Injects "__date" (taken from the filename) into every entry
+- Skips *.enriched.json and any other non-canonical names
+- Caches decoded entries in-process by (path, mtime, size), so several
+  analyzers running in one process reuse the same decoded data
+
+Entries returned from the cache are shared objects: callers must treat
+them as read-only and copy before mutating.
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+STATE_DIR = Path("cortex/state")
+
+# Matches canonical task-entry files only (task-entry-2025-12-22.json).
+# task-entry-2025-12-22.enriched.json and similar variants never match.
+TASK_ENTRY_RE = re.compile(r"^task-entry-(\d{4}-\d{2}-\d{2})\.json$")
+
+# Small directories are faster to decode inline than through a pool
+PARALLEL_THRESHOLD = 8
+
+_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+_cache_lock = threading.Lock()
+
+
+def scan_task_entry_files(state_dir: Path = STATE_DIR) -> Dict[str, Tuple[Path, int, int]]:
+    """
+    Enumerate task-entry files with a single directory scan.
+
+    Returns:
+        {"YYYY-MM-DD": (path, mtime_ns, size), ...}
+    """
+    files: Dict[str, Tuple[Path, int, int]] = {}
+    try:
+        with os.scandir(state_dir) as it:
+            for dirent in it:
+                match = TASK_ENTRY_RE.match(dirent.name)
+                if not match or not dirent.is_file():
+                    continue
+                st = dirent.stat()
+                files[match.group(1)] = (Path(dirent.path), st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        return {}
+    return files
+
+
+def _decode(date_str: str, path: Path, mtime_ns: int, size: int) -> Optional[Dict[str, Any]]:
+    """Decode one file, going through the (path, mtime, size) cache."""
+    key = str(path)
+    signature = (mtime_ns, size)
+
+    with _cache_lock:
+        cached = _cache.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except json.JSONDecodeError:
+        print(f"⚠️  Skipping invalid JSON: {path}", file=sys.stderr)
+        return None
+    except Exception as e:
+        print(f"⚠️  Error loading {path}: {e}", file=sys.stderr)
+        return None
+
+    if not isinstance(data, dict):
+        print(f"⚠️  Skipping non-object JSON: {path}", file=sys.stderr)
+        return None
+
+    data["__date"] = date_str
+
+    with _cache_lock:
+        _cache[key] = (signature, data)
+    return data
+
+
+def load_task_entry_files(
+    files: Dict[str, Tuple[Path, int, int]],
+    max_workers: Optional[int] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Decode the given scan result.
+
+    Returns:
+        {"YYYY-MM-DD": entry, ...} for every file that decoded successfully
+    """
+    items = sorted(files.items())
+    if len(items) < PARALLEL_THRESHOLD:
+        decoded = [_decode(d, *meta) for d, meta in items]
+    else:
+        workers = max_workers or min(8, (os.cpu_count() or 1) + 4)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            decoded = list(pool.map(lambda item: _decode(item[0], *item[1]), items))
+
+    return {d: data for (d, _), data in zip(items, decoded) if data is not None}
+
+
+def window_dates(days: int, today: Optional[date] = None) -> List[str]:
+    """Return the date strings of the past N days, newest first (today included)."""
+    today = today or datetime.now().date()
+    return [(today - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(days)]
+
+
+def window_files(
+    days: int,
+    state_dir: Path = STATE_DIR,
+    today: Optional[date] = None,
+) -> Dict[str, Tuple[Path, int, int]]:
+    """scan_task_entry_files() limited to the past N days (today included)."""
+    dates = window_dates(days, today)
+    if not dates:
+        return {}
+    oldest, newest = dates[-1], dates[0]
+    return {d: meta for d, meta in scan_task_entry_files(state_dir).items() if oldest <= d <= newest}
+
+
+def load_task_entries(
+    days: int,
+    state_dir: Path = STATE_DIR,
+    today: Optional[date] = None,
+    max_workers: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Load task-entry files from the past N days (today included).
+
+    Returns entries newest first, each with "__date" set to its file date.
+    """
+    dates = window_dates(days, today)
+    if not dates:
+        return []
+
+    files = window_files(days, state_dir, today)
+    loaded = load_task_entry_files(files, max_workers=max_workers)
+    return [loaded[d] for d in dates if d in loaded]
+
+
+def clear_cache() -> None:
+    """Drop every cached entry (mainly for tests)."""
+    with _cache_lock:
+        _cache.clear()
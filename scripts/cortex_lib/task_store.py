@@ -0,0 +1,351 @@
+"""
+SQLite Task Store
+
+Optional indexed copy of every cortex/state/task-entry-YYYY-MM-DD.json in
+one database, cortex/state/tasks.db, so cross-day questions ("completed
+n8n tasks in Q4", "durations by hour") are index range queries instead of
+opening hundreds of JSON files.
+
+The JSON files stay the source of truth. The store is only used when it
+exists (create it with `python scripts/task-store.py sync`):
+
+- extract-tasks.py writes each day through (write_entry());
+  process-obsidian-batch.py syncs after writing its batch;
+- sync() re-imports every file whose mtime/size differs from what the
+  store recorded (and drops deleted days), so files rewritten by other
+  tools (enrich --in-place, detect-incomplete-tasks) are picked up too.
+  When nothing changed it costs one directory scan.
+
+One row per task ("tasks" and "completed" lists), with the analyzers'
+derived fields precomputed in Python at import time so SQL aggregates
+match the JSON code paths exactly:
+
+    completed       is_task_completed() (status done/completed/finished or "[x]" title)
+    weekday, hour   of started_at, else completed_at (as written, no tz conversion)
+    clock_weekday, clock_hour
+                    of the "timestamp" HH:MM field on the entry date (/log tasks)
+    has_duration    completed and duration_minutes / duration_hours present
+    duration_hours  completed and a positive duration (minutes preferred)
+    category        task.get("category", "uncategorized")
+
+Indexes cover date (primary key), category, status and hour. The
+database runs in WAL mode, so analyzers can read while a writer syncs.
+Bump STORE_VERSION when a derived column changes; older stores are
+rebuilt on open.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .task_entries import STATE_DIR, TASK_ENTRY_RE, window_dates
+
+
+STORE_PATH = STATE_DIR / "tasks.db"
+STORE_VERSION = 1
+BUSY_TIMEOUT_MS = 10000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS days (
+    date TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    tasks INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    date TEXT NOT NULL,
+    list TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    title TEXT,
+    category TEXT,
+    status TEXT,
+    completed INTEGER NOT NULL,
+    started_at TEXT,
+    completed_at TEXT,
+    weekday INTEGER,
+    hour INTEGER,
+    clock_weekday INTEGER,
+    clock_hour INTEGER,
+    has_duration INTEGER NOT NULL,
+    duration_hours REAL,
+    duration_confidence REAL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (date, list, seq)
+);
+CREATE INDEX IF NOT EXISTS tasks_category ON tasks (category, date);
+CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, date);
+CREATE INDEX IF NOT EXISTS tasks_hour ON tasks (hour, date);
+"""
+
+COLUMNS = (
+    "date", "list", "seq", "title", "category", "status", "completed", "started_at", "completed_at",
+    "weekday", "hour", "clock_weekday", "clock_hour", "has_duration", "duration_hours",
+    "duration_confidence", "data",
+)
+INSERT_SQL = f"INSERT INTO tasks ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+
+# Columns the query API filters and groups on
+FILTERS = ("category", "status", "completed", "hour", "weekday")
+GROUP_COLUMNS = ("date", "category", "status", "completed", "hour", "weekday", "list")
+
+
+def open_store(path: Path = STORE_PATH, create: bool = False) -> Optional[sqlite3.Connection]:
+    """
+    Connection to the store, or None if it does not exist (and create is False).
+
+    The schema is created (or rebuilt on a STORE_VERSION change) on open.
+    """
+    if not create and not path.exists():
+        return None
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    if conn.execute("PRAGMA user_version").fetchone()[0] != STORE_VERSION:
+        with conn:
+            conn.execute("DROP TABLE IF EXISTS tasks")
+            conn.execute("DROP TABLE IF EXISTS days")
+            conn.executescript(SCHEMA)
+            conn.execute(f"PRAGMA user_version = {STORE_VERSION}")
+    return conn
+
+
+def parse_iso(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except Exception:
+        return None
+
+
+def is_completed(task: Dict[str, Any]) -> bool:
+    status = str(task.get("status") or "").lower()
+    title = str(task.get("title") or "")
+    return status in ("completed", "done", "finished") or title.startswith("[x]") or title.startswith("- [x]")
+
+
+def clock_time(date_str: str, value: Any) -> Optional[datetime]:
+    """The "timestamp" field (HH:MM) on the entry date, as analyze-rhythm reads it."""
+    if not isinstance(value, str) or len(value.split(":")) != 2:
+        return None
+    try:
+        return datetime.strptime(f"{date_str} {value}", "%Y-%m-%d %H:%M")
+    except ValueError:
+        return None
+
+
+def duration_fields(task: Dict[str, Any]) -> Tuple[bool, Optional[float]]:
+    """(has_duration, hours) as analyze-duration's task_duration() sees a completed task."""
+    minutes = task.get("duration_minutes")
+    hours = task.get("duration_hours")
+    has_duration = minutes is not None or hours is not None
+    try:
+        if minutes is not None and minutes > 0:
+            return has_duration, minutes / 60.0
+        if hours is not None and hours > 0:
+            return has_duration, float(hours)
+    except TypeError:
+        pass
+    return has_duration, None
+
+
+def task_row(date_str: str, list_name: str, seq: int, task: Dict[str, Any]) -> Tuple[Any, ...]:
+    """The tasks row (COLUMNS order) for one task."""
+    completed = is_completed(task)
+    at = parse_iso(task.get("started_at")) or parse_iso(task.get("completed_at"))
+    clock = clock_time(date_str, task.get("timestamp"))
+    has_duration, duration_hours = duration_fields(task) if completed else (False, None)
+    category = task.get("category", "uncategorized")
+    status = task.get("status")
+    return (
+        date_str, list_name, seq,
+        str(task.get("title") or ""),
+        category if category is None else str(category),
+        status if status is None else str(status),
+        int(completed),
+        task.get("started_at"), task.get("completed_at"),
+        at.weekday() if at else None, at.hour if at else None,
+        clock.weekday() if clock else None, clock.hour if clock else None,
+        int(has_duration), duration_hours,
+        task.get("duration_confidence", 1.0),
+        json.dumps(task, ensure_ascii=False),
+    )
+
+
+def entry_rows(date_str: str, entry: Dict[str, Any]) -> List[Tuple[Any, ...]]:
+    rows = []
+    for list_name in ("tasks", "completed"):
+        tasks = entry.get(list_name) or []
+        if not isinstance(tasks, list):
+            continue
+        rows.extend(task_row(date_str, list_name, seq, task) for seq, task in enumerate(tasks) if isinstance(task, dict))
+    return rows
+
+
+def _replace_day(conn: sqlite3.Connection, date_str: str, entry: Dict[str, Any], mtime_ns: int, size: int) -> None:
+    rows = entry_rows(date_str, entry)
+    conn.execute("DELETE FROM tasks WHERE date = ?", (date_str,))
+    conn.executemany(INSERT_SQL, rows)
+    conn.execute("INSERT OR REPLACE INTO days (date, mtime_ns, size, tasks) VALUES (?, ?, ?, ?)",
+                 (date_str, mtime_ns, size, len(rows)))
+
+
+def write_entry(conn: sqlite3.Connection, date_str: str, entry: Dict[str, Any], path: Path) -> None:
+    """Write-through for a task-entry file that was just written to path."""
+    st = path.stat()
+    with conn:
+        _replace_day(conn, date_str, entry, st.st_mtime_ns, st.st_size)
+
+
+def sync(conn: sqlite3.Connection, state_dir: Path = STATE_DIR) -> int:
+    """
+    Bring the store in line with the task-entry files.
+
+    Returns the number of days (re)imported or dropped.
+    """
+    files: Dict[str, Tuple[Path, int, int]] = {}
+    try:
+        with os.scandir(state_dir) as it:
+            for dirent in it:
+                match = TASK_ENTRY_RE.match(dirent.name)
+                if match and dirent.is_file():
+                    st = dirent.stat()
+                    files[match.group(1)] = (Path(dirent.path), st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        pass
+
+    known = {row["date"]: (row["mtime_ns"], row["size"]) for row in conn.execute("SELECT date, mtime_ns, size FROM days")}
+    stale = {d: meta for d, meta in files.items() if known.get(d) != (meta[1], meta[2])}
+    removed = [d for d in known if d not in files]
+    if not stale and not removed:
+        return 0
+
+    changed = 0
+    with conn:
+        for d in removed:
+            conn.execute("DELETE FROM tasks WHERE date = ?", (d,))
+            conn.execute("DELETE FROM days WHERE date = ?", (d,))
+            changed += 1
+        for d, (path, mtime_ns, size) in sorted(stale.items()):
+            try:
+                entry = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Task store: skipping {path}: {e}", file=sys.stderr)
+                entry = None
+            if not isinstance(entry, dict):
+                # Recorded as empty so an unreadable file is not re-read until it changes
+                entry = {}
+            _replace_day(conn, d, entry, mtime_ns, size)
+            changed += 1
+    return changed
+
+
+def open_synced(path: Path = STORE_PATH, state_dir: Path = STATE_DIR) -> Optional[sqlite3.Connection]:
+    """open_store() + sync() for analyzers: None if there is no store or it cannot be used."""
+    try:
+        conn = open_store(path)
+        if conn is None:
+            return None
+        sync(conn, state_dir)
+        return conn
+    except sqlite3.Error as e:
+        print(f"⚠️  Task store {path} unavailable, reading JSON files: {e}", file=sys.stderr)
+        return None
+
+
+def window_bounds(days: int) -> Tuple[str, str]:
+    """(since, until) dates of the past N days (today included), as load_task_entries() reads them."""
+    dates = window_dates(days)
+    return dates[-1], dates[0]
+
+
+def count_days(conn: sqlite3.Connection, since: str, until: str) -> int:
+    """Number of task-entry days in the store within [since, until]."""
+    return conn.execute("SELECT COUNT(*) FROM days WHERE date BETWEEN ? AND ?", (since, until)).fetchone()[0]
+
+
+def _where(since: Optional[str], until: Optional[str], filters: Dict[str, Any]) -> Tuple[str, List[Any]]:
+    clauses: List[str] = []
+    params: List[Any] = []
+    if since:
+        clauses.append("date >= ?")
+        params.append(since)
+    if until:
+        clauses.append("date <= ?")
+        params.append(until)
+    for column, value in filters.items():
+        if column not in FILTERS:
+            raise ValueError(f"unknown filter: {column}")
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple, set)):
+            values = list(value)
+            clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+        else:
+            clauses.append(f"{column} = ?")
+            params.append(int(value) if isinstance(value, bool) else value)
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+def query_tasks(
+    conn: sqlite3.Connection,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    limit: Optional[int] = None,
+    **filters: Any,
+) -> List[Dict[str, Any]]:
+    """
+    Tasks in a date range (inclusive YYYY-MM-DD bounds), oldest first.
+
+    Filters: category, status, completed, hour, weekday (a value or a list).
+    Each task is the stored JSON object plus "__date".
+    """
+    where, params = _where(since, until, filters)
+    sql = f"SELECT date, data FROM tasks{where} ORDER BY date, list DESC, seq"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+    return [{**json.loads(row["data"]), "__date": row["date"]} for row in conn.execute(sql, params)]
+
+
+def group_counts(
+    conn: sqlite3.Connection,
+    by: Sequence[str],
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    **filters: Any,
+) -> List[Dict[str, Any]]:
+    """
+    Task counts and duration totals grouped by columns (see GROUP_COLUMNS).
+
+    Returns:
+        [{<by columns>, "tasks", "completed", "duration_hours", "avg_duration_hours"}]
+    """
+    unknown = [column for column in by if column not in GROUP_COLUMNS]
+    if unknown or not by:
+        raise ValueError(f"cannot group by {', '.join(unknown) or 'nothing'} (choose from {', '.join(GROUP_COLUMNS)})")
+    where, params = _where(since, until, filters)
+    columns = ", ".join(by)
+    sql = (
+        f"SELECT {columns}, COUNT(*) AS tasks, SUM(completed) AS completed, "
+        f"SUM(duration_hours) AS duration_hours, AVG(duration_hours) AS avg_duration_hours "
+        f"FROM tasks{where} GROUP BY {columns} ORDER BY {columns}"
+    )
+    return [dict(row) for row in conn.execute(sql, params)]
+
+
+def execute(conn: sqlite3.Connection, sql: str, params: Iterable[Any] = ()) -> List[Dict[str, Any]]:
+    """Run a read-only SQL query against the store."""
+    conn.execute("PRAGMA query_only = ON")
+    try:
+        return [dict(row) for row in conn.execute(sql, list(params))]
+    finally:
+        conn.execute("PRAGMA query_only = OFF")
+
@@ -0,0 +1,297 @@
+"""
+Compact Task Table
+
+Column-oriented in-memory form of task-entry data for analyzers that load
+long histories. Each decoded task dict costs a hash table plus a string
+object per value; here every task is one slot in a set of parallel
+arrays:
+
+    status, category,           uint16 codes into one interned string pool
+    timestamp_source,           ("completed", "timerange", category names
+    duration_source             ... are stored once)
+    started_at, completed_at    int64 wall-clock seconds + int16 UTC offset
+                                in minutes (the hour/weekday as written)
+    timestamp                   int16 minutes of day (/log "HH:MM")
+    duration_hours              float32 (minutes converted as task_duration() does)
+    *_confidence                float32
+    title                       str (needed for the "[x]" completion marker)
+
+Everything else in the task dicts is dropped.
+
+TaskTable.entries() hands out adapters shaped like the loaded entries
+({"__date", "tasks", "completed"}) whose tasks are TaskView objects
+supporting .get() / [] / in, so is_task_completed(), task_duration(),
+add_activity() and the other dict-based analyzer code run over the table
+unchanged. Views rebuild values on access: timestamps come back as ISO
+strings (seconds precision), confidences rounded to 6 decimals, durations
+as duration_hours only.
+"""
+
+import json
+import math
+import sys
+from array import array
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .task_entries import STATE_DIR, scan_task_entry_files, window_dates
+
+
+MISSING = 0           # string code: key absent
+NONE = 1              # string code: key present with a null value
+NO_TIME = -(1 << 63)  # started_at / completed_at absent or unparsable
+NAIVE = -(1 << 15)    # offset of a timestamp without a UTC offset
+NO_CLOCK = -1         # timestamp (HH:MM) absent or unparsable
+
+EPOCH = datetime(1970, 1, 1)
+CODED = ("status", "category", "timestamp_source", "duration_source")
+TIMES = ("started_at", "completed_at")
+CONFIDENCES = ("timestamp_confidence", "duration_confidence")
+LISTS = ("tasks", "completed")
+
+
+class TaskTable:
+    """Parallel arrays, one slot per task; entries keep their load order."""
+
+    __slots__ = (
+        "strings", "codes", "titles", "coded", "times", "offsets", "clock",
+        "duration_hours", "confidences", "entry_dates", "entry_bounds",
+    )
+
+    def __init__(self) -> None:
+        self.strings: List[Any] = [None, None]  # MISSING, NONE
+        self.codes: Dict[str, int] = {}
+        self.titles: List[str] = []
+        self.coded = {field: array("H") for field in CODED}
+        self.times = {field: array("q") for field in TIMES}
+        self.offsets = {field: array("h") for field in TIMES}
+        self.clock = array("h")
+        self.duration_hours = array("f")
+        self.confidences = {field: array("f") for field in CONFIDENCES}
+        self.entry_dates: List[str] = []
+        # Per entry: start of "tasks", start of "completed", end
+        self.entry_bounds = array("I", [0])
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[Dict[str, Any]]) -> "TaskTable":
+        """Table from loaded task entries (each with "__date")."""
+        table = cls()
+        for entry in entries:
+            table.append_entry(entry.get("__date"), entry)
+        return table
+
+    def intern(self, value: Any) -> int:
+        if value is None:
+            return NONE
+        value = str(value)
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.strings)
+            if code > 0xFFFF:
+                raise ValueError("task table: more than 65535 distinct status/category/source values")
+            self.strings.append(value)
+        return code
+
+    def append_entry(self, date_str: str, entry: Dict[str, Any]) -> None:
+        """Add one task entry's "tasks" and "completed" lists."""
+        self.entry_dates.append(date_str)
+        for list_name in LISTS:
+            tasks = entry.get(list_name) or []
+            if isinstance(tasks, list):
+                for task in tasks:
+                    if isinstance(task, dict):
+                        self._append_task(task)
+            if list_name == "tasks":
+                self.entry_bounds.append(len(self.titles))
+        self.entry_bounds.append(len(self.titles))
+
+    def _append_task(self, task: Dict[str, Any]) -> None:
+        self.titles.append(str(task.get("title", "")))
+        for field in CODED:
+            self.coded[field].append(self.intern(task[field]) if field in task else MISSING)
+        for field in TIMES:
+            seconds, offset = encode_time(task.get(field))
+            self.times[field].append(seconds)
+            self.offsets[field].append(offset)
+        self.clock.append(encode_clock(task.get("timestamp")))
+        self.duration_hours.append(encode_duration(task))
+        for field in CONFIDENCES:
+            value = task.get(field)
+            self.confidences[field].append(float(value) if isinstance(value, (int, float)) else math.nan)
+
+    def entries(self) -> Iterator[Dict[str, Any]]:
+        """Entry adapters in load order: {"__date", "tasks", "completed"}."""
+        bounds = self.entry_bounds
+        for i, date_str in enumerate(self.entry_dates):
+            start, middle, end = bounds[2 * i], bounds[2 * i + 1], bounds[2 * i + 2]
+            yield {"__date": date_str, "tasks": TaskRows(self, start, middle), "completed": TaskRows(self, middle, end)}
+
+    def nbytes(self) -> int:
+        """Approximate memory of the table (arrays, titles and the string pool)."""
+        arrays = [*self.coded.values(), *self.times.values(), *self.offsets.values(), self.clock,
+                  self.duration_hours, *self.confidences.values(), self.entry_bounds]
+        total = sum(sys.getsizeof(a) for a in arrays) + sys.getsizeof(self.titles)
+        total += sum(sys.getsizeof(title) for title in self.titles)
+        total += sum(sys.getsizeof(s) for s in self.strings if s is not None)
+        return total
+
+
+def encode_time(value: Any) -> Tuple[int, int]:
+    """(wall-clock seconds since 1970, UTC offset minutes or NAIVE) of an ISO timestamp."""
+    if not value:
+        return NO_TIME, NAIVE
+    try:
+        dt = datetime.fromisoformat(value)
+    except Exception:
+        return NO_TIME, NAIVE
+    offset = dt.utcoffset()
+    seconds = int((dt.replace(tzinfo=None) - EPOCH).total_seconds())
+    return seconds, NAIVE if offset is None else int(offset.total_seconds() // 60)
+
+
+def decode_time(seconds: int, offset: int) -> Optional[str]:
+    if seconds == NO_TIME:
+        return None
+    dt = EPOCH + timedelta(seconds=seconds)
+    if offset != NAIVE:
+        dt = dt.replace(tzinfo=timezone(timedelta(minutes=offset)))
+    return dt.isoformat()
+
+
+def encode_clock(value: Any) -> int:
+    """Minutes of day of a "HH:MM" timestamp, as analyze-rhythm parses it."""
+    if not isinstance(value, str) or len(value.split(":")) != 2:
+        return NO_CLOCK
+    try:
+        parsed = datetime.strptime(value, "%H:%M")
+    except ValueError:
+        return NO_CLOCK
+    return parsed.hour * 60 + parsed.minute
+
+
+def encode_duration(task: Dict[str, Any]) -> float:
+    """Duration in hours as task_duration() reads it: NaN if absent, 0.0 if present but unusable."""
+    minutes = task.get("duration_minutes")
+    hours = task.get("duration_hours")
+    if minutes is None and hours is None:
+        return math.nan
+    try:
+        if minutes is not None and minutes > 0:
+            return minutes / 60.0
+        if hours is not None and hours > 0:
+            return float(hours)
+    except TypeError:
+        pass
+    return 0.0
+
+
+class TaskView:
+    """Read-only dict-like view of one table row."""
+
+    __slots__ = ("table", "index")
+
+    def __init__(self, table: TaskTable, index: int) -> None:
+        self.table = table
+        self.index = index
+
+    def _lookup(self, key: str) -> Tuple[bool, Any]:
+        table, i = self.table, self.index
+        if key == "title":
+            return True, table.titles[i]
+        if key in table.coded:
+            code = table.coded[key][i]
+            return code != MISSING, table.strings[code]
+        if key in table.times:
+            value = decode_time(table.times[key][i], table.offsets[key][i])
+            return value is not None, value
+        if key == "timestamp":
+            minutes = table.clock[i]
+            return minutes != NO_CLOCK, f"{minutes // 60:02d}:{minutes % 60:02d}" if minutes != NO_CLOCK else None
+        if key == "duration_hours":
+            value = table.duration_hours[i]
+            return not math.isnan(value), None if math.isnan(value) else float(value)
+        if key in table.confidences:
+            value = table.confidences[key][i]
+            return not math.isnan(value), None if math.isnan(value) else round(float(value), 6)
+        return False, None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        present, value = self._lookup(key)
+        return value if present else default
+
+    def __getitem__(self, key: str) -> Any:
+        present, value = self._lookup(key)
+        if not present:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._lookup(key)[0]
+
+    def keys(self) -> List[str]:
+        fields = ["title", *CODED, *TIMES, "timestamp", "duration_hours", *CONFIDENCES]
+        return [key for key in fields if key in self]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: self[key] for key in self.keys()}
+
+
+class TaskRows(Sequence):
+    """The tasks of one entry list, as TaskView objects."""
+
+    __slots__ = ("table", "start", "stop")
+
+    def __init__(self, table: TaskTable, start: int, stop: int) -> None:
+        self.table = table
+        self.start = start
+        self.stop = stop
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __getitem__(self, i: Any) -> Any:
+        if isinstance(i, slice):
+            return [TaskView(self.table, j) for j in range(self.start, self.stop)[i]]
+        if not -len(self) <= i < len(self):
+            raise IndexError(i)
+        return TaskView(self.table, self.start + (i % len(self)))
+
+    def __iter__(self) -> Iterator[TaskView]:
+        table = self.table
+        for i in range(self.start, self.stop):
+            yield TaskView(table, i)
+
+    def __add__(self, other: Iterable[Any]) -> List[Any]:
+        return [*self, *other]
+
+    def __radd__(self, other: Iterable[Any]) -> List[Any]:
+        return [*other, *self]
+
+
+def load_task_table(days: int, state_dir: Path = STATE_DIR) -> TaskTable:
+    """
+    load_task_entries() into a TaskTable: the past N days, newest first.
+
+    Files are decoded one at a time and their dicts dropped, bypassing the
+    shared entry cache, so peak memory is the table plus one file.
+    """
+    dates = window_dates(days)
+    files = scan_task_entry_files(state_dir)
+    table = TaskTable()
+    for date_str in dates:
+        if date_str not in files:
+            continue
+        path = files[date_str][0]
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except Exception as e:
+            print(f"⚠️  Error loading {path}: {e}", file=sys.stderr)
+            continue
+        if isinstance(entry, dict):
+            table.append_entry(date_str, entry)
+    return table
@@ -0,0 +1,77 @@
+"""
+Multi-Window Analysis
+
+Helpers for analyzers that answer several windows (--windows 7,30,90,365)
+from a single load of the longest one.
+
+Entries come newest first (task_entries.load_task_entries), so every
+shorter window is a prefix of the longest. accumulate_windows() feeds
+the entries once, newest to oldest, into the analyzer's running
+aggregates and snapshots them each time a window boundary is crossed.
+"""
+
+import argparse
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+def parse_windows(spec: str) -> List[int]:
+    """argparse type for "7,30,90": sorted unique positive day counts."""
+    try:
+        windows = sorted({int(part) for part in spec.split(",") if part.strip()})
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid window list: {spec!r} (expected e.g. 7,30,90)")
+    if not windows or windows[0] < 1:
+        raise argparse.ArgumentTypeError(f"windows must be positive day counts: {spec!r}")
+    return windows
+
+
+def window_cutoff(days: int, today: Optional[date] = None) -> str:
+    """Oldest date (YYYY-MM-DD) in a window of N days ending today."""
+    today = today or datetime.now().date()
+    return (today - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+
+
+def accumulate_windows(
+    items: Iterable[Any],
+    windows: List[int],
+    add: Callable[[Any], None],
+    snapshot: Callable[[], Any],
+    date_of: Callable[[Any], str] = lambda entry: entry["__date"],
+    today: Optional[date] = None,
+) -> Dict[int, Any]:
+    """
+    One pass over newest-first items, snapshotting each window.
+
+    Args:
+        items: Items ordered newest first (e.g. loaded task entries)
+        windows: Window sizes in days
+        add: Folds one item into the caller's running aggregates
+        snapshot: Builds a window's result from the running aggregates;
+            called in increasing window order
+        date_of: YYYY-MM-DD of an item
+
+    Returns:
+        {days: snapshot()} for every window
+    """
+    pending = sorted(set(windows))
+    cutoffs = [window_cutoff(days, today) for days in pending]
+    results: Dict[int, Any] = {}
+
+    for item in items:
+        item_date = date_of(item)
+        while pending and item_date < cutoffs[0]:
+            results[pending.pop(0)] = snapshot()
+            cutoffs.pop(0)
+        if not pending:
+            break
+        add(item)
+
+    for days in pending:
+        results[days] = snapshot()
+    return results
+
+
+def windows_json(results: Dict[int, Any], windows: List[int]) -> Dict[str, Any]:
+    """The "windows" output section: {"7": {...}, "30": {...}}."""
+    return {str(days): results[days] for days in windows}
@@ -23,6 +23,11 @@ from zoneinfo import ZoneInfo
 CORTEX_ROOT = Path(__file__).resolve().parents[1]
 STATE_DIR = CORTEX_ROOT / "cortex" / "state"
 
+if str(CORTEX_ROOT / "scripts") not in sys.path:
+    sys.path.insert(0, str(CORTEX_ROOT / "scripts"))
+
+from cortex_lib import profiling  # noqa: E402
+
 
 def detect_incomplete_tasks_from_entry(task_entry: dict) -> dict:
     """
@@ -198,4 +203,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    profiling.run_main(main)
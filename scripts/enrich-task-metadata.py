@@ -6,25 +6,63 @@ Enriches existing task-entry-*.json files with source/confidence metadata
 for timestamps and durations. Implements spec v0.1 from digest 2025-12-22.
 
 Input:
-  - cortex/state/task-entry-*.json (existing format)
+  - cortex/state/task-entry-YYYY-MM-DD.json (canonical names only)
 
 Output:
-  - cortex/state/task-entry-*-enriched.json (with source/confidence fields)
+  - cortex/state/task-entry-*.enriched.json (with source/confidence fields)
+  - or the input itself with --in-place (streamed to a temp file, then
+    renamed over the original, so readers never see a partial file)
+
+Every output carries a stamp:
+
+    "enrichment": {"version": "0.1", "input_sha256": "..."}
+
+Idempotent and incremental: cortex/state/.enrich-manifest.json records the
+fingerprints (cortex_lib/fingerprint.py) of each input and output. Files
+whose stat matches the manifest are skipped without being opened, so a
+rerun over unchanged history costs a single directory scan. Files without
+a manifest record are read, and skipped if their stamp is already current.
+Bump ENRICHMENT_VERSION when the enrichment rules change. Files are
+enriched on a thread pool.
 
 Usage:
-    python scripts/enrich-task-metadata.py [--date YYYY-MM-DD] [--all]
-    python scripts/enrich-task-metadata.py --all --overwrite  # Replace originals
+    python scripts/enrich-task-metadata.py [--date YYYY-MM-DD] [--all] [--jobs N] [--force]
+    python scripts/enrich-task-metadata.py --all --in-place  # Replace originals
 """
 
+import hashlib
 import json
+import os
 import sys
+import time
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Any, Optional, Tuple
+from datetime import datetime, timezone
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from cortex_lib import profiling, spans  # noqa: E402
+from cortex_lib.fingerprint import (  # noqa: E402
+    atomic_write_json,
+    file_fingerprint,
+    load_manifest,
+    same_content,
+    save_manifest,
+)
+from cortex_lib.task_entries import TASK_ENTRY_RE, window_dates  # noqa: E402
 
 
 STATE_DIR = Path("cortex/state")
+ENRICHMENT_VERSION = "0.1"  # spec version; bump when enrich_task() rules change
+MANIFEST_NAME = ".enrich-manifest.json"
+ENRICHED_SUFFIX = ".enriched.json"
+
+# Small batches are faster to enrich inline than through a pool
+PARALLEL_THRESHOLD = 8
 
 
 def enrich_task(task: Dict[str, Any]) -> Dict[str, Any]:
@@ -111,44 +149,111 @@ def enrich_task_entry(entry_data: Dict[str, Any]) -> Dict[str, Any]:
     return enriched_data
 
 
-def enrich_file(input_path: Path, output_path: Path, overwrite: bool = False) -> bool:
+def stamp_is_current(stamp: Any, input_sha256: Optional[str] = None) -> bool:
+    """True if an "enrichment" stamp is at ENRICHMENT_VERSION (and for the given input, if any)."""
+    return (
+        isinstance(stamp, dict)
+        and stamp.get("version") == ENRICHMENT_VERSION
+        and (input_sha256 is None or stamp.get("input_sha256") == input_sha256)
+    )
+
+
+def enrich_file(input_path: Path, output_path: Path, force: bool = False) -> Dict[str, Any]:
     """
     Enrich a single task-entry file.
 
     Args:
         input_path: Input file path
-        output_path: Output file path
-        overwrite: If True, replace original file
+        output_path: Output file path (the input itself for in-place)
+        force: Rewrite even if the output stamp is already current
 
     Returns:
-        True if successful, False otherwise
+        {"name", "status": "enriched" | "current" | "error", "timestamps",
+         "durations", "input", "output", "error"}
+        where input/output are fingerprints for the manifest.
+        Runs on worker threads, so it returns results instead of printing.
     """
+    result: Dict[str, Any] = {
+        "name": input_path.name,
+        "status": "error",
+        "timestamps": 0,
+        "durations": 0,
+        "input": None,
+        "output": None,
+        "error": None,
+    }
+    in_place = output_path == input_path
+
     try:
-        # Read input
-        with input_path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
+        with input_path.open("rb") as f:
+            st = os.fstat(f.fileno())
+            raw = f.read()
+        input_sha256 = hashlib.sha256(raw).hexdigest()
+        result["input"] = {"sha256": input_sha256, "mtime_ns": st.st_mtime_ns, "size": st.st_size}
+        data = json.loads(raw)
+
+        if not force:
+            stamp = data.get("enrichment") if in_place else load_manifest(output_path).get("enrichment")
+            if stamp_is_current(stamp, None if in_place else input_sha256):
+                result["status"] = "current"
+                result["output"] = result["input"] if in_place else file_fingerprint(output_path)
+                return result
 
-        # Enrich
         enriched = enrich_task_entry(data)
+        if in_place and stamp_is_current(data.get("enrichment")):
+            input_sha256 = data["enrichment"].get("input_sha256", input_sha256)  # --force: keep the original input
+        enriched["enrichment"] = {"version": ENRICHMENT_VERSION, "input_sha256": input_sha256}
+        atomic_write_json(output_path, enriched, ensure_ascii=False, indent=2)
 
-        # Count enrichments
         tasks = enriched.get("tasks", [])
-        timestamp_enriched = sum(1 for t in tasks if t.get("timestamp_source"))
-        duration_enriched = sum(1 for t in tasks if t.get("duration_source"))
+        result["timestamps"] = sum(1 for t in tasks if t.get("timestamp_source"))
+        result["durations"] = sum(1 for t in tasks if t.get("duration_source"))
+        result["output"] = file_fingerprint(output_path)
+        result["status"] = "enriched"
+    except Exception as e:
+        result["error"] = f"Error enriching {input_path}: {e}"
+    return result
 
-        # Write output
-        actual_output = input_path if overwrite else output_path
-        with actual_output.open("w", encoding="utf-8") as f:
-            json.dump(enriched, f, ensure_ascii=False, indent=2)
 
-        return True, timestamp_enriched, duration_enriched
+def output_path_for(input_path: Path, in_place: bool) -> Path:
+    """task-entry-D.json -> task-entry-D.enriched.json (or the input itself)."""
+    return input_path if in_place else input_path.with_name(input_path.stem + ENRICHED_SUFFIX)
 
-    except Exception as e:
-        print(f"❌ Error enriching {input_path}: {e}", file=sys.stderr)
-        return False, 0, 0
+
+def scan_state_dir(state_dir: Path) -> Dict[str, os.stat_result]:
+    """stat() of every task-entry-* file (inputs and outputs), from one directory scan."""
+    found: Dict[str, os.stat_result] = {}
+    with os.scandir(state_dir) as it:
+        for dirent in it:
+            if dirent.name.startswith("task-entry-") and dirent.is_file():
+                found[dirent.name] = dirent.stat()
+    return found
+
+
+def is_up_to_date(record: Optional[Dict[str, Any]], in_place: bool,
+                  input_fp: Optional[Dict[str, Any]], output_fp: Optional[Dict[str, Any]]) -> bool:
+    """True if a file was enriched in this mode and neither side changed since."""
+    if not record or record.get("in_place") != in_place or output_fp is None:
+        return False
+    if in_place:
+        return same_content(record.get("output"), input_fp)
+    return same_content(record.get("input"), input_fp) and same_content(record.get("output"), output_fp)
+
+
+def run_enrichment(work: List[Tuple[Path, Path, bool]], jobs: int) -> Iterator[Dict[str, Any]]:
+    """Enrich files in order, on a thread pool for larger batches."""
+    if jobs <= 1 or len(work) < PARALLEL_THRESHOLD:
+        for item in work:
+            yield enrich_file(*item)
+        return
+
+    # Threads, not processes: run-pipeline and benchmark-analytics call
+    # main() in-process, where this module cannot be pickled by name
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(lambda item: enrich_file(*item), work)
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     parser = argparse.ArgumentParser(
         description="Enrich task-entry files with source/confidence metadata"
     )
@@ -169,86 +274,156 @@ def main():
         help="Number of recent days to enrich (default: 7, used when --date not specified)",
     )
     parser.add_argument(
+        "--in-place",
         "--overwrite",
+        dest="in_place",
         action="store_true",
-        help="Overwrite original files instead of creating .enriched.json files (USE WITH CAUTION)",
+        help="Atomically replace the original files instead of creating .enriched.json files",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=0,
+        help="Worker threads (default: 0 = automatic)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Ignore the manifest and stamps and re-enrich every selected file",
     )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     if not STATE_DIR.exists():
         print(f"❌ State directory not found: {STATE_DIR}", file=sys.stderr)
         sys.exit(1)
 
-    # Determine which files to process
-    files_to_process = []
+    # One directory scan: inputs, outputs and their stats
+    stats = scan_state_dir(STATE_DIR)
+    inputs = {}
+    for name in stats:
+        match = TASK_ENTRY_RE.match(name)
+        if match:
+            inputs[match.group(1)] = name
 
+    # Determine which files to process
     if args.date:
-        # Single date
-        input_file = STATE_DIR / f"task-entry-{args.date}.json"
-        if input_file.exists():
-            files_to_process.append(input_file)
-        else:
-            print(f"❌ File not found: {input_file}", file=sys.stderr)
+        if args.date not in inputs:
+            print(f"❌ File not found: {STATE_DIR / f'task-entry-{args.date}.json'}", file=sys.stderr)
             sys.exit(1)
+        selected = [args.date]
     elif args.all:
-        # All files
-        files_to_process = sorted(STATE_DIR.glob("task-entry-*.json"))
-        # Exclude already enriched files
-        files_to_process = [f for f in files_to_process if "-enriched.json" not in f.name]
+        # Canonical names only: *.enriched.json outputs are never inputs
+        selected = sorted(inputs)
     else:
         # Recent N days
-        today = datetime.now().date()
-        for i in range(args.days):
-            date = today - timedelta(days=i)
-            date_str = date.strftime("%Y-%m-%d")
-            input_file = STATE_DIR / f"task-entry-{date_str}.json"
-            if input_file.exists():
-                files_to_process.append(input_file)
-
-    if not files_to_process:
+        selected = sorted(d for d in window_dates(args.days) if d in inputs)
+
+    if not selected:
         print("❌ No files to process", file=sys.stderr)
         sys.exit(1)
 
-    print(f"🔍 Enriching {len(files_to_process)} task-entry files...", file=sys.stderr)
-    if args.overwrite:
-        print("⚠️  OVERWRITE MODE: Original files will be replaced", file=sys.stderr)
+    manifest_path = STATE_DIR / MANIFEST_NAME
+    manifest = {} if args.force else load_manifest(manifest_path)
+    records = manifest.get("files", {}) if manifest.get("enrichment_version") == ENRICHMENT_VERSION else {}
+    changed = records != manifest.get("files")
+
+    work = []
+    unchanged = 0
+    for date_str in selected:
+        name = inputs[date_str]
+        input_path = STATE_DIR / name
+        output_path = output_path_for(input_path, args.in_place)
+        record = records.get(name)
+        previous = record or {}
+
+        input_fp = file_fingerprint(
+            input_path, previous.get("output" if args.in_place else "input"), stats[name])
+        if args.in_place:
+            output_fp = input_fp
+        else:
+            output_st = stats.get(output_path.name)
+            output_fp = file_fingerprint(output_path, previous.get("output"), output_st) if output_st else None
+
+        if not args.force and is_up_to_date(record, args.in_place, input_fp, output_fp):
+            # Refresh stat info so touched-but-identical files stay cheap
+            refreshed = {**record, "output": output_fp} if args.in_place else {**record, "input": input_fp, "output": output_fp}
+            changed = changed or refreshed != record
+            records[name] = refreshed
+            unchanged += 1
+            continue
+        work.append((input_path, output_path, args.force))
+
+    jobs = args.jobs if args.jobs > 0 else min(8, (os.cpu_count() or 1) + 4)
+
+    if not work:
+        print(f"✅ All {len(selected)} task-entry files already enriched (v{ENRICHMENT_VERSION})", file=sys.stderr)
     else:
-        print("✅ Safe mode: Creating .enriched.json files", file=sys.stderr)
-    print()
+        print(f"🔍 Enriching {len(work)} task-entry files ({unchanged} unchanged, skipped; jobs: {jobs})...",
+              file=sys.stderr)
+        if args.in_place:
+            print("⚠️  IN-PLACE MODE: Original files will be replaced (atomically)", file=sys.stderr)
+        else:
+            print("✅ Safe mode: Creating .enriched.json files", file=sys.stderr)
+        print()
 
     # Process files
     processed = 0
+    current = 0
     total_timestamp_enriched = 0
     total_duration_enriched = 0
-
-    for input_path in files_to_process:
-        output_path = input_path.parent / input_path.name.replace(".json", ".enriched.json")
-
-        success, ts_count, dur_count = enrich_file(input_path, output_path, args.overwrite)
-
-        if success:
-            processed += 1
-            total_timestamp_enriched += ts_count
-            total_duration_enriched += dur_count
-
-            mode = "✍️" if args.overwrite else "→"
-            output_display = input_path.name if args.overwrite else output_path.name
-            print(f"✅ {input_path.name} {mode} {output_display}")
-            print(f"   Enriched: {ts_count} timestamps, {dur_count} durations")
+    start = time.perf_counter()
+
+    for result in run_enrichment(work, jobs):
+        if result["error"]:
+            print(f"❌ {result['error']}", file=sys.stderr)
+            continue
+
+        name = result["name"]
+        records[name] = {"in_place": args.in_place, "input": result["input"], "output": result["output"]}
+        changed = True
+        if result["status"] == "current":
+            current += 1
+            continue
+
+        processed += 1
+        total_timestamp_enriched += result["timestamps"]
+        total_duration_enriched += result["durations"]
+
+        mode = "✍️" if args.in_place else "→"
+        output_display = output_path_for(Path(name), args.in_place).name
+        print(f"✅ {name} {mode} {output_display}")
+        print(f"   Enriched: {result['timestamps']} timestamps, {result['durations']} durations")
+
+    spans.write_span("enrich-task-metadata.enrich", (time.perf_counter() - start) * 1000, processed)
+
+    # Drop records of inputs that no longer exist
+    for name in [name for name in records if name not in stats]:
+        del records[name]
+        changed = True
+    if changed:
+        save_manifest(manifest_path, {
+            "enrichment_version": ENRICHMENT_VERSION,
+            "updated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "files": records,
+        })
+
+    if not work:
+        return
 
     print()
     print(f"📊 Summary:", file=sys.stderr)
-    print(f"   Files processed: {processed}/{len(files_to_process)}", file=sys.stderr)
+    print(f"   Files processed: {processed}/{len(work)} ({current} already current)", file=sys.stderr)
+    print(f"   Files unchanged since last run: {unchanged}", file=sys.stderr)
     print(f"   Total timestamp enrichments: {total_timestamp_enriched}", file=sys.stderr)
     print(f"   Total duration enrichments: {total_duration_enriched}", file=sys.stderr)
     print()
 
-    if not args.overwrite:
+    if not args.in_place:
         print("💡 Next steps:", file=sys.stderr)
         print("   1. Verify enriched files: diff cortex/state/task-entry-YYYY-MM-DD.json cortex/state/task-entry-YYYY-MM-DD.enriched.json", file=sys.stderr)
         print("   2. Test with analysis: python3 scripts/analyze-duration.py", file=sys.stderr)
-        print("   3. If satisfied, re-run with --overwrite to replace originals", file=sys.stderr)
+        print("   3. If satisfied, re-run with --in-place to replace originals", file=sys.stderr)
     else:
         print("✅ Enrichment complete! Run analytics to see the impact:", file=sys.stderr)
         print("   python3 scripts/analyze-duration.py", file=sys.stderr)
@@ -256,4 +431,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    profiling.run_main(main)
@@ -17,8 +17,12 @@ Supported formats:
   - Satisfaction: 7/10
   - Free-form reflection text (for sentiment analysis)
 
+The output begins with a "_meta" header line (cortex_lib/result_cache.py)
+fingerprinting the arguments, the run date and the window's digests; an
+unchanged fingerprint reuses the existing output. --no-cache recomputes.
+
 Usage:
-    python scripts/extract-feedback.py [--days 30]
+    python scripts/extract-feedback.py [--days 30] [--no-cache]
 """
 
 import json
@@ -29,6 +33,13 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 import argparse
 
+SCRIPTS_DIR = Path(__file__).resolve().parent
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from cortex_lib import digest_cache, profiling, result_cache, spans  # noqa: E402
+from cortex_lib.digest_cache import extract_reflection  # noqa: E402,F401
+
 
 DAILY_DIR = Path("cortex/daily")
 STATE_DIR = Path("cortex/state")
@@ -43,34 +54,16 @@ MOOD_MAP = {
 }
 
 
-def load_digest(date_str: str) -> Optional[str]:
-    """Load a daily digest file."""
+def load_parsed_digest(date_str: str) -> Optional[Dict[str, Any]]:
+    """Load a daily digest through the shared parsed-digest cache."""
     digest_file = DAILY_DIR / f"{date_str}-digest.md"
-    if not digest_file.exists():
-        return None
     try:
-        return digest_file.read_text(encoding="utf-8")
+        return digest_cache.load_parsed_digest(digest_file, date_str)
     except Exception as e:
         print(f"⚠️  Error reading {digest_file}: {e}", file=sys.stderr)
         return None
 
 
-def extract_reflection(content: str) -> Optional[str]:
-    """Extract the Reflection section from digest content."""
-    # Look for ## Reflection section
-    match = re.search(
-        r"^## Reflection\s*\n(.*?)(?=^##|\Z)",
-        content,
-        re.MULTILINE | re.DOTALL
-    )
-    if match:
-        reflection = match.group(1).strip()
-        # Remove empty placeholder text
-        if reflection and "（今日の振り返り" not in reflection:
-            return reflection
-    return None
-
-
 def extract_mood(reflection: str) -> Optional[int]:
     """Extract mood emoji and convert to numeric score (1-5)."""
     # Look for "Mood: 😀" or just standalone mood emojis
@@ -139,11 +132,11 @@ def simple_sentiment(text: str) -> str:
 
 def extract_feedback_for_date(date_str: str) -> Optional[Dict[str, Any]]:
     """Extract feedback data for a single date."""
-    content = load_digest(date_str)
-    if not content:
+    parsed = load_parsed_digest(date_str)
+    if not parsed:
         return None
     
-    reflection = extract_reflection(content)
+    reflection = parsed["reflection"]
     if not reflection:
         return None
     
@@ -269,7 +262,21 @@ def generate_insights(entries: List[Dict[str, Any]], trends: Dict[str, str]) ->
     return insights
 
 
-def main():
+def window_dates(days: int) -> List[str]:
+    """Digest dates of the past N days, newest first (today included)."""
+    today = datetime.now().date()
+    return [(today - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(days)]
+
+
+def result_fingerprint(args: argparse.Namespace, dates: List[str]) -> str:
+    """Result cache fingerprint: arguments, run date and the window's digest files."""
+    key = {"args": result_cache.args_key(args), "today": dates[0] if dates else None}
+    return result_cache.input_fingerprint(
+        key, result_cache.file_signatures(DAILY_DIR / f"{date_str}-digest.md" for date_str in dates)
+    )
+
+
+def main(argv: Optional[List[str]] = None):
     parser = argparse.ArgumentParser(description="Extract feedback from daily digests")
     parser.add_argument(
         "--days",
@@ -283,8 +290,13 @@ def main():
         default="cortex/state/feedback-history.json",
         help="Output file path",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Recompute even if the inputs are unchanged since the output was written",
+    )
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     print(f"📊 Extracting feedback (past {args.days} days)...", file=sys.stderr)
     
@@ -292,16 +304,22 @@ def main():
         print(f"❌ Daily directory not found: {DAILY_DIR}", file=sys.stderr)
         sys.exit(1)
     
+    dates = window_dates(args.days)
+    output_path = Path(args.output)
+    fingerprint = result_fingerprint(args, dates)
+    cached = None if args.no_cache else result_cache.load_result(output_path, fingerprint)
+    if cached is not None:
+        print(f"⏭️  Inputs unchanged, keeping {output_path}", file=sys.stderr)
+        print(json.dumps(cached, ensure_ascii=False))
+        return
+    
     entries: List[Dict[str, Any]] = []
-    today = datetime.now().date()
     
-    for i in range(args.days):
-        date = today - timedelta(days=i)
-        date_str = date.strftime("%Y-%m-%d")
-        
-        entry = extract_feedback_for_date(date_str)
-        if entry:
-            entries.append(entry)
+    with spans.span("extract-feedback.extract", items=args.days):
+        for date_str in dates:
+            entry = extract_feedback_for_date(date_str)
+            if entry:
+                entries.append(entry)
     
     # Sort by date
     entries.sort(key=lambda e: e["date"])
@@ -320,9 +338,7 @@ def main():
         "insights": insights,
     }
     
-    output_path = Path(args.output)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+    result_cache.write_result(output_path, result, fingerprint, summary={"total_entries": len(entries)})
     
     print(f"✅ Feedback history saved to {output_path}", file=sys.stderr)
     
@@ -336,4 +352,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    profiling.run_main(main)
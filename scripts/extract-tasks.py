@@ -9,21 +9,48 @@ Sources:
   - TODO.md (todo sync)
   - data/tomorrow.json (wrap-up)
 
+Categories come from cortex/config/category-rules.json
+(cortex_lib/categories.py), falling back to the first #tag.
+
 Output:
   - cortex/state/task-entry-YYYY-MM-DD.json
+  - cortex/state/day-agg-YYYY-MM-DD.json (per-day aggregates, cortex_lib/day_agg.py)
+  - cortex/state/.extract-manifest.json (input fingerprints per date)
+  - cortex/state/tasks.db, when the task store exists (written through)
+
+Incremental mode:
+  Each date's inputs (its digest, plus TODO.md and data/tomorrow.json for
+  today) are fingerprinted into the manifest together with the extractor
+  version. Dates whose inputs are unchanged are neither re-parsed nor
+  rewritten, so their task-entry mtimes stay stable.
 
 Usage:
-    python scripts/extract-tasks.py [--date YYYY-MM-DD] [--days 30]
+    python scripts/extract-tasks.py [--date YYYY-MM-DD] [--days 30] [--force]
 """
 
 import json
 import re
 import sys
+import time
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional, Tuple
 import argparse
 
+SCRIPTS_DIR = Path(__file__).resolve().parent
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from cortex_lib import categories, day_agg, digest_cache, profiling, spans, task_store  # noqa: E402
+from cortex_lib.digest_cache import parse_checkboxes  # noqa: E402
+from cortex_lib.fingerprint import file_fingerprint, load_manifest, same_content, save_manifest  # noqa: E402
+
+
+# Bump when parsing or output format changes: invalidates the whole manifest
+# (so does a change to cortex/config/category-rules.json)
+EXTRACTOR_VERSION = "1.2.0"
+MANIFEST_NAME = ".extract-manifest.json"
+
 
 def parse_markdown_tasks(content: str, source: str, date: str) -> List[Dict[str, Any]]:
     """
@@ -34,64 +61,63 @@ def parse_markdown_tasks(content: str, source: str, date: str) -> List[Dict[str,
       - [x] Completed task
       - [X] Completed task
     """
+    return tasks_from_checkboxes(parse_checkboxes(content), source, date)
+
+
+def tasks_from_checkboxes(checkboxes: List[Tuple[str, str]], source: str, date: str) -> List[Dict[str, Any]]:
+    """Build task dicts from (status_char, title) checkbox pairs."""
     tasks = []
-    task_pattern = r'^\s*-\s*\[([xX ])\]\s*(.+)$'
+    classify, default_category = categories.load_classifier()
     
-    for line in content.split('\n'):
-        match = re.match(task_pattern, line)
-        if match:
-            status_char = match.group(1)
-            title = match.group(2).strip()
-            
-            # Skip empty titles
-            if not title:
-                continue
-            
-            # Determine status
-            status = 'done' if status_char.lower() == 'x' else 'pending'
-            
-            # Extract category from tags (e.g., #work)
-            category = None
+    for status_char, title in checkboxes:
+        # Skip empty titles
+        if not title:
+            continue
+        
+        # Determine status
+        status = 'done' if status_char.lower() == 'x' else 'pending'
+        
+        # Category: first matching category rule, else the first tag (e.g., #work),
+        # else the rules' default category
+        category = classify(title)
+        if not category:
             tag_match = re.search(r'#(\w+)', title)
-            if tag_match:
-                category = tag_match.group(1)
-            
-            # Generate task ID
-            task_id = f"{date}-{len(tasks)+1}"
-            
-            task = {
-                "id": task_id,
-                "title": title,
-                "status": status,
-                "source": source
-            }
-            
-            if category:
-                task["category"] = category
-            
-            if status == 'done':
-                task["completed_at"] = f"{date}T12:00:00Z"
-            
-            tasks.append(task)
+            category = tag_match.group(1) if tag_match else default_category
+        
+        # Generate task ID
+        task_id = f"{date}-{len(tasks)+1}"
+        
+        task = {
+            "id": task_id,
+            "title": title,
+            "status": status,
+            "source": source
+        }
+        
+        task["category"] = category
+        
+        if status == 'done':
+            task["completed_at"] = f"{date}T12:00:00Z"
+        
+        tasks.append(task)
     
     return tasks
 
 
 def extract_from_daily_digest(date_str: str) -> List[Dict[str, Any]]:
-    """Extract tasks from daily digest file."""
+    """Extract tasks from daily digest file (via the parsed-digest cache)."""
     file_path = Path(f"cortex/daily/{date_str}-digest.md")
     
-    if not file_path.exists():
-        return []
-    
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        return parse_markdown_tasks(content, "daily-digest", date_str)
+        parsed = digest_cache.load_parsed_digest(file_path, date_str)
     except Exception as e:
         print(f"Warning: Failed to extract from {file_path}: {e}", file=sys.stderr)
         return []
+    
+    if parsed is None:
+        return []
+    
+    return tasks_from_checkboxes(parsed["checkboxes"], "daily-digest", date_str)
 
 
 def extract_from_todo(date_str: str) -> List[Dict[str, Any]]:
@@ -209,11 +235,47 @@ def generate_task_entry(date_str: str) -> Dict[str, Any]:
     }
 
 
-def main():
+def source_paths(date_str: str, is_today: bool) -> Dict[str, Path]:
+    """Input files that generate_task_entry() reads for a date."""
+    paths = {"digest": Path(f"cortex/daily/{date_str}-digest.md")}
+    if is_today:
+        paths["todo"] = Path("TODO.md")
+        paths["tomorrow"] = Path("data/tomorrow.json")
+    return paths
+
+
+def fingerprint_inputs(date_str: str, is_today: bool, record: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Fingerprint a date's inputs, reusing recorded hashes for unchanged stats."""
+    previous = (record or {}).get("inputs", {})
+    return {
+        key: file_fingerprint(path, previous.get(key))
+        for key, path in source_paths(date_str, is_today).items()
+    }
+
+
+def is_up_to_date(record: Optional[Dict[str, Any]], inputs: Dict[str, Any],
+                  is_today: bool, output_file: Path) -> bool:
+    """True if a date's inputs match the manifest record and its output is intact."""
+    if not record or record.get("is_today") != is_today:
+        return False
+
+    recorded = record.get("inputs", {})
+    if set(recorded) != set(inputs):
+        return False
+    if not all(same_content(recorded[key], inputs[key]) for key in inputs):
+        return False
+
+    # A previously written entry that has since been deleted must be rebuilt
+    return not record.get("written") or output_file.exists()
+
+
+def main(argv: Optional[List[str]] = None):
     parser = argparse.ArgumentParser(description="Extract tasks and generate task-entry.json")
     parser.add_argument('--date', type=str, help='Specific date (YYYY-MM-DD)')
     parser.add_argument('--days', type=int, default=30, help='Number of days to process')
-    args = parser.parse_args()
+    parser.add_argument('--force', action='store_true',
+                        help='Ignore the manifest and re-extract every date')
+    args = parser.parse_args(argv)
     
     # Create output directory
     output_dir = Path("cortex/state")
@@ -233,22 +295,61 @@ def main():
             dates.append(current.strftime("%Y-%m-%d"))
             current += timedelta(days=1)
     
+    manifest_path = output_dir / MANIFEST_NAME
+    manifest = {} if args.force else load_manifest(manifest_path)
+    rules = file_fingerprint(categories.RULES_PATH, manifest.get("category_rules"))
+    if manifest.get("extractor_version") == EXTRACTOR_VERSION and same_content(manifest.get("category_rules"), rules):
+        records = manifest.get("dates", {})
+    else:
+        records = {}
+
+    store = task_store.open_store()
+    today_str = datetime.now().strftime("%Y-%m-%d")
     processed = 0
+    unchanged = 0
+    start = time.perf_counter()
     for date_str in dates:
+        is_today = date_str == today_str
+        output_file = output_dir / f"task-entry-{date_str}.json"
+        record = records.get(date_str)
+        inputs = fingerprint_inputs(date_str, is_today, record)
+
+        if is_up_to_date(record, inputs, is_today, output_file):
+            # Refresh stat info so touched-but-identical files stay cheap
+            record["inputs"] = inputs
+            unchanged += 1
+            continue
+
         entry = generate_task_entry(date_str)
+        written = entry['metadata']['total_tasks'] > 0
         
         # Only save if there are tasks
-        if entry['metadata']['total_tasks'] > 0:
-            output_file = output_dir / f"task-entry-{date_str}.json"
+        if written:
             with open(output_file, 'w', encoding='utf-8') as f:
                 json.dump(entry, f, indent=2, ensure_ascii=False)
+            day_agg.write_day_agg(date_str, entry, output_file)
+            if store is not None:
+                task_store.write_entry(store, date_str, entry, output_file)
             
             print(f"✓ {date_str}: {entry['metadata']['total_tasks']} tasks ({entry['metadata']['completed']} completed)")
             processed += 1
+
+        records[date_str] = {"inputs": inputs, "is_today": is_today, "written": written}
+
+    if store is not None:
+        store.close()
+
+    save_manifest(manifest_path, {
+        "extractor_version": EXTRACTOR_VERSION,
+        "category_rules": rules,
+        "updated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "dates": records,
+    })
+    spans.write_span("extract-tasks.extract", (time.perf_counter() - start) * 1000, len(dates))
     
-    print(f"\n✅ Processed {processed} dates")
+    print(f"\n✅ Processed {processed} dates ({unchanged} unchanged, skipped)")
     print(f"📁 Output: cortex/state/task-entry-*.json")
 
 
 if __name__ == "__main__":
-    main()
+    profiling.run_main(main)
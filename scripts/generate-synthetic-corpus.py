@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Synthetic Corpus Generator
+
+Writes a seeded, realistic cortex/ tree (digests, task entries, recipe
+JSONL + legacy logs) for benchmarking the analytics scripts at scale.
+See cortex_lib/synthetic.py for the formats produced.
+
+Usage:
+    python scripts/generate-synthetic-corpus.py --output /tmp/corpus [--days 365]
+        [--tasks-per-day 20] [--log-lines 100] [--seed 42] [--end-date YYYY-MM-DD]
+
+Then run any script from inside the corpus:
+    cd /tmp/corpus && python /path/to/scripts/analyze-duration.py --days 365
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from cortex_lib.synthetic import generate_corpus  # noqa: E402
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic Cortex corpus")
+    parser.add_argument("--output", type=str, required=True,
+                        help="Directory to create cortex/ in")
+    parser.add_argument("--days", type=int, default=365, help="Days of history (default: 365)")
+    parser.add_argument("--tasks-per-day", type=int, default=20, help="Tasks per day (default: 20)")
+    parser.add_argument("--log-lines", type=int, default=100,
+                        help="Log lines per recipe per day (default: 100)")
+    parser.add_argument("--seed", type=int, default=42, help="RNG seed (default: 42)")
+    parser.add_argument("--end-date", type=str,
+                        help="Last day of the corpus, YYYY-MM-DD (default: today)")
+    args = parser.parse_args(argv)
+
+    end_date = datetime.strptime(args.end_date, "%Y-%m-%d").date() if args.end_date else None
+    root = Path(args.output)
+
+    if (root / "cortex").exists():
+        print(f"⚠️  {root / 'cortex'} already exists; files will be overwritten", file=sys.stderr)
+
+    start = time.perf_counter()
+    stats = generate_corpus(root, args.days, args.tasks_per_day, args.log_lines, args.seed, end_date)
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ Generated {stats['digests']} digests, {stats['tasks']} tasks, "
+          f"{stats['jsonl_lines'] + stats['log_lines']} log lines in {elapsed:.2f}s → {root / 'cortex'}",
+          file=sys.stderr)
+    print(json.dumps(stats, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -18,6 +18,11 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parents[1]
 DAILY_DIR = ROOT / "cortex" / "daily"
 
+if str(ROOT / "scripts") not in sys.path:
+    sys.path.insert(0, str(ROOT / "scripts"))
+
+from cortex_lib import profiling  # noqa: E402
+
 
 def get_jst_now():
     """Get current time in JST (UTC+9)"""
@@ -110,4 +115,4 @@ Examples:
 
 
 if __name__ == "__main__":
-    main()
+    profiling.run_main(main)
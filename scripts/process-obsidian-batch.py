@@ -3,310 +3,38 @@
 Process Obsidian Daily Digests from Batch Read
 
 Processes multiple daily digest markdown contents and generates
-task-entry-*.json files for analytics.
+task-entry-*.json files for analytics, each with its day-agg-*.json
+aggregate sidecar (and syncs cortex/state/tasks.db when the task store
+exists).
 
 Usage:
     python scripts/process-obsidian-batch.py
+    python scripts/process-obsidian-batch.py --from-files [--jobs N]
 """
 
 import json
-import re
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
+SCRIPTS_DIR = Path(__file__).resolve().parent
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
 
-STATE_DIR = Path("cortex/state")
-
-
-def extract_timerange_from_text(text: str) -> tuple[str | None, str | None, str]:
-    """
-    Extract time range from text like (18:20-18:30 JST).
-    Returns (start_time, end_time, cleaned_text) tuple.
-    Times are returned in HH:MM format.
-    """
-    # Pattern: (HH:MM-HH:MM JST) or (HH:MM-HH:MM)
-    timerange_pattern = r'\((\d{2}:\d{2})-(\d{2}:\d{2})(?:\s*JST)?\)'
-    match = re.search(timerange_pattern, text)
-
-    if match:
-        start_time = match.group(1)
-        end_time = match.group(2)
-        # Remove the time range from text
-        text = re.sub(timerange_pattern, '', text).strip()
-        text = re.sub(r'\s+', ' ', text).strip()
-        return start_time, end_time, text
-
-    return None, None, text
-
+from cortex_lib import categories, day_agg, digest_cache, profiling, spans, task_store  # noqa: E402
 
-def extract_duration_from_text(text: str) -> tuple[int | None, str, str]:
-    """
-    Extract duration from text using multiple patterns.
-    Returns (duration_minutes, duration_source, cleaned_text) tuple.
-
-    duration_source values:
-    - "explicit": Explicitly stated duration (10分, 10m, **所要時間**: 10m)
-    - None: No duration found
-    """
-    duration = None
-    duration_source = None
-
-    # Try multiple patterns
-    duration_patterns = [
-        (r'\((\d+)分\)', 1),         # (30分)
-        (r'(\d+)分', 1),             # 30分
-        (r'\((\d+)m\)', 1),          # (10m)
-        (r'(\d+)m(?!\w)', 1),        # 10m (not followed by word chars)
-        (r'\*\*所要時間\*\*:\s*(\d+)m', 1),  # **所要時間**: 10m
-        (r'\*\*所要時間\*\*:\s*(\d+)分', 1),  # **所要時間**: 10分
-    ]
+# Single-pass digest parser (see cortex_lib/digest_parser.py)
+from cortex_lib.digest_parser import (  # noqa: E402,F401
+    extract_duration_from_text,
+    extract_timerange_from_text,
+    parse_daily_digest,
+)
 
-    for pattern, _ in duration_patterns:
-        duration_match = re.search(pattern, text)
-        if duration_match:
-            duration = int(duration_match.group(1))
-            duration_source = "explicit"
-            # Remove the duration from text
-            text = re.sub(pattern, '', text).strip()
-            # Clean up extra whitespace
-            text = re.sub(r'\s+', ' ', text).strip()
-            break
 
-    return duration, duration_source, text
-
-
-def parse_daily_digest(content: str, date_str: str) -> Dict[str, Any]:
-    """
-    Parse a daily digest markdown content and extract task data.
-
-    Supports multiple formats:
-    1. Task list: - [x] Task title (30分)
-    2. Table: | Time | Task | Duration |
-    3. Progress section: ### Title (time) + **所要時間**: Xm
-
-    Returns task entry dict in format:
-    {
-        "tasks": [
-            {
-                "title": "Task title",
-                "status": "completed" | "incomplete",
-                "category": "high-priority" | "normal" | "untagged",
-                "completed_at": "ISO8601" or None,
-                "duration_minutes": int or None
-            }
-        ]
-    }
-    """
-    tasks = []
-    current_category = "untagged"
-
-    lines = content.split("\n")
-
-    # Phase 1: Parse task list format
-    for line in lines:
-        line = line.strip()
-
-        # Detect category headers
-        if "優先度：高" in line or "優先度: 高" in line or "High Priority" in line:
-            current_category = "high-priority"
-            continue
-        elif "通常タスク" in line or "Regular Tasks" in line:
-            current_category = "normal"
-            continue
-        elif "タグなしタスク" in line or "No Tags" in line:
-            current_category = "untagged"
-            continue
-
-        # Parse task lines: - [x] or - [ ]
-        task_match = re.match(r'^-\s*\[([ xX✓])\]\s+(.+)$', line)
-        if task_match:
-            is_completed = task_match.group(1).lower() in ['x', '✓']
-            task_text = task_match.group(2).strip()
-
-            # Skip placeholder tasks
-            if "タスクなし" in task_text or "今日の主な進捗" in task_text:
-                continue
-
-            # Extract time range first (highest priority)
-            start_time, end_time, task_text = extract_timerange_from_text(task_text)
-
-            # Extract duration using unified function
-            duration, duration_source, task_text = extract_duration_from_text(task_text)
-
-            task = {
-                "title": task_text,
-                "status": "completed" if is_completed else "incomplete",
-                "category": current_category
-            }
-
-            # Timestamp handling with source/confidence
-            if start_time and end_time:
-                # Timerange found: highest confidence
-                task["started_at"] = f"{date_str}T{start_time}:00+09:00"
-                task["completed_at"] = f"{date_str}T{end_time}:00+09:00"
-                task["timestamp_source"] = "timerange"
-                task["timestamp_confidence"] = 0.7
-
-                # Calculate duration from timerange if not explicitly provided
-                if not duration:
-                    start_h, start_m = map(int, start_time.split(':'))
-                    end_h, end_m = map(int, end_time.split(':'))
-                    duration_mins = (end_h * 60 + end_m) - (start_h * 60 + start_m)
-                    if 1 <= duration_mins <= 240:  # Sanity check: 1-240 minutes
-                        task["duration_minutes"] = duration_mins
-                        task["duration_source"] = "timerange"
-                        task["duration_confidence"] = 0.7
-            elif is_completed:
-                # No timerange: use fixed placeholder (方針B)
-                task["completed_at"] = f"{date_str}T01:00:00Z"
-                task["timestamp_source"] = "fixed"
-                task["timestamp_confidence"] = 0.1
-            else:
-                task["completed_at"] = None
-                task["timestamp_source"] = "unknown"
-                task["timestamp_confidence"] = 0.0
-
-            # Duration handling with source/confidence
-            if duration and duration_source == "explicit":
-                task["duration_minutes"] = duration
-                task["duration_source"] = "explicit"
-                task["duration_confidence"] = 1.0
-            elif "duration_source" not in task:
-                # No duration info at all
-                task["duration_source"] = "unknown"
-                task["duration_confidence"] = 0.0
-
-            tasks.append(task)
-
-    # Phase 2: Parse table format (| Time | Task | Duration |)
-    in_table = False
-    for i, line in enumerate(lines):
-        line = line.strip()
-
-        # Detect table header row
-        if re.match(r'\|\s*時刻\s*\|.*\|\s*時間\s*\|', line, re.IGNORECASE):
-            in_table = True
-            continue
-
-        # Skip separator row
-        if in_table and re.match(r'\|[-:\s]+\|', line):
-            continue
-
-        # Parse table data rows
-        if in_table and line.startswith('|') and not re.match(r'\|[-:\s]+\|', line):
-            parts = [p.strip() for p in line.split('|')]
-            if len(parts) >= 4:  # | time | task | duration |
-                time_text = parts[1]
-                task_title = parts[2]
-                duration_text = parts[3] if len(parts) > 3 else ""
-
-                # Extract time range from time column
-                start_time, end_time, _ = extract_timerange_from_text(time_text)
-
-                # Extract duration from the duration column
-                duration, duration_source, _ = extract_duration_from_text(duration_text)
-
-                if task_title and task_title != "タスク":
-                    task = {
-                        "title": task_title,
-                        "status": "completed",  # Table tasks are assumed completed
-                        "category": "normal"
-                    }
-
-                    # Timestamp handling
-                    if start_time and end_time:
-                        task["started_at"] = f"{date_str}T{start_time}:00+09:00"
-                        task["completed_at"] = f"{date_str}T{end_time}:00+09:00"
-                        task["timestamp_source"] = "timerange"
-                        task["timestamp_confidence"] = 0.7
-
-                        # Calculate duration from timerange if not in duration column
-                        if not duration:
-                            start_h, start_m = map(int, start_time.split(':'))
-                            end_h, end_m = map(int, end_time.split(':'))
-                            duration_mins = (end_h * 60 + end_m) - (start_h * 60 + start_m)
-                            if 1 <= duration_mins <= 240:
-                                task["duration_minutes"] = duration_mins
-                                task["duration_source"] = "timerange"
-                                task["duration_confidence"] = 0.7
-                    else:
-                        # No time info: fixed placeholder
-                        task["completed_at"] = f"{date_str}T01:00:00Z"
-                        task["timestamp_source"] = "fixed"
-                        task["timestamp_confidence"] = 0.1
-
-                    # Duration handling
-                    if duration and duration_source == "explicit":
-                        task["duration_minutes"] = duration
-                        task["duration_source"] = "explicit"
-                        task["duration_confidence"] = 1.0
-                    elif "duration_source" not in task:
-                        task["duration_source"] = "unknown"
-                        task["duration_confidence"] = 0.0
-
-                    tasks.append(task)
-        elif in_table and not line.startswith('|'):
-            # End of table
-            in_table = False
-
-    # Phase 3: Parse progress section format (### Title (HH:MM-HH:MM JST) + **所要時間**: Xm)
-    for i, line in enumerate(lines):
-        line = line.strip()
-
-        # Detect section header with time range: ### Title (HH:MM-HH:MM JST)
-        section_match = re.match(r'^###\s+(.+?)\s*\((\d{2}:\d{2})-(\d{2}:\d{2})\s*JST\)', line)
-        if section_match:
-            section_title = section_match.group(1).strip()
-            start_time = section_match.group(2)
-            end_time = section_match.group(3)
-
-            # Look ahead for **所要時間**: Xm in the next few lines
-            duration = None
-            duration_source = None
-            for j in range(i + 1, min(i + 5, len(lines))):
-                next_line = lines[j].strip()
-                # Check for duration marker
-                if '**所要時間**:' in next_line or '**カテゴリ**:' in next_line:
-                    dur, dur_src, _ = extract_duration_from_text(next_line)
-                    if dur:
-                        duration = dur
-                        duration_source = dur_src
-                        break
-                # Stop if we hit another section or empty lines
-                if next_line.startswith('###') or (not next_line and j > i + 2):
-                    break
-
-            task = {
-                "title": section_title,
-                "status": "completed",
-                "category": "normal",
-                "started_at": f"{date_str}T{start_time}:00+09:00",
-                "completed_at": f"{date_str}T{end_time}:00+09:00",
-                "timestamp_source": "timerange",
-                "timestamp_confidence": 0.7
-            }
-
-            # Duration handling
-            if duration and duration_source == "explicit":
-                task["duration_minutes"] = duration
-                task["duration_source"] = "explicit"
-                task["duration_confidence"] = 1.0
-            else:
-                # Calculate from timerange
-                start_h, start_m = map(int, start_time.split(':'))
-                end_h, end_m = map(int, end_time.split(':'))
-                duration_mins = (end_h * 60 + end_m) - (start_h * 60 + start_m)
-                if 1 <= duration_mins <= 240:
-                    task["duration_minutes"] = duration_mins
-                    task["duration_source"] = "timerange"
-                    task["duration_confidence"] = 0.7
-                else:
-                    task["duration_source"] = "unknown"
-                    task["duration_confidence"] = 0.0
-
-            tasks.append(task)
-
-    return {"tasks": tasks}
+STATE_DIR = Path("cortex/state")
 
 
 # Digest data from MCP batch read
@@ -466,75 +194,162 @@ DIGEST_DATA = {
 }
 
 
-def load_digest_files() -> Dict[str, str]:
-    """Load digest files from cortex/daily/ directory."""
-    daily_dir = Path("cortex/daily")
+DAILY_DIR = Path("cortex/daily")
+
+
+def iter_digest_files(daily_dir: Path = DAILY_DIR) -> Iterator[Tuple[str, Path]]:
+    """Yield (date_str, path) for cortex/daily/YYYY-MM-DD-digest.md in date order."""
     if not daily_dir.exists():
-        return {}
+        return
 
-    digest_data = {}
+    # Filenames sort by date, so only paths (not contents) are held in memory
     for file_path in sorted(daily_dir.glob("????-??-??-digest.md")):
         # Extract date from filename: 2025-12-22-digest.md -> 2025-12-22
-        date_str = file_path.stem.replace("-digest", "")
+        yield file_path.stem.replace("-digest", ""), file_path
 
+
+def categorize_tasks(tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Copies of the parsed tasks with rule-based categories.
+
+    The digest header group (high-priority / normal / untagged) moves to
+    "section"; "category" comes from cortex/config/category-rules.json
+    (cortex_lib/categories.py). The parsed tasks may be cached, so they
+    are not modified.
+    """
+    classify, default_category = categories.load_classifier()
+    return [
+        {**task, "category": classify(task.get("title", "")) or default_category, "section": task.get("category")}
+        for task in tasks
+    ]
+
+
+def process_digest(date_str: str, source: Union[str, Path], state_dir: Path) -> Dict[str, Any]:
+    """
+    Parse one digest and write its task-entry JSON.
+
+    `source` is either the markdown content or a path to read it from.
+    Runs in worker processes under --jobs, so it returns plain counters
+    instead of printing.
+
+    Returns:
+        {"date", "tasks", "with_duration", "output", "error"}
+    """
+    result: Dict[str, Any] = {
+        "date": date_str,
+        "tasks": 0,
+        "with_duration": 0,
+        "output": None,
+        "error": None,
+    }
+
+    if isinstance(source, Path):
         try:
-            with file_path.open("r", encoding="utf-8") as f:
-                content = f.read()
-                digest_data[date_str] = content
+            # Parsed-digest cache: unchanged files are not reparsed
+            tasks = digest_cache.load_parsed_digest(source, date_str)["tasks"]
         except Exception as e:
-            print(f"⚠️  Error reading {file_path}: {e}", file=sys.stderr)
+            result["error"] = f"Error reading {source}: {e}"
+            return result
+    else:
+        tasks = parse_daily_digest(source, date_str)["tasks"]
+
+    tasks = categorize_tasks(tasks)
+    task_data = {"tasks": tasks}
+    result["tasks"] = len(tasks)
+    if result["tasks"] == 0:
+        return result
+
+    # Count tasks with duration
+    result["with_duration"] = sum(1 for t in task_data["tasks"] if "duration_minutes" in t)
 
-    return digest_data
+    # Write task entry JSON
+    output_file = state_dir / f"task-entry-{date_str}.json"
+    with output_file.open("w", encoding="utf-8") as f:
+        json.dump(task_data, f, ensure_ascii=False, indent=2)
+    day_agg.write_day_agg(date_str, task_data, output_file)
+    result["output"] = str(output_file)
 
+    return result
 
-def main():
+
+def _process_digest_item(item: Tuple[str, Union[str, Path], Path]) -> Dict[str, Any]:
+    """Pool entry point (must be a picklable top-level function)."""
+    return process_digest(*item)
+
+
+def run_digests(items: Iterable[Tuple[str, Union[str, Path]]], jobs: int) -> Iterator[Dict[str, Any]]:
+    """Process digests in date order, on a process pool when jobs > 1."""
+    work = ((date_str, source, STATE_DIR) for date_str, source in items)
+
+    if jobs <= 1:
+        for item in work:
+            yield _process_digest_item(item)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        # map() keeps input order; chunks amortise IPC for small digests
+        yield from pool.map(_process_digest_item, work, chunksize=8)
+
+
+def main(argv: Optional[List[str]] = None):
     import argparse
     parser = argparse.ArgumentParser(description='Process Obsidian daily digests')
     parser.add_argument('--from-files', action='store_true',
                        help='Load digests from cortex/daily/*.md files instead of DIGEST_DATA')
-    args = parser.parse_args()
+    parser.add_argument('--jobs', type=int, default=1,
+                       help='Worker processes for parsing/writing (default: 1, 0 = all CPUs)')
+    args = parser.parse_args(argv)
+
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
 
     STATE_DIR.mkdir(parents=True, exist_ok=True)
 
     # Choose data source
     if args.from_files:
-        digest_data = load_digest_files()
+        items: Iterable[Tuple[str, Union[str, Path]]] = iter_digest_files()
         source = "cortex/daily/"
     else:
-        digest_data = DIGEST_DATA
+        items = sorted(DIGEST_DATA.items())
         source = "DIGEST_DATA (embedded)"
 
     processed = 0
     extracted_total = 0
     duration_count = 0
 
-    print(f"🔍 Processing {len(digest_data)} daily digests from {source}...")
+    print(f"🔍 Processing daily digests from {source} (jobs: {jobs})...")
     print(f"   Output: {STATE_DIR}")
     print()
 
-    for date_str, content in sorted(digest_data.items()):
-        # Parse digest
-        task_data = parse_daily_digest(content, date_str)
-        task_count = len(task_data["tasks"])
+    start = time.perf_counter()
+    for result in run_digests(items, jobs):
+        date_str = result["date"]
 
-        if task_count == 0:
-            print(f"⏭️  {date_str}: No tasks found, skipping")
+        if result["error"]:
+            print(f"⚠️  {result['error']}", file=sys.stderr)
             continue
 
-        # Count tasks with duration
-        tasks_with_duration = sum(1 for t in task_data["tasks"] if "duration_minutes" in t)
-
-        # Write task entry JSON
-        output_file = STATE_DIR / f"task-entry-{date_str}.json"
-        with output_file.open("w", encoding="utf-8") as f:
-            json.dump(task_data, f, ensure_ascii=False, indent=2)
+        if result["tasks"] == 0:
+            print(f"⏭️  {date_str}: No tasks found, skipping")
+            continue
 
+        tasks_with_duration = result["with_duration"]
         duration_info = f" ({tasks_with_duration} with duration)" if tasks_with_duration > 0 else ""
-        print(f"✅ {date_str}: {task_count} tasks{duration_info} → {output_file}")
+        print(f"✅ {date_str}: {result['tasks']} tasks{duration_info} → {result['output']}")
         processed += 1
-        extracted_total += task_count
+        extracted_total += result["tasks"]
         duration_count += tasks_with_duration
 
+    spans.write_span("process-obsidian-batch.process", (time.perf_counter() - start) * 1000, extracted_total)
+
+    # Workers write JSON only; bring the task store (if any) up to date once
+    store = task_store.open_store()
+    if store is not None:
+        try:
+            synced = task_store.sync(store, STATE_DIR)
+        finally:
+            store.close()
+        print(f"🗄️  Task store: {synced} days updated")
+
     print()
     print(f"📊 Summary:")
     print(f"   Files processed: {processed}")
@@ -548,8 +363,8 @@ def main():
     print("   2. Run analytics: python3 scripts/analyze-category-heatmap.py")
     print("   3. Run analytics: python3 scripts/analyze-rhythm.py")
     print("   4. Run health check: python3 scripts/analyze-health.py --window-days 7")
+    print("   (or all at once: python3 scripts/run-pipeline.py)")
 
 
 if __name__ == "__main__":
-    import sys
-    main()
+    profiling.run_main(main)
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Nightly Analytics Pipeline
+
+Runs the analytics chain in a single process instead of one interpreter
+launch per script:
+
+    extract ─► [enrich] ─► day-aggs ─┬─► duration ─┐
+                                     ├─► rhythm   ─┤
+                                     └─► heatmap  ─┼─► health
+    recipes ───────────────────────────────────────┤
+    feedback ──────────────────────────────────────┘
+
+- Each stage calls the existing script's main() with an argv list
+- "enrich" only runs with --enrich-in-place: it rewrites the task entries
+  (enrich-task-metadata.py --all --in-place) so the analyzers see the
+  enriched fields, at the cost of new mtimes (every day-agg sidecar and
+  task-store row for a rewritten day is rebuilt once). Its default
+  .enriched.json copies are read by nothing downstream, so it is left
+  out of the graph otherwise
+- "day-aggs" rebuilds the window's missing or stale day-agg sidecars
+  (cortex_lib/day_agg.py) once, before duration/rhythm/heatmap fan out
+  and sum them, instead of each analyzer rebuilding the same ones
+- Independent stages run concurrently on a thread pool
+- Stages whose inputs, outputs and arguments are unchanged since their
+  last successful run are skipped (cortex/state/.pipeline-manifest.json).
+  The run date is part of every stage's key because the analysis windows
+  are relative to today, and health always runs because its freshness
+  score depends on the current time (analyze-health itself reuses its
+  score within the hour when no input changed; cortex_lib/result_cache.py).
+
+Script stdout (JSON for piping) is discarded; progress still goes to
+stderr and the run summary is printed to stdout as JSON.
+
+Usage:
+    python scripts/run-pipeline.py [--days 30] [--jobs 4] [--force] [--dry-run] [--enrich-in-place]
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from cortex_lib import day_agg, pipeline, profiling, spans  # noqa: E402
+
+
+STATE_DIR = Path("cortex/state")
+MANIFEST_PATH = STATE_DIR / ".pipeline-manifest.json"
+
+DIGESTS = "cortex/daily/*-digest.md"
+TASK_ENTRIES = "cortex/state/task-entry-*.json"
+DAY_AGGS = "cortex/state/day-agg-*.json"
+# Live, rotated and compressed recipe log segments (cortex_lib/log_segments.py)
+RECIPE_LOGS = ["cortex/logs/recipe-*.log*", "cortex/logs/recipe-*.jsonl*"]
+
+_modules: Dict[str, Any] = {}
+
+
+def load_script(name: str) -> Any:
+    """Import scripts/<name>.py as a module (hyphenated names are not importable)."""
+    if name not in _modules:
+        spec = importlib.util.spec_from_file_location(name.replace("-", "_"), SCRIPTS_DIR / f"{name}.py")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _modules[name] = module
+    return _modules[name]
+
+
+def script_runner(name: str, argv: List[str]) -> Callable[[], None]:
+    """Stage callable that runs scripts/<name>.py main(argv) in-process."""
+    def run() -> None:
+        load_script(name).main(argv)
+    return run
+
+
+def build_stages(days: int, recipe_days: int, window_days: int, no_cache: bool = False,
+                 enrich_in_place: bool = False) -> List[Dict[str, Any]]:
+    """
+    The nightly stage graph.
+
+    Args:
+        no_cache: The analyzers recompute instead of reusing their outputs
+        enrich_in_place: Add the "enrich" stage, rewriting the task entries
+            with their enriched fields before the analyzers read them
+    """
+    today = datetime.now().date().isoformat()
+    cache = ["--no-cache"] if no_cache else []
+
+    def stage(name: str, deps: List[str], run: Callable[[], None], argv: List[str],
+              inputs: List[str], outputs: List[str], always: bool = False) -> Dict[str, Any]:
+        return {
+            "name": name,
+            "deps": deps,
+            "run": run,
+            "inputs": inputs,
+            "outputs": outputs,
+            "key": [today, argv],
+            "always": always,
+        }
+
+    def script(name: str, script_name: str, deps: List[str], argv: List[str],
+               inputs: List[str], outputs: List[str], always: bool = False) -> Dict[str, Any]:
+        return {
+            **stage(name, deps, script_runner(script_name, argv), argv, inputs, outputs, always),
+            "script": script_name,
+        }
+
+    def build_day_aggs() -> None:
+        aggs = day_agg.load_window(days, STATE_DIR)
+        print(f"✅ Day aggregates current for {len(aggs)} task entries", file=sys.stderr)
+
+    enrich = []
+    if enrich_in_place:
+        enrich = [script("enrich", "enrich-task-metadata", ["extract"], ["--all", "--in-place"],
+                         [TASK_ENTRIES], [])]
+
+    analytics_inputs = [TASK_ENTRIES, DAY_AGGS]
+    return [
+        script("extract", "extract-tasks", [], ["--days", str(days)],
+               [DIGESTS, "TODO.md", "data/tomorrow.json"], [TASK_ENTRIES]),
+        *enrich,
+        stage("day-aggs", ["enrich" if enrich_in_place else "extract"], build_day_aggs, [str(days)],
+              [TASK_ENTRIES], [DAY_AGGS]),
+        script("duration", "analyze-duration", ["day-aggs"], ["--days", str(days), *cache],
+               analytics_inputs, ["cortex/state/duration-patterns.json"]),
+        script("rhythm", "analyze-rhythm", ["day-aggs"], ["--days", str(days), *cache],
+               analytics_inputs, ["cortex/state/rhythm-patterns.json"]),
+        script("heatmap", "analyze-category-heatmap", ["day-aggs"], ["--days", str(days), *cache],
+               analytics_inputs, ["cortex/state/category-heatmap.json"]),
+        script("recipes", "analyze-recipes", [], ["--days", str(recipe_days), *cache],
+               RECIPE_LOGS, ["cortex/state/recipe-metrics.json"]),
+        script("feedback", "extract-feedback", [], ["--days", str(days), *cache],
+               [DIGESTS], ["cortex/state/feedback-history.json"]),
+        script("health", "analyze-health", ["duration", "rhythm", "heatmap", "recipes", "feedback"],
+               ["--window-days", str(window_days), *cache],
+               RECIPE_LOGS, ["cortex/state/health-score.json"], always=True),
+    ]
+
+
+def report_stage(name: str, result: Dict[str, Any]) -> None:
+    """Print a finished stage and record its timing span."""
+    if result["status"] in ("ran", "failed"):
+        spans.write_span(f"run-pipeline.{name}", result["seconds"] * 1000, error=result.get("error"))
+
+    icon = {"ran": "✅", "skipped": "⏭️ ", "failed": "❌", "blocked": "⚠️ "}[result["status"]]
+    line = f"{icon} [{name}] {result['status']} ({result['seconds']:.2f}s)"
+    if result.get("error"):
+        line += f": {result['error']}"
+    print(line, file=sys.stderr)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Run the nightly analytics pipeline in one process")
+    parser.add_argument("--days", type=int, default=30,
+                        help="Days for extract and the task analyzers (default: 30)")
+    parser.add_argument("--recipe-days", type=int, default=7,
+                        help="Days for analyze-recipes (default: 7)")
+    parser.add_argument("--window-days", type=int, default=7,
+                        help="Window for analyze-health (default: 7)")
+    parser.add_argument("--jobs", type=int, default=4,
+                        help="Stages to run concurrently (default: 4)")
+    parser.add_argument("--force", action="store_true",
+                        help="Ignore the manifest and run every stage (the analyzers recompute too)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Print the stage order and exit")
+    parser.add_argument("--enrich-in-place", action="store_true",
+                        help="Enrich the task-entry files in place before the analyzers run")
+    args = parser.parse_args(argv)
+
+    stages = build_stages(args.days, args.recipe_days, args.window_days, no_cache=args.force,
+                          enrich_in_place=args.enrich_in_place)
+
+    if args.dry_run:
+        by_name = {s["name"]: s for s in stages}
+        for name in pipeline.validate(stages):
+            deps = ", ".join(by_name[name]["deps"]) or "-"
+            print(f"{name:<10} after: {deps}")
+        return
+
+    # Load every script up front so module imports never race on the pool
+    for stage in stages:
+        if stage.get("script"):
+            load_script(stage["script"])
+
+    print(f"🚀 Running pipeline ({len(stages)} stages, {args.jobs} concurrent)...", file=sys.stderr)
+
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        results = pipeline.run_pipeline(
+            stages,
+            MANIFEST_PATH,
+            max_workers=args.jobs,
+            force=args.force,
+            on_finish=report_stage,
+        )
+
+    counts = {status: sum(1 for r in results.values() if r["status"] == status)
+              for status in ("ran", "skipped", "failed", "blocked")}
+    print(f"\n📊 Pipeline: {counts['ran']} ran, {counts['skipped']} skipped, "
+          f"{counts['failed']} failed, {counts['blocked']} blocked", file=sys.stderr)
+
+    print(json.dumps({"stages": results, **counts}, ensure_ascii=False, indent=2))
+
+    if counts["failed"] or counts["blocked"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    profiling.run_main(main)
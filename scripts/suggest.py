@@ -12,6 +12,12 @@ from typing import Dict, List, Any
 
 # Paths
 REPO_ROOT = Path(__file__).parent.parent
+
+if str(REPO_ROOT / "scripts") not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+from cortex_lib import digest_cache, profiling  # noqa: E402
+
 DATA_DIR = REPO_ROOT / "data"
 ANALYTICS_DIR = DATA_DIR / "analytics"
 CORTEX_DIR = REPO_ROOT / "cortex" / "daily"
@@ -75,25 +81,11 @@ def load_tomorrow_candidates() -> List[Dict]:
 def load_today_digest(date_str: str) -> List[str]:
     """Extract task list from today's digest."""
     digest_path = CORTEX_DIR / f"{date_str}-digest.md"
-    if not digest_path.exists():
+    parsed = digest_cache.load_parsed_digest(digest_path, date_str)
+    if not parsed:
         return []
     
-    tasks = []
-    with open(digest_path, 'r', encoding='utf-8') as f:
-        in_tasks_section = False
-        for line in f:
-            if line.startswith('## Tasks'):
-                in_tasks_section = True
-                continue
-            if in_tasks_section:
-                if line.startswith('##'):  # Next section
-                    break
-                if line.strip().startswith('- '):
-                    # Extract task text (remove checkbox and formatting)
-                    task_text = line.strip()[2:].replace('[x]', '').replace('[ ]', '').strip()
-                    tasks.append(task_text)
-    
-    return tasks
+    return list(parsed["tasks_section"])
 
 
 def get_weekday_pattern(patterns: Dict, weekday: int) -> Dict:
@@ -369,4 +361,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    profiling.run_main(main)
@@ -11,7 +11,7 @@ Usage:
 Strategy:
     1. Parse digest markdown (## 進捗 section)
     2. Extract completed tasks with metadata
-    3. Sync to task-entry-YYYY-MM-DD.json
+    3. Sync to task-entry-YYYY-MM-DD.json (and its day-agg-YYYY-MM-DD.json sidecar)
     4. Handle conflicts based on timestamp
 """
 
@@ -25,6 +25,13 @@ from typing import Dict, List, Optional
 
 # Resolve paths
 ROOT = Path(__file__).resolve().parents[1]
+
+if str(ROOT / "scripts") not in sys.path:
+    sys.path.insert(0, str(ROOT / "scripts"))
+
+from cortex_lib import day_agg, digest_cache, profiling  # noqa: E402
+from cortex_lib.digest_cache import parse_digest_progress  # noqa: E402,F401
+
 DAILY_DIR = ROOT / "cortex" / "daily"
 STATE_DIR = ROOT / "cortex" / "state"
 
@@ -35,48 +42,6 @@ def get_jst_now():
     return datetime.now(jst)
 
 
-def parse_digest_progress(digest_content: str) -> List[Dict]:
-    """
-    Parse ## 進捗 section and extract task entries
-    
-    Returns list of tasks with:
-    - title: str
-    - category: str
-    - duration: str
-    - memo: Optional[str]
-    - timestamp: str (HH:MM JST)
-    """
-    tasks = []
-    
-    # Find ## 進捗 section
-    progress_match = re.search(r'## 進捗\s*\n(.*?)(?=\n## |$)', digest_content, re.DOTALL)
-    if not progress_match:
-        return tasks
-    
-    progress_section = progress_match.group(1)
-    
-    # Parse task blocks: ### Title (HH:MM JST)
-    task_pattern = r'### (.+?) \((\d{2}:\d{2}) JST\)\s*\n- \*\*カテゴリ\*\*: (.+?)\n- \*\*所要時間\*\*: (.+?)(?:\n- \*\*メモ\*\*: (.+?))?(?:\n|$)'
-    
-    for match in re.finditer(task_pattern, progress_section):
-        title = match.group(1).strip()
-        timestamp = match.group(2).strip()
-        category = match.group(3).strip()
-        duration = match.group(4).strip()
-        memo = match.group(5).strip() if match.group(5) else None
-        
-        tasks.append({
-            "title": title,
-            "category": category,
-            "duration": duration,
-            "memo": memo,
-            "timestamp": timestamp,
-            "status": "completed"
-        })
-    
-    return tasks
-
-
 def load_task_entry(date: str) -> Dict:
     """Load task-entry-YYYY-MM-DD.json or create empty structure"""
     task_file = STATE_DIR / f"task-entry-{date}.json"
@@ -287,6 +252,7 @@ def save_task_entry(date: str, task_entry: Dict) -> None:
     
     with open(task_file, 'w', encoding='utf-8') as f:
         json.dump(task_entry, f, indent=2, ensure_ascii=False)
+    day_agg.write_day_agg(date, task_entry, task_file)
     
     print(f"💾 Saved: {task_file.name}")
 
@@ -337,11 +303,9 @@ Examples:
         print(f"❌ Digest not found: {digest_file}", file=sys.stderr)
         sys.exit(1)
     
-    digest_content = digest_file.read_text(encoding='utf-8')
-    
-    # Parse digest tasks
+    # Parse digest tasks (shared parsed-digest cache)
     print("📖 Parsing digest...")
-    digest_tasks = parse_digest_progress(digest_content)
+    digest_tasks = digest_cache.load_parsed_digest(digest_file, date)["progress"]
     print(f"   Found {len(digest_tasks)} completed tasks in digest\n")
     
     # Load task-entry
@@ -380,4 +344,4 @@ Examples:
 
 
 if __name__ == "__main__":
-    main()
+    profiling.run_main(main)
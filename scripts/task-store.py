@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Task Store CLI
+
+Creates, syncs and queries the SQLite task store (cortex/state/tasks.db,
+see cortex_lib/task_store.py). Once it exists, the extractors write
+through to it and analyze-duration / analyze-rhythm /
+analyze-category-heatmap aggregate in SQL instead of reading JSON.
+
+Every command syncs the store with the task-entry files first (one
+directory scan when nothing changed). Results are printed as JSON.
+
+Usage:
+    python scripts/task-store.py sync [--rebuild]
+    python scripts/task-store.py query [--since 2025-10-01] [--until 2025-12-31]
+        [--category n8n] [--status done] [--completed] [--hour 9] [--weekday 0] [--limit 50]
+    python scripts/task-store.py group --by category,hour [filters as for query]
+    python scripts/task-store.py sql "SELECT category, COUNT(*) FROM tasks GROUP BY category"
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from cortex_lib import profiling, task_store  # noqa: E402
+
+
+def add_filters(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--since", type=str, help="First date (YYYY-MM-DD, inclusive)")
+    parser.add_argument("--until", type=str, help="Last date (YYYY-MM-DD, inclusive)")
+    parser.add_argument("--category", action="append", help="Category (repeatable)")
+    parser.add_argument("--status", action="append", help="Status as written in the task (repeatable)")
+    parser.add_argument("--completed", action="store_true", default=None,
+                        help="Completed tasks only (done/completed/finished status or [x] title)")
+    parser.add_argument("--hour", type=int, action="append",
+                        help="Hour of started_at / completed_at (repeatable)")
+    parser.add_argument("--weekday", type=int, action="append",
+                        help="Weekday of started_at / completed_at, 0 = Monday (repeatable)")
+
+
+def filters_from(args: argparse.Namespace) -> Dict[str, Any]:
+    return {name: getattr(args, name) for name in task_store.FILTERS}
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="SQLite task store for task-entry files")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sync_parser = commands.add_parser("sync", help="Create the store or bring it up to date")
+    sync_parser.add_argument("--rebuild", action="store_true", help="Drop and re-import every day")
+
+    query_parser = commands.add_parser("query", help="List tasks (oldest first)")
+    add_filters(query_parser)
+    query_parser.add_argument("--limit", type=int, help="Maximum number of tasks")
+
+    group_parser = commands.add_parser("group", help="Task counts and duration totals per group")
+    group_parser.add_argument("--by", type=str, required=True,
+                              help=f"Comma-separated columns ({', '.join(task_store.GROUP_COLUMNS)})")
+    add_filters(group_parser)
+
+    sql_parser = commands.add_parser("sql", help="Run a read-only SQL query (tables: tasks, days)")
+    sql_parser.add_argument("query", type=str)
+
+    args = parser.parse_args(argv)
+
+    if args.command != "sync" and not task_store.STORE_PATH.exists():
+        print(f"❌ Task store not found: {task_store.STORE_PATH}", file=sys.stderr)
+        print("   Create it with: python scripts/task-store.py sync", file=sys.stderr)
+        sys.exit(1)
+
+    if args.command == "sync" and args.rebuild:
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{task_store.STORE_PATH}{suffix}").unlink(missing_ok=True)
+
+    conn = task_store.open_store(create=True)
+    try:
+        changed = task_store.sync(conn)
+        if args.command == "sync":
+            days, tasks = conn.execute("SELECT COUNT(*), COALESCE(SUM(tasks), 0) FROM days").fetchone()
+            print(f"✅ Task store {task_store.STORE_PATH}: {changed} days updated ({days} days, {tasks} tasks)",
+                  file=sys.stderr)
+            return
+
+        try:
+            if args.command == "query":
+                result = task_store.query_tasks(conn, args.since, args.until, args.limit, **filters_from(args))
+            elif args.command == "group":
+                by = [column.strip() for column in args.by.split(",") if column.strip()]
+                result = task_store.group_counts(conn, by, args.since, args.until, **filters_from(args))
+            else:
+                result = task_store.execute(conn, args.query)
+        except (ValueError, sqlite3.Error) as e:
+            print(f"❌ {e}", file=sys.stderr)
+            sys.exit(1)
+    finally:
+        conn.close()
+
+    print(f"✅ {len(result)} rows", file=sys.stderr)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    profiling.run_main(main)
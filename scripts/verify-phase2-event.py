@@ -17,9 +17,13 @@ import sys
 import hashlib
 from pathlib import Path
 from datetime import datetime
-import re
 
 ROOT = Path(__file__).parent.parent
+
+if str(ROOT / "scripts") not in sys.path:
+    sys.path.insert(0, str(ROOT / "scripts"))
+
+from cortex_lib import digest_cache, profiling  # noqa: E402
 MONITORING_FILE = ROOT / "cortex/state/phase2-monitoring.json"
 
 
@@ -122,12 +126,8 @@ def verify_event(date_str):
     result["digest"]["mtime"] = datetime.fromtimestamp(digest_path.stat().st_mtime).isoformat()
     result["digest"]["hash"] = compute_file_hash(digest_path)
 
-    # /log 形式のタスクを抽出: ### タスク名 (HH:MM JST)
-    with open(digest_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    task_pattern = r'### (.+?) \((\d{2}:\d{2}) JST\)'
-    tasks_found = re.findall(task_pattern, content)
+    # /log 形式のタスクを抽出: ### タスク名 (HH:MM JST)（共有パース済みキャッシュ経由）
+    tasks_found = digest_cache.load_parsed_digest(digest_path, date_str)["log_headings"]
 
     if not tasks_found:
         result["errors"].append("no /log tasks found in digest")
@@ -243,4 +243,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    profiling.run_main(main)
@@ -0,0 +1,17 @@
+"""
+Shared fixtures for the script tests.
+"""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def no_timing_spans(monkeypatch):
+    """Keep timing spans (cortex_lib/spans.py) out of the repo's cortex/logs.
+
+    Scripts run in-process or as subprocesses of a test would otherwise
+    append span records to cortex/logs/recipe-local-*.jsonl under the
+    working directory. Tests of the spans themselves re-enable them with
+    a temporary logs_dir.
+    """
+    monkeypatch.setenv("CORTEX_SPANS", "0")
@@ -7,6 +7,7 @@ Validates category heatmap logic including:
 - Dominant category detection (threshold 30%)
 - Busiest day calculation
 - Insights generation
+- Interned category matrix engines (python / numpy)
 """
 
 import pytest
@@ -17,8 +18,14 @@ from datetime import datetime, timedelta
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
 
+import importlib.util
 import subprocess
 
+SCRIPT = Path(__file__).parent.parent.parent / "scripts" / "analyze-category-heatmap.py"
+spec = importlib.util.spec_from_file_location("analyze_category_heatmap", SCRIPT)
+heatmap_module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(heatmap_module)
+
 
 def create_mock_task_entry(date_str: str, tasks: list) -> dict:
     """Create a mock task-entry JSON structure."""
@@ -416,5 +423,60 @@ def test_category_heatmap_insights_generation(tmp_path):
     assert weekday.lower() in insights_text or "busiest" in insights_text
 
 
+MATRIX_ENTRIES = [
+    {
+        "__date": "2025-12-08",  # Monday
+        "tasks": [
+            {"title": "a", "status": "done", "category": "dev", "started_at": "2025-12-08T09:00:00+09:00"},
+            {"title": "b", "status": "done", "category": "dev", "started_at": "2025-12-08T10:00:00+09:00"},
+            {"title": "[x] c", "category": "#meeting", "completed_at": "2025-12-08T11:00:00+09:00"},
+            {"title": "d", "status": "done", "category": " ", "started_at": "2025-12-08T12:00:00+09:00"},
+            {"title": "e", "status": "pending", "category": "dev", "started_at": "2025-12-08T13:00:00+09:00"},
+        ],
+    },
+    {
+        "__date": "2025-12-13",  # Saturday
+        "tasks": [
+            {"title": "f", "status": "completed", "category": "#meeting", "started_at": "2025-12-13T09:00:00+09:00"},
+            {"title": "g", "status": "done", "category": "dev"},
+        ],
+    },
+]
+
+
+def test_category_matrix_interning():
+    categories, matrix, active_days = heatmap_module.build_category_matrix(MATRIX_ENTRIES)
+
+    assert categories == ["dev", "#meeting", "uncategorized"]
+    assert matrix[0] == [2, 1, 1]
+    assert matrix[5] == [0, 1, 0]
+    assert active_days == 2
+
+    heatmap = heatmap_module.heatmap_from_matrix(categories, matrix, 0.3, "python")
+    assert heatmap["total_completed"] == 5
+    assert heatmap["category_totals"] == {"dev": 2, "#meeting": 2, "uncategorized": 1}
+    assert heatmap["weekday_totals"]["Monday"] == 4
+    assert heatmap["weekday_category_matrix"]["Saturday"] == {"#meeting": 1}
+    assert heatmap["weekday_category_matrix"]["Sunday"] == {}
+    assert heatmap["dominant_categories"]["Monday"] == [{"category": "dev", "count": 2, "percentage": 50.0}]
+    assert heatmap["dominant_categories"]["Saturday"][0]["percentage"] == 100.0
+
+
+def test_find_dominant_categories_wrapper():
+    categories, matrix, _ = heatmap_module.build_category_matrix(MATRIX_ENTRIES)
+    matrix_json, _, weekday_totals, _, _ = heatmap_module.extract_category_activity(MATRIX_ENTRIES)
+
+    assert heatmap_module.find_dominant_categories(matrix_json, weekday_totals, 0.2) == \
+        heatmap_module.heatmap_from_matrix(categories, matrix, 0.2, "python")["dominant_categories"]
+
+
+def test_numpy_engine_matches_python():
+    pytest.importorskip("numpy")
+    categories, matrix, _ = heatmap_module.build_category_matrix(MATRIX_ENTRIES)
+
+    assert heatmap_module.heatmap_from_matrix(categories, matrix, 0.25, "numpy") == \
+        heatmap_module.heatmap_from_matrix(categories, matrix, 0.25, "python")
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
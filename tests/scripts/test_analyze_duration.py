@@ -330,5 +330,45 @@ def test_duration_analysis_no_data(tmp_path):
     assert "No task entries found" in result.stderr or "State directory not found" in result.stderr
 
 
+def run_in(cwd: Path, *args: str) -> subprocess.CompletedProcess:
+    script = Path(__file__).parent.parent.parent / "scripts" / "analyze-duration.py"
+    return subprocess.run(["python3", str(script), *args], capture_output=True, text=True, cwd=cwd)
+
+
+def test_sketches_match_exact(tmp_path):
+    """Per-day sketches give the same patterns as the raw durations, and are reused."""
+    state_dir = tmp_path / "cortex" / "state"
+    state_dir.mkdir(parents=True)
+    today = datetime.now().date()
+
+    for offset in range(6):
+        date_str = (today - timedelta(days=offset)).strftime("%Y-%m-%d")
+        tasks = [
+            {"title": f"T{i}", "status": "completed", "category": ["dev", "ops"][i % 2],
+             "duration_minutes": 10 + (offset * 7 + i * 13) % 95}
+            for i in range(5)
+        ]
+        (state_dir / f"task-entry-{date_str}.json").write_text(
+            json.dumps(create_mock_task_entry(date_str, tasks)), encoding="utf-8"
+        )
+
+    first = run_in(tmp_path, "--days", "7", "--output", "sketch.json")
+    assert first.returncode == 0, first.stderr
+    assert "6 decoded" in first.stderr
+    assert (state_dir / ".duration-sketches.json").exists()
+
+    second = run_in(tmp_path, "--days", "3", "--output", "narrow.json")
+    assert "0 decoded, 3 from sketches" in second.stderr
+
+    exact = run_in(tmp_path, "--days", "7", "--exact", "--output", "exact.json")
+    assert exact.returncode == 0, exact.stderr
+
+    sketch_stats = json.loads((tmp_path / "sketch.json").read_text())
+    exact_stats = json.loads((tmp_path / "exact.json").read_text())
+    assert sketch_stats["overall"] == exact_stats["overall"]
+    assert sketch_stats["by_category"] == exact_stats["by_category"]
+    assert json.loads((tmp_path / "narrow.json").read_text())["overall"]["count"] == 15
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
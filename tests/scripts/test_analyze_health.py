@@ -6,6 +6,9 @@ Tests cover:
 - Data freshness scoring (file age thresholds)
 - Analytics health scoring (sample size thresholds)
 - Insight generation logic
+- Latency component (timing spans in the JSONL logs)
+- Incremental JSONL scanning (byte-offset checkpoints)
+- Analytics scored from the result cache header (cortex_lib/result_cache.py)
 """
 
 import json
@@ -23,12 +26,16 @@ spec = importlib.util.spec_from_file_location("analyze_health", script_path)
 analyze_health = importlib.util.module_from_spec(spec)
 spec.loader.exec_module(analyze_health)
 
+sys.path.insert(0, str(script_path.parent))
+from cortex_lib import result_cache  # noqa: E402
+
 # Import functions
 parse_log_files = analyze_health.parse_log_files
 calculate_automation_score = analyze_health.calculate_automation_score
 calculate_freshness_score = analyze_health.calculate_freshness_score
 calculate_analytics_health = analyze_health.calculate_analytics_health
 generate_insights = analyze_health.generate_insights
+calculate_latency_health = analyze_health.calculate_latency_health
 LOGS_DIR = analyze_health.LOGS_DIR
 STATE_DIR = analyze_health.STATE_DIR
 
@@ -347,6 +354,31 @@ class TestAnalyticsHealth:
         assert score == 80
         assert details["score"] == 80
 
+    def test_result_cache_header_is_read_instead_of_body(self, tmp_state_dir):
+        """Analyzer outputs are scored from their "_meta" header line alone."""
+        outputs = {
+            "duration-patterns.json": ({"overall": {"count": 60, "mean": 1.0}, "by_category": {}},
+                                       {"overall": {"count": 60}}),
+            "rhythm-patterns.json": ({"active_days": 12, "total_tasks": 25, "hourly_distribution": {}},
+                                     {"active_days": 12, "total_tasks": 25}),
+            "category-heatmap.json": ({"active_days": 14, "total_completed_tasks": 40, "heatmap": {}},
+                                      {"total_completed_tasks": 40, "active_days": 14}),
+        }
+        for name, (result, summary) in outputs.items():
+            path = tmp_state_dir / name
+            result_cache.write_result(path, result, "fp", summary=summary)
+            assert json.loads(path.read_text(encoding="utf-8"))["_meta"]["summary"] == summary
+
+        expected = calculate_analytics_health(tmp_state_dir)
+        assert expected[0] == 90  # (95 + 80 + 95) / 3
+
+        # Only the header line is decoded: a body that is not JSON does not matter
+        for name in outputs:
+            path = tmp_state_dir / name
+            path.write_text(path.read_text(encoding="utf-8").split("\n", 1)[0] + "\n  truncated",
+                            encoding="utf-8")
+        assert calculate_analytics_health(tmp_state_dir) == expected
+
 
 class TestInsightGeneration:
     """Test insight generation logic."""
@@ -496,5 +528,165 @@ class TestEdgeCases:
         assert score == 50
 
 
+
+class TestLatencyComponent:
+    """Test timing span handling and the latency component."""
+
+    def test_spans_are_not_counted_as_runs(self, tmp_logs_dir):
+        now = datetime.now().astimezone().isoformat()
+        lines = [
+            {"ts": now, "workflow": "Recipe 15", "status": "success"},
+            {"ts": now, "recipe": "15", "stage": "analyze-duration.load", "duration_ms": 12.0, "items": 30},
+            {"ts": now, "workflow": "Recipe 15", "status": "error"},
+        ]
+        (tmp_logs_dir / "recipe-15-2025-12-22.jsonl").write_text(
+            "\n".join(json.dumps(line) for line in lines), encoding="utf-8"
+        )
+
+        latency = []
+        assert parse_log_files(7, latency) == (2, 1, 1)
+        assert [list(stages) for stages in latency] == [["analyze-duration.load"]]
+        assert latency[0]["analyze-duration.load"]["items"] == 30
+        # Callers that do not ask for spans still get the same counts
+        assert parse_log_files(7) == (2, 1, 1)
+
+    def test_latency_no_data(self):
+        assert calculate_latency_health([]) == {"status": "no_data", "stages": {}}
+
+    def test_latency_percentiles_and_slowdown(self):
+        spans = [
+            {"ts": f"2025-12-2{i}T00:00:00Z", "stage": "analyze-rhythm.load", "duration_ms": ms, "items": 100}
+            for i, ms in enumerate([10, 10, 30, 30])
+        ]
+        periods = []
+        for span in spans:
+            periods.append({})
+            analyze_health.timing_spans.add_span(periods[-1], span)
+        latency = calculate_latency_health(periods)
+
+        stats = latency["stages"]["analyze-rhythm.load"]
+        assert stats["count"] == 4
+        assert stats["p50_ms"] == 20.0
+        assert stats["p95_ms"] == 30.0
+        assert stats["items_per_sec"] == 5000.0
+        assert stats["trend_ratio"] == 3.0
+        assert latency["status"] == "slowing"
+        assert latency["slowing_stages"] == ["analyze-rhythm.load"]
+        assert "analyze-rhythm.load" in analyze_health.generate_latency_insights(latency)[0]
+
+
+
+def run_line(status, ts=None):
+    ts = ts or datetime.now().astimezone().isoformat()
+    return json.dumps({"ts": ts, "workflow": "Recipe 15", "status": status}) + "\n"
+
+
+class TestLogCheckpoints:
+    """Test incremental JSONL scanning with byte-offset checkpoints."""
+
+    def test_only_appended_lines_are_decoded(self, tmp_logs_dir, monkeypatch):
+        log = tmp_logs_dir / "recipe-15-2025-12-22.jsonl"
+        log.write_text(run_line("success") + run_line("error"), encoding="utf-8")
+        assert parse_log_files(7) == (2, 1, 1)
+
+        checkpoint = json.loads(analyze_health.checkpoint_path().read_text(encoding="utf-8"))
+        assert checkpoint["files"][log.name]["offset"] == log.stat().st_size
+
+        decoded = []
+        fold = analyze_health.fold_log_line
+        monkeypatch.setattr(analyze_health, "fold_log_line", lambda b, line: (decoded.append(line), fold(b, line)))
+        with log.open("a", encoding="utf-8") as f:
+            f.write(run_line("success"))
+
+        assert parse_log_files(7) == (3, 2, 1)
+        assert len(decoded) == 1
+        assert parse_log_files(7) == (3, 2, 1)
+        assert len(decoded) == 1
+
+    def test_partial_last_line_is_reread(self, tmp_logs_dir):
+        log = tmp_logs_dir / "recipe-15-2025-12-22.jsonl"
+        line = run_line("error")
+        log.write_text(run_line("success") + line[:20], encoding="utf-8")
+        assert parse_log_files(7) == (1, 1, 0)
+
+        with log.open("a", encoding="utf-8") as f:
+            f.write(line[20:])
+        assert parse_log_files(7) == (2, 1, 1)
+
+    def test_truncation_and_rotation_reset_checkpoint(self, tmp_logs_dir):
+        log = tmp_logs_dir / "recipe-15-2025-12-22.jsonl"
+        log.write_text(run_line("success") * 3, encoding="utf-8")
+        assert parse_log_files(7) == (3, 3, 0)
+
+        # Truncated in place: smaller than the last offset
+        log.write_text(run_line("error"), encoding="utf-8")
+        assert parse_log_files(7) == (1, 0, 1)
+
+        # Rotated: a new file (new inode) under the same name, same size or larger
+        rotated = tmp_logs_dir / "rotated.tmp"
+        rotated.write_text(run_line("success") * 2, encoding="utf-8")
+        log.unlink()
+        rotated.rename(log)
+        assert parse_log_files(7) == (2, 2, 0)
+
+    def test_window_rebuilt_from_buckets(self, tmp_logs_dir):
+        old = (datetime.now().astimezone() - timedelta(days=10)).isoformat()
+        log = tmp_logs_dir / "recipe-15-2025-12-22.jsonl"
+        log.write_text(run_line("error", ts=old) + run_line("success"), encoding="utf-8")
+
+        assert parse_log_files(7) == (1, 1, 0)
+        assert parse_log_files(30) == (2, 1, 1)
+        assert parse_log_files(7, rescan=True) == (1, 1, 0)
+
+    def test_buckets_before_window_are_pruned(self, tmp_logs_dir):
+        now = datetime.now().astimezone()
+        log = tmp_logs_dir / "recipe-15-2025-12-22.jsonl"
+        log.write_text(run_line("error", ts=(now - timedelta(days=3)).isoformat()) + run_line("success"),
+                       encoding="utf-8")
+        assert parse_log_files(7) == (2, 1, 1)
+        assert parse_log_files(1) == (1, 1, 0)
+
+        checkpoint = json.loads(analyze_health.checkpoint_path().read_text(encoding="utf-8"))
+        assert len(checkpoint["files"][log.name]["buckets"]) == 1
+        # The dropped hours are read again for a wider window
+        assert parse_log_files(7) == (2, 1, 1)
+
+    def test_new_checkpoint_seeks_to_window(self, tmp_logs_dir):
+        now = datetime.now().astimezone()
+        log = tmp_logs_dir / "recipe-15-2025-12-22.jsonl"
+        log.write_text("".join(
+            run_line("success", ts=(now - timedelta(hours=h)).isoformat()) for h in range(30 * 24, 0, -1)
+        ), encoding="utf-8")
+
+        assert parse_log_files(7) == (7 * 24, 7 * 24, 0)
+        checkpoint = json.loads(analyze_health.checkpoint_path().read_text(encoding="utf-8"))
+        assert checkpoint["files"][log.name]["from"] != ""
+        assert analyze_health.log_index.index_path(log).exists()
+
+        # A wider window than the checkpoint covers re-seeks
+        assert parse_log_files(30) == (30 * 24, 30 * 24, 0)
+
+    def test_rotated_and_compressed_segments(self, tmp_logs_dir):
+        import gzip
+        (tmp_logs_dir / "recipe-15.jsonl").write_text(run_line("success"), encoding="utf-8")
+        with gzip.open(tmp_logs_dir / "recipe-15.jsonl.1.gz", "wt", encoding="utf-8") as f:
+            f.write(run_line("error") + run_line("success"))
+        (tmp_logs_dir / "recipe-old.log.1.gz").write_bytes(gzip.compress("❌ FAILED".encode("utf-8")))
+        (tmp_logs_dir / "recipe-new.log.1").write_text("Recipe completed", encoding="utf-8")
+
+        assert parse_log_files(7) == (5, 3, 2)
+        assert parse_log_files(7) == (5, 3, 2)
+
+    def test_deleted_files_are_forgotten(self, tmp_logs_dir):
+        log = tmp_logs_dir / "recipe-15-2025-12-22.jsonl"
+        log.write_text(run_line("success"), encoding="utf-8")
+        assert parse_log_files(7) == (1, 1, 0)
+
+        log.unlink()
+        assert parse_log_files(7) == (0, 0, 0)
+        checkpoint = json.loads(analyze_health.checkpoint_path().read_text(encoding="utf-8"))
+        assert checkpoint["files"] == {}
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -18,6 +18,8 @@ spec = importlib.util.spec_from_file_location("analyze_recipes", Path(__file__).
 analyze_recipes = importlib.util.module_from_spec(spec)
 spec.loader.exec_module(analyze_recipes)
 
+from cortex_lib import sketches
+
 parse_log_line = analyze_recipes.parse_log_line
 aggregate_metrics = analyze_recipes.aggregate_metrics
 compute_statistics = analyze_recipes.compute_statistics
@@ -93,7 +95,7 @@ class TestAggregateMetrics:
         assert result["recipe_13"]["runs"] == 2
         assert result["recipe_13"]["successes"] == 2
         assert result["recipe_13"]["failures"] == 0
-        assert len(result["recipe_13"]["durations"]) == 2
+        assert result["recipe_13"]["durations"]["n"] == 2
         assert result["recipe_13"]["last_status"] == "success"
     
     def test_aggregate_with_failures(self):
@@ -146,7 +148,7 @@ class TestComputeStatistics:
                 "runs": 10,
                 "successes": 9,
                 "failures": 1,
-                "durations": [10.0, 11.0, 9.5, 10.5],
+                "durations": sketches.from_values([10.0, 11.0, 9.5, 10.5]),
                 "last_run": "2025-12-05T10:00:00+09:00",
                 "last_status": "success",
                 "last_failure": "2025-12-04T10:00:00+09:00",
@@ -159,6 +161,8 @@ class TestComputeStatistics:
         assert result["recipe_test"]["success_rate"] == 0.9
         assert result["recipe_test"]["runs"] == 10
         assert result["recipe_test"]["avg_duration_sec"] == 10.25
+        assert result["recipe_test"]["p50_duration_sec"] == 10.25
+        assert result["recipe_test"]["p99_duration_sec"] == pytest.approx(10.97, abs=0.01)
         assert result["recipe_test"]["last_failure"] == "2025-12-04T10:00:00+09:00"
     
     def test_compute_perfect_success_rate(self):
@@ -167,7 +171,7 @@ class TestComputeStatistics:
                 "runs": 5,
                 "successes": 5,
                 "failures": 0,
-                "durations": [20.0, 21.0, 19.0],
+                "durations": sketches.from_values([20.0, 21.0, 19.0]),
                 "last_run": "2025-12-05T10:00:00+09:00",
                 "last_status": "success",
                 "last_failure": None,
@@ -187,7 +191,7 @@ class TestComputeStatistics:
                 "runs": 3,
                 "successes": 3,
                 "failures": 0,
-                "durations": [],
+                "durations": sketches.from_values([]),
                 "last_run": "2025-12-05T10:00:00+09:00",
                 "last_status": "success",
                 "last_failure": None,
@@ -311,3 +315,91 @@ class TestEndToEnd:
         assert recipes["recipe_13"]["success_rate"] == 1.0
         assert recipes["recipe_10"]["success_rate"] == 0.5
         assert len(insights) > 0
+
+    def test_load_recipe_logs_seeks_to_window(self, tmp_path, monkeypatch):
+        """Lines before the window are skipped via the sparse index, none inside it are lost"""
+        monkeypatch.setattr(analyze_recipes, "LOGS_DIR", tmp_path)
+        now = datetime.now().astimezone().replace(microsecond=0)
+        lines = []
+        for hours in range(30 * 24, 0, -1):
+            ts = (now - timedelta(hours=hours, minutes=-30)).isoformat()
+            lines.append(f"{ts} [recipe_13] SUCCESS (40.0s)")
+        (tmp_path / "recipe-13.log").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+        entries = analyze_recipes.load_recipe_logs(7)
+        assert len(entries) == 7 * 24
+        assert (tmp_path / ".recipe-13.log.idx").exists()
+
+        seen = []
+        parse = analyze_recipes.parse_log_line
+        monkeypatch.setattr(analyze_recipes, "parse_log_line", lambda line: (seen.append(line), parse(line))[1])
+        assert len(analyze_recipes.load_recipe_logs(7)) == 7 * 24
+        assert len(seen) < 7 * 24 + analyze_recipes.log_index.INDEX_EVERY
+
+    def test_load_recipe_logs_reads_rotated_segments(self, tmp_path, monkeypatch):
+        import gzip
+        monkeypatch.setattr(analyze_recipes, "LOGS_DIR", tmp_path)
+        ts = datetime.now().astimezone().replace(microsecond=0).isoformat()
+        (tmp_path / "recipe-13.log").write_text(f"{ts} [recipe_13] SUCCESS (40.0s)\n", encoding="utf-8")
+        (tmp_path / "recipe-13.log.1.gz").write_bytes(
+            gzip.compress(f"{ts} [recipe_13] FAILURE: timeout\n".encode("utf-8"))
+        )
+
+        entries = analyze_recipes.load_recipe_logs(7)
+        assert sorted(e["status"] for e in entries) == ["failure", "success"]
+
+    def test_load_recipe_logs_reads_jsonl(self, tmp_path, monkeypatch):
+        """v1.3 JSONL run records are ingested; span records are not runs"""
+        monkeypatch.setattr(analyze_recipes, "LOGS_DIR", tmp_path)
+        ts = datetime.now().astimezone().isoformat()
+        records = [
+            {"ts": ts, "workflow": "Recipe 02: Nightly KB Rebuild", "status": "success", "durationMs": 1500},
+            {"ts": ts, "workflow": "Recipe 02: Nightly KB Rebuild", "status": "error", "durationMs": 500,
+             "errorMessage": "rebuild exited 1"},
+            {"ts": ts, "recipe": "02", "stage": "analyze-recipes.load", "duration_ms": 3.0, "items": 2},
+            {"ts": "2020-01-01T00:00:00Z", "workflow": "Recipe 02: Nightly KB Rebuild", "status": "success"},
+        ]
+        (tmp_path / "recipe-02-2025-12-22.jsonl").write_text(
+            "".join(json.dumps(r) + "\n" for r in records), encoding="utf-8"
+        )
+
+        recipes = compute_statistics(aggregate_metrics(analyze_recipes.iter_recipe_entries(7)))
+        stats = recipes["recipe_02"]
+        assert (stats["runs"], stats["successes"], stats["failures"]) == (2, 1, 1)
+        assert stats["avg_duration_sec"] == 1.0
+        assert stats["last_failure_reason"] == "rebuild exited 1"
+
+    def test_jsonl_and_legacy_runs_share_a_recipe_id(self, tmp_path, monkeypatch):
+        """A recipe logged as [recipe_02_kb_rebuild] and as "Recipe 02: ..." is one recipe"""
+        monkeypatch.setattr(analyze_recipes, "LOGS_DIR", tmp_path)
+        ts = datetime.now().astimezone().replace(microsecond=0).isoformat()
+        (tmp_path / "recipe-02.log").write_text(f"{ts} [recipe_02_kb_rebuild] SUCCESS (2.0s)\n", encoding="utf-8")
+        (tmp_path / "recipe-02-2025-12-22.jsonl").write_text(json.dumps(
+            {"ts": ts, "workflow": "Recipe 02: Nightly KB Rebuild", "status": "success", "durationMs": 1000}
+        ) + "\n", encoding="utf-8")
+
+        recipes = compute_statistics(aggregate_metrics(analyze_recipes.iter_recipe_entries(7)))
+        assert list(recipes) == ["recipe_02"]
+        assert recipes["recipe_02"]["runs"] == 2
+
+    def test_recipe_id(self):
+        assert analyze_recipes.recipe_id("recipe_13_nightly_wrapup") == "recipe_13"
+        assert analyze_recipes.recipe_id("Recipe 2: Daily Brief") == "recipe_02"
+        assert analyze_recipes.recipe_id("15") == "recipe_15"
+        assert analyze_recipes.recipe_id("Nightly Backup") == "Nightly Backup"
+
+    def test_aggregation_is_streaming_with_bounded_sketch(self):
+        """Entries are consumed from an iterator; the duration sketch stays bounded"""
+        def entries():
+            for i in range(5000):
+                yield {"timestamp": f"2025-12-05T{i % 24:02d}:00:00+09:00", "recipe": "recipe_13",
+                       "status": "success", "duration_sec": float(i % 100), "reason": None}
+
+        data = aggregate_metrics(entries())["recipe_13"]
+        assert data["runs"] == 5000
+        assert len(data["durations"]["centroids"]) <= sketches.COMPRESS_AT
+
+        stats = compute_statistics({"recipe_13": data})["recipe_13"]
+        assert stats["avg_duration_sec"] == 49.5
+        assert stats["p50_duration_sec"] == pytest.approx(49.5, abs=2)
+        assert stats["p95_duration_sec"] == pytest.approx(95, abs=2)
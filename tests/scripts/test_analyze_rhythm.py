@@ -7,6 +7,7 @@ Validates rhythm detection logic including:
 - Chronotype classification (morning/balanced/evening)
 - Peak hour and peak window detection
 - Hourly distribution and weekday matrix
+- Circular peak windows for every size (python / numpy engines)
 """
 
 import pytest
@@ -17,8 +18,15 @@ from datetime import datetime, timedelta
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
 
+import importlib.util
+import random
 import subprocess
 
+SCRIPT = Path(__file__).parent.parent.parent / "scripts" / "analyze-rhythm.py"
+spec = importlib.util.spec_from_file_location("analyze_rhythm", SCRIPT)
+rhythm = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(rhythm)
+
 
 def create_mock_task_entry(date_str: str, tasks: list) -> dict:
     """Create a mock task-entry JSON structure."""
@@ -409,5 +417,81 @@ def test_rhythm_insufficient_data(tmp_path):
     assert patterns["total_tasks"] == 3
 
 
+def brute_force_window(row: list, size: int) -> tuple:
+    totals = [sum(row[(start + i) % 24] for i in range(size)) for start in range(24)]
+    best = max(totals)
+    return totals.index(best), best
+
+
+def test_peak_windows_wrap_midnight():
+    """A night owl's busiest 3-hour window spans midnight."""
+    matrix = [[0] * 24 for _ in range(7)]
+    for hour, count in {23: 4, 0: 5, 1: 3, 12: 2}.items():
+        matrix[rhythm.WEEKDAYS.index("Friday")][hour] = count
+
+    windows = rhythm.peak_windows(matrix, "python")
+
+    three = windows["overall"][2]
+    assert three == {"size": 3, "start_hour": 23, "end_hour": 2, "total_tasks": 12}
+    assert windows["overall"][23]["total_tasks"] == 14
+    assert list(windows["by_weekday"]) == ["Friday"]
+    assert windows["by_weekday"]["Friday"] == windows["overall"]
+
+
+def test_peak_windows_match_brute_force():
+    rng = random.Random(3)
+    matrix = [[rng.choice([0, 0, 1, 2, 5]) for _ in range(24)] for _ in range(7)]
+    windows = rhythm.peak_windows(matrix, "python")
+
+    for weekday, row in zip(rhythm.WEEKDAYS, matrix):
+        for window in windows["by_weekday"][weekday]:
+            start, total = brute_force_window(row, window["size"])
+            assert (window["start_hour"], window["total_tasks"]) == (start, total)
+
+
+def test_peak_windows_numpy_matches_python():
+    pytest.importorskip("numpy")
+    rng = random.Random(5)
+    matrix = [[rng.randint(0, 6) for _ in range(24)] for _ in range(7)]
+
+    assert rhythm.peak_windows(matrix, "numpy") == rhythm.peak_windows(matrix, "python")
+
+
+def test_find_peak_window_clips_at_midnight():
+    counts = {h: 0 for h in range(24)}
+    counts.update({22: 3, 23: 3, 0: 4})
+
+    assert rhythm.find_peak_window(counts) == (21, 24, 6)
+
+
+def test_rhythm_windows_match_separate_runs(tmp_path):
+    """--windows gives the same per-window results as separate --days runs."""
+    state_dir = tmp_path / "cortex" / "state"
+    state_dir.mkdir(parents=True)
+    today = datetime.now().date()
+
+    for offset in (0, 2, 5, 9, 20):
+        day = today - timedelta(days=offset)
+        tasks = [
+            {"title": f"T{i}", "status": "completed", "started_at": f"{day}T{(offset + 5 * i) % 24:02d}:00:00+09:00"}
+            for i in range(offset % 4 + 2)
+        ]
+        entry = create_mock_task_entry(day.strftime("%Y-%m-%d"), tasks)
+        (state_dir / f"task-entry-{entry['date']}.json").write_text(json.dumps(entry))
+
+    def run(*args):
+        result = subprocess.run(["python3", str(SCRIPT), *args], capture_output=True, text=True, cwd=tmp_path)
+        assert result.returncode == 0, result.stderr
+        return json.loads(result.stdout)
+
+    combined = run("--days", "30", "--windows", "3,10", "--min-tasks", "3", "--output", "w.json")
+    assert list(combined["windows"]) == ["3", "10"]
+
+    for days in ("3", "10"):
+        single = run("--days", days, "--min-tasks", "3", "--output", f"r{days}.json")
+        single.pop("generated_at")
+        assert combined["windows"][days] == single
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
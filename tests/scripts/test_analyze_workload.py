@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests for scripts/analyze-workload.py
+
+Validates the workload aggregation engines:
+- Pure-Python counts (weekday, status, category, completion rates, period)
+- value_counts ordering (descending count, ties in first-seen order, None dropped)
+- pandas backend (when installed) produces identical output
+- --windows engine matches separate runs per window
+"""
+
+import importlib.util
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+
+SCRIPT = Path(__file__).parent.parent.parent / "scripts" / "analyze-workload.py"
+spec = importlib.util.spec_from_file_location("analyze_workload", SCRIPT)
+workload = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(workload)
+
+
+ENTRIES = [
+    # 2025-12-08 is a Monday
+    {"date": "2025-12-08", "status": "done", "category": "work"},
+    {"date": "2025-12-08", "status": "pending", "category": "work"},
+    {"date": "2025-12-08", "status": "done"},
+    {"date": "2025-12-10", "status": "done", "category": "review"},
+    {"date": "2025-12-14", "status": "pending", "category": None},
+    {"date": "2025-12-14", "status": None, "category": "review"},
+]
+
+
+def test_python_backend_counts():
+    analysis = workload.analyze_workload(ENTRIES, "python")
+
+    assert analysis["total_tasks"] == 6
+    assert analysis["completion_rate"] == 50.0
+    assert analysis["by_weekday"]["Monday"] == {"total": 3, "completed": 2, "completion_rate": 2 / 3 * 100}
+    assert analysis["by_weekday"]["Wednesday"]["completed"] == 1
+    assert analysis["by_weekday"]["Sunday"] == {"total": 2, "completed": 0, "completion_rate": 0.0}
+    assert analysis["by_weekday"]["Friday"] == {"total": 0, "completed": 0, "completion_rate": 0.0}
+    assert list(analysis["by_status"].items()) == [("done", 3), ("pending", 2)]
+    assert list(analysis["by_category"].items()) == [("work", 2), ("review", 2)]
+    assert analysis["period"] == {"start": "2025-12-08", "end": "2025-12-14", "days": 7}
+
+
+def test_empty_entries():
+    assert workload.analyze_workload([], "python")["total_tasks"] == 0
+
+
+def test_markdown_report_renders():
+    report = workload.generate_markdown_report(workload.analyze_workload(ENTRIES))
+    assert "| Monday | 3 | 2 | 66.7% |" in report
+    assert "- **done**: 3" in report
+
+
+def test_pandas_backend_matches_python():
+    pytest.importorskip("pandas")
+    assert workload.analyze_workload(ENTRIES, "pandas") == workload.analyze_workload(ENTRIES, "python")
+
+
+def test_windows_match_separate_runs():
+    rng = random.Random(2)
+    today = datetime.now().date()
+    day_entries = []
+    for offset in range(60):
+        date_str = (today - timedelta(days=offset)).isoformat()
+        tasks = [
+            {"status": rng.choice(["done", "pending", None]), "category": rng.choice(["a", "b", "c", None])}
+            for _ in range(rng.randint(0, 5))
+        ]
+        day_entries.append({"__date": date_str, "date": date_str, "tasks": tasks})
+
+    results = workload.analyze_workload_windows(day_entries, [7, 30, 90], "python")
+
+    for days in (7, 30, 90):
+        cutoff = (today - timedelta(days=days)).isoformat()
+        expected = workload.analyze_workload(
+            workload.flatten_tasks([e for e in day_entries if e["__date"] >= cutoff]), "python"
+        )
+        assert results[days] == expected
+        # Tie order of value_counts() is preserved too
+        assert list(results[days]["by_category"]) == list(expected["by_category"])
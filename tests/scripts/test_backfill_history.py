@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for scripts/backfill-history.py and scripts/cortex_lib/backfill.py
+
+Validates the historical backfill:
+- sweep() slides every window by one day per date
+- Sliding samples give the statistics module's results
+- The latest date matches analyze-rhythm / analyze-duration --exact run today
+- A slid window equals the same date computed from scratch
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+
+from cortex_lib import backfill
+from cortex_lib.synthetic import generate_corpus
+
+
+SCRIPTS = Path(__file__).parent.parent.parent / "scripts"
+
+
+def run_script(cwd: Path, name: str, *args: str) -> subprocess.CompletedProcess:
+    result = subprocess.run(
+        ["python3", str(SCRIPTS / f"{name}.py"), *args],
+        capture_output=True,
+        text=True,
+        cwd=cwd,
+    )
+    assert result.returncode == 0, f"{name} failed: {result.stderr}"
+    return result
+
+
+def read_jsonl(path: Path) -> list:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_sweep_slides_windows():
+    added, removed = [], []
+    dates = list(backfill.sweep(date(2025, 1, 10), date(2025, 1, 12),
+                                [(3, added.append, removed.append)]))
+
+    assert dates == ["2025-01-10", "2025-01-11", "2025-01-12"]
+    assert added == ["2025-01-08", "2025-01-09", "2025-01-10", "2025-01-11", "2025-01-12"]
+    assert removed == ["2025-01-08", "2025-01-09"]
+
+
+def test_sliding_sample_matches_statistics():
+    sample = backfill.new_sample()
+    values = [0.5, 1.25, 0.5, 3.0, 2.0, 0.75]
+    for value in values:
+        backfill.sample_add(sample, value)
+    backfill.sample_remove(sample, 0.5)
+    rest = values[1:]
+
+    n, mean, median, std_dev, lo, hi = backfill.sample_stats(sample)
+    assert (n, median, lo, hi) == (len(rest), statistics.median(rest), min(rest), max(rest))
+    assert abs(mean - statistics.mean(rest)) < 1e-9 and abs(std_dev - statistics.stdev(rest)) < 1e-9
+
+    for value in rest:
+        backfill.sample_remove(sample, value)
+    assert backfill.sample_stats(sample) is None and sample["sum"] == 0.0
+
+
+def test_latest_date_matches_analyzers(tmp_path):
+    generate_corpus(tmp_path, 60, 12, 20)
+
+    run_script(tmp_path, "backfill-history", "--days", "30")
+    rhythm = read_jsonl(tmp_path / "cortex" / "state" / "rhythm-history.jsonl")
+    duration = read_jsonl(tmp_path / "cortex" / "state" / "duration-history.jsonl")
+    health = read_jsonl(tmp_path / "cortex" / "state" / "health-history.jsonl")
+    assert len(rhythm) == len(duration) == len(health) == 60
+    assert rhythm[-1]["date"] == datetime.now().date().isoformat()
+
+    run_script(tmp_path, "analyze-rhythm", "--no-store", "--output", "rhythm.json")
+    run_script(tmp_path, "analyze-duration", "--no-store", "--exact", "--output", "duration.json")
+    live_rhythm = json.loads((tmp_path / "rhythm.json").read_text(encoding="utf-8"))
+    live_duration = json.loads((tmp_path / "duration.json").read_text(encoding="utf-8"))
+
+    assert {k: live_rhythm[k] for k in rhythm[-1] if k != "date"} == {k: v for k, v in rhythm[-1].items() if k != "date"}
+    assert duration[-1]["overall"]["count"] == live_duration["overall"]["count"]
+    assert duration[-1]["overall"]["median"] == live_duration["overall"]["median"]
+    assert sorted(duration[-1]["by_category"]) == sorted(live_duration["by_category"])
+    assert health[-1]["components"]["analytics_health"]["rhythm_samples"] == live_rhythm["total_tasks"]
+    assert health[-1]["components"]["automation"]["runs"] > 0
+
+
+def test_slid_window_equals_fresh_window(tmp_path):
+    generate_corpus(tmp_path, 50, 10, 5)
+    middle = (datetime.now().date() - timedelta(days=12)).isoformat()
+
+    run_script(tmp_path, "backfill-history", "--days", "14", "--output-dir", "swept")
+    run_script(tmp_path, "backfill-history", "--days", "14", "--from", middle, "--to", middle,
+               "--output-dir", "fresh")
+
+    for name in ("rhythm-history.jsonl", "duration-history.jsonl", "health-history.jsonl"):
+        swept = {r["date"]: r for r in read_jsonl(tmp_path / "swept" / name)}
+        [fresh] = read_jsonl(tmp_path / "fresh" / name)
+        assert swept[middle] == fresh, name
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests for scripts/cortex_lib/categories.py
+
+Validates the category-rules classifier:
+- the combined regex gives the same answer as trying each rule in
+  priority order (on the shipped cortex/config/category-rules.json)
+- priority (not file order or match position) decides between rules
+- case_sensitive and invalid patterns are honoured / skipped
+- titles are memoized
+"""
+
+import json
+import re
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+from cortex_lib import categories
+
+RULES_FILE = REPO_ROOT / "cortex" / "config" / "category-rules.json"
+
+
+def naive_classify(config, title):
+    for rule in sorted(config["rules"], key=lambda r: r.get("priority", float("inf"))):
+        flags = 0 if rule.get("case_sensitive") else re.IGNORECASE
+        if any(re.search(p, title, flags) for p in rule["patterns"]):
+            return rule["category"]
+    return None
+
+
+def test_matches_per_rule_loop_on_shipped_rules():
+    config = json.loads(RULES_FILE.read_text(encoding="utf-8"))
+    classify = categories.build_classifier(config)
+    titles = [
+        "Fix Slack alert routing", "n8n recipe 10 のテスト", "Update README", "Review PR #12",
+        "Deploy to production", "Cortex daily digest", "運用手順の整理", "Buy groceries",
+        "workflow docs for on-call", "github merge of docker changes", "Weekly Summary 設計",
+        "N8N upgrade", "pr review", "improve llm prompts", "買い物",
+    ]
+    for title in titles:
+        assert classify(title) == naive_classify(config, title), title
+
+
+def test_priority_beats_position_and_file_order():
+    config = {"rules": [
+        {"category": "low", "priority": 5, "patterns": ["alpha"]},
+        {"category": "high", "priority": 1, "patterns": ["omega"]},
+    ]}
+    classify = categories.build_classifier(config)
+    assert classify("alpha then omega") == "high"
+    assert classify("only alpha") == "low"
+    assert classify("nothing") is None
+
+
+def test_case_sensitivity_and_invalid_patterns(capsys):
+    config = {"rules": [
+        {"category": "exact", "priority": 1, "patterns": ["API", "(unclosed"], "case_sensitive": True},
+        {"category": "loose", "priority": 2, "patterns": ["api"]},
+    ]}
+    classify = categories.build_classifier(config)
+    assert classify("call the API") == "exact"
+    assert classify("call the api") == "loose"
+    assert "(unclosed" in capsys.readouterr().err
+
+
+def test_literal_and_regex_patterns_mix():
+    config = {"rules": [
+        {"category": "ops", "priority": 1, "patterns": ["deploy", r"on[- ]?call"]},
+        {"category": "web", "priority": 2, "patterns": [r"index\.html", r"\bui\b", "css"], "case_sensitive": True},
+    ]}
+    assert categories.literal_text(r"index\.html") == "index.html"
+    assert categories.literal_text(r"\bui\b") is None
+    classify = categories.build_classifier(config)
+    assert classify("fix the ui css before DEPLOY") == "ops"   # literal beats a lower regex hit
+    assert classify("ON CALL handover") == "ops"
+    assert classify("edit index.html") == "web"
+    assert classify("edit indexXhtml") is None
+    assert classify("polish the ui") == "web"                   # second regex alternative, mid-title
+    assert classify("polish the UI") is None
+
+
+def test_titles_are_memoized():
+    classify = categories.build_classifier({"rules": [{"category": "x", "patterns": ["x"]}]})
+    for _ in range(3):
+        classify("x marks the spot")
+    info = classify.cache_info()
+    assert (info.hits, info.misses) == (2, 1)
+
+
+def test_load_classifier_defaults(tmp_path):
+    classify, default = categories.load_classifier(tmp_path / "missing.json")
+    assert classify("anything") is None
+    assert default == categories.DEFAULT_CATEGORY
+
+    classify, default = categories.load_classifier(RULES_FILE)
+    assert classify("Deploy the server") == "infra"
+    assert default == "other"
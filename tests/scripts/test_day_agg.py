@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Tests for scripts/cortex_lib/day_agg.py
+
+Validates the day-agg-YYYY-MM-DD.json sidecars:
+- build_day_agg() derives the per-day facts the analyzers sum
+- extract-tasks writes a current sidecar next to each task entry
+- Stale or missing sidecars are rebuilt on load
+- The analyzers give the same output from sidecars as from the task entries
+- Threads rebuilding the same sidecar at once never leave a torn file
+"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+
+from cortex_lib import day_agg
+from cortex_lib.fingerprint import atomic_write_json
+from cortex_lib.synthetic import generate_corpus
+
+
+SCRIPTS = Path(__file__).parent.parent.parent / "scripts"
+
+
+def run_script(cwd: Path, name: str, *args: str) -> subprocess.CompletedProcess:
+    result = subprocess.run(
+        ["python3", str(SCRIPTS / f"{name}.py"), *args],
+        capture_output=True,
+        text=True,
+        cwd=cwd,
+    )
+    assert result.returncode == 0, f"{name} failed: {result.stderr}"
+    return result
+
+
+def sample_entry(date_str: str) -> dict:
+    return {
+        "tasks": [
+            {"title": "[x] bracket done", "category": "  ", "completed_at": f"{date_str}T22:15:00+09:00"},
+            {"title": "timed", "status": "done", "category": "dev", "started_at": f"{date_str}T06:00:00",
+             "duration_minutes": 30, "duration_confidence": 0.3},
+            {"title": "no time", "status": "completed", "category": "dev", "duration_hours": 0},
+            {"title": "open", "status": "todo", "category": "dev", "duration_minutes": 15},
+        ],
+        "completed": [
+            {"title": "logged", "status": "completed", "timestamp": "23:40"},
+        ],
+    }
+
+
+def test_build_day_agg():
+    agg = day_agg.build_day_agg("2025-12-01", sample_entry("2025-12-01"), 5, 10)
+
+    assert agg["source"] == [5, 10]
+    assert (agg["tasks"], agg["completed"]) == (5, 4)
+    # 2025-12-01 is a Monday
+    assert agg["weekday_hour"][0][22] == 1 and agg["weekday_hour"][0][6] == 1 and agg["weekday_hour"][0][23] == 1
+    assert sum(map(sum, agg["weekday_hour"])) == 3
+    assert list(agg["categories"].items()) == [("uncategorized", [1, 0, 0, 0, 0, 0, 0]),
+                                               ("dev", [1, 0, 0, 0, 0, 0, 0])]
+    assert agg["durations"] == [["dev", 0.5, 0.3], ["dev", None, 1.0]]
+
+
+def test_extract_tasks_writes_sidecar(tmp_path):
+    daily_dir = tmp_path / "cortex" / "daily"
+    daily_dir.mkdir(parents=True)
+    d = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+    (daily_dir / f"{d}-digest.md").write_text("- [x] Done #work\n- [ ] Open\n", encoding="utf-8")
+
+    run_script(tmp_path, "extract-tasks", "--days", "3")
+
+    state_dir = tmp_path / "cortex" / "state"
+    entry_path = state_dir / f"task-entry-{d}.json"
+    st = entry_path.stat()
+    agg = day_agg.read_day_agg(day_agg.day_agg_path(state_dir, d), st.st_mtime_ns, st.st_size)
+    assert agg is not None
+    assert (agg["tasks"], agg["completed"]) == (2, 1)
+
+
+def test_stale_sidecar_is_rebuilt(tmp_path):
+    state_dir = tmp_path / "state"
+    state_dir.mkdir()
+    today = datetime.now().strftime("%Y-%m-%d")
+    entry_path = state_dir / f"task-entry-{today}.json"
+    entry_path.write_text(json.dumps(sample_entry(today)), encoding="utf-8")
+    day_agg.write_day_agg(today, sample_entry(today), entry_path)
+
+    # Rewritten by another tool: the recorded mtime/size no longer match
+    entry_path.write_text(json.dumps({"tasks": [{"title": "only", "status": "done"}]}), encoding="utf-8")
+    st = entry_path.stat()
+    os.utime(entry_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+
+    [agg] = day_agg.load_window(7, state_dir)
+
+    assert (agg["tasks"], agg["completed"]) == (1, 1)
+    st = entry_path.stat()
+    assert day_agg.read_day_agg(day_agg.day_agg_path(state_dir, today), st.st_mtime_ns, st.st_size) == agg
+
+
+def test_analyzers_match_task_entries(tmp_path):
+    generate_corpus(tmp_path, 40, 12, 4)
+    d = (datetime.now().date() - timedelta(days=3)).isoformat()
+    (tmp_path / "cortex" / "state" / f"task-entry-{d}.json").write_text(
+        json.dumps(sample_entry(d)), encoding="utf-8")
+
+    def output(name: str, *args: str) -> dict:
+        path = tmp_path / f"{name}.json"
+        run_script(tmp_path, name, "--windows", "7,30", "--no-store", "--no-cache", "--output", str(path), *args)
+        data = json.loads(path.read_text(encoding="utf-8"))
+        data.pop("generated_at")
+        data.pop("_meta")
+        return data
+
+    for name, *args in (("analyze-rhythm",), ("analyze-category-heatmap",),
+                        ("analyze-duration", "--exact"), ("analyze-duration",)):
+        expected = output(name, *args, "--no-day-agg")
+        (tmp_path / "cortex" / "state" / ".duration-sketches.json").unlink(missing_ok=True)
+        assert output(name, *args) == expected, name
+        assert output(name, *args) == expected, name  # from the sidecars written by the first run
+    assert len(list((tmp_path / "cortex" / "state").glob("day-agg-*.json"))) == 30  # the --days window
+
+
+def test_concurrent_sidecar_writes(tmp_path):
+    """run-pipeline.py runs analyzers as threads of one process; each may rebuild the same sidecar"""
+    path = day_agg.day_agg_path(tmp_path, "2025-12-01")
+    payloads = [{"writer": i, "durations": [[f"c{i}", float(j), 1.0] for j in range(2000)]} for i in range(4)]
+    errors = []
+    barrier = threading.Barrier(len(payloads))
+
+    def write(payload):
+        barrier.wait()
+        for _ in range(20):
+            try:
+                atomic_write_json(path, payload, ensure_ascii=False)
+            except OSError as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(payload,)) for payload in payloads]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert json.loads(path.read_text(encoding="utf-8")) in payloads
+    assert [p.name for p in tmp_path.iterdir()] == [path.name]
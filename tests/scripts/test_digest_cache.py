@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Tests for scripts/cortex_lib/digest_cache.py
+
+Validates the parsed-digest cache:
+- Every field of the parsed representation
+- Reuse from the in-process memo and from the on-disk cache
+- Invalidation on file change and on DIGEST_PARSER_VERSION bump
+"""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+
+from cortex_lib import digest_cache
+
+
+DIGEST = "\n".join([
+    "# Digest - 2025-12-10",
+    "",
+    "## Tasks",
+    "- [x] Morning review",
+    "- [ ] Write report",
+    "",
+    "## 進捗",
+    "",
+    "### Recipe fix (18:20 JST)",
+    "- **カテゴリ**: maintenance",
+    "- **所要時間**: 10m",
+    "",
+    "| 時刻 | タスク | 時間 |",
+    "|---|---|---|",
+    "| 11:00 | Row | 5分 |",
+    "",
+    "## Reflection",
+    "Good focus today.",
+])
+
+
+def write_digest(root: Path, content: str = DIGEST) -> Path:
+    daily_dir = root / "cortex" / "daily"
+    daily_dir.mkdir(parents=True, exist_ok=True)
+    path = daily_dir / "2025-12-10-digest.md"
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+def test_parsed_fields(tmp_path):
+    digest_cache.clear_memo()
+    parsed = digest_cache.load_parsed_digest(write_digest(tmp_path))
+
+    assert parsed["date"] == "2025-12-10"
+    assert parsed["checkboxes"] == [("x", "Morning review"), (" ", "Write report")]
+    assert parsed["tasks_section"] == ["Morning review", "Write report"]
+    assert parsed["progress"][0]["title"] == "Recipe fix"
+    assert parsed["progress"][0]["duration"] == "10m"
+    assert parsed["log_headings"] == [("Recipe fix", "18:20")]
+    assert parsed["tables"] == [[["時刻", "タスク", "時間"], ["11:00", "Row", "5分"]]]
+    assert parsed["reflection"] == "Good focus today."
+    assert [s["title"] for s in parsed["sections"]] == [
+        "Digest - 2025-12-10", "Tasks", "進捗", "Recipe fix (18:20 JST)", "Reflection",
+    ]
+    assert [t["title"] for t in parsed["tasks"]] == ["Morning review", "Write report", "Row"]
+
+
+def test_missing_digest_returns_none(tmp_path):
+    assert digest_cache.load_parsed_digest(tmp_path / "cortex" / "daily" / "2025-01-01-digest.md") is None
+
+
+def test_disk_cache_reused_across_processes(tmp_path, monkeypatch):
+    path = write_digest(tmp_path)
+    digest_cache.clear_memo()
+    first = digest_cache.load_parsed_digest(path)
+
+    cache_files = list((tmp_path / "cortex" / "tmp" / "digest-cache").glob("*.pickle.z"))
+    assert len(cache_files) == 1
+
+    # Fresh process (empty memo): served from disk without reparsing
+    digest_cache.clear_memo()
+    calls = []
+    monkeypatch.setattr(digest_cache, "parse_digest", lambda *a: calls.append(a) or {})
+    assert digest_cache.load_parsed_digest(path) == first
+    assert calls == []
+
+
+def test_changed_digest_is_reparsed(tmp_path):
+    path = write_digest(tmp_path)
+    digest_cache.clear_memo()
+    assert digest_cache.load_parsed_digest(path)["reflection"] == "Good focus today."
+
+    stat = path.stat()
+    path.write_text(DIGEST.replace("Good focus today.", "Scattered day."), encoding="utf-8")
+    # Same mtime, different size still invalidates
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert digest_cache.load_parsed_digest(path)["reflection"] == "Scattered day."
+
+
+def test_version_bump_invalidates(tmp_path, monkeypatch):
+    path = write_digest(tmp_path)
+    digest_cache.clear_memo()
+    digest_cache.load_parsed_digest(path)
+
+    digest_cache.clear_memo()
+    monkeypatch.setattr(digest_cache, "DIGEST_PARSER_VERSION", digest_cache.DIGEST_PARSER_VERSION + 1)
+    monkeypatch.setattr(digest_cache, "parse_digest", lambda content, date_str: {"date": date_str})
+    assert digest_cache.load_parsed_digest(path) == {"date": "2025-12-10"}
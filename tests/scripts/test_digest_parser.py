@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Tests for scripts/cortex_lib/digest_parser.py
+
+Validates the single-pass digest parser:
+- Checkbox tasks under category headers (timerange / explicit / fixed)
+- | 時刻 | タスク | 時間 | tables
+- ### Title (HH:MM-HH:MM JST) progress blocks with **所要時間** look-ahead
+- Output order (list, table, progress) regardless of document order
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+
+from cortex_lib.digest_parser import (
+    extract_duration_from_text,
+    extract_timerange_from_text,
+    parse_daily_digest,
+)
+
+
+DATE = "2025-12-10"
+
+
+def test_extract_duration_priority_and_cleanup():
+    assert extract_duration_from_text("Fix bug (30分)") == (30, "explicit", "Fix bug")
+    assert extract_duration_from_text("Write docs 10m") == (10, "explicit", "Write docs")
+    # 分 patterns win over m patterns even when they appear later
+    assert extract_duration_from_text("10m then 5分")[0] == 5
+    assert extract_duration_from_text("No duration here") == (None, None, "No duration here")
+    assert extract_duration_from_text("10min meeting")[0] is None
+
+
+def test_extract_timerange():
+    assert extract_timerange_from_text("Deploy (18:20-18:30 JST) now") == ("18:20", "18:30", "Deploy now")
+    assert extract_timerange_from_text("No range") == (None, None, "No range")
+
+
+def test_checkbox_tasks_with_categories():
+    content = "\n".join([
+        "### 優先度：高",
+        "- [x] Recipe fix (10分)",
+        "### 通常タスク",
+        "- [ ] Open task",
+        "- [x] Deploy (09:00-09:45 JST)",
+        "### タグなしタスク",
+        "- [x] （タスクなし）",
+    ])
+    tasks = parse_daily_digest(content, DATE)["tasks"]
+
+    assert len(tasks) == 3
+    assert tasks[0] == {
+        "title": "Recipe fix",
+        "status": "completed",
+        "category": "high-priority",
+        "completed_at": f"{DATE}T01:00:00Z",
+        "timestamp_source": "fixed",
+        "timestamp_confidence": 0.1,
+        "duration_minutes": 10,
+        "duration_source": "explicit",
+        "duration_confidence": 1.0,
+    }
+    assert tasks[1]["status"] == "incomplete"
+    assert tasks[1]["category"] == "normal"
+    assert tasks[1]["timestamp_source"] == "unknown"
+    assert tasks[1]["duration_source"] == "unknown"
+    assert tasks[2]["started_at"] == f"{DATE}T09:00:00+09:00"
+    assert tasks[2]["duration_minutes"] == 45
+    assert tasks[2]["duration_source"] == "timerange"
+
+
+def test_table_tasks():
+    content = "\n".join([
+        "| 時刻  | タスク | 時間  |",
+        "|-------|--------|-------|",
+        "| 17:00+ | Log check | 10分 |",
+        "| (18:00-18:20) | Health check | |",
+        "",
+        "| not | a | table | row |",
+    ])
+    tasks = parse_daily_digest(content, DATE)["tasks"]
+
+    assert [t["title"] for t in tasks] == ["Log check", "Health check"]
+    assert tasks[0]["duration_minutes"] == 10
+    assert tasks[0]["timestamp_source"] == "fixed"
+    assert tasks[1]["duration_minutes"] == 20
+    assert tasks[1]["duration_source"] == "timerange"
+
+
+def test_progress_blocks_lookahead():
+    content = "\n".join([
+        "## 進捗",
+        "",
+        "### 🔧 Recipe schedule (18:20-18:30 JST)",
+        "- **カテゴリ**: maintenance",
+        "- **所要時間**: 12m",
+        "",
+        "### Long session (09:00-14:00 JST)",
+        "- **メモ**: no explicit duration",
+        "",
+        "### Short (10:00-10:30 JST)",
+    ])
+    tasks = parse_daily_digest(content, DATE)["tasks"]
+
+    assert [t["title"] for t in tasks] == ["🔧 Recipe schedule", "Long session", "Short"]
+    assert tasks[0]["duration_minutes"] == 12
+    assert tasks[0]["duration_source"] == "explicit"
+    # 300 minutes fails the 1-240 sanity check
+    assert "duration_minutes" not in tasks[1]
+    assert tasks[1]["duration_source"] == "unknown"
+    assert tasks[2]["duration_minutes"] == 30
+
+
+def test_output_order_is_list_table_progress():
+    content = "\n".join([
+        "### Block (10:00-10:15 JST)",
+        "| 時刻 | タスク | 時間 |",
+        "|---|---|---|",
+        "| 11:00 | Row | 5分 |",
+        "",
+        "- [x] Item",
+    ])
+    tasks = parse_daily_digest(content, DATE)["tasks"]
+
+    assert [t["title"] for t in tasks] == ["Item", "Row", "Block"]
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for scripts/enrich-task-metadata.py
+
+Validates idempotent enrichment:
+- --all only picks canonical task-entry files (never *.enriched.json)
+- Outputs carry the enrichment version / input fingerprint stamp
+- Re-running with unchanged files rewrites nothing
+- Changed inputs are re-enriched; --in-place replaces files atomically
+- Stamped files are skipped even without a manifest
+"""
+
+import json
+import subprocess
+from pathlib import Path
+
+
+SCRIPT = Path(__file__).parent.parent.parent / "scripts" / "enrich-task-metadata.py"
+
+
+def run_enrich(cwd: Path, *args: str) -> subprocess.CompletedProcess:
+    result = subprocess.run(
+        ["python3", str(SCRIPT), *args],
+        capture_output=True,
+        text=True,
+        cwd=cwd,
+    )
+    assert result.returncode == 0, f"Script failed: {result.stderr}"
+    return result
+
+
+def setup_entries(root: Path, count: int = 3) -> Path:
+    state_dir = root / "cortex" / "state"
+    state_dir.mkdir(parents=True)
+    for i in range(1, count + 1):
+        entry = {"tasks": [
+            {"title": f"Task {i}", "completed_at": f"2025-12-{i:02d}T01:00:00Z"},
+            {"title": f"Timed {i}", "duration_minutes": 30},
+        ]}
+        (state_dir / f"task-entry-2025-12-{i:02d}.json").write_text(json.dumps(entry), encoding="utf-8")
+    return state_dir
+
+
+def mtimes(state_dir: Path) -> dict:
+    return {p.name: p.stat().st_mtime_ns for p in state_dir.glob("task-entry-*")}
+
+
+def test_all_skips_enriched_outputs_and_stamps(tmp_path):
+    state_dir = setup_entries(tmp_path)
+
+    run_enrich(tmp_path, "--all")
+    run_enrich(tmp_path, "--all", "--force")
+
+    names = sorted(p.name for p in state_dir.glob("task-entry-*"))
+    assert not any(".enriched.enriched" in name for name in names)
+    assert len(names) == 6
+
+    enriched = json.loads((state_dir / "task-entry-2025-12-01.enriched.json").read_text(encoding="utf-8"))
+    assert enriched["enrichment"]["version"]
+    assert len(enriched["enrichment"]["input_sha256"]) == 64
+    assert enriched["tasks"][0]["timestamp_source"] == "fixed"
+    assert enriched["tasks"][1]["duration_source"] == "explicit"
+
+
+def test_rerun_rewrites_nothing(tmp_path):
+    state_dir = setup_entries(tmp_path)
+    run_enrich(tmp_path, "--all", "--jobs", "2")
+    before = mtimes(state_dir)
+
+    result = run_enrich(tmp_path, "--all")
+
+    assert mtimes(state_dir) == before
+    assert "already enriched" in result.stderr
+
+
+def test_changed_input_is_reenriched(tmp_path):
+    state_dir = setup_entries(tmp_path)
+    run_enrich(tmp_path, "--all")
+    source = state_dir / "task-entry-2025-12-02.json"
+    source.write_text(json.dumps({"tasks": [{"title": "New"}]}), encoding="utf-8")
+
+    result = run_enrich(tmp_path, "--all")
+
+    assert "Enriching 1 task-entry files (2 unchanged" in result.stderr
+    enriched = json.loads((state_dir / "task-entry-2025-12-02.enriched.json").read_text(encoding="utf-8"))
+    assert [t["title"] for t in enriched["tasks"]] == ["New"]
+
+
+def test_in_place_is_atomic_and_idempotent(tmp_path):
+    state_dir = setup_entries(tmp_path, count=10)  # above the parallel threshold
+
+    run_enrich(tmp_path, "--all", "--in-place")
+
+    assert not list(state_dir.glob("*.enriched.json"))
+    assert not list(state_dir.glob(".*.tmp"))
+    entry = json.loads((state_dir / "task-entry-2025-12-01.json").read_text(encoding="utf-8"))
+    assert entry["tasks"][0]["timestamp_source"] == "fixed"
+
+    # Without the manifest, stamped files are read but not rewritten
+    (state_dir / ".enrich-manifest.json").unlink()
+    before = mtimes(state_dir)
+    result = run_enrich(tmp_path, "--all", "--in-place")
+    assert mtimes(state_dir) == before
+    assert "10 already current" in result.stderr
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Tests for scripts/extract-tasks.py
+
+Validates incremental extraction:
+- First run extracts and records input fingerprints in the manifest
+- Re-running with unchanged inputs rewrites nothing
+- Changed digests (and deleted outputs) are re-extracted
+- Categories come from the category rules, then the first #tag
+"""
+
+import json
+import subprocess
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+SCRIPT = Path(__file__).parent.parent.parent / "scripts" / "extract-tasks.py"
+
+
+def run_extract(cwd: Path, *args: str) -> subprocess.CompletedProcess:
+    result = subprocess.run(
+        ["python3", str(SCRIPT), *args],
+        capture_output=True,
+        text=True,
+        cwd=cwd,
+    )
+    assert result.returncode == 0, f"Script failed: {result.stderr}"
+    return result
+
+
+def setup_digests(root: Path, count: int = 3) -> list:
+    daily_dir = root / "cortex" / "daily"
+    daily_dir.mkdir(parents=True)
+    dates = []
+    for i in range(1, count + 1):
+        d = (datetime.now() - timedelta(days=i)).strftime("%Y-%m-%d")
+        (daily_dir / f"{d}-digest.md").write_text(
+            f"# Digest {d}\n\n- [x] Done task {i} #work\n- [ ] Open task {i}\n",
+            encoding="utf-8",
+        )
+        dates.append(d)
+    return dates
+
+
+def test_first_run_writes_entries_and_manifest(tmp_path):
+    dates = setup_digests(tmp_path)
+
+    result = run_extract(tmp_path, "--days", "5")
+
+    state_dir = tmp_path / "cortex" / "state"
+    for d in dates:
+        entry = json.loads((state_dir / f"task-entry-{d}.json").read_text(encoding="utf-8"))
+        assert entry["metadata"]["total_tasks"] == 2
+
+    manifest = json.loads((state_dir / ".extract-manifest.json").read_text(encoding="utf-8"))
+    assert manifest["extractor_version"]
+    assert manifest["dates"][dates[0]]["inputs"]["digest"]["sha256"]
+    assert "Processed 3 dates" in result.stdout
+
+
+def test_rerun_with_unchanged_inputs_is_noop(tmp_path):
+    dates = setup_digests(tmp_path)
+    run_extract(tmp_path, "--days", "5")
+
+    state_dir = tmp_path / "cortex" / "state"
+    mtimes = {d: (state_dir / f"task-entry-{d}.json").stat().st_mtime_ns for d in dates}
+
+    result = run_extract(tmp_path, "--days", "5")
+
+    assert "Processed 0 dates" in result.stdout
+    for d in dates:
+        assert (state_dir / f"task-entry-{d}.json").stat().st_mtime_ns == mtimes[d]
+
+
+def test_changed_digest_is_reextracted(tmp_path):
+    dates = setup_digests(tmp_path)
+    run_extract(tmp_path, "--days", "5")
+
+    digest = tmp_path / "cortex" / "daily" / f"{dates[0]}-digest.md"
+    digest.write_text(digest.read_text(encoding="utf-8") + "- [x] Added later\n", encoding="utf-8")
+
+    result = run_extract(tmp_path, "--days", "5")
+
+    assert "Processed 1 dates" in result.stdout
+    entry = json.loads(
+        (tmp_path / "cortex" / "state" / f"task-entry-{dates[0]}.json").read_text(encoding="utf-8")
+    )
+    assert entry["metadata"]["total_tasks"] == 3
+
+
+def test_deleted_output_is_regenerated(tmp_path):
+    dates = setup_digests(tmp_path)
+    run_extract(tmp_path, "--days", "5")
+
+    output = tmp_path / "cortex" / "state" / f"task-entry-{dates[1]}.json"
+    output.unlink()
+
+    result = run_extract(tmp_path, "--days", "5")
+
+    assert "Processed 1 dates" in result.stdout
+    assert output.exists()
+
+
+def test_force_ignores_manifest(tmp_path):
+    setup_digests(tmp_path)
+    run_extract(tmp_path, "--days", "5")
+
+    result = run_extract(tmp_path, "--days", "5", "--force")
+
+    assert "Processed 3 dates" in result.stdout
+
+
+def test_categories_from_rules_then_tags(tmp_path):
+    config_dir = tmp_path / "cortex" / "config"
+    config_dir.mkdir(parents=True)
+    (config_dir / "category-rules.json").write_text(json.dumps({
+        "default_category": "other",
+        "rules": [{"category": "n8n", "priority": 1, "patterns": ["recipe"]}],
+    }), encoding="utf-8")
+    daily_dir = tmp_path / "cortex" / "daily"
+    daily_dir.mkdir(parents=True)
+    d = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+    (daily_dir / f"{d}-digest.md").write_text(
+        "- [x] Fix Recipe 10 #work\n- [ ] Tagged task #home\n- [ ] Plain task\n", encoding="utf-8"
+    )
+
+    run_extract(tmp_path, "--days", "2")
+
+    entry = json.loads((tmp_path / "cortex" / "state" / f"task-entry-{d}.json").read_text(encoding="utf-8"))
+    assert [t["category"] for t in entry["tasks"]] == ["n8n", "home", "other"]
+
+    # Changing the rules invalidates the manifest
+    (config_dir / "category-rules.json").write_text(json.dumps({"rules": []}), encoding="utf-8")
+    result = run_extract(tmp_path, "--days", "2")
+    assert "Processed 1 dates" in result.stdout
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests for scripts/cortex_lib/log_index.py
+
+Validates the sparse timestamp index:
+- window_start() never skips a line inside the window, and skips most of
+  the lines before it
+- the index is extended on append and rebuilt on truncation / rotation
+- out-of-order and undated lines are never skipped
+"""
+
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+
+from cortex_lib import log_index
+
+START = datetime(2025, 12, 1, tzinfo=timezone.utc)
+
+
+def record(minutes: int, **extra) -> str:
+    ts = (START + timedelta(minutes=minutes)).isoformat().replace("+00:00", "Z")
+    return json.dumps({"ts": ts, "status": "success", **extra}) + "\n"
+
+
+def lines_from(path: Path, offset: int) -> list:
+    with path.open("rb") as f:
+        f.seek(offset)
+        return [json.loads(line) for line in f]
+
+
+def test_seek_skips_old_lines_only(tmp_path):
+    log = tmp_path / "recipe-15.jsonl"
+    log.write_text("".join(record(m, n=m) for m in range(1000)), encoding="utf-8")
+
+    cutoff = START + timedelta(minutes=700)
+    index = log_index.update_index(log, every=16)
+    offset = log_index.seek_offset(index, cutoff)
+
+    kept = [entry["n"] for entry in lines_from(log, offset)]
+    assert 700 in kept
+    assert kept[0] > 680
+    assert log_index.index_path(log).exists()
+    assert log_index.seek_offset(index, START - timedelta(days=1)) == 0
+
+
+def test_index_extended_on_append(tmp_path):
+    log = tmp_path / "recipe-15.jsonl"
+    log.write_text("".join(record(m) for m in range(100)), encoding="utf-8")
+    first = log_index.update_index(log, every=10)
+    assert first["lines"] == 100
+
+    with log.open("a", encoding="utf-8") as f:
+        f.write("".join(record(m) for m in range(100, 150)))
+        f.write(record(150)[:10])  # half-written line is not indexed yet
+
+    second = log_index.update_index(log, every=10)
+    assert second["lines"] == 150
+    assert second["points"][:len(first["points"])] == first["points"]
+    assert len(second["points"]) == 15
+    assert second["offset"] == log.stat().st_size - 10
+
+
+def test_truncation_and_rotation_rebuild(tmp_path):
+    log = tmp_path / "recipe-15.jsonl"
+    log.write_text("".join(record(m) for m in range(100)), encoding="utf-8")
+    log_index.update_index(log, every=10)
+
+    log.write_text("".join(record(m) for m in range(500, 520)), encoding="utf-8")
+    index = log_index.update_index(log, every=10)
+    assert index["lines"] == 20
+
+    rotated = tmp_path / "rotated.tmp"
+    rotated.write_text("".join(record(m) for m in range(600, 700)), encoding="utf-8")
+    log.unlink()
+    rotated.rename(log)
+    index = log_index.update_index(log, every=10)
+    assert index["lines"] == 100
+    assert index["inode"] == log.stat().st_ino
+
+
+def test_out_of_order_and_undated_lines_are_kept(tmp_path):
+    log = tmp_path / "recipe-15.jsonl"
+    body = [record(m) for m in range(50)]
+    body[5] = record(900, late=True)  # a late writer's line near the start
+    body[30] = json.dumps({"status": "success", "undated": True}) + "\n"
+    body += [record(m) for m in range(50, 100)]
+    log.write_text("".join(body), encoding="utf-8")
+
+    index = log_index.update_index(log, every=4)
+    cutoff = START + timedelta(minutes=90)
+    entries = lines_from(log, log_index.seek_offset(index, cutoff))
+    assert any(entry.get("late") for entry in entries)
+    assert any(entry.get("undated") for entry in entries)
+
+
+def test_window_start_falls_back_to_zero(tmp_path):
+    assert log_index.window_start(tmp_path / "missing.jsonl", START) == 0
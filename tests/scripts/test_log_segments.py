@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Tests for scripts/cortex_lib/log_segments.py
+
+Validates the recipe log segment reader:
+- rotated / compressed segment names are recognized, sidecars are not
+- segments are ordered by mtime and old ones are dropped before opening
+- lines stream through gzip (and zstandard when installed)
+- marker search finds matches in plain (mmap) and compressed segments,
+  including across chunk boundaries
+"""
+
+import gzip
+import os
+import re
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+
+from cortex_lib import log_segments
+
+
+def set_age(path: Path, days: float) -> None:
+    stamp = time.time() - days * 86400
+    os.utime(path, (stamp, stamp))
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("recipe-15-2025-12-22.jsonl", ("15-2025-12-22", "jsonl", None, None)),
+    ("recipe-15.jsonl.1", ("15", "jsonl", "1", None)),
+    ("recipe-13.log.2.gz", ("13", "log", "2", "gz")),
+    ("recipe-13.log-20251220.zst", ("13", "log", "20251220", "zst")),
+    ("recipe-13.log.gz", ("13", "log", None, "gz")),
+])
+def test_parse_segment_name(name, expected):
+    info = log_segments.parse_segment_name(name)
+    assert (info["stem"], info["kind"], info["rotation"], info["compression"]) == expected
+
+
+@pytest.mark.parametrize("name", [".recipe-15.jsonl.idx", "recipe-15.jsonl.tmp", "other.log", "recipe-15.txt"])
+def test_non_segments_ignored(name):
+    assert log_segments.parse_segment_name(name) is None
+
+
+def test_list_segments_orders_and_skips_old(tmp_path):
+    for name, age in [("recipe-a.log", 0.1), ("recipe-a.log.1", 2), ("recipe-a.log.2.gz", 20),
+                      ("recipe-b.jsonl", 1), (".recipe-a.log.idx", 0)]:
+        (tmp_path / name).write_bytes(b"")
+        set_age(tmp_path / name, age)
+
+    names = [s["name"] for s in log_segments.list_segments(tmp_path, "log")]
+    assert names == ["recipe-a.log.2.gz", "recipe-a.log.1", "recipe-a.log"]
+
+    since = datetime.now(timezone.utc) - timedelta(days=7)
+    assert [s["name"] for s in log_segments.list_segments(tmp_path, "log", since=since)] == \
+        ["recipe-a.log.1", "recipe-a.log"]
+
+
+def test_iter_lines_plain_and_gzip(tmp_path):
+    body = b"".join(b'{"n": %d}\n' % i for i in range(100))
+    (tmp_path / "recipe-a.jsonl").write_bytes(body)
+    with gzip.open(tmp_path / "recipe-a.jsonl.1.gz", "wb") as f:
+        f.write(body)
+
+    for segment in log_segments.list_segments(tmp_path, "jsonl"):
+        assert b"".join(log_segments.iter_lines(segment)) == body
+        assert next(log_segments.iter_lines(segment, len(b'{"n": 0}\n'))) == b'{"n": 1}\n'
+
+
+def test_iter_lines_zstd(tmp_path):
+    zstandard = pytest.importorskip("zstandard")
+    body = b"line one\nline two\n"
+    (tmp_path / "recipe-a.log.1.zst").write_bytes(zstandard.ZstdCompressor().compress(body))
+
+    [segment] = log_segments.list_segments(tmp_path, "log")
+    assert list(log_segments.iter_lines(segment)) == [b"line one\n", b"line two\n"]
+
+
+def test_zstd_missing_skips_segment(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(log_segments, "zstd_available", lambda: False)
+    monkeypatch.setattr(log_segments, "_zstd_warned", False)
+    (tmp_path / "recipe-a.log.1.zst").write_bytes(b"\x28\xb5\x2f\xfd")
+
+    [segment] = log_segments.list_segments(tmp_path, "log")
+    assert not log_segments.readable(segment)
+    assert list(log_segments.iter_lines(segment)) == []
+    assert "pip install zstandard" in capsys.readouterr().err
+
+
+def test_search_plain_and_compressed(tmp_path, monkeypatch):
+    monkeypatch.setattr(log_segments, "CHUNK_SIZE", 64)
+    pattern = re.compile(b"SUCCESS|(?i:completed)")
+    filler = b"x" * 60
+    (tmp_path / "recipe-a.log").write_bytes(filler + b"Recipe COMPLETED\n")
+    with gzip.open(tmp_path / "recipe-a.log.1.gz", "wb") as f:
+        f.write(filler + b"SUCCESS" + filler)  # match straddles a chunk boundary
+    with gzip.open(tmp_path / "recipe-a.log.2.gz", "wb") as f:
+        f.write(filler * 10)
+    (tmp_path / "recipe-a.log.3").write_bytes(b"")
+
+    found = {s["name"]: log_segments.search(s, pattern) for s in log_segments.list_segments(tmp_path, "log")}
+    assert found == {"recipe-a.log": True, "recipe-a.log.1.gz": True,
+                     "recipe-a.log.2.gz": False, "recipe-a.log.3": False}
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Tests for scripts/cortex_lib/pipeline.py
+
+Validates the stage graph runner:
+- Dependency validation (unknown deps, cycles) and ordering
+- Skip when inputs/outputs/key are unchanged, rerun when they change
+- Failures block downstream stages and are not recorded
+- run-pipeline.py runs the whole chain from a state dir without sidecars
+"""
+
+import json
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+
+from cortex_lib import day_agg, pipeline, task_entries
+from cortex_lib.synthetic import generate_corpus
+
+
+SCRIPTS = Path(__file__).parent.parent.parent / "scripts"
+
+
+def make_stage(name, deps, calls, src=None, out=None, key=None, fail=False):
+    def run():
+        calls.append(name)
+        if fail:
+            sys.exit(1)
+        if out is not None:
+            Path(out).write_text(Path(src).read_text() if src else name)
+
+    return {
+        "name": name,
+        "deps": deps,
+        "run": run,
+        "inputs": [str(src)] if src else [],
+        "outputs": [str(out)] if out else [],
+        "key": key,
+    }
+
+
+def test_validate_rejects_unknown_deps_and_cycles():
+    calls = []
+    with pytest.raises(ValueError, match="unknown stage"):
+        pipeline.validate([make_stage("a", ["missing"], calls)])
+    with pytest.raises(ValueError, match="cycle"):
+        pipeline.validate([make_stage("a", ["b"], calls), make_stage("b", ["a"], calls)])
+    order = pipeline.validate([make_stage("c", ["a", "b"], calls), make_stage("b", ["a"], calls),
+                               make_stage("a", [], calls)])
+    assert order == ["a", "b", "c"]
+
+
+def test_dependencies_finish_first_and_independent_stages_overlap(tmp_path):
+    calls = []
+    barrier = threading.Barrier(2, timeout=5)
+
+    def concurrent(name):
+        def run():
+            barrier.wait()  # deadlocks unless both run at the same time
+            calls.append(name)
+        return {"name": name, "deps": ["root"], "run": run}
+
+    stages = [
+        make_stage("root", [], calls),
+        concurrent("left"),
+        concurrent("right"),
+        make_stage("sink", ["left", "right"], calls),
+    ]
+    results = pipeline.run_pipeline(stages, tmp_path / "manifest.json", max_workers=2)
+
+    assert all(r["status"] == "ran" for r in results.values())
+    assert calls[0] == "root" and calls[-1] == "sink"
+    assert set(calls[1:3]) == {"left", "right"}
+
+
+def test_unchanged_stages_are_skipped(tmp_path):
+    src = tmp_path / "in.txt"
+    out = tmp_path / "out.txt"
+    manifest = tmp_path / "manifest.json"
+    src.write_text("v1")
+
+    def stages(calls, key="k"):
+        return [make_stage("copy", [], calls, src=src, out=out, key=key)]
+
+    calls = []
+    pipeline.run_pipeline(stages(calls), manifest)
+    results = pipeline.run_pipeline(stages(calls), manifest)
+    assert results["copy"]["status"] == "skipped"
+    assert calls == ["copy"]
+
+    # Touched but identical: still skipped
+    src.write_text("v1")
+    assert pipeline.run_pipeline(stages(calls), manifest)["copy"]["status"] == "skipped"
+
+    src.write_text("v2")
+    assert pipeline.run_pipeline(stages(calls), manifest)["copy"]["status"] == "ran"
+    assert out.read_text() == "v2"
+
+    out.unlink()
+    assert pipeline.run_pipeline(stages(calls), manifest)["copy"]["status"] == "ran"
+
+    assert pipeline.run_pipeline(stages(calls, key="other"), manifest)["copy"]["status"] == "ran"
+    assert pipeline.run_pipeline(stages(calls), manifest, force=True)["copy"]["status"] == "ran"
+
+
+def test_failure_blocks_downstream_and_is_retried(tmp_path):
+    manifest = tmp_path / "manifest.json"
+    calls = []
+    stages = [
+        make_stage("bad", [], calls, fail=True),
+        make_stage("after", ["bad"], calls),
+        make_stage("other", [], calls),
+    ]
+    results = pipeline.run_pipeline(stages, manifest)
+
+    assert results["bad"] == {"status": "failed", "seconds": results["bad"]["seconds"], "error": "exit status 1"}
+    assert results["after"]["status"] == "blocked"
+    assert results["other"]["status"] == "ran"
+    assert "after" not in calls
+
+    # Failed stages have no manifest record, so the next run retries them
+    calls.clear()
+    pipeline.run_pipeline(stages, manifest)
+    assert "bad" in calls
+
+
+def test_run_pipeline_from_cold_state_dir(tmp_path):
+    generate_corpus(tmp_path, 20, 8, 4)
+    state_dir = tmp_path / "cortex" / "state"
+    for sidecar in state_dir.glob("day-agg-*.json"):
+        sidecar.unlink()
+
+    result = subprocess.run(
+        ["python3", str(SCRIPTS / "run-pipeline.py"), "--days", "14", "--jobs", "4"],
+        capture_output=True,
+        text=True,
+        cwd=tmp_path,
+    )
+    assert result.returncode == 0, result.stderr
+    assert "Could not write day aggregate" not in result.stderr
+    summary = json.loads(result.stdout)
+    assert summary["failed"] == summary["blocked"] == 0
+    # Sidecars are built by one stage before the analyzers; enrich only runs with --enrich-in-place
+    assert set(summary["stages"]) == {"extract", "day-aggs", "duration", "rhythm", "heatmap",
+                                      "recipes", "feedback", "health"}
+
+    # Every sidecar in the window is current and whole; no temp files are left behind
+    files = task_entries.scan_task_entry_files(state_dir)
+    for date_str in task_entries.window_dates(14):
+        if date_str in files:
+            _, mtime_ns, size = files[date_str]
+            assert day_agg.read_day_agg(day_agg.day_agg_path(state_dir, date_str), mtime_ns, size), date_str
+    assert not list(state_dir.glob(".*.tmp"))
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for scripts/process-obsidian-batch.py
+
+Validates --from-files backfill:
+- Serial and --jobs N runs write identical task-entry files
+- Summary counters are aggregated from the workers
+- Categories come from the category rules; the header group moves to "section"
+"""
+
+import json
+import re
+import subprocess
+from pathlib import Path
+
+
+SCRIPT = Path(__file__).parent.parent.parent / "scripts" / "process-obsidian-batch.py"
+
+
+def write_digests(root: Path, count: int) -> None:
+    daily_dir = root / "cortex" / "daily"
+    daily_dir.mkdir(parents=True)
+    for day in range(1, count + 1):
+        (daily_dir / f"2025-11-{day:02d}-digest.md").write_text(
+            "\n".join([
+                "### 優先度：高",
+                f"- [x] Task {day} (10分)",
+                "- [ ] Open task",
+                "",
+                "## 進捗",
+                f"### Session {day} (09:00-09:30 JST)",
+                "- **所要時間**: 25m",
+            ]),
+            encoding="utf-8",
+        )
+    # No tasks: counted as skipped, not processed
+    (daily_dir / "2025-11-30-digest.md").write_text("# Empty\n", encoding="utf-8")
+
+
+def run_batch(cwd: Path, *args: str) -> str:
+    result = subprocess.run(
+        ["python3", str(SCRIPT), "--from-files", *args],
+        capture_output=True,
+        text=True,
+        cwd=cwd,
+    )
+    assert result.returncode == 0, f"Script failed: {result.stderr}"
+    return result.stdout
+
+
+def summary(stdout: str) -> dict:
+    return {
+        key: int(re.search(rf"{key}: (\d+)", stdout).group(1))
+        for key in ("Files processed", "Tasks extracted", "Tasks with duration")
+    }
+
+
+def read_outputs(root: Path) -> dict:
+    state_dir = root / "cortex" / "state"
+    return {p.name: p.read_text(encoding="utf-8") for p in sorted(state_dir.glob("task-entry-*.json"))}
+
+
+def test_parallel_backfill_matches_serial(tmp_path):
+    serial_root = tmp_path / "serial"
+    parallel_root = tmp_path / "parallel"
+    write_digests(serial_root, 12)
+    write_digests(parallel_root, 12)
+
+    serial_out = run_batch(serial_root)
+    parallel_out = run_batch(parallel_root, "--jobs", "3")
+
+    assert read_outputs(serial_root) == read_outputs(parallel_root)
+    assert summary(serial_out) == summary(parallel_out) == {
+        "Files processed": 12,
+        "Tasks extracted": 36,
+        "Tasks with duration": 24,
+    }
+    assert "2025-11-30: No tasks found" in parallel_out
+
+
+def test_categories_from_rules(tmp_path):
+    write_digests(tmp_path, 1)
+    config_dir = tmp_path / "cortex" / "config"
+    config_dir.mkdir(parents=True)
+    (config_dir / "category-rules.json").write_text(json.dumps({
+        "default_category": "other",
+        "rules": [{"category": "focus", "priority": 1, "patterns": ["^task \\d"]}],
+    }), encoding="utf-8")
+
+    run_batch(tmp_path)
+
+    entry = json.loads((tmp_path / "cortex" / "state" / "task-entry-2025-11-01.json").read_text(encoding="utf-8"))
+    by_title = {t["title"]: t for t in entry["tasks"]}
+    assert by_title["Task 1"]["category"] == "focus"
+    assert by_title["Open task"]["category"] == "other"
+    assert by_title["Task 1"]["section"] == "high-priority"
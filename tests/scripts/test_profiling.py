@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for scripts/cortex_lib/profiling.py
+
+Validates the --profile mode:
+- run_main() only profiles when --profile is given, and strips the flag
+- profile files (.pstats, .alloc.txt, .trace.json) are written, also on SystemExit
+- spans become Chrome trace events
+- scripts accept --profile end to end
+"""
+
+import json
+import pstats
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).parent.parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from cortex_lib import profiling, spans
+from cortex_lib.synthetic import generate_corpus
+
+
+def profile_files(out_dir: Path) -> dict:
+    return {suffix: sorted(out_dir.glob(f"*{suffix}")) for suffix in (".pstats", ".alloc.txt", ".trace.json")}
+
+
+def test_run_main_without_flag(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["analyze-duration.py", "--days", "7"])
+    seen = []
+    profiling.run_main(lambda: seen.append(list(sys.argv)))
+
+    assert seen == [["analyze-duration.py", "--days", "7"]]
+    assert not (tmp_path / "cortex").exists()
+
+
+def test_run_main_strips_flag_and_writes_profile(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("CORTEX_SPANS", "0")
+    monkeypatch.setattr(sys, "argv", ["analyze-duration.py", "--profile", "--days", "7"])
+    seen = []
+
+    def main():
+        seen.append(list(sys.argv))
+        with spans.span("analyze-duration.load", items=3):
+            sum(range(1000))
+
+    profiling.run_main(main)
+
+    assert seen == [["analyze-duration.py", "--days", "7"]]
+    files = profile_files(tmp_path / "cortex" / "tmp" / "profiles")
+    assert all(len(paths) == 1 for paths in files.values())
+    assert files[".pstats"][0].name.startswith("analyze-duration-")
+
+    pstats.Stats(str(files[".pstats"][0]))
+    assert "Peak traced memory" in files[".alloc.txt"][0].read_text(encoding="utf-8")
+
+    trace = json.loads(files[".trace.json"][0].read_text(encoding="utf-8"))
+    events = {e["name"]: e for e in trace["traceEvents"]}
+    assert events["analyze-duration.load"]["ph"] == "X"
+    assert events["analyze-duration.load"]["args"]["items"] == 3
+    assert events["analyze-duration.main"]["dur"] >= events["analyze-duration.load"]["dur"]
+    assert any(e["ph"] == "C" for e in trace["traceEvents"])
+
+    # Sink is removed afterwards; spans stay disabled in the log
+    assert spans._trace_sink is None
+    assert not (tmp_path / "cortex" / "logs").exists()
+
+
+def test_profile_written_on_exit(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+
+    def main():
+        sys.exit(1)
+
+    with pytest.raises(SystemExit):
+        profiling.profile_call(main, "failing")
+
+    files = profile_files(tmp_path / "cortex" / "tmp" / "profiles")
+    assert all(len(paths) == 1 for paths in files.values())
+
+
+def test_script_profile_end_to_end(tmp_path):
+    generate_corpus(tmp_path, days=5, tasks_per_day=6, log_lines=4)
+
+    result = subprocess.run(
+        [sys.executable, str(SCRIPTS_DIR / "analyze-duration.py"), "--days", "5", "--profile"],
+        cwd=tmp_path, capture_output=True, text=True,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout)
+    assert "Profile (analyze-duration)" in result.stderr
+
+    files = profile_files(tmp_path / "cortex" / "tmp" / "profiles")
+    trace = json.loads(files[".trace.json"][0].read_text(encoding="utf-8"))
+    names = {e["name"] for e in trace["traceEvents"]}
+    assert {"analyze-duration.load", "analyze-duration.analyze", "analyze-duration.main"} <= names
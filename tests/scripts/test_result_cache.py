@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Tests for scripts/cortex_lib/result_cache.py
+
+Validates the analyzer result cache:
+- The "_meta" header is the first line of an otherwise ordinary JSON file
+- Fingerprints change with the key and with any input file's mtime/size
+- load_result() only returns outputs written for the same fingerprint
+- Analyzers reuse their output when nothing changed and recompute otherwise
+- Log analyzers ignore the span logs (their own spans), not run records
+"""
+
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+
+from cortex_lib import result_cache
+from cortex_lib.synthetic import generate_corpus
+
+
+SCRIPTS = Path(__file__).parent.parent.parent / "scripts"
+
+
+def run_script(cwd: Path, name: str, *args: str, env: Optional[Dict[str, str]] = None) -> subprocess.CompletedProcess:
+    result = subprocess.run(
+        ["python3", str(SCRIPTS / f"{name}.py"), *args],
+        capture_output=True,
+        text=True,
+        cwd=cwd,
+        env=env or {**os.environ, "CORTEX_SPANS": "0"},
+    )
+    assert result.returncode == 0, f"{name} failed: {result.stderr}"
+    return result
+
+
+def test_header_round_trip(tmp_path):
+    path = tmp_path / "out.json"
+    result = {"generated_at": "2025-12-01T00:00:00+09:00", "insights": ["a\nb"], "nested": {"x": [1, 2]}}
+
+    result_cache.write_result(path, result, "abc", summary={"total_tasks": 3})
+
+    first_line = path.read_text(encoding="utf-8").split("\n", 1)[0]
+    assert first_line.startswith('{"_meta": ')
+    assert json.loads(path.read_text(encoding="utf-8")) == {
+        "_meta": {"version": result_cache.RESULT_CACHE_VERSION, "fingerprint": "abc",
+                  "summary": {"total_tasks": 3}},
+        **result,
+    }
+    assert result_cache.read_header(path)["summary"] == {"total_tasks": 3}
+    assert result_cache.load_result(path, "abc") == result
+    assert result_cache.load_result(path, "other") is None
+
+
+def test_header_is_read_from_the_first_line_only(tmp_path):
+    path = tmp_path / "out.json"
+    result_cache.write_result(path, {"total_tasks": 3}, "abc", summary={"total_tasks": 3})
+    first_line = path.read_text(encoding="utf-8").split("\n", 1)[0]
+    path.write_text(first_line + "\n  not json", encoding="utf-8")
+
+    assert result_cache.read_header(path)["fingerprint"] == "abc"
+    assert result_cache.load_result(path, "abc") is None  # the body is unreadable
+
+
+def test_files_without_header(tmp_path):
+    legacy = tmp_path / "legacy.json"
+    legacy.write_text(json.dumps({"total_tasks": 3}, indent=2), encoding="utf-8")
+    compact = tmp_path / "compact.json"
+    compact.write_text(json.dumps({"total_tasks": 3}), encoding="utf-8")
+
+    for path in (legacy, compact, tmp_path / "missing.json"):
+        assert result_cache.read_header(path) is None
+        assert result_cache.load_result(path, "abc") is None
+
+
+def test_fingerprint_tracks_key_and_files(tmp_path):
+    src = tmp_path / "in.json"
+    src.write_text("{}", encoding="utf-8")
+
+    def fingerprint(key="k"):
+        return result_cache.input_fingerprint(key, result_cache.file_signatures([src, tmp_path / "absent.json"]))
+
+    base = fingerprint()
+    assert fingerprint() == base
+    assert fingerprint("other") != base
+
+    st = src.stat()
+    os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+    assert fingerprint() != base
+
+    (tmp_path / "absent.json").write_text("{}", encoding="utf-8")
+    touched = fingerprint()
+    (tmp_path / "absent.json").unlink()
+    assert fingerprint() != touched
+
+
+def test_analyzers_reuse_unchanged_output(tmp_path):
+    generate_corpus(tmp_path, 20, 8, 4)
+    state_dir = tmp_path / "cortex" / "state"
+
+    for name, output in (("analyze-rhythm", "rhythm-patterns.json"),
+                         ("analyze-category-heatmap", "category-heatmap.json"),
+                         ("analyze-duration", "duration-patterns.json"),
+                         ("analyze-recipes", "recipe-metrics.json"),
+                         ("extract-feedback", "feedback-history.json"),
+                         ("analyze-health", "health-score.json")):
+        first = run_script(tmp_path, name, "--days" if name != "analyze-health" else "--window-days", "14")
+        written = (state_dir / output).read_text(encoding="utf-8")
+
+        second = run_script(tmp_path, name, "--days" if name != "analyze-health" else "--window-days", "14")
+        assert "Inputs unchanged" in second.stderr, name
+        assert json.loads(second.stdout) == json.loads(first.stdout), name
+        assert (state_dir / output).read_text(encoding="utf-8") == written, name
+
+        forced = run_script(tmp_path, name, "--days" if name != "analyze-health" else "--window-days", "14",
+                            "--no-cache")
+        assert "Inputs unchanged" not in forced.stderr, name
+
+
+def test_changed_task_entry_recomputes(tmp_path):
+    generate_corpus(tmp_path, 20, 8, 4)
+    run_script(tmp_path, "analyze-rhythm", "--days", "14")
+
+    d = (datetime.now().date() - timedelta(days=1)).isoformat()
+    entry_path = tmp_path / "cortex" / "state" / f"task-entry-{d}.json"
+    entry = json.loads(entry_path.read_text(encoding="utf-8"))
+    entry["tasks"].append({"title": "late", "status": "completed", "started_at": f"{d}T03:00:00+09:00"})
+    entry_path.write_text(json.dumps(entry), encoding="utf-8")
+
+    rerun = run_script(tmp_path, "analyze-rhythm", "--days", "14")
+    assert "Inputs unchanged" not in rerun.stderr
+    assert json.loads(rerun.stdout)["hourly_distribution"]["3"] >= 1
+
+    # A different window is a different fingerprint
+    other = run_script(tmp_path, "analyze-rhythm", "--days", "7")
+    assert "Inputs unchanged" not in other.stderr
+
+
+@pytest.mark.parametrize("recipe", [None, "13"])
+def test_own_spans_do_not_invalidate_log_analyzers(tmp_path, recipe):
+    generate_corpus(tmp_path, 20, 8, 4)
+    env = {k: v for k, v in os.environ.items() if k not in ("CORTEX_SPANS", "CORTEX_RECIPE")}
+    if recipe:
+        env["CORTEX_RECIPE"] = recipe  # as under n8n: spans go to recipe-13-spans-<date>.jsonl
+    logs_dir = tmp_path / "cortex" / "logs"
+    analyzers = (("analyze-recipes", "--days"), ("analyze-health", "--window-days"))
+
+    for name, days in analyzers:
+        run_script(tmp_path, name, days, "14", env=env)
+    assert list(logs_dir.glob(f"recipe-{recipe or 'local'}-spans-*.jsonl"))  # the runs logged their spans
+
+    # Alternating runs each append spans; neither invalidates the other
+    for name, days in analyzers * 2:
+        rerun = run_script(tmp_path, name, days, "14", env=env)
+        assert "Inputs unchanged" in rerun.stderr, name
+
+    ts = datetime.now().astimezone().isoformat()
+    with (logs_dir / "recipe-02-2025-12-22.jsonl").open("a", encoding="utf-8") as f:
+        f.write(json.dumps({"ts": ts, "workflow": "Recipe 02: Nightly KB Rebuild", "status": "success"}) + "\n")
+    for name, days in analyzers:
+        appended = run_script(tmp_path, name, days, "14", env=env)
+        assert "Inputs unchanged" not in appended.stderr, name
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for scripts/cortex_lib/sketches.py
+
+Validates mergeable sketches:
+- Welford moments match statistics.mean / stdev, also after merging
+- Median is exact up to COMPRESS_AT values
+- Compressed sketches stay within the documented rank error
+"""
+
+import bisect
+import json
+import random
+import statistics
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+
+from cortex_lib import sketches
+
+
+def values(n: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    return [rng.lognormvariate(0, 0.8) for _ in range(n)]
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 10, 57])
+def test_single_sketch_matches_statistics(n):
+    data = values(n)
+    sketch = sketches.from_values(data)
+
+    assert sketch["n"] == n
+    assert sketch["mean"] == pytest.approx(statistics.mean(data))
+    assert sketches.std_dev(sketch) == pytest.approx(statistics.stdev(data) if n > 1 else 0.0)
+    assert sketches.quantile(sketch, 0.5) == pytest.approx(statistics.median(data))
+    assert (sketch["min"], sketch["max"]) == (min(data), max(data))
+
+
+def test_merge_matches_concatenation():
+    data = values(180)
+    parts = [sketches.from_values(data[i:i + 11]) for i in range(0, len(data), 11)]
+    merged = sketches.merge(parts)
+
+    assert merged["n"] == len(data)
+    assert merged["mean"] == pytest.approx(statistics.mean(data))
+    assert sketches.std_dev(merged) == pytest.approx(statistics.stdev(data))
+    assert sketches.quantile(merged, 0.5) == pytest.approx(statistics.median(data))
+    # Inputs are untouched and the result survives a JSON round trip
+    assert parts[0]["n"] == 11
+    assert json.loads(json.dumps(merged)) == merged
+
+
+def test_merge_skips_empty():
+    assert sketches.merge([sketches.new_sketch()])["n"] == 0
+    assert sketches.quantile(sketches.new_sketch(), 0.5) is None
+
+
+def test_compressed_rank_error():
+    data = values(20000)
+    merged = sketches.merge(sketches.from_values(data[i:i + 40]) for i in range(0, len(data), 40))
+
+    assert len(merged["centroids"]) <= sketches.COMPRESS_AT
+    ordered = sorted(data)
+    for q in (0.05, 0.5, 0.95):
+        estimate = sketches.quantile(merged, q)
+        rank = bisect.bisect_left(ordered, estimate) / len(ordered)
+        assert abs(rank - q) < 0.01
+    assert merged["mean"] == pytest.approx(statistics.mean(data))
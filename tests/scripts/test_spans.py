@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests for scripts/cortex_lib/spans.py
+
+Validates timing spans:
+- span() appends one JSONL record per block, with items and errors
+- CORTEX_RECIPE selects the log file, CORTEX_SPANS=0 disables logging
+- percentile() interpolation
+- Per-stage totals of coarse periods summarize like the raw spans
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+
+from cortex_lib import spans
+
+
+def read_records(logs_dir: Path) -> list:
+    return [
+        json.loads(line)
+        for path in sorted(logs_dir.glob("recipe-*.jsonl"))
+        for line in path.read_text(encoding="utf-8").splitlines()
+    ]
+
+
+def test_span_appends_record(tmp_path, monkeypatch):
+    monkeypatch.delenv("CORTEX_SPANS")
+    monkeypatch.setenv("CORTEX_RECIPE", "15")
+    with spans.span("analyze-duration.load", logs_dir=tmp_path) as sp:
+        sp["items"] = 42
+
+    [record] = read_records(tmp_path)
+    assert record["recipe"] == "15"
+    assert record["stage"] == "analyze-duration.load"
+    assert record["items"] == 42
+    assert record["duration_ms"] >= 0
+    assert record["ts"].endswith("Z")
+    assert spans.is_span(record)
+    assert next(tmp_path.glob("recipe-15-spans-*.jsonl"))
+
+
+def test_span_records_errors(tmp_path, monkeypatch):
+    monkeypatch.delenv("CORTEX_SPANS")
+    monkeypatch.delenv("CORTEX_RECIPE", raising=False)
+    with pytest.raises(SystemExit):
+        with spans.span("analyze-rhythm.load", logs_dir=tmp_path):
+            sys.exit(1)
+
+    [record] = read_records(tmp_path)
+    assert record["recipe"] == "local"
+    assert record["error"] == "SystemExit(1)"
+
+
+def test_spans_disabled(tmp_path, monkeypatch):
+    monkeypatch.setenv("CORTEX_SPANS", "0")
+    spans.write_span("extract-tasks.extract", 1.0, 3, logs_dir=tmp_path)
+    assert read_records(tmp_path) == []
+
+
+def test_run_records_are_not_spans():
+    assert not spans.is_span({"ts": "x", "workflow": "Recipe 10", "status": "success", "durationMs": 5})
+
+
+def test_percentile():
+    assert spans.percentile([], 50) is None
+    assert spans.percentile([5.0], 95) == 5.0
+    assert spans.percentile([40, 10, 30, 20], 50) == 25.0
+    assert spans.percentile(list(range(1, 101)), 95) == pytest.approx(95.05)
+
+
+def test_stage_totals_match_raw_spans():
+    records = [
+        {"ts": f"2025-12-{10 + i:02d}T00:00:00Z", "stage": "analyze-rhythm.load",
+         "duration_ms": ms, "items": 100 if i % 2 else None}
+        for i, ms in enumerate([10, 12, 11, 30, 33, 31])
+    ]
+    by_day = []
+    for i in range(0, len(records), 3):
+        stages = {}
+        for record in records[i:i + 3]:
+            spans.add_span(stages, record)
+        by_day.append(stages)
+
+    assert spans.summarize_stage_totals(by_day) == spans.summarize_spans(records)
+    assert spans.summarize_spans(records)["analyze-rhythm.load"]["trend_ratio"] == 2.82
+    assert spans.summarize_stage_totals([]) == {}
+
+
+def test_span_logs():
+    assert spans.is_span_log(spans.span_log_path(spans.DEFAULT_RECIPE))
+    assert spans.is_span_log(spans.span_log_path("02"))
+    assert spans.is_span_log(Path("cortex/logs/recipe-13-spans-2025-12-22.jsonl.1.gz"))
+    assert spans.is_span_log(Path("cortex/logs/recipe-local-2025-12-22.jsonl"))
+    # Run logs, including those of a recipe named like a span log's prefix
+    assert not spans.is_span_log(Path("cortex/logs/recipe-02-2025-12-22.jsonl"))
+    assert not spans.is_span_log(Path("cortex/logs/recipe-spans.jsonl"))
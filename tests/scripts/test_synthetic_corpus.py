@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for scripts/cortex_lib/synthetic.py and scripts/benchmark-analytics.py
+
+Validates the synthetic corpus and the benchmark harness:
+- Same seed, same corpus (byte-identical files)
+- Digests exercise every parse_daily_digest format and the section parsers
+- Recipe logs are readable by the JSONL and legacy log parsers
+- The harness records per-script timings and memory to its history file
+- Failing warm runs are errors; cold and warm slowdowns are both flagged
+"""
+
+import importlib.util
+import json
+import subprocess
+import sys
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+
+from cortex_lib import digest_cache
+from cortex_lib.synthetic import generate_corpus
+
+
+SCRIPTS = Path(__file__).parent.parent.parent / "scripts"
+END = date(2025, 12, 10)
+
+spec = importlib.util.spec_from_file_location("benchmark_analytics", SCRIPTS / "benchmark-analytics.py")
+benchmark_analytics = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(benchmark_analytics)
+
+
+def read_tree(root: Path) -> dict:
+    return {str(p.relative_to(root)): p.read_bytes() for p in sorted(root.rglob("*")) if p.is_file()}
+
+
+def test_corpus_is_deterministic(tmp_path):
+    stats = generate_corpus(tmp_path / "a", 5, 8, 6, seed=7, end_date=END)
+    generate_corpus(tmp_path / "b", 5, 8, 6, seed=7, end_date=END)
+
+    assert read_tree(tmp_path / "a") == read_tree(tmp_path / "b")
+    assert stats["digests"] == stats["task_entries"] == 5
+    assert (tmp_path / "a" / "cortex" / "daily" / "2025-12-06-digest.md").exists()
+    assert (tmp_path / "a" / "cortex" / "state" / "task-entry-2025-12-10.json").exists()
+
+
+def test_corpus_covers_all_formats(tmp_path):
+    generate_corpus(tmp_path, 1, 12, 8, end_date=END)
+    cortex = tmp_path / "cortex"
+
+    parsed = digest_cache.parse_digest(
+        (cortex / "daily" / "2025-12-10-digest.md").read_text(encoding="utf-8"), "2025-12-10"
+    )
+    titles = [t["title"] for t in parsed["tasks"]]
+    assert any(t.startswith("Task ") for t in titles)
+    assert any(t.startswith("Table task") for t in titles)
+    assert any(t.startswith("Session") for t in titles)
+    assert parsed["progress"] and parsed["reflection"]
+
+    entry = json.loads((cortex / "state" / "task-entry-2025-12-10.json").read_text(encoding="utf-8"))
+    assert len(entry["tasks"]) == len(parsed["tasks"])
+
+    jsonl = (cortex / "logs" / "recipe-10-2025-12-10.jsonl").read_text(encoding="utf-8").splitlines()
+    assert len(jsonl) == 6
+    assert all(json.loads(line)["status"] in ("success", "error") for line in jsonl)
+    legacy = (cortex / "logs" / "recipe-10-2025-12-10.log").read_text(encoding="utf-8").splitlines()
+    assert len(legacy) == 2
+    assert all("[recipe_10]" in line for line in legacy)
+
+
+def test_benchmark_harness_records_results(tmp_path):
+    output = tmp_path / "bench.json"
+    result = subprocess.run(
+        ["python3", str(SCRIPTS / "benchmark-analytics.py"), "--sizes", "3x4x2", "--repeat", "1",
+         "--scripts", "analyze-duration,analyze-recipes", "--output", str(output)],
+        capture_output=True,
+        text=True,
+        cwd=tmp_path,
+    )
+    assert result.returncode == 0, result.stderr
+
+    runs = json.loads(output.read_text(encoding="utf-8"))["runs"]
+    assert len(runs) == 1
+    scripts = runs[0]["sizes"][0]["scripts"]
+    assert set(scripts) == {"analyze-duration", "analyze-recipes"}
+    for entry in scripts.values():
+        assert entry["cold_sec"] >= 0 and entry["peak_kb"] > 0
+
+
+def test_benchmark_records_warm_run_errors(tmp_path, monkeypatch):
+    runs = []
+
+    def main(argv):
+        runs.append(argv)
+        if len(runs) > 1:
+            raise RuntimeError("state left behind by the first run")
+
+    monkeypatch.setattr(benchmark_analytics, "load_script", lambda name: type("Script", (), {"main": main}))
+    result = benchmark_analytics.bench_script("flaky", ["--days", "3"], tmp_path, 2, False)
+
+    assert result == {"argv": ["--days", "3"], "error": "warm run: RuntimeError: state left behind by the first run"}
+
+
+def test_benchmark_compares_warm_runs():
+    def run(cold, warm):
+        return {"sizes": [{"size": "3x4x2", "scripts": {"analyze-rhythm": {"cold_sec": cold, "warm_sec": warm}}}]}
+
+    assert benchmark_analytics.compare(run(1.0, 0.1), run(1.0, 0.1)) == []
+    [line] = benchmark_analytics.compare(run(1.0, 0.1), run(1.0, 0.2))
+    assert "analyze-rhythm (warm)" in line and "2.00x" in line
+    [line] = benchmark_analytics.compare(run(1.0, 0.1), run(2.0, 0.1))
+    assert "(cold)" in line
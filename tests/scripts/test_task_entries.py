@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests for scripts/cortex_lib/task_entries.py
+
+Validates the shared task-entry loader:
+- Single-scan enumeration (canonical names only, *.enriched.json skipped)
+- Date window filtering and newest-first ordering
+- "__date" injection
+- (path, mtime, size) cache reuse and invalidation
+"""
+
+import json
+import os
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+
+from cortex_lib import task_entries
+
+
+TODAY = date(2025, 12, 22)
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    task_entries.clear_cache()
+    yield
+    task_entries.clear_cache()
+
+
+def write_entry(state_dir: Path, date_str: str, tasks: list, suffix: str = ".json") -> Path:
+    path = state_dir / f"task-entry-{date_str}{suffix}"
+    path.write_text(json.dumps({"date": date_str, "tasks": tasks}), encoding="utf-8")
+    return path
+
+
+def test_scan_skips_enriched_and_unrelated_files(tmp_path):
+    write_entry(tmp_path, "2025-12-22", [])
+    write_entry(tmp_path, "2025-12-22", [], suffix=".enriched.json")
+    write_entry(tmp_path, "2025-12-22", [], suffix=".enriched.enriched.json")
+    (tmp_path / "task-entries.json").write_text("{}", encoding="utf-8")
+
+    files = task_entries.scan_task_entry_files(tmp_path)
+    assert list(files) == ["2025-12-22"]
+    assert files["2025-12-22"][0].name == "task-entry-2025-12-22.json"
+
+
+def test_scan_missing_directory_returns_empty(tmp_path):
+    assert task_entries.scan_task_entry_files(tmp_path / "missing") == {}
+
+
+def test_load_window_order_and_date_injection(tmp_path):
+    for i in range(12):
+        d = (TODAY - timedelta(days=i)).strftime("%Y-%m-%d")
+        write_entry(tmp_path, d, [{"title": f"Task {i}", "status": "completed"}])
+
+    entries = task_entries.load_task_entries(7, tmp_path, today=TODAY)
+
+    assert [e["__date"] for e in entries] == [
+        (TODAY - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(7)
+    ]
+    assert entries[0]["tasks"][0]["title"] == "Task 0"
+
+
+def test_invalid_json_is_skipped(tmp_path, capsys):
+    write_entry(tmp_path, "2025-12-22", [{"title": "ok"}])
+    (tmp_path / "task-entry-2025-12-21.json").write_text("{broken", encoding="utf-8")
+
+    entries = task_entries.load_task_entries(7, tmp_path, today=TODAY)
+
+    assert [e["__date"] for e in entries] == ["2025-12-22"]
+    assert "Skipping invalid JSON" in capsys.readouterr().err
+
+
+def test_cache_reuses_decoded_entries(tmp_path):
+    write_entry(tmp_path, "2025-12-22", [{"title": "A"}])
+
+    first = task_entries.load_task_entries(1, tmp_path, today=TODAY)
+    second = task_entries.load_task_entries(1, tmp_path, today=TODAY)
+
+    assert first[0] is second[0]
+
+
+def test_cache_invalidated_when_file_changes(tmp_path):
+    path = write_entry(tmp_path, "2025-12-22", [{"title": "A"}])
+    first = task_entries.load_task_entries(1, tmp_path, today=TODAY)
+
+    path.write_text(json.dumps({"tasks": [{"title": "B"}, {"title": "C"}]}), encoding="utf-8")
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    second = task_entries.load_task_entries(1, tmp_path, today=TODAY)
+    assert first[0] is not second[0]
+    assert [t["title"] for t in second[0]["tasks"]] == ["B", "C"]
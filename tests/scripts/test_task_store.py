@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tests for scripts/cortex_lib/task_store.py and scripts/task-store.py
+
+Validates the SQLite task store:
+- sync() imports changed task-entry files only and drops deleted days
+- query / group API filters on the indexed columns
+- the analyzers give the same output from the store as from JSON
+- extract-tasks writes through, so a later sync has nothing to do
+"""
+
+import json
+import subprocess
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+
+from cortex_lib import task_store
+from cortex_lib.synthetic import generate_corpus
+
+
+SCRIPTS = Path(__file__).parent.parent.parent / "scripts"
+
+
+def run_script(cwd: Path, name: str, *args: str) -> subprocess.CompletedProcess:
+    result = subprocess.run(
+        ["python3", str(SCRIPTS / f"{name}.py"), *args],
+        capture_output=True,
+        text=True,
+        cwd=cwd,
+    )
+    assert result.returncode == 0, f"{name} failed: {result.stderr}"
+    return result
+
+
+def write_entry(state_dir: Path, date_str: str, entry: dict) -> None:
+    state_dir.mkdir(parents=True, exist_ok=True)
+    (state_dir / f"task-entry-{date_str}.json").write_text(json.dumps(entry), encoding="utf-8")
+
+
+def edge_case_entry(date_str: str) -> dict:
+    """Tasks exercising every derived column."""
+    return {
+        "tasks": [
+            {"title": "[x] bracket done", "category": "  ", "completed_at": f"{date_str}T22:15:00+09:00"},
+            {"title": "no category", "status": "done", "started_at": f"{date_str}T06:00:00",
+             "duration_hours": 2},
+            {"title": "low confidence", "status": "completed", "category": "dev",
+             "completed_at": f"{date_str}T10:00:00", "duration_minutes": 30, "duration_confidence": 0.3},
+            {"title": "open", "status": "todo", "category": "dev", "duration_minutes": 15},
+        ],
+        "completed": [
+            {"title": "logged", "status": "completed", "timestamp": "23:40"},
+        ],
+    }
+
+
+def test_sync_is_incremental(tmp_path):
+    state_dir = tmp_path / "state"
+    write_entry(state_dir, "2025-12-01", {"tasks": [{"title": "a"}]})
+    write_entry(state_dir, "2025-12-02", {"tasks": [{"title": "b"}, {"title": "c"}]})
+    (state_dir / "task-entry-2025-12-02.enriched.json").write_text("{}", encoding="utf-8")
+
+    conn = task_store.open_store(tmp_path / "tasks.db", create=True)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert task_store.sync(conn, state_dir) == 2
+    assert task_store.sync(conn, state_dir) == 0
+
+    write_entry(state_dir, "2025-12-01", {"tasks": [{"title": "a"}, {"title": "a2"}, {"title": "a3"}]})
+    (state_dir / "task-entry-2025-12-02.json").unlink()
+    assert task_store.sync(conn, state_dir) == 2
+    assert [t["title"] for t in task_store.query_tasks(conn)] == ["a", "a2", "a3"]
+
+
+def test_query_and_group(tmp_path):
+    state_dir = tmp_path / "state"
+    write_entry(state_dir, "2025-10-05", edge_case_entry("2025-10-05"))
+    write_entry(state_dir, "2025-12-30", edge_case_entry("2025-12-30"))
+    write_entry(state_dir, "2026-01-02", edge_case_entry("2026-01-02"))
+    conn = task_store.open_store(tmp_path / "tasks.db", create=True)
+    task_store.sync(conn, state_dir)
+
+    q4_dev = task_store.query_tasks(conn, "2025-10-01", "2025-12-31", category="dev", completed=True)
+    assert [(t["__date"], t["title"]) for t in q4_dev] == [("2025-10-05", "low confidence"),
+                                                          ("2025-12-30", "low confidence")]
+    assert [t["title"] for t in task_store.query_tasks(conn, hour=[22, 6], limit=2)] == \
+        ["[x] bracket done", "no category"]
+
+    by_hour = {row["hour"]: row for row in task_store.group_counts(conn, ["hour"], completed=True)}
+    assert by_hour[6]["duration_hours"] == 6.0
+    assert by_hour[None]["tasks"] == 3  # the logged task has no started/completed_at
+
+    rows = task_store.execute(conn, "SELECT COUNT(*) AS n FROM tasks WHERE clock_hour = 23")
+    assert rows == [{"n": 3}]
+
+
+def test_analyzers_match_json_path(tmp_path):
+    generate_corpus(tmp_path, 40, 12, 4)
+    today = datetime.now().date()
+    write_entry(tmp_path / "cortex" / "state", (today - timedelta(days=2)).isoformat(),
+                edge_case_entry((today - timedelta(days=2)).isoformat()))
+    run_script(tmp_path, "task-store", "sync")
+
+    def outputs(name: str, *args: str) -> tuple:
+        with_store = json.loads(run_script(tmp_path, name, "--windows", "7,30", *args).stdout)
+        without = json.loads(run_script(tmp_path, name, "--windows", "7,30", "--no-store", *args).stdout)
+        with_store.pop("generated_at")
+        without.pop("generated_at")
+        return with_store, without
+
+    for name in ("analyze-rhythm", "analyze-category-heatmap"):
+        with_store, without = outputs(name)
+        assert with_store == without, name
+
+    # Means / std devs are float sums in SQL: compare the exact fields
+    with_store, without = outputs("analyze-duration", "--exact")
+    for key in ("overall", *without["by_category"]):
+        a = with_store["overall"] if key == "overall" else with_store["by_category"][key]
+        b = without["overall"] if key == "overall" else without["by_category"][key]
+        assert {k: a[k] for k in ("count", "median", "min", "max", "confidence")} == \
+            {k: b[k] for k in ("count", "median", "min", "max", "confidence")}
+        assert abs(a["mean"] - b["mean"]) <= 0.01 and abs(a["std_dev"] - b["std_dev"]) <= 0.01
+    assert list(with_store["by_category"]) == list(without["by_category"])
+    assert with_store["windows"]["7"]["overall"]["count"] == without["windows"]["7"]["overall"]["count"]
+
+
+def test_extract_tasks_writes_through(tmp_path):
+    daily_dir = tmp_path / "cortex" / "daily"
+    daily_dir.mkdir(parents=True)
+    d = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+    (daily_dir / f"{d}-digest.md").write_text("- [x] Done #work\n- [ ] Open\n", encoding="utf-8")
+    run_script(tmp_path, "task-store", "sync")
+
+    run_script(tmp_path, "extract-tasks", "--days", "3")
+
+    conn = task_store.open_store(tmp_path / task_store.STORE_PATH)
+    assert conn.execute("SELECT tasks FROM days WHERE date = ?", (d,)).fetchone()[0] == 2
+    assert task_store.sync(conn, tmp_path / task_store.STATE_DIR) == 0
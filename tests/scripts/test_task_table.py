@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for scripts/cortex_lib/task_table.py
+
+Validates the compact task table:
+- Task dicts convert to interned codes / epoch ints / float32 and back
+- Entry adapters keep the load order and the tasks / completed split
+- The analyzers give the same output with --compact as from the dicts
+"""
+
+import json
+import subprocess
+import sys
+from array import array
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+
+from cortex_lib import task_table
+from cortex_lib.synthetic import generate_corpus
+
+
+SCRIPTS = Path(__file__).parent.parent.parent / "scripts"
+
+
+def run_script(cwd: Path, name: str, *args: str) -> dict:
+    output = cwd / f"{name}.json"
+    result = subprocess.run(
+        ["python3", str(SCRIPTS / f"{name}.py"), *args, "--output", str(output)],
+        capture_output=True,
+        text=True,
+        cwd=cwd,
+    )
+    assert result.returncode == 0, f"{name} failed: {result.stderr}"
+    data = json.loads(output.read_text(encoding="utf-8"))
+    data.pop("generated_at")
+    data.pop("_meta")  # fingerprints the arguments, which differ by design
+    return data
+
+
+def sample_entry() -> dict:
+    return {
+        "tasks": [
+            {"title": "[x] bracket done", "category": None, "completed_at": "2025-12-01T22:15:30+09:00",
+             "timestamp_source": "fixed", "timestamp_confidence": 0.7, "notes": "dropped"},
+            {"title": "timed", "status": "completed", "category": "dev", "started_at": "2025-12-01T06:00:00",
+             "duration_minutes": 37, "duration_source": "explicit", "duration_confidence": 1.0},
+            {"title": "bad times", "status": "todo", "category": "dev", "started_at": "not a date",
+             "duration_hours": 0},
+        ],
+        "completed": [
+            {"title": "logged", "status": "completed", "timestamp": "9:05"},
+        ],
+    }
+
+
+def test_round_trip_through_views():
+    table = task_table.TaskTable.from_entries([{"__date": "2025-12-01", **sample_entry()}])
+
+    assert len(table) == 4
+    assert isinstance(table.times["completed_at"], array)
+    assert table.duration_hours.typecode == "f"
+    assert table.coded["category"][1] == table.coded["category"][2]  # "dev" interned once
+
+    [entry] = list(table.entries())
+    bracket, timed, bad = entry["tasks"]
+    [logged] = entry["completed"]
+
+    assert entry["__date"] == "2025-12-01"
+    assert bracket.get("completed_at") == "2025-12-01T22:15:30+09:00"
+    assert "category" in bracket and bracket["category"] is None
+    assert bracket.get("status", "") == ""
+    assert bracket.get("timestamp_confidence") == 0.7
+    assert bracket.get("notes") is None
+    assert timed.get("started_at") == "2025-12-01T06:00:00"
+    assert abs(timed["duration_hours"] - 37 / 60) < 1e-6
+    assert timed.get("duration_minutes") is None
+    assert bad.get("started_at") is None and bad.get("duration_hours") == 0.0
+    assert "category" not in logged and logged.get("timestamp") == "09:05"
+    assert logged.to_dict() == {"title": "logged", "status": "completed", "timestamp": "09:05"}
+    assert [t.get("title") for t in entry["tasks"] + entry["completed"]] == \
+        ["[x] bracket done", "timed", "bad times", "logged"]
+
+
+def test_load_task_table_matches_loader_order(tmp_path):
+    state_dir = tmp_path / "state"
+    state_dir.mkdir()
+    today = datetime.now().date()
+    for offset in (0, 2, 40):
+        date_str = (today - timedelta(days=offset)).isoformat()
+        (state_dir / f"task-entry-{date_str}.json").write_text(json.dumps(sample_entry()), encoding="utf-8")
+    (state_dir / f"task-entry-{today.isoformat()}.enriched.json").write_text("{}", encoding="utf-8")
+
+    table = task_table.load_task_table(30, state_dir)
+
+    assert [e["__date"] for e in table.entries()] == \
+        [today.isoformat(), (today - timedelta(days=2)).isoformat()]
+    assert len(table) == 8
+
+
+def test_analyzers_match_dict_path(tmp_path):
+    generate_corpus(tmp_path, 40, 12, 4)
+    today = datetime.now().date()
+    state_dir = tmp_path / "cortex" / "state"
+    (state_dir / f"task-entry-{(today - timedelta(days=3)).isoformat()}.json").write_text(
+        json.dumps(sample_entry()), encoding="utf-8")
+
+    for name, *args in (("analyze-rhythm",), ("analyze-category-heatmap",), ("analyze-duration", "--exact")):
+        common = [*args, "--windows", "7,30", "--no-store"]
+        assert run_script(tmp_path, name, *common, "--compact") == run_script(tmp_path, name, *common), name
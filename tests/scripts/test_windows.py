@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Tests for scripts/cortex_lib/windows.py
+
+Validates multi-window helpers:
+- --windows parsing
+- accumulate_windows() snapshots each window from one newest-first pass
+"""
+
+import argparse
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+
+from cortex_lib.windows import accumulate_windows, parse_windows, window_cutoff, windows_json
+
+
+TODAY = date(2025, 12, 22)
+
+
+def test_parse_windows():
+    assert parse_windows("30, 7,90,7") == [7, 30, 90]
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_windows("7,x")
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_windows("0,7")
+
+
+def test_window_cutoff_includes_today():
+    assert window_cutoff(1, TODAY) == "2025-12-22"
+    assert window_cutoff(7, TODAY) == "2025-12-16"
+
+
+def test_accumulate_windows_matches_filtering():
+    # Newest first, with gaps
+    entries = [{"__date": (TODAY - timedelta(days=d)).isoformat(), "n": d} for d in (0, 1, 3, 6, 7, 20, 40)]
+    seen = []
+
+    results = accumulate_windows(
+        entries, [30, 7, 2], lambda e: seen.append(e["n"]), lambda: sorted(seen), today=TODAY
+    )
+
+    for days, got in results.items():
+        cutoff = window_cutoff(days, TODAY)
+        assert got == sorted(e["n"] for e in entries if e["__date"] >= cutoff)
+    # The pass stops once the longest window is complete
+    assert 40 not in seen
+    assert windows_json(results, [7, 30]) == {"7": [0, 1, 3, 6], "30": [0, 1, 3, 6, 7, 20]}
+
+
+def test_accumulate_windows_empty():
+    assert accumulate_windows([], [7, 30], lambda e: None, lambda: 0) == {7: 0, 30: 0}